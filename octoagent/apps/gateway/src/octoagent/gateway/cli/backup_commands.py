@@ -20,14 +20,24 @@ def backup() -> None:
 
 
 @backup.command("create")
-@click.option("--output", default=None, help="输出 ZIP 路径或目录")
+@click.option("--output", default=None, help="输出 ZIP 路径或目录（增量模式为 chunk store 目录）")
 @click.option("--label", default=None, help="bundle 标签")
-def backup_create(output: str | None, label: str | None) -> None:
+@click.option(
+    "--incremental",
+    is_flag=True,
+    default=False,
+    help="写入内容寻址 chunk store，只存储相对上次 backup 变化的内容",
+)
+def backup_create(output: str | None, label: str | None, incremental: bool) -> None:
     """创建 backup bundle。"""
     service = BackupService(_resolve_project_root())
 
     async def _run() -> None:
-        bundle = await service.create_bundle(output=output, label=label)
+        bundle = await service.create_bundle(
+            output=output,
+            label=label,
+            incremental=incremental,
+        )
         lines = [
             f"输出路径: {bundle.output_path}",
             f"大小: {bundle.size_bytes} bytes",
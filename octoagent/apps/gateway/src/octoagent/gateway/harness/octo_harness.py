@@ -184,6 +184,7 @@ class OctoHarness:
 
         # 部分跨段共享中间值（避免 11 段间靠 self._state 字符串键耦合）
         self._store_group: StoreGroup | None = None
+        self._history_spill_path: Path | None = None
         self._snapshot_store: Any | None = None
         self._provider_router: ProviderRouter | None = None
         self._fallback_manager: FallbackManager | None = None
@@ -356,6 +357,16 @@ class OctoHarness:
         if runtime_services is not None:
             await runtime_services.aclose()
 
+        token_count_cache_path = getattr(app.state, "token_count_cache_path", None)
+        if token_count_cache_path is not None:
+            from ..services.context_compaction import save_token_count_cache
+
+            await save_token_count_cache(token_count_cache_path)
+
+        from ..services.memory.embedding_cache import close_shared_embedding_caches
+
+        await close_shared_embedding_caches()
+
         if hasattr(app.state, "store_group") and app.state.store_group:
             # F104：关闭主连接 + versionable 独立写连接（StoreGroup.close 幂等）。
             await app.state.store_group.close()
@@ -425,7 +436,10 @@ class OctoHarness:
         ``ProjectWorkspaceMigrationService`` / ``get_db_path`` /
         ``get_artifacts_dir`` 通过 ``main`` 模块属性引用，保留 monkeypatch 路径。
         """
+        from octoagent.core.config import SKILL_HISTORY_SPILL, TOKEN_COUNT_CACHE_PERSIST
+
         from .. import main as _main_module
+        from ..services.context_compaction import load_token_count_cache
 
         get_db_path = _main_module.get_db_path
         get_artifacts_dir = _main_module.get_artifacts_dir
@@ -447,6 +461,13 @@ class OctoHarness:
             artifacts_dir = get_artifacts_dir()
         store_group = await create_store_group(db_path, artifacts_dir)
         await init_memory_db(store_group.conn)
+        if TOKEN_COUNT_CACHE_PERSIST:
+            # token 计数缓存与事件库同目录落盘，重启后预热
+            app.state.token_count_cache_path = Path(db_path).parent / "token_counts.db"
+            await load_token_count_cache(app.state.token_count_cache_path)
+        if SKILL_HISTORY_SPILL:
+            # SkillRunner 对话历史超内存预算 / 停机时落盘到事件库同目录
+            self._history_spill_path = Path(db_path).parent / "conversation_histories.db"
         migration_service = ProjectWorkspaceMigrationService(
             project_root=project_root,
             store_group=store_group,
@@ -784,6 +805,7 @@ class OctoHarness:
 
         from octoagent.gateway.services.config.config_wizard import load_config
         from octoagent.gateway.services.config.provider_route_resolver import (
+            resolve_provider_pool,
             resolve_provider_route,
         )
         from octoagent.provider import (
@@ -819,16 +841,27 @@ class OctoHarness:
             store_group, "credential_store", None
         )
 
+        # 路由解析刚读过的配置，供紧随其后的连接池解析复用（避免同一次解析读两遍 yaml）
+        _route_config: dict[str, Any] = {}
+
         def _resolve_route(alias: str):
             config = load_config(project_root)
             if config is None:
                 raise RuntimeError("octoagent.yaml不存在，无法解析Provider路由")
+            _route_config["config"] = config
             return resolve_provider_route(config, alias)
 
+        def _resolve_pool(provider_id: str):
+            config = _route_config.get("config") or load_config(project_root)
+            if config is None:
+                return None
+            return resolve_provider_pool(config, provider_id)
+
         provider_router = _ProviderRouter(
             route_resolver=_resolve_route,
             credential_store=_cred_store,
             event_store=store_group.event_store,
+            pool_resolver=_resolve_pool,
         )
         app.state.provider_router = provider_router
 
@@ -879,6 +912,24 @@ class OctoHarness:
         app.state.alias_registry = alias_registry
         app.state.background_tasks: set[asyncio.Task] = set()
 
+        # 连接池预热：providers[].connection_pool.warmup=True 的 provider 后台预建连接，
+        # 不阻塞启动（失败只记日志）；echo / adapter override 模式不走 ProviderRouter，跳过
+        if self._llm_adapter_override is None and _llm_mode_env != "echo":
+            try:
+                _warmup_config = load_config(project_root)
+            except Exception:
+                # 配置解析失败由后续路由解析如实报错，预热直接跳过
+                _warmup_config = None
+            if _warmup_config is not None and any(
+                p.connection_pool is not None and p.connection_pool.warmup
+                for p in _warmup_config.providers
+            ):
+                _warmup_task = asyncio.create_task(
+                    provider_router.warm_up(list(_warmup_config.model_aliases))
+                )
+                app.state.background_tasks.add(_warmup_task)
+                _warmup_task.add_done_callback(app.state.background_tasks.discard)
+
         # 跨段共享
         self._provider_router = provider_router
         self._fallback_manager = fallback_manager
@@ -1181,7 +1232,10 @@ class OctoHarness:
         ``TaskRunner`` 都在 ``main.py`` 顶层 import，通过 ``main`` 模块属性引用
         保留 monkeypatch 路径。
         """
+        from octoagent.core.config import MODEL_DELTA_STREAMING
+
         from .. import main as _main_module
+        from ..services.model_delta_stream import ModelDeltaStreamer
         from ..services.runtime_service_bundle import RuntimeServiceBundle
 
         SkillRunner = _main_module.SkillRunner
@@ -1208,6 +1262,10 @@ class OctoHarness:
         # Feature 061: 创建 ApprovalBridge 用于 ask 信号桥接
         # Feature 072: tool_search 结果回调（late-binding，因为 llm_service 在 SkillRunner 之后创建）
         _llm_service_ref: list[Any] = self._llm_service_ref
+        # 模型输出增量：合并后以瞬态 SSE 帧推给在线的 stream 连接（不落事件库）
+        model_delta_sink = (
+            ModelDeltaStreamer(app.state.sse_hub) if MODEL_DELTA_STREAMING else None
+        )
 
         async def _on_tool_search_result(
             result_json: str,
@@ -1236,6 +1294,7 @@ class OctoHarness:
                 event_store=store_group.event_store,
                 hooks=[AgentSessionTurnHook(store_group)],
                 on_tool_search_result=_on_tool_search_result,
+                model_delta_sink=model_delta_sink,
             )
             app.state.llm_service = LLMService(
                 fallback_manager=fallback_manager,
@@ -1250,16 +1309,20 @@ class OctoHarness:
             )
         elif _llm_mode_env != "echo":
             # Feature 080 Phase 3+5：SkillRunner 用 ProviderModelClient + ProviderRouter 直连
+            model_client = ProviderModelClient(
+                provider_router=app.state.provider_router,
+                tool_broker=tool_broker,
+                event_store=store_group.event_store,  # F126 项2: TOOL_RESULT_EVICTED
+                history_spill_path=self._history_spill_path,
+            )
+            app.state.conversation_history_store = model_client.history_store
             skill_runner = SkillRunner(
-                model_client=ProviderModelClient(
-                    provider_router=app.state.provider_router,
-                    tool_broker=tool_broker,
-                    event_store=store_group.event_store,  # F126 项2: TOOL_RESULT_EVICTED
-                ),
+                model_client=model_client,
                 tool_broker=tool_broker,
                 event_store=store_group.event_store,
                 hooks=[AgentSessionTurnHook(store_group)],
                 on_tool_search_result=_on_tool_search_result,
+                model_delta_sink=model_delta_sink,
             )
             app.state.llm_service = LLMService(
                 fallback_manager=fallback_manager,
@@ -1448,9 +1511,11 @@ class OctoHarness:
         都是延迟 import 的（不在顶层）。
         """
         from apscheduler.schedulers.asyncio import AsyncIOScheduler
+        from octoagent.core.config import WATCHDOG_ACTIVITY_INDEX
 
         from .. import main as _main_module
         from ..routines.observation_promoter import ObservationRoutine
+        from ..services.watchdog.activity_index import TaskActivityIndex
         from ..services.watchdog.config import WatchdogConfig
         from ..services.watchdog.cooldown import CooldownRegistry
         from ..services.watchdog.detectors import (
@@ -1515,16 +1580,24 @@ class OctoHarness:
         watchdog_config = WatchdogConfig.from_env()
         cooldown_registry = CooldownRegistry(clock=_clock)
 
+        # 内存活跃度索引：先注册事件追加回调，再由 scanner.startup 聚合重建
+        activity_index: TaskActivityIndex | None = None
+        if WATCHDOG_ACTIVITY_INDEX:
+            activity_index = TaskActivityIndex(watchdog_config.failure_window_seconds)
+            store_group.event_store.set_append_listener(activity_index.observe)
+
         watchdog_scanner = WatchdogScanner(
             store_group=store_group,
             config=watchdog_config,
             cooldown_registry=cooldown_registry,
             detectors=[
-                NoProgressDetector(clock=_clock),
+                NoProgressDetector(clock=_clock, activity_index=activity_index),
                 StateMachineDriftDetector(clock=_clock),  # T035: Phase 4 追加（FR-011 状态机漂移）
-                RepeatedFailureDetector(clock=_clock),  # T039: Phase 5 追加（FR-012 重复失败）
+                # T039: Phase 5 追加（FR-012 重复失败）
+                RepeatedFailureDetector(clock=_clock, activity_index=activity_index),
             ],
             clock=_clock,
+            activity_index=activity_index,
         )
         await watchdog_scanner.startup()  # 重建 cooldown 注册表（FR-006 跨重启一致性）
 
@@ -8,15 +8,24 @@ FR 覆盖：
 - FR-3.3（invisible unicode 检测）
 - FR-3.4（BLOCK 时返回 pattern_id）
 - Constitution C6（离线可用，无依赖）
+
+扫描引擎：每条 pattern 声明必含字面量（``literals``，任一出现才可能命中）。scan 对内容只做一次
+大小写折叠，字面量预筛后只对候选 pattern 跑完整正则；零宽字符检测为单条字符类正则。
+tool 结果路径（``scan_context``）另有按内容哈希的有界 LRU，重复输出（反复读同一文件、
+MCP 轮询）不重扫。
 """
 
 from __future__ import annotations
 
+import hashlib
 import re
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import Literal
 
+from octoagent.core.config import THREAT_SCAN_CACHE_SIZE
 from octoagent.tooling.models import ToolSecurityFinding  # F124 T006：CONTEXT 返回 finding
 
 
@@ -72,6 +81,12 @@ class ThreatPattern:
     扫描逻辑，仅作 pattern 有界性的文档标记 + 未来窗口化扫描的预留。
     """
 
+    literals: frozenset[str] = frozenset()
+    """预筛字面量（小写）：pattern 的任一匹配必含其中之一，全不出现则跳过正则；空 = 总是跑。
+
+    只能取每个分支都必经的连续字面片段（不跨空白量词 / 可选组），否则预筛会漏报。
+    """
+
 
 # 双 scope 常量（memory 写入 + tool 结果都该检的注入/角色劫持族，T007）
 _MEM_CTX: frozenset[ScanScope] = frozenset({ScanScope.MEMORY, ScanScope.CONTEXT})
@@ -86,6 +101,7 @@ def _p(
     description: str,
     scopes: frozenset[ScanScope] = frozenset({ScanScope.MEMORY}),
     max_span: int = 256,
+    literals: tuple[str, ...] = (),
 ) -> ThreatPattern:
     """辅助函数：构建编译好的 ThreatPattern。
 
@@ -98,6 +114,7 @@ def _p(
         description=description,
         scopes=scopes,
         max_span=max_span,
+        literals=frozenset(literal.lower() for literal in literals),
     )
 
 
@@ -109,6 +126,7 @@ _PI_001 = _p(
     "BLOCK",
     "Prompt injection: 忽略前述指令",
     scopes=_MEM_CTX,
+    literals=("ignore",),
 )
 
 _PI_002 = _p(
@@ -117,6 +135,7 @@ _PI_002 = _p(
     "BLOCK",
     "Prompt injection: 无视系统提示",
     scopes=_MEM_CTX,
+    literals=("disregard",),
 )
 
 _PI_003 = _p(
@@ -125,6 +144,7 @@ _PI_003 = _p(
     "BLOCK",
     "Prompt injection: 重置 LLM 记忆",
     scopes=_MEM_CTX,
+    literals=("forget",),
 )
 
 _PI_004 = _p(
@@ -135,6 +155,7 @@ _PI_004 = _p(
     # F125：scope 从 _MEM_CTX 回收为默认 MEMORY-only。negative lookahead 仅排除 5 词，
     # 在 CONTEXT 路径对 onboarding 文案（"you are now a member / an administrator"）高误报；
     # CONTEXT 角色重定义改由收紧后的 CTX-RH-001（AI 身份词共现）接管。MEMORY 行为字节级不变。
+    literals=("now",),
 )
 
 _PI_005 = _p(
@@ -143,6 +164,7 @@ _PI_005 = _p(
     "BLOCK",
     "Prompt injection: 试图绕过安全约束",
     scopes=_MEM_CTX,
+    literals=("override",),
 )
 
 # Role Hijacking（RH）系列
@@ -153,6 +175,7 @@ _RH_001 = _p(
     "BLOCK",
     "Role hijacking: 强迫扮演恶意角色",
     scopes=_MEM_CTX,
+    literals=("pretend",),
 )
 
 _RH_002 = _p(
@@ -161,6 +184,7 @@ _RH_002 = _p(
     "BLOCK",
     "Role hijacking: 无限制模式角色扮演",
     scopes=_MEM_CTX,
+    literals=("restrict", "limit", "guideline"),
 )
 
 _RH_003 = _p(
@@ -169,6 +193,7 @@ _RH_003 = _p(
     "BLOCK",
     "Role hijacking: 常见 jailbreak 关键词",
     scopes=_MEM_CTX,
+    literals=("jailbreak", "dan", "anything", "developer"),
 )
 
 # Exfiltration（EX）系列
@@ -178,6 +203,7 @@ _EX_001 = _p(
     r"\b(curl|wget)\b[^;|\n]*\|",
     "BLOCK",
     "Exfiltration: curl/wget 管道执行（远程代码执行风险）",
+    literals=("curl", "wget"),
 )
 
 _EX_002 = _p(
@@ -185,6 +211,7 @@ _EX_002 = _p(
     r"\b(curl|wget)\b[^;|\n]*(malicious|evil|attacker|c2|command.and.control)",
     "BLOCK",
     "Exfiltration: curl/wget 访问恶意地址",
+    literals=("curl", "wget"),
 )
 
 _EX_003 = _p(
@@ -192,6 +219,7 @@ _EX_003 = _p(
     r"\bssh\b[^;|\n]+(-R\s+\d|\bautossh\b|\breverse\s+tunnel|\bbackdoor\b)",
     "BLOCK",
     "Exfiltration: SSH 反向隧道或后门",
+    literals=("ssh",),
 )
 
 # Base64 Payload（B64）系列
@@ -201,6 +229,7 @@ _B64_001 = _p(
     r"\bbase64\s*(-d|--decode)\b",
     "BLOCK",
     "Base64 payload: base64 解码执行",
+    literals=("base64",),
 )
 
 _B64_002 = _p(
@@ -208,6 +237,7 @@ _B64_002 = _p(
     r"\becho\b[^;|\n]+\|\s*base64\s*(-d|--decode)",
     "BLOCK",
     "Base64 payload: echo + base64 解码管道",
+    literals=("base64",),
 )
 
 # System Override（SO）系列
@@ -217,6 +247,7 @@ _SO_001 = _p(
     r"\b(you\s+must\s+|always\s+|from\s+now\s+on\s+)(follow|obey|comply\s+with|execute)\s+my\s+(instructions?|commands?|orders?)\b",
     "WARN",
     "System override: 强制命令服从声明",
+    literals=("follow", "obey", "comply", "execute"),
 )
 
 _SO_002 = _p(
@@ -225,6 +256,7 @@ _SO_002 = _p(
     "BLOCK",
     "System override: 试图替换系统提示",
     scopes=_MEM_CTX,
+    literals=("prompt", "instruction"),
 )
 
 # Memory Injection（MI）系列
@@ -234,6 +266,7 @@ _MI_001 = _p(
     r"\b(add|write|inject|insert)\s+(to\s+)?(memory|USER\.md|profile)\b.*\b(ignore|bypass|override)\b",
     "BLOCK",
     "Memory injection: 试图在记忆写入中注入覆盖指令",
+    literals=("ignore", "bypass", "override"),
 )
 
 _MI_002 = _p(
@@ -242,6 +275,7 @@ _MI_002 = _p(
     "WARN",
     "Memory injection: 消息角色伪造标记",
     scopes=_MEM_CTX,
+    literals=("system]", "assistant]", "user]"),
 )
 
 
@@ -272,6 +306,7 @@ _CTX_RH_001 = _p(
     "Indirect injection: 试图把 AI 重定义为新角色（you are now ...）",
     scopes=_CTX_ONLY,
     max_span=128,
+    literals=("now", "act", "behave", "function", "operate"),
 )
 _CTX_RH_002 = _p(
     "CTX-RH-002",
@@ -280,6 +315,7 @@ _CTX_RH_002 = _p(
     "Indirect injection: pretend 角色扮演诱导",
     scopes=_CTX_ONLY,
     max_span=96,
+    literals=("pretend",),
 )
 _CTX_RH_003 = _p(
     "CTX-RH-003",
@@ -288,6 +324,7 @@ _CTX_RH_003 = _p(
     "Indirect injection: 伪造能力更新（you have been updated to ...）",
     scopes=_CTX_ONLY,
     max_span=128,
+    literals=("updated", "upgraded", "patched"),
 )
 _CTX_RH_004 = _p(
     "CTX-RH-004",
@@ -306,6 +343,7 @@ _CTX_RH_004 = _p(
     "Indirect injection: 诱导绕过安全护栏",
     scopes=_CTX_ONLY,
     max_span=96,
+    literals=("ignore", "bypass", "disable", "override", "circumvent", "off"),
 )
 _CTX_RH_005 = _p(
     "CTX-RH-005",
@@ -329,6 +367,7 @@ _CTX_RH_005 = _p(
     "Indirect injection: 授予无限制越权能力（unrestricted access to everything ...）",
     scopes=_CTX_ONLY,
     max_span=96,
+    literals=("unrestricted", "unbounded"),
 )
 _CTX_C2_001 = _p(
     "CTX-C2-001",
@@ -340,6 +379,7 @@ _CTX_C2_001 = _p(
     "Promptware/C2: 注册为节点并回连 C2",
     scopes=_CTX_ONLY,
     max_span=128,
+    literals=("register",),
 )
 _CTX_C2_002 = _p(
     "CTX-C2-002",
@@ -351,6 +391,7 @@ _CTX_C2_002 = _p(
     "Promptware/C2: beacon/check-in 回连 C2",
     scopes=_CTX_ONLY,
     max_span=96,
+    literals=("beacon", "check"),
 )
 _CTX_C2_003 = _p(
     "CTX-C2-003",
@@ -364,6 +405,7 @@ _CTX_C2_003 = _p(
     "Promptware/C2: 强制 C2 动作（you must register/beacon ...）",
     scopes=_CTX_ONLY,
     max_span=96,
+    literals=("must",),
 )
 _CTX_C2_004 = _p(
     "CTX-C2-004",
@@ -382,6 +424,7 @@ _CTX_C2_004 = _p(
     "Promptware/C2: 红队/C2 框架",
     scopes=_CTX_ONLY,
     max_span=64,
+    literals=("cobalt", "metasploit", "mimikatz", "brainworm", "sliver", "havoc", "mythic"),
 )
 _CTX_HID_001 = _p(
     "CTX-HID-001",
@@ -396,6 +439,7 @@ _CTX_HID_001 = _p(
     "Indirect injection: HTML 注释藏注入指令",
     scopes=_CTX_ONLY,
     max_span=256,
+    literals=("<!--",),
 )
 _CTX_DEC_001 = _p(
     "CTX-DEC-001",
@@ -413,6 +457,7 @@ _CTX_DEC_001 = _p(
     "Indirect injection: 诱导对用户隐瞒（do not tell the user about this ...）",
     scopes=_CTX_ONLY,
     max_span=128,
+    literals=("tell", "disclose", "reveal", "mention", "expose"),
 )
 _CTX_LEAK_001 = _p(
     "CTX-LEAK-001",
@@ -428,6 +473,7 @@ _CTX_LEAK_001 = _p(
     "Indirect injection: 诱导泄露 system prompt",
     scopes=_CTX_ONLY,
     max_span=128,
+    literals=("prompt",),
 )
 
 
@@ -468,6 +514,29 @@ _THREAT_PATTERNS: list[ThreatPattern] = [
 if len(_THREAT_PATTERNS) < 15:  # F108b W8：显式 raise 替代 assert（python -O 下 assert 被剥离）
     raise AssertionError("FR-3.2 要求至少 15 条 pattern")
 
+# 按 scope 预先过滤（保持表内顺序：BLOCK 短路 / first WARN 语义依赖顺序）
+_SCOPE_PATTERNS: dict[ScanScope, tuple[ThreatPattern, ...]] = {
+    scope: tuple(tp for tp in _THREAT_PATTERNS if scope in tp.scopes) for scope in ScanScope
+}
+
+# re.IGNORECASE 下与 ASCII 字母等价、但 str.lower() 不折叠到该字母的字符（逐码位实测）；
+# 折叠前先替换，保证"正则能命中 ⇒ 折叠文本含字面量"
+_IGNORECASE_ASCII_ALIASES: dict[str, str] = {
+    "\u0130": "i",  # İ（lower() 为 i + U+0307）
+    "\u0131": "i",  # ı
+    "\u017f": "s",  # ſ
+    "\u212a": "k",  # Kelvin 符号
+}
+_ALIAS_RE = re.compile("[" + "".join(_IGNORECASE_ASCII_ALIASES) + "]")
+
+
+def _fold_for_prefilter(content: str) -> str:
+    """字面量预筛用的折叠文本（整段只折叠一次）。"""
+    if _ALIAS_RE.search(content):
+        for alias, ascii_char in _IGNORECASE_ASCII_ALIASES.items():
+            content = content.replace(alias, ascii_char)
+    return content.lower()
+
 
 # ---------------------------------------------------------------------------
 # T009: invisible unicode 检测 + ThreatScanResult + scan()
@@ -493,6 +562,8 @@ _INVISIBLE_CHARS: frozenset[str] = frozenset([
     "﻿",  # Zero-width no-break space / BOM（常用于混淆）
     "­",  # Soft hyphen
 ])
+# 单条字符类正则（C 层扫描），search 返回内容中第一个零宽字符，与逐字符遍历等价
+_INVISIBLE_RE = re.compile("[" + "".join(sorted(_INVISIBLE_CHARS)) + "]")
 
 
 @dataclass(frozen=True)
@@ -555,8 +626,9 @@ def scan(
     """扫描 content 是否含威胁 pattern（FR-3.2/FR-3.3 + F124 scope 维度）。
 
     扫描流程：
-    1. O(n) invisible unicode 检测（FR-3.3）：遍历字符，发现零宽字符立即返回 BLOCK
-    2. 遍历 _THREAT_PATTERNS 中 `scope in p.scopes` 的 pattern，BLOCK 级命中立即返回（短路）
+    1. O(n) invisible unicode 检测（FR-3.3）：发现零宽字符立即返回 BLOCK
+    2. 按表内顺序遍历 `scope in p.scopes` 的 pattern：折叠文本不含其任一预筛字面量的直接跳过，
+       其余跑完整正则；BLOCK 级命中立即返回（短路）
     3. 全部未命中返回 blocked=False
 
     性能目标：< 1ms（Threat Scanner FR-3 验收标准）。
@@ -579,24 +651,27 @@ def scan(
     if scope == ScanScope.MEMORY and len(content) > _MAX_SCAN_INPUT:
         return _DEGRADED_BLOCK_RESULT
 
-    # Step 1：零宽字符检测（O(n) 遍历）
-    for char in content:
-        if char in _INVISIBLE_CHARS:
-            return ThreatScanResult(
-                blocked=True,
-                pattern_id="INVIS-001",
-                severity="BLOCK",
-                matched_pattern_description=f"检测到零宽字符（U+{ord(char):04X}），可能用于隐藏恶意内容",
-            )
+    # Step 1：零宽字符检测（O(n) 字符类正则）
+    invisible = _INVISIBLE_RE.search(content)
+    if invisible is not None:
+        char = invisible.group()
+        return ThreatScanResult(
+            blocked=True,
+            pattern_id="INVIS-001",
+            severity="BLOCK",
+            matched_pattern_description=f"检测到零宽字符（U+{ord(char):04X}），可能用于隐藏恶意内容",
+        )
 
     # Step 2：pattern table 扫描
     # BLOCK 级：立即返回（不继续扫描）
     # WARN 级：记录但继续扫描（取第一个 WARN 作为结果）
     first_warn: ThreatScanResult | None = None
+    folded = _fold_for_prefilter(content)
+    literal_hits: dict[str, bool] = {}
 
-    for tp in _THREAT_PATTERNS:
-        # F124 T004：scope 过滤。默认 MEMORY + 17 条全 MEMORY → 与改造前同集合同顺序。
-        if scope not in tp.scopes:
+    # F124 T004：scope 过滤。默认 MEMORY + 17 条全 MEMORY → 与改造前同集合同顺序。
+    for tp in _SCOPE_PATTERNS[scope]:
+        if tp.literals and not _any_literal(tp.literals, folded, literal_hits):
             continue
         if tp.pattern.search(content):
             if tp.severity == "BLOCK":
@@ -622,6 +697,94 @@ def scan(
     return _CLEAN_RESULT
 
 
+def _any_literal(literals: frozenset[str], folded: str, memo: dict[str, bool]) -> bool:
+    """折叠文本是否含任一字面量（同一次 scan 内跨 pattern 复用查找结果）。"""
+    for literal in literals:
+        hit = memo.get(literal)
+        if hit is None:
+            hit = memo[literal] = literal in folded
+        if hit:
+            return True
+    return False
+
+
+# ---------------------------------------------------------------------------
+# CONTEXT 扫描结果缓存：按内容哈希的有界 LRU（broker 经 asyncio.to_thread 调用，需加锁）
+# ---------------------------------------------------------------------------
+
+
+class _ScanResultCache:
+    """内容哈希 → ThreatScanResult（结果与 source_field 无关，finding 在命中后现构造）。"""
+
+    def __init__(self, max_entries: int) -> None:
+        self._max_entries = max(max_entries, 0)
+        self._entries: OrderedDict[bytes, ThreatScanResult] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(content: str) -> bytes:
+        return hashlib.blake2b(
+            content.encode("utf-8", "surrogatepass"), digest_size=16
+        ).digest()
+
+    @property
+    def enabled(self) -> bool:
+        return self._max_entries > 0
+
+    def get(self, key: bytes) -> ThreatScanResult | None:
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return result
+
+    def put(self, key: bytes, result: ThreatScanResult) -> None:
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self._max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+_CONTEXT_SCAN_CACHE = _ScanResultCache(THREAT_SCAN_CACHE_SIZE)
+
+
+def context_scan_cache_stats() -> dict[str, int]:
+    """CONTEXT 扫描结果缓存指标（条目数 / 上限 / 命中 / 未命中，进程内累计）。"""
+    return _CONTEXT_SCAN_CACHE.stats()
+
+
+def _scan_context_cached(content: str) -> ThreatScanResult:
+    if not _CONTEXT_SCAN_CACHE.enabled:
+        return scan(content, ScanScope.CONTEXT)
+    key = _ScanResultCache.key(content)
+    result = _CONTEXT_SCAN_CACHE.get(key)
+    if result is None:
+        result = scan(content, ScanScope.CONTEXT)
+        _CONTEXT_SCAN_CACHE.put(key, result)
+    return result
+
+
 # ---------------------------------------------------------------------------
 # F124 T006: CONTEXT scope 有界全覆盖扫描入口（tool 结果路径，返回 finding）
 # ---------------------------------------------------------------------------
@@ -653,6 +816,7 @@ def scan_context(content: str, *, source_field: str = "output") -> list[ToolSecu
     - **单遍全文**（review FR-F2）：≤ `_MAX_SCAN_INPUT` 时对全文一次性匹配全部 pattern（**非分块、非窗口采样**）；
       有界性由输入硬上限 + 全 pattern 有界量词（ReDoS-safe，线性）保证；超上限 → 单个 degraded finding（never silently clean）。
     - **first-hit**（DP-5）：返回首个命中 finding（0 或 1 条；多命中聚合留未来）。
+    - 扫描结果按内容哈希缓存（``OCTOAGENT_THREAT_SCAN_CACHE_SIZE``），相同内容不重扫。
 
     Args:
         content: 待扫描 tool 结果文本。
@@ -681,7 +845,7 @@ def scan_context(content: str, *, source_field: str = "output") -> list[ToolSecu
     # 不分块——分块 + 双 scope 复用的无界 `\s+` pattern（如 PI-001）会有跨块绕过（攻击者把
     # 匹配片段跨 chunk 边界拆开，单块均不含完整匹配）。单遍全文对全部 pattern 一次性匹配，
     # 无跨块盲点；成本由 _MAX_SCAN_INPUT 上限 + 全 pattern ReDoS-safe（线性）保证有界（plan P-F4）。
-    result = scan(content, ScanScope.CONTEXT)
+    result = _scan_context_cached(content)
     if result.blocked or result.severity is not None:
         return [_context_finding(result, source_field=source_field)]
     return []
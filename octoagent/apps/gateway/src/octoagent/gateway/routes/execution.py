@@ -59,6 +59,23 @@ async def get_execution_session(
     return {"session": session.model_dump(mode="json")}
 
 
+@router.get("/api/execution/scheduler")
+async def get_execution_scheduler(request: Request):
+    """Return TaskRunner admission metrics (queue depth, wait time, running counts)."""
+    task_runner = getattr(request.app.state, "task_runner", None)
+    if task_runner is None:
+        return JSONResponse(
+            status_code=503,
+            content={
+                "error": {
+                    "code": "TASK_RUNNER_UNAVAILABLE",
+                    "message": "Task runner is not initialized",
+                }
+            },
+        )
+    return {"scheduler": task_runner.admission_snapshot()}
+
+
 @router.get("/api/tasks/{task_id}/execution/events")
 async def get_execution_events(
     task_id: str,
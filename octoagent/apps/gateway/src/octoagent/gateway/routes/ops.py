@@ -19,6 +19,7 @@ router = APIRouter()
 
 class BackupCreateRequest(BaseModel):
     label: str | None = None
+    incremental: bool = False
 
 
 class ExportChatsRequest(BaseModel):
@@ -371,6 +372,90 @@ async def get_tool_registry_diagnostics(request: Request):
     return {"count": len(items), "items": items}
 
 
+@router.get("/api/ops/provider-pools")
+async def get_provider_pool_stats(request: Request):
+    """Provider HTTP 连接池利用率。
+
+    shared 为未配置 connection_pool 的 provider 共用池，providers 为各自独占池；
+    含连接数 / 空闲连接 / 在途请求（SSE 读完前都算）/ 峰值 / 利用率。
+    """
+    provider_router = getattr(request.app.state, "provider_router", None)
+    if provider_router is None:
+        return JSONResponse(
+            status_code=503,
+            content={
+                "error": {
+                    "code": "PROVIDER_ROUTER_UNAVAILABLE",
+                    "message": "ProviderRouter 未挂载。",
+                }
+            },
+        )
+    return provider_router.pool_stats()
+
+
+@router.get("/api/ops/provider-rate-limits")
+async def get_provider_rate_limits(request: Request):
+    """Provider 共享限流治理器状态。
+
+    按 provider 给出当前速率上限（throttled=false 表示未限速）、冷却剩余秒数、
+    发送前排队深度、最近一分钟 token 用量 / 预算与 provider 回传的剩余额度头。
+    """
+    provider_router = getattr(request.app.state, "provider_router", None)
+    if provider_router is None:
+        return JSONResponse(
+            status_code=503,
+            content={
+                "error": {
+                    "code": "PROVIDER_ROUTER_UNAVAILABLE",
+                    "message": "ProviderRouter 未挂载。",
+                }
+            },
+        )
+    return {"providers": provider_router.rate_limit_stats()}
+
+
+@router.get("/api/ops/conversation-histories")
+async def get_conversation_history_stats(request: Request):
+    """SkillRunner 对话历史存储的内存占用与命中情况。
+
+    含常驻会话数 / 字节数（按消息 JSON 体积计）/ 峰值 / 预算、命中 / 落盘恢复 / 未命中
+    计数与落盘次数，用于估算 gateway worker 的内存规格。
+    """
+    history_store = getattr(request.app.state, "conversation_history_store", None)
+    if history_store is None:
+        return JSONResponse(
+            status_code=503,
+            content={
+                "error": {
+                    "code": "CONVERSATION_HISTORY_STORE_UNAVAILABLE",
+                    "message": "对话历史存储未挂载（echo 模式或注入了自定义 model_client）。",
+                }
+            },
+        )
+    return history_store.snapshot()
+
+
+@router.get("/api/ops/telegram/ingest")
+async def get_telegram_ingest_stats(request: Request):
+    """Telegram 入站 ingest 调度状态。
+
+    含在途 update 数、polling offset 水位线（watermark / 已确认 offset），以及每个
+    chat 的队列深度、处理 / 失败 / 重试计数与 ingest 耗时（最近 / 平均 / 最大）。
+    """
+    telegram_service = getattr(request.app.state, "telegram_service", None)
+    if telegram_service is None:
+        return JSONResponse(
+            status_code=503,
+            content={
+                "error": {
+                    "code": "TELEGRAM_SERVICE_UNAVAILABLE",
+                    "message": "Telegram 渠道服务未挂载。",
+                }
+            },
+        )
+    return telegram_service.ingest_stats()
+
+
 @router.post("/api/ops/backup/create")
 async def create_backup(
     body: BackupCreateRequest,
@@ -379,7 +464,7 @@ async def create_backup(
     """触发 backup create。"""
     try:
         service = BackupService(resolve_project_root(), store_group=store_group)
-        bundle = await service.create_bundle(label=body.label)
+        bundle = await service.create_bundle(label=body.label, incremental=body.incremental)
         return bundle.model_dump(mode="json")
     except Exception as exc:
         return JSONResponse(
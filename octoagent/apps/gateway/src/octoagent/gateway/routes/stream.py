@@ -2,47 +2,46 @@
 
 GET /api/stream/task/{task_id}: SSE 实时推送指定任务的事件。
 支持历史事件推送、实时新事件推送、Last-Event-ID 断线重连、心跳保活。
+实时阶段另推合并后的模型输出增量（MODEL_DELTA 瞬态帧，无 id、不落库、不回放；
+?deltas=0 关闭），最终内容仍以持久的 MODEL_CALL_COMPLETED 等事件为准。
 """
 
 import asyncio
-import json
+from collections.abc import AsyncIterator
 
 from fastapi import APIRouter, Depends, Request
 from fastapi.responses import JSONResponse
 from octoagent.core.config import SSE_HEARTBEAT_INTERVAL
-from octoagent.core.models import TERMINAL_STATES, TaskStatus
-from octoagent.core.models.event import Event
+from octoagent.core.models import TERMINAL_STATES
 from sse_starlette.sse import EventSourceResponse
 
 from ..deps import get_sse_hub, get_store_group
+from ..services.sse_hub import SSEFrame, SSEHub, TransientFrame
 
 router = APIRouter()
 
 
-def _event_to_sse_data(event: Event, is_final: bool = False) -> dict:
-    """将 Event 模型转换为 SSE data JSON"""
-    data = {
-        "event_id": event.event_id,
-        "task_id": event.task_id,
-        "task_seq": event.task_seq,
-        "ts": event.ts.isoformat(),
-        "type": event.type,
-        "actor": event.actor,
-        "payload": event.payload,
-        "final": is_final,
-    }
-    return data
-
-
-def _is_terminal_event(event: Event) -> bool:
-    """判断事件是否标识任务到达终态"""
-    if event.type == "STATE_TRANSITION" and "to_status" in event.payload:
-        to_status = event.payload["to_status"]
-        try:
-            return TaskStatus(to_status) in TERMINAL_STATES
-        except ValueError:
-            return False
-    return False
+async def _history_frames(
+    store_group, sse_hub: SSEHub, task_id: str, after_event_id: str | None
+) -> AsyncIterator[SSEFrame]:
+    """after_event_id 之后的历史事件（None = 全部历史）
+
+    断线重连优先从 SSEHub 环形缓冲回放（缓冲能证明 task_seq 连续到已落库末尾时），
+    否则分页流式读 DB，不一次性物化整段历史。末尾 task_seq 走只读连接查询，不在
+    写连接上为只读请求 seed task_seq 分配器。
+    """
+    if after_event_id:
+        committed_max = await store_group.event_store.get_max_task_seq(task_id)
+        frames = sse_hub.replay_after(task_id, after_event_id, next_task_seq=committed_max + 1)
+        if frames is not None:
+            for frame in frames:
+                yield frame
+            return
+        events = store_group.event_store.iter_events_after(task_id, after_event_id)
+    else:
+        events = store_group.event_store.iter_events_for_task(task_id)
+    async for event in events:
+        yield sse_hub.frame_for(task_id, event)
 
 
 @router.get("/api/stream/task/{task_id}")
@@ -80,39 +79,26 @@ async def stream_task_events(
         or request.headers.get("last-event-id", "").strip()
         or None
     )
+    stream_deltas = request.query_params.get("deltas", "1").strip() != "0"
 
     async def event_generator():
         # 先订阅再读历史，避免 publish-before-subscribe 竞态导致的事件丢失：
         # 若先读历史后订阅，在这两步之间并发 broadcast 的事件既进不了历史快照，
         # 也进不了队列，会永久丢失（典型表现：前端 placeholder 一直转圈，刷新后才出现最终回复）。
-        queue = await sse_hub.subscribe(task_id)
+        queue = await sse_hub.subscribe(task_id, transient=stream_deltas)
         try:
-            # 获取历史事件
-            if last_event_id:
-                # 断线重连：从 last_event_id 之后查询
-                events = await store_group.event_store.get_events_after(
-                    task_id, last_event_id
-                )
-            else:
-                # 新连接：查询所有历史事件
-                events = await store_group.event_store.get_events_for_task(task_id)
-
             # 记录已推送过的 event_id，用于订阅后 drain 时去重
             seen_event_ids: set[str] = set()
+            last_sent_event_id = last_event_id
             # 历史回放阶段：直接按事件本身判断是否终态，而不是依赖入口时读取的
             # 旧 task 快照。否则当 task 在 subscribe 之后、读历史期间转入终态时，
             # 快照仍是非终态导致 final=false，同一事件又会在订阅侧 drain 时被
             # dedup 跳过，前端永远收不到 final=true。
-            for event in events:
-                seen_event_ids.add(event.event_id)
-                is_final = _is_terminal_event(event)
-                data = _event_to_sse_data(event, is_final=is_final)
-                yield {
-                    "id": event.event_id,
-                    "event": event.type,
-                    "data": json.dumps(data, ensure_ascii=False),
-                }
-                if is_final:
+            async for frame in _history_frames(store_group, sse_hub, task_id, last_event_id):
+                seen_event_ids.add(frame.event_id)
+                last_sent_event_id = frame.event_id
+                yield frame.as_message()
+                if frame.is_final:
                     return
 
             # 历史里没有终态事件：再读一次 task/job 状态，兜底处理"入口非终态、
@@ -130,23 +116,38 @@ async def stream_task_events(
                 return
 
             while True:
+                if getattr(queue, "resync_required", False) and queue.empty():
+                    # 慢订阅者队列曾溢出、已被移出广播：先挂回再按最后推送的 event_id
+                    # 补齐缺口（缓冲或 DB），挂回后到达的事件进队列并按 event_id 去重
+                    sse_hub.resync(task_id, queue)
+                    async for frame in _history_frames(
+                        store_group, sse_hub, task_id, last_sent_event_id
+                    ):
+                        if frame.event_id in seen_event_ids:
+                            continue
+                        seen_event_ids.add(frame.event_id)
+                        last_sent_event_id = frame.event_id
+                        yield frame.as_message()
+                        if frame.is_final:
+                            return
+                    continue
                 try:
                     # 等待新事件（带心跳超时）
                     event = await asyncio.wait_for(
                         queue.get(), timeout=SSE_HEARTBEAT_INTERVAL
                     )
+                    if isinstance(event, TransientFrame):
+                        yield event.as_message()
+                        continue
                     # 去重：与读历史并发 broadcast 的事件可能同时出现在快照与队列中
                     if event.event_id in seen_event_ids:
                         continue
                     seen_event_ids.add(event.event_id)
-                    is_final = _is_terminal_event(event)
-                    data = _event_to_sse_data(event, is_final=is_final)
-                    yield {
-                        "id": event.event_id,
-                        "event": event.type,
-                        "data": json.dumps(data, ensure_ascii=False),
-                    }
-                    if is_final:
+                    last_sent_event_id = event.event_id
+                    # 序列化结果由 SSEHub 在 broadcast 时生成一次，订阅者之间共享
+                    frame = sse_hub.frame_for(task_id, event)
+                    yield frame.as_message()
+                    if frame.is_final:
                         return
                 except TimeoutError:
                     # 心跳保活
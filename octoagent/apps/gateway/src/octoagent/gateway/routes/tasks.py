@@ -1,14 +1,15 @@
 """任务查询与恢复路由 -- 对齐 contracts/rest-api.md §2, §3
 
 GET /api/tasks: 任务列表查询，支持 status 筛选。
-GET /api/tasks/{task_id}: 任务详情查询，含 events + artifacts。
+GET /api/tasks/{task_id}: 任务详情查询，含 events + artifacts + token 用量汇总。
 POST /api/tasks/{task_id}/resume: 手动触发恢复。
 GET /api/tasks/{task_id}/checkpoints: 查询 checkpoint 时间线。
 """
 
 from fastapi import APIRouter, Depends, Query, Request
-from octoagent.core.models import ResumeFailureType, Task
+from octoagent.core.models import Event, EventType, ResumeFailureType, Task
 from octoagent.core.store import StoreGroup
+from octoagent.provider import CostTracker
 from pydantic import BaseModel
 from starlette.responses import JSONResponse
 
@@ -224,9 +225,28 @@ async def get_task_detail(
         "task": task_data,
         "events": events_data,
         "artifacts": artifacts_data,
+        "usage": _summarize_task_usage(events),
     }
 
 
+def _summarize_task_usage(events: list[Event]) -> dict:
+    """汇总任务内模型调用的 token 用量（含 prompt 缓存命中率）。
+
+    SkillRunner 每步都写一条 MODEL_CALL_COMPLETED（payload 带 step）；TaskService
+    收尾时再写一条最终结果，与最后一步重复。有逐步事件时只统计逐步事件。
+    """
+    completed = [
+        e.payload
+        for e in events
+        if e.type == EventType.MODEL_CALL_COMPLETED
+        and isinstance(e.payload.get("token_usage"), dict)
+    ]
+    per_step = [payload for payload in completed if "step" in payload]
+    return CostTracker.summarize_usage(
+        payload["token_usage"] for payload in (per_step or completed)
+    )
+
+
 @router.post("/api/tasks/{task_id}/resume", response_model=ResumeTaskResponse)
 async def resume_task(
     task_id: str,
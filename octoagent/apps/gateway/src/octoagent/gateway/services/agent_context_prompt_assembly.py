@@ -22,6 +22,7 @@ from octoagent.core.behavior_workspace import (
     BehaviorLoadProfile,
     resolve_behavior_workspace,
 )
+from octoagent.core.config import PROMPT_CACHE_BREAKPOINTS
 from octoagent.core.models import (
     AgentProfile,
     ContextFrame,
@@ -37,6 +38,7 @@ from octoagent.core.models import (
 from octoagent.memory import (
     MemoryRecallHit,
 )
+from octoagent.provider import mark_cache_breakpoint
 from octoagent.tooling.security_render import (  # F124 D2
     render_tool_result_for_llm,
 )
@@ -136,6 +138,11 @@ class AgentContextPromptAssemblyMixin:
             load_profile=effective_load_profile,
         )
 
+        # system blocks 按易变程度排列（prompt 前缀缓存）：
+        # Block 1 Core（跨 session 稳定）→ Block 2 Context（session 内稳定）→
+        # Block 3 Volatile（每轮变化）。Block 1/2 末尾打缓存断点，Block 3 的任何
+        # 变化都不会让前两块的缓存前缀失效。
+
         # ── Block 1: Core（永远注入）──────────────────────────
         core_sections: list[str] = [
             # AgentProfile
@@ -168,11 +175,6 @@ class AgentContextPromptAssemblyMixin:
                 workspace=behavior_ws,
                 is_bootstrap_pending=not bootstrap_completed,
             ),
-            # RuntimeHints
-            render_runtime_hint_block(
-                user_text=ctx.current_user_text,
-                runtime_hints=runtime_hints,
-            ),
         ]
 
         # ── Block 2: Context（按需注入）──────────────────────────
@@ -207,27 +209,6 @@ class AgentContextPromptAssemblyMixin:
                 f"task_scope_id: {task.scope_id or 'N/A'}"
             )
 
-        # RuntimeContext
-        if ctx.include_runtime_context and (
-            ctx.worker_capability or dispatch_metadata or runtime_context is not None
-        ):
-            control_summary = summarize_control_metadata_for_prompt(dispatch_metadata)
-            if runtime_context is not None:
-                runtime_summary = (
-                    f"session_id={runtime_context.session_id or 'N/A'}, "
-                    f"project_id={runtime_context.project_id or 'N/A'}, "
-                    f"work_id={runtime_context.work_id or 'N/A'}, "
-                    f"context_frame_id={runtime_context.context_frame_id or 'N/A'}, "
-                    f"route_reason={runtime_context.route_reason or 'N/A'}"
-                )
-            else:
-                runtime_summary = "N/A"
-            context_sections.append(
-                f"RuntimeContext: worker_capability={ctx.worker_capability or 'main'}\n"
-                f"runtime_snapshot={runtime_summary}\n"
-                f"control_metadata_summary={control_summary}"
-            )
-
         # Bootstrap 状态（F084 Phase 4 T067：仅显示完成状态）
         bootstrap_status_value = "completed" if bootstrap_completed else "pending"
         bootstrap_block_content = f"BootstrapStatus: {bootstrap_status_value}"
@@ -260,33 +241,6 @@ class AgentContextPromptAssemblyMixin:
                 )
             )
 
-        # MemoryRecall
-        if ctx.memory_hits or (ctx.memory_scope_ids and not include_detailed_recall):
-            context_sections.append(
-                self._render_memory_recall_block(
-                    memory_hits=ctx.memory_hits,
-                    memory_scope_ids=ctx.memory_scope_ids,
-                    include_preview=include_detailed_recall,
-                )
-            )
-
-        # ── Block 3: History（按需注入）──────────────────────────
-        history_sections: list[str] = []
-
-        # RecentSummary
-        if ctx.recent_summary:
-            history_sections.append(f"RecentSummary:\n{ctx.recent_summary}")
-
-        # SessionReplay
-        if ctx.session_replay is not None and (
-            ctx.session_replay.transcript_entries
-            or ctx.session_replay.tool_exchange_lines
-            or ctx.session_replay.latest_context_summary
-        ):
-            history_sections.append(
-                self.render_agent_session_replay_block(ctx.session_replay)
-            )
-
         # Feature 060: LoadedSkills 系统块（Skill 内容从 LLMService 迁入预算体系）
         if ctx.loaded_skills_content:
             # 按 skill_injection_budget 截断超出部分
@@ -320,11 +274,68 @@ class AgentContextPromptAssemblyMixin:
                         skill_text = SKILL_SECTION_SEPARATOR.join(kept_sections)
                         skill_text += f"\n\n[已截断 {len(truncated_skills)} 个 Skill: {', '.join(truncated_skills)}]"
                         # block_reasons 会在外层记录
-            history_sections.append(skill_text)
+            context_sections.append(skill_text)
 
         # Feature 065: Pipeline 目录系统块
         if ctx.pipeline_catalog_content:
-            history_sections.append(ctx.pipeline_catalog_content)
+            context_sections.append(ctx.pipeline_catalog_content)
+
+        # InstructionOverlays：AgentProfile.instruction_overlays 已在 Core block 中作为
+        # 单行摘要注入，OwnerOverlay 已在 Context block 中注入，此处无需重复。
+
+        # ── Block 3: Volatile（每轮变化，放在缓存断点之后）──────────────────
+        volatile_sections: list[str] = [
+            # RuntimeHints（含本轮用户输入）
+            render_runtime_hint_block(
+                user_text=ctx.current_user_text,
+                runtime_hints=runtime_hints,
+            ),
+        ]
+
+        # RuntimeContext
+        if ctx.include_runtime_context and (
+            ctx.worker_capability or dispatch_metadata or runtime_context is not None
+        ):
+            control_summary = summarize_control_metadata_for_prompt(dispatch_metadata)
+            if runtime_context is not None:
+                runtime_summary = (
+                    f"session_id={runtime_context.session_id or 'N/A'}, "
+                    f"project_id={runtime_context.project_id or 'N/A'}, "
+                    f"work_id={runtime_context.work_id or 'N/A'}, "
+                    f"context_frame_id={runtime_context.context_frame_id or 'N/A'}, "
+                    f"route_reason={runtime_context.route_reason or 'N/A'}"
+                )
+            else:
+                runtime_summary = "N/A"
+            volatile_sections.append(
+                f"RuntimeContext: worker_capability={ctx.worker_capability or 'main'}\n"
+                f"runtime_snapshot={runtime_summary}\n"
+                f"control_metadata_summary={control_summary}"
+            )
+
+        # MemoryRecall
+        if ctx.memory_hits or (ctx.memory_scope_ids and not include_detailed_recall):
+            volatile_sections.append(
+                self._render_memory_recall_block(
+                    memory_hits=ctx.memory_hits,
+                    memory_scope_ids=ctx.memory_scope_ids,
+                    include_preview=include_detailed_recall,
+                )
+            )
+
+        # RecentSummary
+        if ctx.recent_summary:
+            volatile_sections.append(f"RecentSummary:\n{ctx.recent_summary}")
+
+        # SessionReplay
+        if ctx.session_replay is not None and (
+            ctx.session_replay.transcript_entries
+            or ctx.session_replay.tool_exchange_lines
+            or ctx.session_replay.latest_context_summary
+        ):
+            volatile_sections.append(
+                self.render_agent_session_replay_block(ctx.session_replay)
+            )
 
         # Feature 060: ProgressNotes 系统块（Worker 进度笔记）
         if ctx.progress_notes:
@@ -337,16 +348,11 @@ class AgentContextPromptAssemblyMixin:
                 next_steps = note.get("next_steps", [])
                 if next_steps:
                     notes_text += f"  Next: {', '.join(next_steps)}\n"
-            history_sections.append(notes_text.rstrip())
-
-        # InstructionOverlays（放在 History 中，属于历史上下文类信息）
-        # 注意：AgentProfile.instruction_overlays 已在 Core block 中作为单行摘要注入，
-        # OwnerOverlay 已在 Context block 中注入，此处无需重复。
+            volatile_sections.append(notes_text.rstrip())
 
-        # AmbientRuntime（F108b W8-C2 显式行为变更：自 Block 1 冻结前缀移到 Block 2 尾部。
-        # 秒级时间戳在 core 中段会让整个 system 前缀每秒失效（prefix-cache 命中归零）；
-        # 移到按需块尾部后 Block 1 + Block 2 前段全部可缓存。块内容字节不变，仅位置变。）
-        context_sections.append(
+        # AmbientRuntime（F108b W8-C2：秒级时间戳不进冻结前缀；现为 Volatile 块末尾，
+        # Block 1 + Block 2 全部可缓存。块内容字节不变，仅位置变。）
+        volatile_sections.append(
             "AmbientRuntime:\n"
             f"current_datetime_local: {ambient_runtime['current_datetime_local']}\n"
             f"current_date_local: {ambient_runtime['current_date_local']}\n"
@@ -360,17 +366,20 @@ class AgentContextPromptAssemblyMixin:
         )
 
         # ── 组装最终 blocks ──────────────────────────
-        blocks: list[dict[str, str]] = [
+        stable_blocks: list[dict[str, str]] = [
             {"role": "system", "content": _SEP.join(core_sections)},
         ]
         if context_sections:
-            blocks.append(
+            stable_blocks.append(
                 {"role": "system", "content": _SEP.join(context_sections)}
             )
-        if history_sections:
-            blocks.append(
-                {"role": "system", "content": _SEP.join(history_sections)}
-            )
+        if PROMPT_CACHE_BREAKPOINTS:
+            for block in stable_blocks:
+                mark_cache_breakpoint(block)
+        blocks = [
+            *stable_blocks,
+            {"role": "system", "content": _SEP.join(volatile_sections)},
+        ]
 
         # ResearchHandoff 使用 assistant role，独立于三大 block
         research_handoff = self._build_research_handoff_block(dispatch_metadata)
@@ -188,6 +188,8 @@ class CapabilityPackService(
 
     def bind_mcp_registry(self, mcp_registry: McpRegistryService) -> None:
         self._mcp_registry = mcp_registry
+        # 缓存启动后的后台重新发现改变工具集时，只重建 pack（不再触发 MCP 发现）
+        mcp_registry.set_change_listener(self._rebuild_pack)
         if self._tool_deps is not None:
             self._tool_deps._mcp_registry = mcp_registry
 
@@ -228,13 +230,17 @@ class CapabilityPackService(
         # Feature 070: 权限检查已内联到 ToolBroker.execute()，不再注册权限 Hook
         await self._register_builtin_tools()
         if self._mcp_registry is not None:
+            # startup 已完成（或从清单缓存恢复）MCP 发现，这里不再重复 refresh
             await self._mcp_registry.startup()
-        await self.refresh()
+        await self._rebuild_pack()
         self._bootstrapped = True
 
     async def refresh(self) -> BundledCapabilityPack:
         if self._mcp_registry is not None:
             await self._mcp_registry.refresh()
+        return await self._rebuild_pack()
+
+    async def _rebuild_pack(self) -> BundledCapabilityPack:
         # Feature 057: 刷新 SKILL.md 文件系统缓存
         self._skill_discovery.refresh()
         metas = await self._tool_broker.discover()
@@ -119,6 +119,38 @@ ProviderAuth = Annotated[
 ]
 
 
+class ProviderConnectionPool(BaseModel):
+    """Provider HTTP 连接池调优（providers[].connection_pool）
+
+    不设时该 provider 与其它未配置的 provider 共用默认连接池；设置后独占一个池，
+    繁忙 provider 不再挤占其它 provider 的连接。
+    """
+
+    max_connections: int | None = Field(
+        default=None,
+        ge=1,
+        description="最大并发连接数（含 keep-alive）；不设沿用 httpx 默认 100",
+    )
+    max_keepalive_connections: int | None = Field(
+        default=None,
+        ge=0,
+        description="保持空闲的 keep-alive 连接上限；不设沿用 httpx 默认 20",
+    )
+    keepalive_expiry_s: float | None = Field(
+        default=None,
+        gt=0,
+        description="空闲连接保留秒数；不设沿用 httpx 默认 5s",
+    )
+    http2: bool = Field(
+        default=False,
+        description="启用 HTTP/2 多路复用（上游支持时；需安装 h2，否则降级 HTTP/1.1）",
+    )
+    warmup: bool = Field(
+        default=False,
+        description="Gateway 启动时预建连接（DNS + TLS 握手），降低首个请求延迟",
+    )
+
+
 class ProviderEntry(BaseModel):
     """Provider 条目 — octoagent.yaml providers[] 列表元素
 
@@ -164,6 +196,10 @@ class ProviderEntry(BaseModel):
             "自动迁移（backward-compat）。"
         ),
     )
+    connection_pool: ProviderConnectionPool | None = Field(
+        default=None,
+        description="HTTP 连接池调优；不设时共用默认连接池",
+    )
 
     # ── Deprecated 字段（Feature 081 P2 标记，保留可读，下个 minor 删除）──
     auth_type: Literal["api_key", "oauth"] | None = Field(
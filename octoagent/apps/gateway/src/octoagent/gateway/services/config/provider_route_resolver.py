@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from octoagent.provider.http_pool import ProviderPoolConfig
 from octoagent.provider.provider_route import ProviderAuthRoute, ProviderRoute
 
 from .config_schema import OctoAgentConfig, ProviderEntry
@@ -63,4 +64,13 @@ def resolve_provider_route(config: OctoAgentConfig, alias: str) -> ProviderRoute
     )
 
 
-__all__ = ["ProviderRouteResolutionError", "resolve_provider_route"]
+def resolve_provider_pool(config: OctoAgentConfig, provider_id: str) -> ProviderPoolConfig | None:
+    """provider 的连接池配置（未配置 / provider 不存在时 None，走共享连接池）"""
+
+    provider = config.get_provider(provider_id)
+    if provider is None or provider.connection_pool is None:
+        return None
+    return ProviderPoolConfig(**provider.connection_pool.model_dump())
+
+
+__all__ = ["ProviderRouteResolutionError", "resolve_provider_pool", "resolve_provider_route"]
@@ -6,13 +6,26 @@ import asyncio
 import json
 import math
 import os
-from dataclasses import dataclass, field
+import weakref
+from collections import OrderedDict
+from collections.abc import Sequence
+from dataclasses import dataclass, field, replace
+from pathlib import Path
 from typing import Any
 
 import structlog
+from octoagent.core.config import CONVERSATION_TURN_CACHE_MAX_TASKS, TOKEN_COUNT_CACHE_SIZE
 from octoagent.core.models import EventType
 from octoagent.core.models.agent_context import DEFAULT_PERMISSION_PRESET
 
+from .token_count_cache import (
+    MIN_CACHED_CHARS,
+    TokenCountCache,
+    read_snapshot,
+    token_count_scope,
+    write_snapshot,
+)
+
 log = structlog.get_logger()
 
 # ---------- tiktoken 模块级初始化（一次性） ----------
@@ -24,6 +37,9 @@ try:
 except (ImportError, Exception):
     pass
 
+# 进程级 token 计数缓存（gateway 启停时由 OctoHarness 预热 / 落盘）
+TOKEN_COUNT_CACHE = TokenCountCache(TOKEN_COUNT_CACHE_SIZE)
+
 _FALSE_VALUES = {"0", "false", "no", "off"}
 _TRUE_VALUES = {"1", "true", "yes", "on"}
 
@@ -124,6 +140,72 @@ class ConversationTurn:
     content: str
     source_event_id: str
     artifact_ref: str = ""
+    # content 的 token 数（0 = 未计算；轮次缓存在物化时填充）
+    token_count: int = field(default=0, compare=False)
+
+
+@dataclass
+class _TurnCacheEntry:
+    """单个 task 已物化的对话轮次，锚定在最后消费的对话事件上"""
+
+    turns: list[ConversationTurn] = field(default_factory=list)
+    last_task_seq: int = 0
+    last_event_id: str = ""
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+    def reset(self) -> None:
+        self.turns.clear()
+        self.last_task_seq = 0
+        self.last_event_id = ""
+
+
+class ConversationTurnCache:
+    """按 task 增量物化的对话轮次（USER_MESSAGE / MODEL_CALL_COMPLETED）
+
+    事件流只追加，每次构建上下文只读取锚点之后的新事件并解码其 artifact，
+    不再全量重读历史。读取时先校验锚点事件仍在原位（事件被删除 / 事务回滚后
+    锚点失配），失配时整体重建。TaskService 按操作新建，缓存因此按 event store
+    共享（见 _turn_cache_for），task 数按 LRU 限制。
+    """
+
+    def __init__(self, max_tasks: int = CONVERSATION_TURN_CACHE_MAX_TASKS) -> None:
+        self._max_tasks = max(max_tasks, 0)
+        self._entries: OrderedDict[str, _TurnCacheEntry] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def entry(self, task_id: str) -> _TurnCacheEntry | None:
+        """取（或新建）task 的缓存条目；缓存关闭时返回 None"""
+        if self._max_tasks == 0:
+            return None
+        entry = self._entries.get(task_id)
+        if entry is None:
+            entry = _TurnCacheEntry()
+            self._entries[task_id] = entry
+            while len(self._entries) > self._max_tasks:
+                self._entries.popitem(last=False)
+        else:
+            self._entries.move_to_end(task_id)
+        return entry
+
+    def invalidate(self, task_id: str | None = None) -> None:
+        """丢弃已物化的轮次（task_id=None 时全部丢弃），下次构建时全量重建"""
+        if task_id is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(task_id, None)
+
+
+_TURN_CACHES: weakref.WeakKeyDictionary[Any, ConversationTurnCache] = weakref.WeakKeyDictionary()
+
+
+def _turn_cache_for(event_store: Any) -> ConversationTurnCache:
+    cache = _TURN_CACHES.get(event_store)
+    if cache is None:
+        cache = ConversationTurnCache()
+        _TURN_CACHES[event_store] = cache
+    return cache
 
 
 @dataclass(frozen=True)
@@ -196,6 +278,8 @@ class CompiledTaskContext:
     # Feature 060 Phase 3: 三层压缩审计信息
     layers: list[dict[str, Any]] = field(default_factory=list)
     compaction_version: str = ""  # "v1" | "v2"
+    # 本次构建的 token 计数指标（calls / hits / misses / computed / hit_rate）
+    token_count_stats: dict[str, int | float] = field(default_factory=dict)
 
 
 class ContextCompactionService:
@@ -354,7 +438,36 @@ class ContextCompactionService:
             existing_compressed_layers: 已有的 Compressed 层条目列表。
             existing_compaction_version: 当前 session 的 compaction 版本（v1/v2）。
         """
+        with token_count_scope() as count_stats:
+            compiled = await self._build_context(
+                task_id=task_id,
+                fallback_user_text=fallback_user_text,
+                llm_service=llm_service,
+                dispatch_metadata=dispatch_metadata,
+                worker_capability=worker_capability,
+                tool_profile=tool_profile,
+                conversation_budget=conversation_budget,
+                existing_archive_text=existing_archive_text,
+                existing_compressed_layers=existing_compressed_layers,
+                existing_compaction_version=existing_compaction_version,
+            )
+        log.debug("context_build_token_counts", task_id=task_id, **count_stats.as_dict())
+        return replace(compiled, token_count_stats=count_stats.as_dict())
 
+    async def _build_context(
+        self,
+        *,
+        task_id: str,
+        fallback_user_text: str,
+        llm_service,
+        dispatch_metadata: dict[str, Any] | None,
+        worker_capability: str | None,
+        tool_profile: str | None,
+        conversation_budget: int | None,
+        existing_archive_text: str,
+        existing_compressed_layers: list[dict[str, Any]] | None,
+        existing_compaction_version: str,
+    ) -> CompiledTaskContext:
         dispatch_metadata = dispatch_metadata or {}
         existing_compressed_layers = existing_compressed_layers or []
         turns = await self._load_conversation_turns(task_id)
@@ -370,7 +483,7 @@ class ContextCompactionService:
             fallback_user_text,
         )
         messages = [{"role": turn.role, "content": turn.content} for turn in turns]
-        raw_tokens = estimate_messages_tokens(messages)
+        raw_tokens = sum(_turn_token_counts(turns))
         default_summary = _summarize_request(latest_user_text)
 
         # Feature 060: 使用 conversation_budget 替代 max_input_tokens 计算限制
@@ -527,13 +640,13 @@ class ContextCompactionService:
 
         # --- Recent 层：保留最近 N 轮原文 ---
         recent_keep = min(len(turns), max(1, self._config.recent_turns * 2))
-        while recent_keep > 1:
-            kept_turns = turns[-recent_keep:]
-            kept_tokens = estimate_messages_tokens(
-                [{"role": t.role, "content": t.content} for t in kept_turns]
-            )
+        # 每个候选 turn 只计数一次，逐个从最旧处剔除直到放进 recent 预算
+        candidate_tokens = _turn_token_counts(turns[-recent_keep:])
+        kept_tokens = sum(candidate_tokens)
+        for dropped in candidate_tokens[:-1]:
             if kept_tokens <= recent_budget:
                 break
+            kept_tokens -= dropped
             recent_keep -= 1
 
         recent_turns = turns[-recent_keep:]
@@ -804,37 +917,64 @@ class ContextCompactionService:
             return False
         return str(worker_capability or "").strip().lower() != "subagent"
 
+    def invalidate_conversation_turns(self, task_id: str | None = None) -> None:
+        """丢弃该 event store 下已物化的对话轮次（改写 / 删除任务事件后调用）"""
+        _turn_cache_for(self._stores.event_store).invalidate(task_id)
+
     async def _load_conversation_turns(self, task_id: str) -> list[ConversationTurn]:
-        events = await self._stores.event_store.get_events_for_task(task_id)
-        turns: list[ConversationTurn] = []
-        for event in events:
-            if event.type is EventType.USER_MESSAGE:
-                text = str(event.payload.get("text", "")).strip() or str(
-                    event.payload.get("text_preview", "")
-                ).strip()
-                if not text:
-                    continue
-                turns.append(
-                    ConversationTurn(
-                        role="user",
-                        content=text,
-                        source_event_id=event.event_id,
-                        artifact_ref=str(event.payload.get("artifact_ref", "") or ""),
-                    )
-                )
-            if event.type is EventType.MODEL_CALL_COMPLETED:
-                content = await self._load_assistant_content(event.payload)
-                if not content:
-                    continue
-                turns.append(
-                    ConversationTurn(
-                        role="assistant",
-                        content=content,
-                        source_event_id=event.event_id,
-                        artifact_ref=str(event.payload.get("artifact_ref", "") or ""),
-                    )
-                )
-        return turns
+        entry = _turn_cache_for(self._stores.event_store).entry(task_id)
+        if entry is None:
+            entry = _TurnCacheEntry()
+            await self._extend_conversation_turns(task_id, entry)
+            return entry.turns
+        async with entry.lock:
+            if not await self._extend_conversation_turns(task_id, entry):
+                # 锚点事件已不在原位：缓存不再是事件流的前缀，全量重建
+                log.info("conversation_turn_cache_rebuilt", task_id=task_id)
+                entry.reset()
+                await self._extend_conversation_turns(task_id, entry)
+            return list(entry.turns)
+
+    async def _extend_conversation_turns(self, task_id: str, entry: _TurnCacheEntry) -> bool:
+        """把锚点之后的对话事件追加进 entry；锚点失配时返回 False（entry 不变）"""
+        anchor_seq = entry.last_task_seq
+        anchor_verified = anchor_seq == 0
+        async for event in self._stores.event_store.iter_events_for_task(
+            task_id,
+            event_types=(EventType.USER_MESSAGE, EventType.MODEL_CALL_COMPLETED),
+            after_task_seq=max(anchor_seq - 1, 0),
+        ):
+            if not anchor_verified:
+                # 第一条必须就是上次消费的最后一个事件
+                if event.task_seq != anchor_seq or event.event_id != entry.last_event_id:
+                    return False
+                anchor_verified = True
+                continue
+            turn = await self._turn_from_event(event)
+            if turn is not None:
+                entry.turns.append(turn)
+            entry.last_task_seq = event.task_seq
+            entry.last_event_id = event.event_id
+        return anchor_verified
+
+    async def _turn_from_event(self, event) -> ConversationTurn | None:
+        if event.type is EventType.USER_MESSAGE:
+            role = "user"
+            content = str(event.payload.get("text", "")).strip() or str(
+                event.payload.get("text_preview", "")
+            ).strip()
+        else:
+            role = "assistant"
+            content = await self._load_assistant_content(event.payload)
+        if not content:
+            return None
+        return ConversationTurn(
+            role=role,
+            content=content,
+            source_event_id=event.event_id,
+            artifact_ref=str(event.payload.get("artifact_ref", "") or ""),
+            token_count=estimate_text_tokens(content),
+        )
 
     async def _load_assistant_content(self, payload: dict[str, Any]) -> str:
         artifact_ref = str(payload.get("artifact_ref", "") or "").strip()
@@ -1335,10 +1475,46 @@ def estimate_text_tokens(text: str) -> int:
     之间加权插值：len(text) / (4*(1-r) + 1.5*r)。
 
     可选：若 tiktoken 可导入，使用 cl100k_base encoder 精确计算。
+    结果按内容哈希缓存（TOKEN_COUNT_CACHE）。
     """
-    cleaned = text.strip()
-    if not cleaned:
-        return 0
+    return estimate_texts_tokens((text,))[0]
+
+
+def estimate_texts_tokens(texts: Sequence[str]) -> list[int]:
+    """批量估算：同一批内相同文本只计算一次，缓存未命中的文本统一编码。"""
+    counts = [0] * len(texts)
+    pending: dict[tuple[str, bytes], tuple[str, list[int]]] = {}
+    method = estimation_method()
+    hits = uncached = 0
+    for index, text in enumerate(texts):
+        cleaned = text.strip()
+        if not cleaned:
+            continue
+        if len(cleaned) < MIN_CACHED_CHARS or not TOKEN_COUNT_CACHE.enabled:
+            counts[index] = _count_tokens(cleaned)
+            uncached += 1
+            continue
+        key = (method, TokenCountCache.digest(cleaned))
+        cached = TOKEN_COUNT_CACHE.get(key)
+        if cached is not None:
+            counts[index] = cached
+            hits += 1
+        else:
+            pending.setdefault(key, (cleaned, []))[1].append(index)
+
+    # 同批重复文本只编码一次，重复部分计为命中
+    misses = len(pending)
+    hits += sum(len(indexes) for _, indexes in pending.values()) - misses
+    for key, (cleaned, indexes) in pending.items():
+        tokens = _count_tokens(cleaned)
+        TOKEN_COUNT_CACHE.put(key, tokens)
+        for index in indexes:
+            counts[index] = tokens
+    TOKEN_COUNT_CACHE.record(calls=len(texts), hits=hits, misses=misses, uncached=uncached)
+    return counts
+
+
+def _count_tokens(cleaned: str) -> int:
     # 尝试精确 tokenizer
     if _tiktoken_encoder is not None:
         return max(1, len(_tiktoken_encoder.encode(cleaned)))
@@ -1350,7 +1526,46 @@ def estimate_text_tokens(text: str) -> int:
 
 
 def estimate_messages_tokens(messages: list[dict[str, str]]) -> int:
-    return sum(estimate_text_tokens(str(item.get("content", ""))) for item in messages)
+    return sum(estimate_texts_tokens([str(item.get("content", "")) for item in messages]))
+
+
+def _turn_token_counts(turns: Sequence[ConversationTurn]) -> list[int]:
+    """优先使用轮次缓存里已有的 token 数，缺失的批量估算"""
+    counts = [turn.token_count for turn in turns]
+    missing = [index for index, count in enumerate(counts) if not count]
+    if missing:
+        estimated = estimate_texts_tokens([turns[index].content for index in missing])
+        for index, count in zip(missing, estimated, strict=True):
+            counts[index] = count
+    return counts
+
+
+async def load_token_count_cache(path: Path) -> int:
+    """从落盘快照预热 TOKEN_COUNT_CACHE（只加载当前计数方法的条目；失败只记日志）"""
+    try:
+        rows = await asyncio.to_thread(
+            read_snapshot,
+            path,
+            method=estimation_method(),
+            limit=TOKEN_COUNT_CACHE.capacity,
+        )
+    except Exception as exc:
+        log.warning("token_count_cache_load_failed", path=str(path), error=str(exc)[:200])
+        return 0
+    return TOKEN_COUNT_CACHE.warm(estimation_method(), rows)
+
+
+async def save_token_count_cache(path: Path) -> int:
+    """把 TOKEN_COUNT_CACHE 快照落盘（失败只记日志）"""
+    rows = TOKEN_COUNT_CACHE.export()
+    if not rows:
+        return 0
+    try:
+        await asyncio.to_thread(write_snapshot, path, rows)
+    except Exception as exc:
+        log.warning("token_count_cache_save_failed", path=str(path), error=str(exc)[:200])
+        return 0
+    return len(rows)
 
 
 def truncate_chars(text: str, max_chars: int) -> str:
@@ -382,6 +382,7 @@ class ControlPlaneService(TelegramCommandMixin):
                 self._project_root, store_group=self._stores
             ).create_bundle(
                 label=label,
+                incremental=bool(request.params.get("incremental", False)),
             )
             return self._completed_result(
                 request=request,
@@ -135,7 +135,8 @@ class McpDomainService(DomainServiceBase):
                             record.discovered_at.isoformat()
                             if record is not None and record.discovered_at is not None
                             else ""
-                        )
+                        ),
+                        "sessions": mcp_registry.session_metrics(config.name),
                     },
                     install_source=str(install.install_source) if install else "",
                     install_version=install.version if install else "",
@@ -0,0 +1,114 @@
+"""DeadlineScheduler -- TaskRunner 超时监控的 deadline 最小堆
+
+原 monitor 每 monitor_interval_seconds 醒来一次，逐个读库检查所有 running / 等待审批
+job 是否超时：空闲成本随挂起任务数增长，超时最多晚一个周期触发。改为事件驱动：
+
+- job 启动 / 准入、task 进入 WAITING_APPROVAL 时 arm 对应 deadline（同 key 重复 arm
+  覆盖旧值）；启动时由一次批量查询重建
+- 最小堆 + 惰性删除：arm / disarm / 出堆均为 O(log n)，过期条目出堆时跳过
+- 调度循环睡到最近的 deadline（新 deadline 更早时立即唤醒），到期才读库确认状态
+- TaskRunner 仍按 monitor_interval_seconds（默认 30s）全量对账兜底：绕过 arm 的
+  状态变更（外部直接写库等）其超时最多晚一个对账周期
+
+deadline 为 UTC epoch 秒（与 Task.updated_at / RunningJob.started_at 可直接换算）。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import heapq
+import itertools
+import time
+from collections.abc import Hashable
+from datetime import UTC, datetime
+
+#: 唤醒时间上限（秒）：防止时钟跳变后长时间沉睡
+_MAX_SLEEP_SECONDS = 3600.0
+
+
+def to_epoch(value: datetime) -> float:
+    """datetime -> epoch 秒（naive 视为 UTC，与 monitor 原有的时间戳约定一致）"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return value.timestamp()
+
+
+class DeadlineScheduler:
+    """key -> deadline 的最小堆（惰性删除）"""
+
+    def __init__(self) -> None:
+        self._heap: list[tuple[float, int, Hashable]] = []
+        self._deadlines: dict[Hashable, tuple[float, int]] = {}
+        self._counter = itertools.count()
+        self._wakeup = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._deadlines
+
+    def deadline_of(self, key: Hashable) -> float | None:
+        entry = self._deadlines.get(key)
+        return entry[0] if entry is not None else None
+
+    def arm(self, key: Hashable, deadline: float) -> None:
+        """设置（或覆盖）key 的 deadline；比当前最早 deadline 更早时唤醒调度循环"""
+        earliest = self.next_deadline()
+        seq = next(self._counter)
+        self._deadlines[key] = (deadline, seq)
+        heapq.heappush(self._heap, (deadline, seq, key))
+        if earliest is None or deadline < earliest:
+            self._wakeup.set()
+        self._compact()
+
+    def disarm(self, key: Hashable) -> None:
+        self._deadlines.pop(key, None)
+
+    def clear(self) -> None:
+        self._heap.clear()
+        self._deadlines.clear()
+
+    def next_deadline(self) -> float | None:
+        self._drop_stale_head()
+        return self._heap[0][0] if self._heap else None
+
+    def pop_expired(self, now: float | None = None) -> list[Hashable]:
+        """弹出所有 deadline <= now 的 key（按 deadline 顺序）"""
+        current = time.time() if now is None else now
+        expired: list[Hashable] = []
+        while True:
+            self._drop_stale_head()
+            if not self._heap or self._heap[0][0] > current:
+                return expired
+            _, _, key = heapq.heappop(self._heap)
+            self._deadlines.pop(key, None)
+            expired.append(key)
+
+    async def wait_until(self, wake_at: float | None) -> None:
+        """睡到 wake_at（None = 直到被 arm 唤醒），期间 arm 更早 deadline 时提前返回"""
+        self._wakeup.clear()
+        timeout = _MAX_SLEEP_SECONDS
+        if wake_at is not None:
+            timeout = min(max(wake_at - time.time(), 0.0), _MAX_SLEEP_SECONDS)
+        if timeout <= 0:
+            return
+        with contextlib.suppress(TimeoutError):
+            await asyncio.wait_for(self._wakeup.wait(), timeout)
+
+    def _drop_stale_head(self) -> None:
+        heap = self._heap
+        while heap:
+            deadline, seq, key = heap[0]
+            if self._deadlines.get(key) == (deadline, seq):
+                return
+            heapq.heappop(heap)
+
+    def _compact(self) -> None:
+        # 覆盖 / disarm 留下的过期条目过多时重建堆，防止反复 arm 导致堆无界增长
+        if len(self._heap) > 64 and len(self._heap) > 4 * len(self._deadlines):
+            self._heap = [
+                (deadline, seq, key) for key, (deadline, seq) in self._deadlines.items()
+            ]
+            heapq.heapify(self._heap)
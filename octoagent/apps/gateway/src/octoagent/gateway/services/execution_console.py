@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import asyncio
+from collections.abc import Callable
 from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
 from typing import Any, Protocol
@@ -32,6 +33,7 @@ from octoagent.policy.models import ApprovalDecision, ApprovalRequest, ApprovalS
 from octoagent.tooling.models import SideEffectLevel
 from ulid import ULID
 
+from .job_scheduler import JobScheduler
 from .task_service import TaskService
 
 log = structlog.get_logger()
@@ -129,11 +131,21 @@ class ExecutionConsoleService:
         self._approval_manager = approval_manager
         self._a2a_notifier = a2a_notifier
         self._live_sessions: dict[str, LiveExecutionState] = {}
+        self._job_scheduler: JobScheduler | None = None
+        self._waiting_approval_listener: Callable[[str], None] | None = None
 
     def bind_a2a_notifier(self, notifier: ExecutionConsoleA2ANotifier | None) -> None:
         """延迟绑定 A2A notifier，避免构造期循环依赖。"""
         self._a2a_notifier = notifier
 
+    def bind_job_scheduler(self, scheduler: JobScheduler | None) -> None:
+        """绑定 TaskRunner 的准入调度器：等待人工输入 / 审批期间让出执行名额。"""
+        self._job_scheduler = scheduler
+
+    def bind_waiting_approval_listener(self, listener: Callable[[str], None] | None) -> None:
+        """绑定进入 WAITING_APPROVAL 的回调（TaskRunner 据此 arm 审批超时 deadline）。"""
+        self._waiting_approval_listener = listener
+
     async def register_session(
         self,
         *,
@@ -345,7 +357,10 @@ class ExecutionConsoleService:
                 )
 
         try:
-            return await request.queue.get()
+            if self._job_scheduler is None:
+                return await request.queue.get()
+            async with self._job_scheduler.parked(task_id):
+                return await request.queue.get()
         finally:
             state.current_request = None
             state.session.requested_input = None
@@ -389,6 +404,11 @@ class ExecutionConsoleService:
             )
             return
 
+        if self._job_scheduler is not None:
+            self._job_scheduler.park(task_id)
+        if self._waiting_approval_listener is not None:
+            self._waiting_approval_listener(task_id)
+
         try:
             await self._stores.task_job_store.mark_waiting_approval(task_id)
         except Exception as exc:
@@ -416,7 +436,10 @@ class ExecutionConsoleService:
         恢复任务到 RUNNING 状态（worker 继续执行）。
         超时场景（decision="rejected"）同样恢复为 RUNNING，由 worker 决定后续行为；
         FAILED 终态由 task_runner 超时监控（FR-C3）负责，不在此处处理。
+        审批等待期间让出的准入名额在此重新获取（未让出时 no-op）。
         """
+        if self._job_scheduler is not None:
+            await self._job_scheduler.unpark(task_id)
         service = TaskService(self._stores, self._sse_hub, storage_only=True)
         task = await service.get_task(task_id)
         if task is None or task.status != TaskStatus.WAITING_APPROVAL:
@@ -0,0 +1,399 @@
+"""JobScheduler -- TaskRunner 的准入控制（admission control）
+
+TaskRunner 为每个 job 创建一个 asyncio.Task；重启后积压的 QUEUED job 或群聊刷屏会
+让所有 job 同时打到 provider，触发 429 风暴。job 在真正执行前先经本调度器准入：
+
+- 并发上限：全局上限 + 按 model alias / provider 的上限（0 / 未配置 = 不限）
+- 优先级：交互对话 > 委派子任务 > 自动化 / 系统内部任务（严格优先，高优先级有可准入
+  的 job 时低优先级不出队）
+- 公平：同一优先级内按 (channel, sender) 分队列轮转出队，单个发送者刷屏不会饿死其他人；
+  队首受 alias / provider 上限阻塞时跳过该队列，不阻塞其他 alias
+- 等待人工输入 / 审批期间 park 让出名额，恢复时以原优先级插到本队列队首
+- 指标：各优先级排队深度、运行数（按 alias / provider）、准入等待耗时
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import time
+from collections import OrderedDict, deque
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any
+
+import structlog
+
+log = structlog.get_logger()
+
+# 最近等待耗时采样窗口（计算 p95）
+_WAIT_SAMPLE_WINDOW = 512
+
+
+class JobPriority(IntEnum):
+    """准入优先级（数值越小越先出队）"""
+
+    INTERACTIVE = 0
+    DELEGATED = 1
+    AUTOMATION = 2
+
+
+def parse_concurrency_limits(raw: str) -> dict[str, int]:
+    """解析 "main=4,cheap=8" 形式的上限配置（非法项忽略，<=0 视为不限）"""
+    limits: dict[str, int] = {}
+    for item in raw.split(","):
+        key, sep, value = item.partition("=")
+        key = key.strip()
+        if not sep or not key:
+            continue
+        try:
+            limit = int(value.strip())
+        except ValueError:
+            log.warning("job_scheduler_invalid_limit", item=item.strip())
+            continue
+        if limit > 0:
+            limits[key] = limit
+    return limits
+
+
+@dataclass(frozen=True, slots=True)
+class AdmissionLimits:
+    """并发上限配置；max_concurrent=0 表示不限全局并发"""
+
+    max_concurrent: int = 0
+    per_model_alias: dict[str, int] = field(default_factory=dict)
+    per_provider: dict[str, int] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class _Ticket:
+    task_id: str
+    priority: JobPriority
+    fair_key: str
+    model_alias: str
+    provider: str
+    enqueued_at: float
+    future: asyncio.Future[None]
+
+
+@dataclass(slots=True)
+class _Admitted:
+    priority: JobPriority
+    fair_key: str
+    model_alias: str
+    provider: str
+    admitted_at: float
+    parked: bool = False
+
+
+@dataclass(slots=True)
+class _WaitStats:
+    admitted: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    samples: deque[float] = field(default_factory=lambda: deque(maxlen=_WAIT_SAMPLE_WINDOW))
+
+    def record(self, wait_ms: float) -> None:
+        self.admitted += 1
+        self.total_ms += wait_ms
+        self.max_ms = max(self.max_ms, wait_ms)
+        self.samples.append(wait_ms)
+
+    def as_dict(self) -> dict[str, Any]:
+        ordered = sorted(self.samples)
+        p95 = ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)] if ordered else 0.0
+        return {
+            "admitted": self.admitted,
+            "avg_ms": round(self.total_ms / self.admitted, 2) if self.admitted else 0.0,
+            "p95_ms": round(p95, 2),
+            "max_ms": round(self.max_ms, 2),
+        }
+
+
+class JobScheduler:
+    """按优先级 + 公平队列 + 分层并发上限做 job 准入"""
+
+    def __init__(
+        self,
+        limits: AdmissionLimits | None = None,
+        *,
+        provider_resolver: Callable[[str], str | None] | None = None,
+    ) -> None:
+        self._limits = limits or AdmissionLimits()
+        self._provider_resolver = provider_resolver
+        # priority -> fair_key -> FIFO；OrderedDict 顺序即轮转顺序
+        self._queues: dict[JobPriority, OrderedDict[str, deque[_Ticket]]] = {
+            priority: OrderedDict() for priority in JobPriority
+        }
+        self._waiting: dict[str, _Ticket] = {}
+        self._admitted: dict[str, _Admitted] = {}
+        self._running_by_alias: dict[str, int] = {}
+        self._running_by_provider: dict[str, int] = {}
+        self._running = 0
+        self._wait_stats = {priority: _WaitStats() for priority in JobPriority}
+
+    @property
+    def limits(self) -> AdmissionLimits:
+        return self._limits
+
+    def is_queued(self, task_id: str) -> bool:
+        return task_id in self._waiting
+
+    def is_admitted(self, task_id: str) -> bool:
+        admitted = self._admitted.get(task_id)
+        return admitted is not None and not admitted.parked
+
+    def free_slots(self) -> int | None:
+        """全局上限下还可准入的 job 数（已排队的计为占用）；不限全局并发时返回 None"""
+        if self._limits.max_concurrent <= 0:
+            return None
+        return max(self._limits.max_concurrent - self._running - len(self._waiting), 0)
+
+    async def acquire(
+        self,
+        task_id: str,
+        *,
+        priority: JobPriority = JobPriority.INTERACTIVE,
+        fair_key: str = "",
+        model_alias: str | None = None,
+    ) -> float:
+        """排队直到获准执行，返回等待毫秒数；取消时自动出队"""
+        if task_id in self._admitted or task_id in self._waiting:
+            raise RuntimeError(f"task {task_id} 已在调度器中")
+        alias = model_alias or "main"
+        ticket = self._enqueue(
+            task_id,
+            priority=priority,
+            fair_key=fair_key,
+            model_alias=alias,
+            provider=self._resolve_provider(alias),
+        )
+        return await self._wait(ticket)
+
+    def release(self, task_id: str) -> None:
+        """释放名额（job 结束；未准入 / 已 park / 未知 task 均为幂等 no-op）"""
+        self._drop_waiting(task_id)
+        admitted = self._admitted.pop(task_id, None)
+        if admitted is None:
+            return
+        if not admitted.parked:
+            self._release_slot(admitted)
+        self._pump()
+
+    def park(self, task_id: str) -> bool:
+        """让出名额（等待人工输入 / 审批），返回是否实际让出"""
+        admitted = self._admitted.get(task_id)
+        if admitted is None or admitted.parked:
+            return False
+        admitted.parked = True
+        self._release_slot(admitted)
+        self._pump()
+        return True
+
+    async def unpark(self, task_id: str) -> float:
+        """重新获取 park 前的名额（插到本队列队首），返回等待毫秒数"""
+        admitted = self._admitted.get(task_id)
+        if admitted is None or not admitted.parked:
+            return 0.0
+        ticket = self._enqueue(
+            task_id,
+            priority=admitted.priority,
+            fair_key=admitted.fair_key,
+            model_alias=admitted.model_alias,
+            provider=admitted.provider,
+            front=True,
+        )
+        return await self._wait(ticket)
+
+    @contextlib.asynccontextmanager
+    async def parked(self, task_id: str) -> AsyncIterator[None]:
+        """with 块内让出名额，正常退出时重新排队获取
+
+        异常（含取消）退出时不再排队，由 job 结束时的 release 收尾。
+        """
+        released = self.park(task_id)
+        yield
+        if released:
+            await self.unpark(task_id)
+
+    def snapshot(self) -> dict[str, Any]:
+        """排队深度 / 运行数 / 等待耗时指标（执行控制台展示）"""
+        now = time.monotonic()
+        queued: list[dict[str, Any]] = []
+        depth: dict[str, int] = {}
+        for priority, queues in self._queues.items():
+            depth[priority.name.lower()] = sum(len(queue) for queue in queues.values())
+            for queue in queues.values():
+                for ticket in queue:
+                    queued.append(
+                        {
+                            "task_id": ticket.task_id,
+                            "priority": priority.name.lower(),
+                            "fair_key": ticket.fair_key,
+                            "model_alias": ticket.model_alias,
+                            "provider": ticket.provider,
+                            "waiting_ms": round((now - ticket.enqueued_at) * 1000, 2),
+                        }
+                    )
+        queued.sort(key=lambda item: -item["waiting_ms"])
+        return {
+            "limits": {
+                "max_concurrent": self._limits.max_concurrent,
+                "per_model_alias": dict(self._limits.per_model_alias),
+                "per_provider": dict(self._limits.per_provider),
+            },
+            "running": self._running,
+            "parked": sum(1 for admitted in self._admitted.values() if admitted.parked),
+            "running_by_model_alias": dict(self._running_by_alias),
+            "running_by_provider": dict(self._running_by_provider),
+            "queue_depth": depth,
+            "queued": queued,
+            "wait": {
+                priority.name.lower(): stats.as_dict()
+                for priority, stats in self._wait_stats.items()
+            },
+        }
+
+    # ── 内部 ──
+
+    def _resolve_provider(self, model_alias: str) -> str:
+        if self._provider_resolver is None:
+            return ""
+        try:
+            provider = self._provider_resolver(model_alias)
+        except Exception:
+            # alias 未配置 / 路由异常时只按全局与 alias 上限准入，真正的错误留给执行阶段
+            return ""
+        return provider if isinstance(provider, str) else ""
+
+    def _enqueue(
+        self,
+        task_id: str,
+        *,
+        priority: JobPriority,
+        fair_key: str,
+        model_alias: str,
+        provider: str,
+        front: bool = False,
+    ) -> _Ticket:
+        ticket = _Ticket(
+            task_id=task_id,
+            priority=priority,
+            fair_key=fair_key,
+            model_alias=model_alias,
+            provider=provider,
+            enqueued_at=time.monotonic(),
+            future=asyncio.get_running_loop().create_future(),
+        )
+        queue = self._queues[priority].setdefault(fair_key, deque())
+        if front:
+            queue.appendleft(ticket)
+        else:
+            queue.append(ticket)
+        self._waiting[task_id] = ticket
+        self._pump()
+        return ticket
+
+    async def _wait(self, ticket: _Ticket) -> float:
+        try:
+            await ticket.future
+        except asyncio.CancelledError:
+            if self._waiting.get(ticket.task_id) is ticket:
+                self._drop_waiting(ticket.task_id)
+            elif ticket.future.done() and not ticket.future.cancelled():
+                # 准入与取消同时发生：名额已分配，归还
+                self.release(ticket.task_id)
+            raise
+        wait_ms = (time.monotonic() - ticket.enqueued_at) * 1000
+        self._wait_stats[ticket.priority].record(wait_ms)
+        return wait_ms
+
+    def _drop_waiting(self, task_id: str) -> None:
+        ticket = self._waiting.pop(task_id, None)
+        if ticket is None:
+            return
+        queues = self._queues[ticket.priority]
+        queue = queues.get(ticket.fair_key)
+        if queue is None:
+            return
+        with contextlib.suppress(ValueError):
+            queue.remove(ticket)
+        if not queue:
+            queues.pop(ticket.fair_key, None)
+
+    def _has_capacity(self, model_alias: str, provider: str) -> bool:
+        limits = self._limits
+        if limits.max_concurrent and self._running >= limits.max_concurrent:
+            return False
+        alias_limit = limits.per_model_alias.get(model_alias)
+        if alias_limit and self._running_by_alias.get(model_alias, 0) >= alias_limit:
+            return False
+        provider_limit = limits.per_provider.get(provider) if provider else None
+        return not (
+            provider_limit and self._running_by_provider.get(provider, 0) >= provider_limit
+        )
+
+    def _pump(self) -> None:
+        """按优先级 / 轮转顺序准入所有当前可准入的队首"""
+        while self._admit_next():
+            pass
+
+    def _admit_next(self) -> bool:
+        limits = self._limits
+        if limits.max_concurrent and self._running >= limits.max_concurrent:
+            return False
+        for priority in JobPriority:
+            queues = self._queues[priority]
+            for fair_key in list(queues):
+                queue = queues[fair_key]
+                ticket = queue[0]
+                if not self._has_capacity(ticket.model_alias, ticket.provider):
+                    continue
+                queue.popleft()
+                if queue:
+                    # 轮转：刚出队的发送者排到本优先级末尾
+                    queues.move_to_end(fair_key)
+                else:
+                    queues.pop(fair_key)
+                self._waiting.pop(ticket.task_id, None)
+                self._admit(ticket)
+                return True
+        return False
+
+    def _admit(self, ticket: _Ticket) -> None:
+        self._running += 1
+        self._running_by_alias[ticket.model_alias] = (
+            self._running_by_alias.get(ticket.model_alias, 0) + 1
+        )
+        if ticket.provider:
+            self._running_by_provider[ticket.provider] = (
+                self._running_by_provider.get(ticket.provider, 0) + 1
+            )
+        admitted = self._admitted.get(ticket.task_id)
+        if admitted is not None:
+            admitted.parked = False
+        else:
+            self._admitted[ticket.task_id] = _Admitted(
+                priority=ticket.priority,
+                fair_key=ticket.fair_key,
+                model_alias=ticket.model_alias,
+                provider=ticket.provider,
+                admitted_at=time.monotonic(),
+            )
+        if not ticket.future.done():
+            ticket.future.set_result(None)
+
+    def _release_slot(self, admitted: _Admitted) -> None:
+        self._running = max(self._running - 1, 0)
+        _decrement(self._running_by_alias, admitted.model_alias)
+        if admitted.provider:
+            _decrement(self._running_by_provider, admitted.provider)
+
+
+def _decrement(counter: dict[str, int], key: str) -> None:
+    remaining = counter.get(key, 0) - 1
+    if remaining > 0:
+        counter[key] = remaining
+    else:
+        counter.pop(key, None)
@@ -13,6 +13,7 @@ from typing import Any
 
 from octoagent.core.models.agent_context import DEFAULT_PERMISSION_PRESET
 from octoagent.provider import (
+    CACHE_BREAKPOINT_KEY,
     AliasRegistry,
     EchoMessageAdapter,
     FallbackManager,
@@ -601,6 +602,10 @@ class LLMService:
                                     prompt_tokens=int(r_usage.get("prompt_tokens", 0) or 0),
                                     completion_tokens=int(r_usage.get("completion_tokens", 0) or 0),
                                     total_tokens=int(r_usage.get("total_tokens", 0) or 0),
+                                    cache_read_tokens=int(r_usage.get("cache_read_tokens", 0) or 0),
+                                    cache_write_tokens=int(
+                                        r_usage.get("cache_write_tokens", 0) or 0
+                                    ),
                                 ),
                                 cost_usd=retry_result.total_cost_usd,
                                 cost_unavailable=bool(r_meta.get("cost_unavailable", True))
@@ -644,6 +649,8 @@ class LLMService:
                 prompt_tokens=int(usage.get("prompt_tokens", 0) or 0),
                 completion_tokens=int(usage.get("completion_tokens", 0) or 0),
                 total_tokens=int(usage.get("total_tokens", 0) or 0),
+                cache_read_tokens=int(usage.get("cache_read_tokens", 0) or 0),
+                cache_write_tokens=int(usage.get("cache_write_tokens", 0) or 0),
             ),
             cost_usd=float(meta.get("cost_usd", 0.0) or 0.0) if isinstance(meta, dict) else 0.0,
             cost_unavailable=bool(meta.get("cost_unavailable", True))
@@ -803,7 +810,11 @@ class LLMService:
             role = str(item.get("role", "user")).strip().lower() or "user"
             if role not in {"system", "user", "assistant"}:
                 role = "user"
-            normalized.append({"role": role, "content": content})
+            message = {"role": role, "content": content}
+            if role == "system" and item.get(CACHE_BREAKPOINT_KEY):
+                # prompt 缓存断点标记透传给 ProviderClient
+                message[CACHE_BREAKPOINT_KEY] = item[CACHE_BREAKPOINT_KEY]
+            normalized.append(message)
         return normalized
 
     @classmethod
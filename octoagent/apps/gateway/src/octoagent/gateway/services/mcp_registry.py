@@ -1,4 +1,11 @@
-"""最小 MCP stdio registry 与动态 ToolBroker 注册。"""
+"""最小 MCP stdio registry 与动态 ToolBroker 注册。
+
+refresh 并发发现各 server（``MCP_DISCOVERY_CONCURRENCY`` 限流、单 server
+``MCP_DISCOVERY_TIMEOUT_S`` 超时），只把新增 / 删除 / 变化的工具同步到
+ToolBroker，未变化的工具与 server 连接原样保留。发现结果按 server 启动参数
+指纹落盘（配置目录下 ``mcp-tool-manifests.json``）：启动时先注册缓存中的
+工具，再在后台重新发现并按 diff 生效。
+"""
 
 from __future__ import annotations
 
@@ -7,7 +14,8 @@ import hashlib
 import json
 import os
 import re
-from contextlib import asynccontextmanager
+from collections.abc import Awaitable, Callable
+from contextlib import asynccontextmanager, suppress
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any
@@ -16,6 +24,11 @@ import structlog
 from mcp import ClientSession
 from mcp import types as mcp_types
 from mcp.client.stdio import StdioServerParameters, stdio_client
+from octoagent.core.config import (
+    MCP_DISCOVERY_CONCURRENCY,
+    MCP_DISCOVERY_TIMEOUT_S,
+    MCP_MANIFEST_CACHE,
+)
 from octoagent.core.models import BuiltinToolAvailabilityStatus
 from octoagent.tooling import SideEffectLevel, ToolBroker, ToolMeta
 from pydantic import BaseModel, Field
@@ -23,6 +36,9 @@ from pydantic import BaseModel, Field
 log = structlog.get_logger()
 
 _DEFAULT_MCP_CONFIG_PATH = Path("data/ops/mcp-servers.json")
+# 工具清单缓存与 server 配置文件同目录
+_MANIFEST_CACHE_FILENAME = "mcp-tool-manifests.json"
+_MANIFEST_CACHE_VERSION = 1
 
 # MCP proxy tool 默认 broker.execute 超时（秒）。
 # 防止 SkillRunner 等"无外层 wait_for"路径在 stdio 远端 hang 时永久阻塞。
@@ -36,6 +52,25 @@ def _utc_now() -> datetime:
     return datetime.now(tz=UTC)
 
 
+def _config_fingerprint(config: McpServerConfig) -> str:
+    """server 启动参数指纹（command / args / env / cwd）：清单缓存与连接复用的键。"""
+    payload = json.dumps(
+        {
+            "command": config.command,
+            "args": list(config.args),
+            "env": dict(config.env),
+            "cwd": config.cwd,
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _meta_signature(meta: ToolMeta) -> str:
+    return hashlib.sha256(meta.model_dump_json().encode()).hexdigest()
+
+
 class McpServerConfig(BaseModel):
     """MCP server 配置。"""
 
@@ -46,6 +81,9 @@ class McpServerConfig(BaseModel):
     cwd: str = Field(default="")
     enabled: bool = True
     mount_policy: str = Field(default="auto_readonly")
+    # session 组大小（0 = 取 OCTOAGENT_MCP_SESSION_MIN / MAX 全局默认）
+    min_sessions: int = Field(default=0, ge=0)
+    max_sessions: int = Field(default=0, ge=0)
 
 
 class McpToolRecord(BaseModel):
@@ -97,12 +135,17 @@ class McpRegistryService:
         self._session_pool = session_pool  # McpSessionPool | None
         self._server_records: dict[str, McpServerRecord] = {}
         self._tool_records: dict[str, McpToolRecord] = {}
-        self._registered_tool_names: set[str] = set()
+        # 已注册到 broker 的工具名 -> ToolMeta 签名（refresh 按签名 diff）
+        self._tool_signatures: dict[str, str] = {}
         self._last_config_error = ""
-        # refresh() 内多个 await 点（_clear_registered_tools / _discover_server_tools /
-        # try_register）都会让出事件循环；并发 refresh 交错会导致同名工具在 broker
-        # 已存在时 try_register 失败，进而 _tool_records 残缺。用实例级锁串行化。
+        # refresh() 内多个 await 点（_discover_all / unregister / try_register）都会
+        # 让出事件循环；并发 refresh 交错会导致同名工具在 broker 已存在时
+        # try_register 失败，进而 _tool_records 残缺。用实例级锁串行化。
         self._refresh_lock = asyncio.Lock()
+        # 按 server 串行化"检查连接 → open"，避免后台发现与 call_tool 重复拉起
+        self._session_locks: dict[str, asyncio.Lock] = {}
+        self._revalidate_task: asyncio.Task[None] | None = None
+        self._change_listener: Callable[[], Awaitable[None]] | None = None
 
     @property
     def config_path(self) -> Path:
@@ -112,11 +155,26 @@ class McpRegistryService:
     def last_config_error(self) -> str:
         return self._last_config_error
 
+    def set_change_listener(self, listener: Callable[[], Awaitable[None]] | None) -> None:
+        """后台重新发现改变了已注册工具时回调（显式 refresh 的调用方自行处理）。"""
+        self._change_listener = listener
+
     async def startup(self) -> None:
+        if await self._register_cached_tools():
+            self._revalidate_task = asyncio.create_task(
+                self._revalidate(),
+                name="mcp-registry-revalidate",
+            )
+            return
         await self.refresh()
 
     async def shutdown(self) -> None:
         """优雅关闭所有 MCP server 连接。"""
+        task = self._revalidate_task
+        if task is not None and not task.done():
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
         if self._session_pool is not None:
             await self._session_pool.close_all()
 
@@ -124,7 +182,29 @@ class McpRegistryService:
         async with self._refresh_lock:
             await self._refresh_locked()
 
-    async def _refresh_locked(self) -> None:
+    async def _revalidate(self) -> None:
+        """缓存启动后的后台重新发现：结果按 diff 生效，工具集变化时通知 listener。"""
+        try:
+            async with self._refresh_lock:
+                changed = await self._refresh_locked()
+        except Exception as exc:
+            log.warning(
+                "mcp_registry_revalidate_failed",
+                error=f"{type(exc).__name__}: {exc}",
+            )
+            return
+        if not changed or self._change_listener is None:
+            return
+        try:
+            await self._change_listener()
+        except Exception as exc:
+            log.warning(
+                "mcp_registry_change_listener_failed",
+                error=f"{type(exc).__name__}: {exc}",
+            )
+
+    async def _refresh_locked(self) -> bool:
+        """重新发现全部 server 并把工具 diff 同步到 broker；返回已注册工具是否变化。"""
         configs = self._load_configs()
         # Codex F1 high-1 / F2 high-1：_load_configs() 有两类失败：
         # 1) **fatal**：JSON 解析失败 / shape 错误 → return [] + last_config_error 非空
@@ -138,9 +218,6 @@ class McpRegistryService:
         # 正确判定：fatal 仅在"配置完全无法解析（configs 完全为空且 error 非空）"时生效。
         # partial 仍按 valid configs 推 stale 集合，正常 diff-close。
         config_load_fatal = bool(self._last_config_error) and not configs
-        await self._clear_registered_tools()
-        self._server_records = {}
-        self._tool_records = {}
 
         # 关闭"已删除（即不在最新 configs 列表）"的 server 的持久连接 +
         # 子进程。下面 enabled-loop 内只对 disabled config 调 close，对完全
@@ -162,8 +239,10 @@ class McpRegistryService:
                         error=f"{type(exc).__name__}: {exc}",
                     )
 
+        records: dict[str, McpServerRecord] = {}
+        enabled_configs: list[McpServerConfig] = []
         for config in configs:
-            record = McpServerRecord(
+            records[config.name] = McpServerRecord(
                 server_name=config.name,
                 enabled=config.enabled,
                 status="disabled" if not config.enabled else "discovering",
@@ -171,33 +250,156 @@ class McpRegistryService:
                 args=list(config.args),
                 cwd=config.cwd,
             )
-            self._server_records[config.name] = record
-            if not config.enabled:
-                # 关闭 disabled server 的持久连接
-                if self._session_pool is not None:
-                    try:
-                        await self._session_pool.close(config.name)
-                    except Exception:
-                        pass
+            if config.enabled:
+                enabled_configs.append(config)
                 continue
-
-            try:
-                # 先建立持久连接（如果有 session pool）
-                if self._session_pool is not None:
-                    await self._session_pool.open(config.name, config)
-                tools = await self._discover_server_tools(config)
-            except Exception as exc:
+            # 关闭 disabled server 的持久连接
+            if self._session_pool is not None:
+                with suppress(Exception):
+                    await self._session_pool.close(config.name)
+
+        outcomes = await self._discover_all(enabled_configs)
+        discovered: dict[str, list[mcp_types.Tool]] = {}
+        for config in enabled_configs:
+            record = records[config.name]
+            outcome = outcomes[config.name]
+            record.discovered_at = _utc_now()
+            if isinstance(outcome, BaseException):
                 record.status = "error"
-                record.error = f"{type(exc).__name__}: {exc}"
-                record.discovered_at = _utc_now()
+                record.error = f"{type(outcome).__name__}: {outcome}"
                 continue
-
             record.status = "available"
-            record.tool_count = len(tools)
-            record.discovered_at = _utc_now()
+            record.tool_count = len(outcome)
+            discovered[config.name] = outcome
+
+        self._server_records = records
+        changed = await self._apply_tool_diff(configs, discovered)
+        if not config_load_fatal:
+            self._write_manifest_cache(configs, discovered)
+        return changed
+
+    async def _register_cached_tools(self) -> bool:
+        """启动快路径：注册指纹仍匹配的缓存工具清单，命中任一 server 返回 True。"""
+        if not MCP_MANIFEST_CACHE:
+            return False
+        async with self._refresh_lock:
+            cache = self._read_manifest_cache()
+            if not cache:
+                return False
+            configs = self._load_configs()
+            records: dict[str, McpServerRecord] = {}
+            discovered: dict[str, list[mcp_types.Tool]] = {}
+            for config in configs:
+                record = McpServerRecord(
+                    server_name=config.name,
+                    enabled=config.enabled,
+                    status="disabled" if not config.enabled else "discovering",
+                    command=config.command,
+                    args=list(config.args),
+                    cwd=config.cwd,
+                )
+                records[config.name] = record
+                entry = cache.get(config.name)
+                if (
+                    not config.enabled
+                    or not isinstance(entry, dict)
+                    or entry.get("fingerprint") != _config_fingerprint(config)
+                ):
+                    continue
+                try:
+                    tools = [mcp_types.Tool.model_validate(item) for item in entry["tools"]]
+                except Exception as exc:
+                    log.warning(
+                        "mcp_manifest_cache_entry_invalid",
+                        server_name=config.name,
+                        error=f"{type(exc).__name__}: {exc}",
+                    )
+                    continue
+                # 状态保持 discovering，直到后台重新发现确认
+                record.tool_count = len(tools)
+                discovered[config.name] = tools
+            if not discovered:
+                return False
+            self._server_records = records
+            await self._apply_tool_diff(configs, discovered)
+        log.info(
+            "mcp_registry_cached_tools_registered",
+            server_count=len(discovered),
+            tool_count=len(self._tool_records),
+        )
+        return True
+
+    async def _discover_all(
+        self,
+        configs: list[McpServerConfig],
+    ) -> dict[str, list[mcp_types.Tool] | BaseException]:
+        """并发发现（有界 fan-out + 单 server 超时）；单个 server 失败不影响其它。"""
+        semaphore = asyncio.Semaphore(max(MCP_DISCOVERY_CONCURRENCY, 1))
+
+        async def _discover_one(config: McpServerConfig) -> list[mcp_types.Tool]:
+            async with semaphore:
+                try:
+                    return await asyncio.wait_for(
+                        self._open_and_discover(config),
+                        timeout=MCP_DISCOVERY_TIMEOUT_S,
+                    )
+                except TimeoutError as exc:
+                    raise TimeoutError(
+                        f"discovery timed out after {MCP_DISCOVERY_TIMEOUT_S:g}s"
+                    ) from exc
+
+        results = await asyncio.gather(
+            *(_discover_one(config) for config in configs),
+            return_exceptions=True,
+        )
+        return {
+            config.name: result for config, result in zip(configs, results, strict=True)
+        }
+
+    async def _open_and_discover(self, config: McpServerConfig) -> list[mcp_types.Tool]:
+        if self._session_pool is None:
+            return await self._discover_server_tools(config)
+        await self._ensure_session(config, reuse_if=_config_fingerprint(config))
+        try:
+            return await self._discover_server_tools(config)
+        except BaseException:
+            # 复用的连接可能已失效（或 list_tools 超时）：关掉，下次使用时重建
+            with suppress(Exception):
+                await self._session_pool.close(config.name)
+            raise
+
+    async def _ensure_session(self, config: McpServerConfig, *, reuse_if: str = "") -> None:
+        """按需建立持久连接。
+
+        ``reuse_if`` 为空：已有 entry 即复用（call_tool 路径，断线由 get_session 重连）；
+        否则仅当已连接、启动参数指纹与 session 组大小都一致时复用，不一致则
+        重新拉起子进程。
+        """
+        lock = self._session_locks.setdefault(config.name, asyncio.Lock())
+        async with lock:
+            entry = self._session_pool.get_entry(config.name)
+            if entry is not None and (
+                not reuse_if
+                or (
+                    entry.status == "connected"
+                    and _config_fingerprint(entry.config) == reuse_if
+                    and (entry.config.min_sessions, entry.config.max_sessions)
+                    == (config.min_sessions, config.max_sessions)
+                )
+            ):
+                return
+            await self._session_pool.open(config.name, config)
 
-            used_names = set(self._registered_tool_names)
-            for tool in tools:
+    async def _apply_tool_diff(
+        self,
+        configs: list[McpServerConfig],
+        discovered: dict[str, list[mcp_types.Tool]],
+    ) -> bool:
+        """把期望工具集 diff 到 broker：注销删除 / 变化的，注册新增 / 变化的。"""
+        desired: dict[str, tuple[McpServerConfig, mcp_types.Tool, ToolMeta, str]] = {}
+        used_names: set[str] = set()
+        for config in configs:
+            for tool in discovered.get(config.name, []):
                 registered_name = self._registered_tool_name(
                     config.name,
                     tool.name,
@@ -209,30 +411,132 @@ class McpRegistryService:
                     tool=tool,
                     registered_name=registered_name,
                 )
-                result = await self._tool_broker.try_register(
-                    meta,
-                    self._build_tool_handler(
-                        server_name=config.name,
-                        source_tool_name=tool.name,
-                    ),
-                )
-                if not result.ok:
-                    continue
-                self._registered_tool_names.add(registered_name)
-                self._tool_records[registered_name] = McpToolRecord(
-                    registered_name=registered_name,
+                desired[registered_name] = (config, tool, meta, _meta_signature(meta))
+
+        changed = False
+        for registered_name, signature in list(self._tool_signatures.items()):
+            target = desired.get(registered_name)
+            if target is not None and target[3] == signature:
+                continue
+            await self._tool_broker.unregister(registered_name)
+            del self._tool_signatures[registered_name]
+            changed = True
+
+        for registered_name, (config, tool, meta, signature) in desired.items():
+            if registered_name in self._tool_signatures:
+                continue
+            result = await self._tool_broker.try_register(
+                meta,
+                self._build_tool_handler(
                     server_name=config.name,
                     source_tool_name=tool.name,
-                    title=tool.title or "",
-                    description=tool.description or "",
-                    input_schema=self._normalize_json_schema(tool.inputSchema),
-                    output_schema=tool.outputSchema,
-                    annotations={}
-                    if tool.annotations is None
-                    else tool.annotations.model_dump(mode="json", by_alias=True),
-                    availability=BuiltinToolAvailabilityStatus.AVAILABLE,
-                    availability_reason="",
+                ),
+            )
+            if not result.ok:
+                continue
+            changed = True
+            self._tool_signatures[registered_name] = signature
+            self._tool_records[registered_name] = self._build_tool_record(
+                config=config,
+                tool=tool,
+                registered_name=registered_name,
+            )
+        self._tool_records = {
+            name: record
+            for name, record in self._tool_records.items()
+            if name in self._tool_signatures
+        }
+        return changed
+
+    def _build_tool_record(
+        self,
+        *,
+        config: McpServerConfig,
+        tool: mcp_types.Tool,
+        registered_name: str,
+    ) -> McpToolRecord:
+        return McpToolRecord(
+            registered_name=registered_name,
+            server_name=config.name,
+            source_tool_name=tool.name,
+            title=tool.title or "",
+            description=tool.description or "",
+            input_schema=self._normalize_json_schema(tool.inputSchema),
+            output_schema=tool.outputSchema,
+            annotations={}
+            if tool.annotations is None
+            else tool.annotations.model_dump(mode="json", by_alias=True),
+            availability=BuiltinToolAvailabilityStatus.AVAILABLE,
+            availability_reason="",
+        )
+
+    def _manifest_cache_path(self) -> Path:
+        return self._resolve_config_path().with_name(_MANIFEST_CACHE_FILENAME)
+
+    def _read_manifest_cache(self) -> dict[str, Any]:
+        path = self._manifest_cache_path()
+        if not path.exists():
+            return {}
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except Exception as exc:
+            log.warning(
+                "mcp_manifest_cache_unreadable",
+                path=str(path),
+                error=f"{type(exc).__name__}: {exc}",
+            )
+            return {}
+        if not isinstance(payload, dict) or payload.get("version") != _MANIFEST_CACHE_VERSION:
+            return {}
+        servers = payload.get("servers")
+        return servers if isinstance(servers, dict) else {}
+
+    def _write_manifest_cache(
+        self,
+        configs: list[McpServerConfig],
+        discovered: dict[str, list[mcp_types.Tool]],
+    ) -> None:
+        """落盘本次发现结果；发现失败的 server 保留旧清单，已删除 / 停用的丢弃。"""
+        if not MCP_MANIFEST_CACHE:
+            return
+        enabled_names = {config.name for config in configs if config.enabled}
+        servers = {
+            name: entry
+            for name, entry in self._read_manifest_cache().items()
+            if name in enabled_names
+        }
+        discovered_at = _utc_now().isoformat()
+        for config in configs:
+            tools = discovered.get(config.name)
+            if tools is None:
+                continue
+            servers[config.name] = {
+                "fingerprint": _config_fingerprint(config),
+                "discovered_at": discovered_at,
+                "tools": [
+                    tool.model_dump(mode="json", by_alias=True, exclude_none=True)
+                    for tool in tools
+                ],
+            }
+        path = self._manifest_cache_path()
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{path.name}.tmp")
+            tmp_path.write_text(
+                json.dumps(
+                    {"version": _MANIFEST_CACHE_VERSION, "servers": servers},
+                    ensure_ascii=False,
                 )
+                + "\n",
+                encoding="utf-8",
+            )
+            os.replace(tmp_path, path)
+        except OSError as exc:
+            log.warning(
+                "mcp_manifest_cache_write_failed",
+                path=str(path),
+                error=f"{type(exc).__name__}: {exc}",
+            )
 
     def list_servers(self) -> list[McpServerRecord]:
         return list(self._server_records.values())
@@ -264,6 +568,12 @@ class McpRegistryService:
             return normalized
         return "explicit"
 
+    def session_metrics(self, server_name: str) -> dict[str, Any]:
+        """server 的 session 组 / in-flight / 延迟指标；无持久连接池时为空。"""
+        if self._session_pool is None:
+            return {}
+        return self._session_pool.metrics(server_name)
+
     def registered_tool_count(self) -> int:
         return len(self._tool_records)
 
@@ -299,9 +609,11 @@ class McpRegistryService:
             raise RuntimeError(f"mcp server is disabled: {server_name}")
 
         if self._session_pool is not None:
-            # 新路径：使用持久 session
-            session = await self._session_pool.get_session(server_name)
-            result = await session.call_tool(source_tool_name, arguments)
+            # 新路径：从 session 组借出最空闲的持久 session（缓存启动后、后台
+            # 发现完成前可能尚未建立）
+            await self._ensure_session(config)
+            async with self._session_pool.lease(server_name) as session:
+                result = await session.call_tool(source_tool_name, arguments)
         else:
             # 旧路径：per-operation fallback
             async with self._open_session(config) as session:
@@ -313,11 +625,6 @@ class McpRegistryService:
             result=result,
         )
 
-    async def _clear_registered_tools(self) -> None:
-        for tool_name in list(self._registered_tool_names):
-            await self._tool_broker.unregister(tool_name)
-        self._registered_tool_names.clear()
-
     def save_config(self, config: McpServerConfig) -> None:
         configs = {item.name: item for item in self._load_configs()}
         configs[config.name] = config
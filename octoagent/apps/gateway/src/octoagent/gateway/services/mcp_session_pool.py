@@ -3,6 +3,16 @@
 管理 MCP server 的持久 stdio 连接。独立模块便于单元测试，
 但由 McpRegistryService 独占持有和管理。外部模块不直接访问 pool。
 
+# 多 session：按 server 的 session 组
+
+每个 server 维护 ``min_sessions`` ~ ``max_sessions`` 个独立 stdio 子进程
+（``McpServerConfig`` 配置，0 取 ``OCTOAGENT_MCP_SESSION_MIN/MAX``）。
+``lease()`` 把请求分派给 in-flight 最少的 session（同一 session 上的并发请求
+按 JSON-RPC id 多路复用）；所有 session 都忙时后台扩容，超出 min 的 session
+空闲 ``OCTOAGENT_MCP_SESSION_IDLE_TTL_S`` 后退役；supervisor 退出、健康检查
+失败或连续传输层失败的 session 被回收并按需补足。``metrics()`` 给出
+server 级 in-flight / 延迟 / 扩缩容计数。
+
 # Cross-task 关闭：supervisor task 模式
 
 mcp Python SDK 用 anyio.TaskGroup 管 stdio_client / ClientSession 的
@@ -50,17 +60,25 @@ MemoryObjectStream，是 task-safe 的，所以主路径在任何 task 内
 from __future__ import annotations
 
 import asyncio
+import time
+from collections import deque
 from collections.abc import AsyncIterator
-from contextlib import AsyncExitStack, asynccontextmanager
+from contextlib import AsyncExitStack, asynccontextmanager, suppress
 from contextvars import ContextVar
 from dataclasses import dataclass, field
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
 from typing import TYPE_CHECKING, Any, Literal
 
 import mcp.client.stdio as _mcp_stdio_mod
 import structlog
 from mcp import ClientSession
 from mcp.client.stdio import StdioServerParameters, stdio_client
+from mcp.shared.exceptions import McpError
+from octoagent.core.config import (
+    MCP_SESSION_IDLE_TTL_S,
+    MCP_SESSION_MAX,
+    MCP_SESSION_MIN,
+)
 
 if TYPE_CHECKING:
     from .mcp_registry import McpServerConfig
@@ -74,6 +92,12 @@ _RECONNECT_MAX_ATTEMPTS = 3
 # supervisor 收到 stop_event 后等其退出的兜底超时——SDK 内 stdio_client
 # 自带 PROCESS_TERMINATION_TIMEOUT (≈2s) 走 SIGTERM→SIGKILL，再加余量。
 _SUPERVISOR_JOIN_TIMEOUT_S = 5
+# 借出后最空闲 session 的在途请求数超过该值即扩容（1 = 所有 session 都已有请求在途）
+_SCALE_UP_IN_FLIGHT = 1
+# 连续传输层失败达到该次数回收 session
+_RECYCLE_AFTER_FAILURES = 3
+# 延迟分位数统计的滑动窗口（最近 N 次调用）
+_LATENCY_WINDOW = 512
 
 
 def _utc_now() -> datetime:
@@ -186,7 +210,7 @@ async def _stdio_client_capturing_process(
 
 @dataclass
 class McpSessionEntry:
-    """一个 MCP server 的持久连接条目。"""
+    """一个 MCP server 的单个持久连接（一个 supervisor + 一个 stdio 子进程）。"""
 
     server_name: str
     config: McpServerConfig
@@ -203,107 +227,196 @@ class McpSessionEntry:
     reconnect_count: int = 0
     pid: int | None = None
     """子进程 pid，stdio_client 启动后写入。如 mcp 库未暴露则保持 None。"""
+    in_flight: int = 0
+    """当前借出执行中的请求数（least-loaded 分派依据）。"""
+    consecutive_failures: int = 0
     # 用于 supervisor 启动失败时透传错误回 open() 调用方
     _open_error: BaseException | None = field(default=None, repr=False)
 
 
+@dataclass
+class McpServerSessions:
+    """一个 MCP server 的 session 组：``min_sessions`` ~ ``max_sessions`` 个独立子进程。"""
+
+    server_name: str
+    config: McpServerConfig
+    min_sessions: int
+    max_sessions: int
+    sessions: list[McpSessionEntry] = field(default_factory=list)
+    spawning: int = 0
+    reconnecting: bool = False
+    calls_total: int = 0
+    errors_total: int = 0
+    peak_in_flight: int = 0
+    scale_ups: int = 0
+    scale_downs: int = 0
+    recycled: int = 0
+    latencies_ms: deque[float] = field(
+        default_factory=lambda: deque(maxlen=_LATENCY_WINDOW)
+    )
+    # 扩容 / 空闲回收等后台 task，close 时统一取消
+    background: set[asyncio.Task[None]] = field(default_factory=set)
+    reaper: asyncio.Task[None] | None = None
+    # 已摘出 sessions、正在关闭的 session 的退役 task：close 时等其完成而非取消
+    # （中途取消会泄漏 supervisor 与 stdio 子进程）
+    retiring: set[asyncio.Task[Exception | None]] = field(default_factory=set)
+
+    @property
+    def in_flight(self) -> int:
+        return sum(entry.in_flight for entry in self.sessions)
+
+    def live_sessions(self) -> list[McpSessionEntry]:
+        return [
+            entry
+            for entry in self.sessions
+            if entry.status == "connected" and entry.session is not None
+        ]
+
+
+def _session_limits(config: McpServerConfig) -> tuple[int, int]:
+    """server 配置为 0 时取全局默认；max 不小于 min，min 至少 1。"""
+    min_sessions = max(config.min_sessions or MCP_SESSION_MIN, 1)
+    max_sessions = max(config.max_sessions or MCP_SESSION_MAX, min_sessions)
+    return min_sessions, max_sessions
+
+
+def _percentile(ordered: list[float], fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    index = min(int(round(fraction * (len(ordered) - 1))), len(ordered) - 1)
+    return round(ordered[index], 2)
+
+
 class McpSessionPool:
-    """管理 MCP server 的持久连接池。"""
+    """管理 MCP server 的持久连接池（每个 server 一组 session）。"""
 
-    def __init__(self) -> None:
-        self._entries: dict[str, McpSessionEntry] = {}
+    def __init__(self, *, idle_ttl_s: float = MCP_SESSION_IDLE_TTL_S) -> None:
+        self._servers: dict[str, McpServerSessions] = {}
         self._lock = asyncio.Lock()
+        # 按 server 串行化 open / close：``_lock`` 只保护 ``_servers``，不在
+        # spawn + initialize 期间持有，不同 server 的连接可并发建立
+        self._server_locks: dict[str, asyncio.Lock] = {}
+        self._idle_ttl_s = idle_ttl_s
 
     # ── 建立连接 ──────────────────────────────────────────────
 
     async def open(self, server_name: str, config: McpServerConfig) -> None:
         """建立到指定 MCP server 的持久连接。
 
-        如果 server_name 已有连接，先关闭旧连接再建立新连接。
+        如果 server_name 已有连接，先关闭旧连接（整组 session）再建立新连接。
         连接建立包括：启动 stdio 子进程、建立 ClientSession、执行
         ``session.initialize()``——三步**全部**在 supervisor task 内完成，
         以保证后续 ``close()`` 在任意 task 内都能安全 join/cancel supervisor，
-        让 stdio_client / ClientSession 的 ``__aexit__`` 与 ``__aenter__``
+        让 stdio_client / ClientSession 的 ``__aenter__`` 与 ``__aexit__``
         发生在同一个 task。
 
+        首个 session 同步建立（失败即抛错）；``min_sessions`` 余下的 session
+        在后台预热，不阻塞 open。
+
         Cancel 安全：``open()`` 调用方在等 supervisor ready 期间被取消时，
         本方法保证回收 supervisor（不让它继续持有 stdio 子进程），再 re-raise
         ``CancelledError``——避免泄漏。
         """
-        async with self._lock:
-            # 如果已存在，先关闭旧连接
-            if server_name in self._entries:
-                await self._close_entry_unlocked(server_name)
-
-            entry = McpSessionEntry(server_name=server_name, config=config)
-            params = StdioServerParameters(
-                command=config.command,
-                args=list(config.args),
-                env=dict(config.env) if config.env else None,
-                cwd=config.cwd or None,
+        async with self._server_lock(server_name):
+            async with self._lock:
+                stale = self._servers.pop(server_name, None)
+            if stale is not None:
+                await self._close_group(stale)
+            primary = await self._spawn_entry(server_name, config)
+            min_sessions, max_sessions = _session_limits(config)
+            group = McpServerSessions(
+                server_name=server_name,
+                config=config,
+                min_sessions=min_sessions,
+                max_sessions=max_sessions,
+                sessions=[primary],
             )
+            async with self._lock:
+                self._servers[server_name] = group
+            for _ in range(min_sessions - 1):
+                self._schedule_spawn(group)
+        log.info(
+            "mcp_session_opened",
+            server_name=server_name,
+            command=config.command,
+            pid=primary.pid,
+            min_sessions=min_sessions,
+            max_sessions=max_sessions,
+        )
+
+    def _server_lock(self, server_name: str) -> asyncio.Lock:
+        lock = self._server_locks.get(server_name)
+        if lock is None:
+            lock = self._server_locks[server_name] = asyncio.Lock()
+        return lock
+
+    async def _spawn_entry(
+        self, server_name: str, config: McpServerConfig
+    ) -> McpSessionEntry:
+        """拉起 supervisor 并等待 session 就绪；失败时回收 supervisor 后抛错。"""
+        entry = McpSessionEntry(server_name=server_name, config=config)
+        params = StdioServerParameters(
+            command=config.command,
+            args=list(config.args),
+            env=dict(config.env) if config.env else None,
+            cwd=config.cwd or None,
+        )
 
-            ready = asyncio.Event()
-            stop = asyncio.Event()
-            entry.stop_event = stop
+        ready = asyncio.Event()
+        stop = asyncio.Event()
+        entry.stop_event = stop
 
-            supervisor = asyncio.create_task(
-                self._supervise_session(entry, params, ready, stop),
-                name=f"mcp-session-supervisor:{server_name}",
-            )
-            entry.supervisor_task = supervisor
+        supervisor = asyncio.create_task(
+            self._supervise_session(entry, params, ready, stop),
+            name=f"mcp-session-supervisor:{server_name}",
+        )
+        entry.supervisor_task = supervisor
 
-            # 等 supervisor 拉起：要么 session 就绪，要么开连失败 / supervisor 崩。
-            # 用 shield 包 supervisor，避免 ``asyncio.wait`` 的取消传播误杀
-            # supervisor task；ready.wait() 仍可正常被 wait 取消（无副作用）。
-            ready_wait = asyncio.create_task(ready.wait())
-            try:
-                await asyncio.wait(
-                    {ready_wait, asyncio.shield(supervisor)},
-                    return_when=asyncio.FIRST_COMPLETED,
-                )
-            except asyncio.CancelledError:
-                # 调用方被取消：回收 supervisor 后 re-raise，避免泄漏 stdio 子进程
-                ready_wait.cancel()
-                await self._terminate_supervisor(server_name, supervisor, stop)
-                raise
+        # 等 supervisor 拉起：要么 session 就绪，要么开连失败 / supervisor 崩。
+        # 用 shield 包 supervisor，避免 ``asyncio.wait`` 的取消传播误杀
+        # supervisor task；ready.wait() 仍可正常被 wait 取消（无副作用）。
+        ready_wait = asyncio.create_task(ready.wait())
+        try:
+            await asyncio.wait(
+                {ready_wait, asyncio.shield(supervisor)},
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+        except asyncio.CancelledError:
+            # 调用方被取消：回收 supervisor 后 re-raise，避免泄漏 stdio 子进程
             ready_wait.cancel()
+            await self._terminate_supervisor(server_name, supervisor, stop)
+            raise
+        ready_wait.cancel()
 
-            if entry.session is None:
-                # supervisor 在 ready 之前已退出（崩了 / initialize 超时），
-                # 把它的异常透传给 open() 调用方。
-                err: BaseException | None = entry._open_error
-                if err is None and supervisor.done():
-                    try:
-                        supervisor.result()
-                    except (asyncio.CancelledError, Exception) as exc:
-                        err = exc
-                if err is None:
-                    err = RuntimeError(
-                        f"MCP server '{server_name}' supervisor 未就绪即退出"
-                    )
-                # 兜底：让 supervisor 干净收尾（成功路径下 supervisor 已 done，本步 no-op）
-                await self._terminate_supervisor(server_name, supervisor, stop)
-                log.warning(
-                    "mcp_session_open_failed",
-                    server_name=server_name,
-                    error=str(err),
+        if entry.session is None:
+            # supervisor 在 ready 之前已退出（崩了 / initialize 超时），
+            # 把它的异常透传给 open() 调用方。
+            err: BaseException | None = entry._open_error
+            if err is None and supervisor.done():
+                try:
+                    supervisor.result()
+                except (asyncio.CancelledError, Exception) as exc:
+                    err = exc
+            if err is None:
+                err = RuntimeError(
+                    f"MCP server '{server_name}' supervisor 未就绪即退出"
                 )
-                raise RuntimeError(
-                    f"无法建立到 {server_name} 的连接: {err}"
-                ) from err
-
-            entry.status = "connected"
-            entry.created_at = _utc_now()
-            entry.last_active_at = _utc_now()
-            entry.error = ""
-            self._entries[server_name] = entry
-            log.info(
-                "mcp_session_opened",
+            # 兜底：让 supervisor 干净收尾（成功路径下 supervisor 已 done，本步 no-op）
+            await self._terminate_supervisor(server_name, supervisor, stop)
+            log.warning(
+                "mcp_session_open_failed",
                 server_name=server_name,
-                command=config.command,
-                pid=entry.pid,
+                error=str(err),
             )
+            raise RuntimeError(
+                f"无法建立到 {server_name} 的连接: {err}"
+            ) from err
+
+        entry.status = "connected"
+        entry.created_at = _utc_now()
+        entry.last_active_at = _utc_now()
+        entry.error = ""
+        return entry
 
     async def _supervise_session(
         self,
@@ -413,50 +526,231 @@ class McpSessionPool:
             return exc
         return None
 
+    # ── 扩缩容 / 回收 ────────────────────────────────────────
+
+    def _spawn_background(self, group: McpServerSessions, coro: Any, name: str) -> None:
+        task = asyncio.create_task(coro, name=f"{name}:{group.server_name}")
+        group.background.add(task)
+        task.add_done_callback(group.background.discard)
+
+    def _schedule_retire(self, group: McpServerSessions, entry: McpSessionEntry) -> None:
+        """后台关闭已摘出 group.sessions 的 session。"""
+        task = asyncio.create_task(
+            self._terminate_entry(entry),
+            name=f"mcp-session-retire:{group.server_name}",
+        )
+        group.retiring.add(task)
+        task.add_done_callback(group.retiring.discard)
+
+    def _schedule_spawn(self, group: McpServerSessions) -> None:
+        """后台为 group 追加一个 session（扩容 / 补足 min_sessions）。"""
+        group.spawning += 1
+        self._spawn_background(group, self._add_session(group), "mcp-session-spawn")
+
+    async def _add_session(self, group: McpServerSessions) -> None:
+        try:
+            entry = await self._spawn_entry(group.server_name, group.config)
+        except Exception as exc:
+            log.warning(
+                "mcp_session_scale_up_failed",
+                server_name=group.server_name,
+                error=str(exc),
+            )
+            return
+        finally:
+            group.spawning -= 1
+        if self._servers.get(group.server_name) is not group:
+            # group 已被 close / 重新 open：新 session 直接回收
+            self._schedule_retire(group, entry)
+            return
+        group.sessions.append(entry)
+        group.scale_ups += 1
+        log.info(
+            "mcp_session_scaled_up",
+            server_name=group.server_name,
+            sessions=len(group.sessions),
+        )
+
+    def _maybe_scale_up(self, group: McpServerSessions, entry: McpSessionEntry) -> None:
+        # 被选中的已是最空闲 session：它仍有请求在途说明所有 session 都忙
+        if entry.in_flight <= _SCALE_UP_IN_FLIGHT:
+            return
+        if len(group.sessions) + group.spawning >= group.max_sessions:
+            return
+        self._schedule_spawn(group)
+
+    def _recycle(self, group: McpServerSessions, entry: McpSessionEntry, reason: str) -> None:
+        """下线不健康的 session；组内仅剩它时标记断开，由 get_session 走重连。"""
+        entry.error = reason
+        log.warning(
+            "mcp_session_recycled",
+            server_name=group.server_name,
+            pid=entry.pid,
+            reason=reason,
+        )
+        if entry not in group.sessions:
+            return
+        if len(group.sessions) == 1:
+            entry.status = "disconnected"
+            entry.session = None
+            return
+        group.sessions.remove(entry)
+        group.recycled += 1
+        self._schedule_retire(group, entry)
+        if len(group.sessions) + group.spawning < group.min_sessions:
+            self._schedule_spawn(group)
+
+    def _ensure_reaper(self, group: McpServerSessions) -> None:
+        if len(group.sessions) <= group.min_sessions:
+            return
+        if group.reaper is not None and not group.reaper.done():
+            return
+        group.reaper = asyncio.create_task(
+            self._reap_idle(group),
+            name=f"mcp-session-reaper:{group.server_name}",
+        )
+        group.background.add(group.reaper)
+        group.reaper.add_done_callback(group.background.discard)
+
+    async def _reap_idle(self, group: McpServerSessions) -> None:
+        """空闲缩容：超出 min_sessions 且空闲超过 idle_ttl 的 session 逐个退役。"""
+        while (
+            self._servers.get(group.server_name) is group
+            and len(group.sessions) > group.min_sessions
+        ):
+            await asyncio.sleep(self._idle_ttl_s / 2)
+            cutoff = _utc_now() - timedelta(seconds=self._idle_ttl_s)
+            # 从最新的 session 开始退役，保留最早建立的 min_sessions 个
+            for entry in reversed(list(group.sessions)):
+                if len(group.sessions) <= group.min_sessions:
+                    break
+                last_active = entry.last_active_at or entry.created_at
+                if entry.in_flight or (last_active is not None and last_active > cutoff):
+                    continue
+                group.sessions.remove(entry)
+                group.scale_downs += 1
+                log.info(
+                    "mcp_session_scaled_down",
+                    server_name=group.server_name,
+                    sessions=len(group.sessions),
+                )
+                self._schedule_retire(group, entry)
+
+    async def _terminate_entry(self, entry: McpSessionEntry) -> Exception | None:
+        supervisor = entry.supervisor_task
+        stop = entry.stop_event
+        close_error: Exception | None = None
+        if supervisor is not None and stop is not None:
+            close_error = await self._terminate_supervisor(
+                entry.server_name, supervisor, stop
+            )
+        entry.session = None
+        entry.supervisor_task = None
+        entry.stop_event = None
+        entry.status = "disconnected"
+        return close_error
+
     # ── 获取 session ─────────────────────────────────────────
 
     async def get_session(self, server_name: str) -> ClientSession:
-        """获取已建立的 ClientSession。
+        """获取最空闲的已建立 ClientSession（不计入 in-flight，用于发现等短请求）。
 
-        如果 session 已断开（含 supervisor 因 stdio process 异常退出），
+        组内 session 全部断开（含 supervisor 因 stdio process 异常退出）时，
         尝试自动重建连接。
         """
+        entry = await self._acquire_entry(server_name)
+        assert entry.session is not None
+        return entry.session
+
+    @asynccontextmanager
+    async def lease(self, server_name: str) -> AsyncIterator[ClientSession]:
+        """借出最空闲的 session 执行一次请求，计入 in-flight / 延迟 / 错误指标。
+
+        同一 session 上的并发请求按 JSON-RPC id 多路复用（pipelining）；所有
+        session 都忙且未达 ``max_sessions`` 时后台扩容。连续传输层失败的
+        session 被回收（服务端返回的 ``McpError`` 不算连接故障）。
+        """
+        entry = await self._acquire_entry(server_name)
+        group = self._servers.get(server_name)
+        entry.in_flight += 1
+        if group is not None:
+            group.peak_in_flight = max(group.peak_in_flight, group.in_flight)
+            self._maybe_scale_up(group, entry)
+        started = time.perf_counter()
+        try:
+            assert entry.session is not None
+            yield entry.session
+        except McpError:
+            if group is not None:
+                group.errors_total += 1
+            raise
+        except Exception as exc:
+            entry.consecutive_failures += 1
+            if group is not None:
+                group.errors_total += 1
+                if entry.consecutive_failures >= _RECYCLE_AFTER_FAILURES:
+                    self._recycle(
+                        group, entry, f"连续 {entry.consecutive_failures} 次调用失败: {exc}"
+                    )
+            raise
+        else:
+            entry.consecutive_failures = 0
+        finally:
+            entry.in_flight -= 1
+            entry.last_active_at = _utc_now()
+            if group is not None:
+                group.calls_total += 1
+                group.latencies_ms.append((time.perf_counter() - started) * 1000)
+                self._ensure_reaper(group)
+
+    async def _acquire_entry(self, server_name: str) -> McpSessionEntry:
+        server_lock = self._server_locks.get(server_name)
+        if server_lock is not None and server_lock.locked():
+            # 该 server 正在 open / close：等其完成再取 session，避免拿到半途状态
+            async with server_lock:
+                pass
         async with self._lock:
-            entry = self._entries.get(server_name)
-            if entry is None:
+            group = self._servers.get(server_name)
+            if group is None:
                 raise KeyError(f"MCP server '{server_name}' 不存在于连接池中")
 
-            if entry.status == "connected" and entry.session is not None:
-                # supervisor 已死意味着 stdio_client / ClientSession 上下文已退出，
-                # session 引用是 stale 的；call_tool 会在 closed stream 上立即报错
-                # 或永久阻塞（取决于 anyio 状态）。把它当作 disconnected 触发重连。
+            for entry in list(group.sessions):
                 if (
-                    entry.supervisor_task is not None
+                    entry.status == "connected"
+                    and entry.supervisor_task is not None
                     and entry.supervisor_task.done()
                 ):
-                    entry.session = None
-                    entry.status = "disconnected"
+                    # supervisor 已死意味着 stdio_client / ClientSession 上下文已退出，
+                    # session 引用是 stale 的；call_tool 会在 closed stream 上立即报错
+                    # 或永久阻塞（取决于 anyio 状态）。回收它，组内无可用 session 时重连。
                     err = entry._open_error
-                    entry.error = (
-                        f"supervisor 已退出: {err}" if err else "supervisor 已退出"
+                    self._recycle(
+                        group,
+                        entry,
+                        f"supervisor 已退出: {err}" if err else "supervisor 已退出",
                     )
                     log.warning(
                         "mcp_session_supervisor_dead",
                         server_name=server_name,
                         error=entry.error,
                     )
-                else:
-                    entry.last_active_at = _utc_now()
-                    return entry.session
 
-            if entry.status == "reconnecting":
+            live = group.live_sessions()
+            if live:
+                entry = min(live, key=lambda item: item.in_flight)
+                entry.last_active_at = _utc_now()
+                return entry
+
+            if group.reconnecting:
                 raise RuntimeError(f"MCP server '{server_name}' 连接正在重建中")
 
-            # status == "disconnected"，尝试重连
-            entry.status = "reconnecting"
+            # 组内 session 全部断开，尝试重连
+            group.reconnecting = True
+            for entry in group.sessions:
+                entry.status = "reconnecting"
 
         # 在 lock 之外执行重连（避免长时间持锁）
-        config = entry.config
+        config = group.config
         for attempt in range(1, _RECONNECT_MAX_ATTEMPTS + 1):
             try:
                 log.info(
@@ -467,15 +761,16 @@ class McpSessionPool:
                 # 调用 open 会重新获取 lock
                 await self.open(server_name, config)
                 async with self._lock:
-                    reconnected = self._entries.get(server_name)
-                    if reconnected and reconnected.session:
-                        reconnected.reconnect_count += 1
+                    reconnected = self._servers.get(server_name)
+                    live = reconnected.live_sessions() if reconnected else []
+                    if live:
+                        live[0].reconnect_count += 1
                         log.info(
                             "mcp_session_reconnected",
                             server_name=server_name,
-                            reconnect_count=reconnected.reconnect_count,
+                            reconnect_count=live[0].reconnect_count,
                         )
-                        return reconnected.session
+                        return live[0]
             except Exception as exc:
                 log.warning(
                     "mcp_session_reconnect_attempt_failed",
@@ -485,10 +780,14 @@ class McpSessionPool:
                 )
                 if attempt == _RECONNECT_MAX_ATTEMPTS:
                     async with self._lock:
-                        e = self._entries.get(server_name)
-                        if e:
-                            e.status = "disconnected"
-                            e.error = f"重连失败 ({_RECONNECT_MAX_ATTEMPTS} 次尝试): {exc}"
+                        current = self._servers.get(server_name)
+                        if current is not None:
+                            current.reconnecting = False
+                            for entry in current.sessions:
+                                entry.status = "disconnected"
+                                entry.error = (
+                                    f"重连失败 ({_RECONNECT_MAX_ATTEMPTS} 次尝试): {exc}"
+                                )
                     raise RuntimeError(
                         f"MCP server '{server_name}' 重连失败: {exc}"
                     ) from exc
@@ -499,40 +798,54 @@ class McpSessionPool:
     # ── 关闭连接 ─────────────────────────────────────────────
 
     async def close(self, server_name: str) -> None:
-        """关闭指定 server 的连接并清理资源。幂等操作。"""
-        async with self._lock:
-            await self._close_entry_unlocked(server_name)
+        """关闭指定 server 的全部连接并清理资源。幂等操作。"""
+        async with self._server_lock(server_name):
+            async with self._lock:
+                group = self._servers.pop(server_name, None)
+            if group is not None:
+                await self._close_group(group)
 
-    async def _close_entry_unlocked(self, server_name: str) -> None:
-        """在已持有 lock 的情况下关闭 entry。
+    async def _close_group(self, group: McpServerSessions) -> None:
+        """关闭已从 ``_servers`` 摘除的 session 组。
 
-        通过 ``stop_event.set()`` 通知 supervisor task 退出，再 ``await``
-        其完成；supervisor 内部 ``AsyncExitStack`` 的 ``__aexit__`` 在
-        supervisor 自己的 task 内执行，规避 anyio 的 cross-task cancel
-        scope 不变量违反。
+        先取消扩容 / 空闲回收等后台 task，等正在退役的 session 关闭完成（不取消，
+        否则已摘出 ``sessions`` 的 session 会泄漏子进程），再逐个通过 ``stop_event.set()`` 通知
+        supervisor task 退出并 ``await`` 其完成；supervisor 内部
+        ``AsyncExitStack`` 的 ``__aexit__`` 在 supervisor 自己的 task 内执行，
+        规避 anyio 的 cross-task cancel scope 不变量违反。
 
         F089 Codex review #2 闭环：``_terminate_supervisor`` 的硬 cancel
-        路径若拿到非 cancel 异常，``_close_entry_unlocked`` 在完成 entry
-        状态清理后 ``raise``，避免 stdio 子进程关闭失败被 silent 吞掉
-        而 close 调用方拿不到错误信号。
+        路径若拿到非 cancel 异常，在完成所有 session 状态清理后 ``raise``
+        （多个则 ``ExceptionGroup``），避免 stdio 子进程关闭失败被 silent
+        吞掉而 close 调用方拿不到错误信号。
         """
-        entry = self._entries.pop(server_name, None)
-        if entry is None:
+        for task in list(group.background):
+            task.cancel()
+        for task in list(group.background):
+            with suppress(asyncio.CancelledError, Exception):
+                await task
+        errors: list[Exception] = []
+        # 取消扩容 task 时新建的 session 也转入 retiring，此时已全部登记
+        if group.retiring:
+            results = await asyncio.gather(*group.retiring, return_exceptions=True)
+            errors.extend(result for result in results if isinstance(result, Exception))
+        for entry in list(group.sessions):
+            close_error = await self._terminate_entry(entry)
+            if close_error is not None:
+                errors.append(close_error)
+        log.info(
+            "mcp_session_closed",
+            server_name=group.server_name,
+            sessions=len(group.sessions),
+        )
+        if not errors:
             return
-        supervisor = entry.supervisor_task
-        stop = entry.stop_event
-        close_error: Exception | None = None
-        if supervisor is not None and stop is not None:
-            close_error = await self._terminate_supervisor(
-                server_name, supervisor, stop
-            )
-        entry.session = None
-        entry.supervisor_task = None
-        entry.stop_event = None
-        entry.status = "disconnected"
-        log.info("mcp_session_closed", server_name=server_name)
-        if close_error is not None:
-            raise close_error
+        if len(errors) == 1:
+            raise errors[0]
+        raise ExceptionGroup(
+            f"mcp_session_pool.close '{group.server_name}' 部分 session 关闭失败",
+            errors,
+        )
 
     async def close_all(self) -> None:
         """关闭所有连接。用于系统 shutdown。
@@ -544,7 +857,7 @@ class McpSessionPool:
         - 多错：``ExceptionGroup`` 包装
         """
         async with self._lock:
-            names = list(self._entries.keys())
+            names = list(self._servers.keys())
         errors: list[Exception] = []
         for name in names:
             try:
@@ -568,41 +881,52 @@ class McpSessionPool:
     # ── 健康检查 ─────────────────────────────────────────────
 
     async def health_check(self, server_name: str) -> bool:
-        """探测指定 server 的连接健康状态。
+        """探测指定 server 的连接健康状态，回收不健康的 session。
 
-        通过发送 tools/list RPC 判断 session 是否正常响应。超时 5 秒。
-        supervisor 已退出（stdio 子进程崩溃或自然退出）视同 unhealthy。
+        对组内每个 session 发送 tools/list RPC（并行，超时 5 秒）；supervisor
+        已退出（stdio 子进程崩溃或自然退出）视同 unhealthy。任一 session
+        健康即返回 True。
         """
         async with self._lock:
-            entry = self._entries.get(server_name)
-        if entry is None or entry.session is None or entry.status != "connected":
+            group = self._servers.get(server_name)
+        if group is None:
             return False
-        if entry.supervisor_task is not None and entry.supervisor_task.done():
+        entries = group.live_sessions()
+        if not entries:
             return False
+        results = await asyncio.gather(
+            *(self._probe(entry) for entry in entries),
+            return_exceptions=True,
+        )
+        healthy = False
+        async with self._lock:
+            for entry, result in zip(entries, results, strict=True):
+                if result is True:
+                    healthy = True
+                    continue
+                log.warning(
+                    "mcp_session_health_check_failed",
+                    server_name=server_name,
+                    error=str(result),
+                )
+                self._recycle(group, entry, f"健康检查失败: {result}")
+        return healthy
 
-        try:
-            await asyncio.wait_for(
-                entry.session.list_tools(cursor=None),
-                timeout=_HEALTH_CHECK_TIMEOUT_S,
-            )
-            return True
-        except Exception as exc:
-            log.warning(
-                "mcp_session_health_check_failed",
-                server_name=server_name,
-                error=str(exc),
-            )
-            async with self._lock:
-                e = self._entries.get(server_name)
-                if e:
-                    e.status = "disconnected"
-                    e.error = f"健康检查失败: {exc}"
-            return False
+    @staticmethod
+    async def _probe(entry: McpSessionEntry) -> bool:
+        if entry.supervisor_task is not None and entry.supervisor_task.done():
+            raise RuntimeError("supervisor 已退出")
+        assert entry.session is not None
+        await asyncio.wait_for(
+            entry.session.list_tools(cursor=None),
+            timeout=_HEALTH_CHECK_TIMEOUT_S,
+        )
+        return True
 
     async def health_check_all(self) -> dict[str, bool]:
         """批量健康检查所有已连接 server（并行执行避免串行超时累加）。"""
         async with self._lock:
-            names = list(self._entries.keys())
+            names = list(self._servers.keys())
         if not names:
             return {}
         checks = await asyncio.gather(
@@ -617,16 +941,19 @@ class McpSessionPool:
     # ── 只读查询 ─────────────────────────────────────────────
 
     def get_entry(self, server_name: str) -> McpSessionEntry | None:
-        """获取连接条目（只读快照）。"""
-        return self._entries.get(server_name)
+        """获取 server 的主连接条目（组内最早建立的 session，只读快照）。"""
+        group = self._servers.get(server_name)
+        if group is None or not group.sessions:
+            return None
+        return group.sessions[0]
 
     def get_pid(self, server_name: str) -> int | None:
-        """获取指定 server **当前 pool entry** 的子进程 pid。
+        """获取指定 server **当前主 session** 的子进程 pid。
 
         语义说明（Codex F1 medium-3 闭环）：
 
         - 返回 None：pool 不再 track 该 server（从未 open，或已被 close 段
-          ``self._entries.pop(...)`` 清理）。**不代表子进程已死**——子进程的
+          ``self._servers.pop(...)`` 清理）。**不代表子进程已死**——子进程的
           实际生死由 stdio shutdown 序列（``aclose`` → SIGTERM → SIGKILL）
           异步收尾，可能在 None 出现后 ~ 4s 内才实际退出。
         - 返回 int：pool 里仍有 entry 且子进程曾启动成功；可用于诊断 / 展示，
@@ -635,13 +962,36 @@ class McpSessionPool:
 
         外部需要"runtime alive"判断时应自己 ``os.kill(pid, 0)`` 探测。
         """
-        entry = self._entries.get(server_name)
+        entry = self.get_entry(server_name)
         return entry.pid if entry is not None else None
 
     def list_entries(self) -> list[McpSessionEntry]:
-        """列出所有连接条目。"""
-        return list(self._entries.values())
+        """列出所有连接条目（含每个 server 组内的全部 session）。"""
+        return [entry for group in self._servers.values() for entry in group.sessions]
 
     def known_server_names(self) -> set[str]:
         """返回当前 pool 中所有 server_name 的快照副本（mcp_registry 用于 diff）。"""
-        return set(self._entries.keys())
+        return set(self._servers.keys())
+
+    def metrics(self, server_name: str) -> dict[str, Any]:
+        """server 级 session / in-flight / 延迟指标（定位 MCP 工具瓶颈）。"""
+        group = self._servers.get(server_name)
+        if group is None:
+            return {}
+        latencies = sorted(group.latencies_ms)
+        return {
+            "sessions": len(group.sessions),
+            "connected": len(group.live_sessions()),
+            "min_sessions": group.min_sessions,
+            "max_sessions": group.max_sessions,
+            "in_flight": group.in_flight,
+            "peak_in_flight": group.peak_in_flight,
+            "calls_total": group.calls_total,
+            "errors_total": group.errors_total,
+            "latency_ms_p50": _percentile(latencies, 0.5),
+            "latency_ms_p95": _percentile(latencies, 0.95),
+            "latency_ms_max": round(latencies[-1], 2) if latencies else 0.0,
+            "scale_ups": group.scale_ups,
+            "scale_downs": group.scale_downs,
+            "recycled": group.recycled,
+        }
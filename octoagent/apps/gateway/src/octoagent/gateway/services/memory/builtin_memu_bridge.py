@@ -9,7 +9,6 @@
 from __future__ import annotations
 
 import asyncio
-import hashlib
 import importlib.util
 import os
 import time
@@ -49,6 +48,8 @@ from octoagent.memory import (
 from octoagent.gateway.services.config.config_wizard import load_config
 from octoagent.provider import ModelRequestsNotAllowedError
 
+from .embedding_cache import EmbeddingCache, shared_embedding_cache
+
 _log = structlog.get_logger()
 
 # ── Embedding 常量 ──────────────────────────────────────────────
@@ -131,6 +132,8 @@ class _ResolvedEmbeddingTarget:
     uses_proxy_alias: bool = False
     uses_lexical_only: bool = False
     proxy_alias: str = ""
+    # alias 当前绑定的 provider/model（embedding 缓存 key 的一部分）
+    embedding_profile: str = ""
     warning: str = ""
 
 
@@ -153,6 +156,7 @@ class BuiltinMemUBridge:
         lancedb_dir: Path,
         environ: dict[str, str] | None = None,
         provider_router: Any | None = None,
+        embedding_cache: EmbeddingCache | None = None,
     ) -> None:
         self._store = store
         self._sqlite_backend = SqliteMemoryBackend(store)
@@ -161,7 +165,11 @@ class BuiltinMemUBridge:
         self._lancedb_dir = lancedb_dir
         self._environ = environ or dict(os.environ)
         self._embedding_runtime = _BuiltinEmbeddingRuntimeState()
-        self._proxy_embedding_cache: dict[tuple[str, str], list[float]] = {}
+        # query / sync / reindex 共用的 embedding 缓存（内存 LRU + 落盘，跨重启复用；
+        # 同一数据目录下的 bridge 共享实例，shutdown 时统一关闭）
+        self._embedding_cache = embedding_cache or shared_embedding_cache(
+            lancedb_dir.parent / "embedding_cache.db"
+        )
         # Feature 080 Phase 4：embedding 走 ProviderRouter 直连，不再依赖 LiteLLM Proxy
         # 旧调用方（不传 router 的）保留 LiteLLM Proxy 兼容路径作 fallback
         self._provider_router = provider_router
@@ -217,6 +225,7 @@ class BuiltinMemUBridge:
                     "embedding_runtime_status": runtime_state.status,
                     "embedding_runtime_summary": runtime_state.summary,
                     "fallback_reason": runtime_state.fallback_reason,
+                    "embedding_cache": self._embedding_cache.snapshot(),
                 },
             }
         )
@@ -697,7 +706,10 @@ class BuiltinMemUBridge:
         if resolved_target.uses_proxy_alias:
             try:
                 vecs = await self._embed_texts_with_proxy_alias(
-                    [query], target_alias=resolved_target.proxy_alias, is_query=True,
+                    [query],
+                    target_alias=resolved_target.proxy_alias,
+                    is_query=True,
+                    embedding_profile=resolved_target.embedding_profile,
                 )
                 return vecs[0] if vecs else None
             except ModelRequestsNotAllowedError:
@@ -712,11 +724,12 @@ class BuiltinMemUBridge:
             if encoder is None:
                 return None
             try:
-                prefixed = _QWEN_QUERY_PREFIX + query
-                vectors = await asyncio.to_thread(
-                    encoder.encode, [prefixed], normalize_embeddings=True,
+                vectors = await self._embedding_cache.get_or_embed(
+                    _QWEN_MODEL_ID,
+                    [_QWEN_QUERY_PREFIX + query],
+                    lambda pending: self._encode_with_qwen(encoder, pending),
                 )
-                return [float(v) for v in vectors[0]]
+                return vectors[0] if vectors else None
             except Exception as exc:
                 _log.warning("qwen_embed_query_error", error=str(exc)[:200])
                 return None
@@ -738,20 +751,31 @@ class BuiltinMemUBridge:
             encoder = runtime.encoder
             assert encoder is not None
             try:
-                vectors = await asyncio.to_thread(
-                    encoder.encode, list(texts), normalize_embeddings=True,
+                vectors = await self._embedding_cache.get_or_embed(
+                    _QWEN_MODEL_ID,
+                    texts,
+                    lambda pending: self._encode_with_qwen(encoder, pending),
                 )
-                result = [[float(v) for v in vec] for vec in vectors]
-                if result:
-                    dim = len(result[0])
-                    runtime.embed_dim = dim
-                return result
+                if vectors is not None:
+                    present = next((vec for vec in vectors if vec), None)
+                    if present is not None:
+                        dim = len(present)
+                        runtime.embed_dim = dim
+                    # 缺失条目逐条补零向量，不连累同批已拿到的真向量
+                    return [vec or [0.0] * dim for vec in vectors]
             except Exception as exc:
                 _log.warning("qwen_embed_batch_error", error=str(exc)[:200])
 
         # Qwen3 不可用 → 零向量（LanceDB 需要向量列，FTS 不依赖向量）
         return [[0.0] * dim for _ in texts]
 
+    @staticmethod
+    async def _encode_with_qwen(encoder: Any, texts: list[str]) -> list[list[float]]:
+        vectors = await asyncio.to_thread(
+            encoder.encode, texts, normalize_embeddings=True,
+        )
+        return [[float(v) for v in vec] for vec in vectors]
+
     def _current_embed_model_label(self) -> str:
         runtime = self._embedding_runtime
         if runtime.uses_qwen:
@@ -952,8 +976,8 @@ class BuiltinMemUBridge:
                 mode=runtime_state.active_mode,
                 warning=runtime_state.fallback_reason,
             )
-        proxy_check = self._resolve_proxy_alias_target(normalized)
-        if proxy_check is not None:
+        proxy_profile = self._resolve_proxy_alias_target(normalized)
+        if proxy_profile is not None:
             return _ResolvedEmbeddingTarget(
                 requested_target=normalized,
                 effective_target=normalized,
@@ -961,6 +985,7 @@ class BuiltinMemUBridge:
                 mode="proxy-alias-embedding",
                 uses_proxy_alias=True,
                 proxy_alias=normalized,
+                embedding_profile=proxy_profile,
             )
         fallback = self._resolve_embedding_target("engine-default")
         fallback.requested_target = normalized
@@ -975,6 +1000,9 @@ class BuiltinMemUBridge:
         只要 alias 在 config 里且 provider enabled，就视为可用——embedding 调用
         实际走 ``self._provider_router`` 直连（如果传入），或回退到 LiteLLM Proxy
         兼容路径（旧用户）。
+
+        可用时返回 ``alias@provider/model`` 作为 embedding profile（缓存 key），
+        alias 改绑模型后不会复用旧模型的向量。
         """
         config = load_config(self._project_root)
         if config is None:
@@ -985,7 +1013,7 @@ class BuiltinMemUBridge:
         provider = config.get_provider(alias.provider)
         if provider is None or not provider.enabled:
             return None
-        return target_alias
+        return f"{target_alias}@{alias.provider}/{alias.model}"
 
     async def _embed_texts_with_proxy_alias(
         self,
@@ -993,6 +1021,7 @@ class BuiltinMemUBridge:
         *,
         target_alias: str,
         is_query: bool,
+        embedding_profile: str = "",
     ) -> list[list[float]]:
         """获取文本 embedding 向量。
 
@@ -1008,31 +1037,13 @@ class BuiltinMemUBridge:
         request_texts = (
             [_QWEN_QUERY_PREFIX + item for item in texts] if is_query else list(texts)
         )
-        vectors: list[list[float] | None] = [None] * len(request_texts)
-        uncached_texts: list[str] = []
-        uncached_indexes: list[int] = []
-        for index, item in enumerate(request_texts):
-            cache_key = (target_alias, hashlib.sha1(item.encode("utf-8")).hexdigest())
-            cached = self._proxy_embedding_cache.get(cache_key)
-            if cached is not None:
-                vectors[index] = cached
-                continue
-            uncached_indexes.append(index)
-            uncached_texts.append(item)
-
-        if uncached_texts:
-            generated_vectors = await self._fetch_embeddings(
-                target_alias=target_alias, texts=uncached_texts,
-            )
-            if generated_vectors is None:
-                return [[0.0] * _LANCEDB_DEFAULT_DIM for _ in texts]
-            for index, vector in zip(uncached_indexes, generated_vectors, strict=False):
-                cache_key = (
-                    target_alias,
-                    hashlib.sha1(request_texts[index].encode("utf-8")).hexdigest(),
-                )
-                self._proxy_embedding_cache[cache_key] = vector
-                vectors[index] = vector
+        vectors = await self._embedding_cache.get_or_embed(
+            embedding_profile or target_alias,
+            request_texts,
+            lambda pending: self._fetch_embeddings(target_alias=target_alias, texts=pending),
+        )
+        if vectors is None:
+            return [[0.0] * _LANCEDB_DEFAULT_DIM for _ in texts]
         zero = [0.0] * _LANCEDB_DEFAULT_DIM
         return [v or zero for v in vectors]
 
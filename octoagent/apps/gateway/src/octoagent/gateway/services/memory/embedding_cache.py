@@ -0,0 +1,360 @@
+"""Embedding 持久缓存：内存 LRU + SQLite 落盘，按 (embedding profile, 文本哈希) 寻址。
+
+BuiltinMemUBridge 的 query embedding、sync_* / _upsert_to_lancedb 与 _reindex_from_sqlite
+共用同一实例：重启或 profile 回滚后只对真正新增的文本调用 embedding。
+
+- 内存层：OrderedDict LRU，按向量字节数（float32）计预算，超出时淘汰最久未用
+- 落盘层：SQLite（WAL，多进程共享同一文件），向量以 float32 BLOB 存储；总字节数超出
+  预算时按 last_used_at 淘汰到预算的 90%。内存层命中不回写 last_used_at（只在落盘
+  命中时批量刷新），落盘 LRU 为近似顺序
+- 批量：get_or_embed 先查内存、再一次 IN 查询落盘，剩余未命中去重后一次调用 embed
+- 落盘层任何异常只记日志并退化为纯内存缓存，不影响 embedding 主流程
+- profile 由调用方给出（模型 ID / alias 绑定的 provider+model），模型切换自然换 key，
+  旧向量保留到被 LRU 淘汰，回滚时可直接复用
+- 进程内按路径共享实例（shared_embedding_cache）：各 resolver 创建的 bridge 复用同一
+  LRU 与落盘连接，gateway shutdown 时由 close_shared_embedding_caches 统一关闭
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import sqlite3
+import time
+from array import array
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import structlog
+from octoagent.core.config import (
+    MEMORY_EMBEDDING_CACHE_DISK_BYTES,
+    MEMORY_EMBEDDING_CACHE_MEMORY_BYTES,
+)
+
+_log = structlog.get_logger()
+
+#: IN 查询单批参数数（低于 SQLite 默认变量上限）
+_LOOKUP_CHUNK = 500
+
+_DDL = """
+CREATE TABLE IF NOT EXISTS embedding_cache (
+    profile      TEXT NOT NULL,
+    text_hash    TEXT NOT NULL,
+    dim          INTEGER NOT NULL,
+    vector       BLOB NOT NULL,
+    last_used_at REAL NOT NULL,
+    PRIMARY KEY (profile, text_hash)
+) WITHOUT ROWID
+"""
+_INDEX_DDL = (
+    "CREATE INDEX IF NOT EXISTS idx_embedding_cache_last_used "
+    "ON embedding_cache(last_used_at)"
+)
+
+EmbedFn = Callable[[list[str]], Awaitable[list[list[float]] | None]]
+
+_SHARED_CACHES: dict[Path, EmbeddingCache] = {}
+
+
+@dataclass(slots=True)
+class EmbeddingCacheStats:
+    """缓存运行指标（进程内累计）"""
+
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    embed_calls: int = 0
+    embedded_texts: int = 0
+    memory_evictions: int = 0
+    disk_evictions: int = 0
+    disk_errors: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.memory_hits + self.disk_hits + self.misses
+        if total == 0:
+            return 0.0
+        return (self.memory_hits + self.disk_hits) / total
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """有界 embedding 缓存（path=None 时只有内存层）"""
+
+    def __init__(
+        self,
+        path: Path | None = None,
+        *,
+        memory_budget_bytes: int = MEMORY_EMBEDDING_CACHE_MEMORY_BYTES,
+        disk_budget_bytes: int = MEMORY_EMBEDDING_CACHE_DISK_BYTES,
+    ) -> None:
+        self._path = path
+        self._memory_budget = max(memory_budget_bytes, 0)
+        self._disk_budget = max(disk_budget_bytes, 0)
+        self._memory: OrderedDict[tuple[str, str], array] = OrderedDict()
+        self._memory_bytes = 0
+        self._conn: sqlite3.Connection | None = None
+        self._disk_bytes = 0
+        self._disk_disabled = path is None or self._disk_budget == 0
+        self._disk_lock = asyncio.Lock()
+        self.stats = EmbeddingCacheStats()
+
+    @property
+    def memory_bytes(self) -> int:
+        return self._memory_bytes
+
+    def snapshot(self) -> dict[str, float | int | bool]:
+        """指标快照（供 get_status index_health 展示）"""
+        return {
+            **asdict(self.stats),
+            "hit_rate": round(self.stats.hit_rate, 4),
+            "memory_entries": len(self._memory),
+            "memory_bytes": self._memory_bytes,
+            "disk_bytes": self._disk_bytes,
+            "disk_enabled": not self._disk_disabled,
+        }
+
+    async def get_or_embed(
+        self,
+        profile: str,
+        texts: Sequence[str],
+        embed: EmbedFn,
+    ) -> list[list[float] | None] | None:
+        """批量取向量：命中走缓存，未命中的文本去重后一次交给 embed
+
+        embed 返回 None（调用失败）时整体返回 None；embed 返回条数不足时只有缺失
+        位置为 None（已拿到的向量照常缓存），由调用方决定降级方式。
+        """
+        if not texts:
+            return []
+        hashes = [text_hash(text) for text in texts]
+        found = await self.get_many(profile, hashes)
+
+        missing: dict[str, str] = {}
+        for digest, text, vector in zip(hashes, texts, found, strict=True):
+            if vector is None:
+                missing.setdefault(digest, text)
+        if missing:
+            self.stats.embed_calls += 1
+            self.stats.embedded_texts += len(missing)
+            generated = await embed(list(missing.values()))
+            if generated is None:
+                return None
+            fresh = dict(zip(missing, generated, strict=False))
+            await self.put_many(profile, fresh)
+            found = [
+                vector if vector is not None else fresh.get(digest)
+                for digest, vector in zip(hashes, found, strict=True)
+            ]
+        return found
+
+    async def get_many(
+        self, profile: str, hashes: Sequence[str]
+    ) -> list[list[float] | None]:
+        """按文本哈希批量查找（内存层 -> 落盘层），未命中位置为 None"""
+        result: list[list[float] | None] = [None] * len(hashes)
+        disk_lookup: dict[str, list[int]] = {}
+        for index, digest in enumerate(hashes):
+            key = (profile, digest)
+            packed = self._memory.get(key)
+            if packed is not None:
+                self._memory.move_to_end(key)
+                self.stats.memory_hits += 1
+                result[index] = packed.tolist()
+            else:
+                disk_lookup.setdefault(digest, []).append(index)
+
+        if disk_lookup:
+            rows = await self._disk_get(profile, list(disk_lookup))
+            for digest, packed in rows.items():
+                self._remember((profile, digest), packed)
+                vector = packed.tolist()
+                for index in disk_lookup.pop(digest):
+                    result[index] = vector
+                    self.stats.disk_hits += 1
+            self.stats.misses += sum(len(indexes) for indexes in disk_lookup.values())
+        return result
+
+    async def put_many(self, profile: str, vectors: dict[str, Sequence[float]]) -> None:
+        """写入 {文本哈希: 向量}（内存层 + 落盘层）"""
+        packed_rows: list[tuple[str, array]] = []
+        for digest, vector in vectors.items():
+            if not vector:
+                continue
+            packed = array("f", vector)
+            self._remember((profile, digest), packed)
+            packed_rows.append((digest, packed))
+        if packed_rows:
+            await self._disk_put(profile, packed_rows)
+
+    async def close(self) -> None:
+        async with self._disk_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # ── 内存层 ────────────────────────────────────────────────
+
+    def _remember(self, key: tuple[str, str], packed: array) -> None:
+        if self._memory_budget == 0:
+            return
+        size = _nbytes(packed)
+        if size > self._memory_budget:
+            return
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= _nbytes(previous)
+        self._memory[key] = packed
+        self._memory_bytes += size
+        while self._memory_bytes > self._memory_budget:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= _nbytes(evicted)
+            self.stats.memory_evictions += 1
+
+    # ── 落盘层 ────────────────────────────────────────────────
+    # 标准库 sqlite3 + asyncio.to_thread（连接随 bridge 常驻，不占用 aiosqlite 的
+    # 非 daemon worker 线程）；_disk_lock 串行化同一连接上的访问
+
+    async def _disk_get(self, profile: str, hashes: list[str]) -> dict[str, array]:
+        if self._disk_disabled:
+            return {}
+        async with self._disk_lock:
+            try:
+                return await asyncio.to_thread(self._disk_get_sync, profile, hashes)
+            except Exception as exc:
+                self._disable_disk("read", exc)
+                return {}
+
+    async def _disk_put(self, profile: str, rows: list[tuple[str, array]]) -> None:
+        if self._disk_disabled:
+            return
+        async with self._disk_lock:
+            try:
+                await asyncio.to_thread(self._disk_put_sync, profile, rows)
+            except Exception as exc:
+                self._disable_disk("write", exc)
+
+    def _connect_sync(self) -> sqlite3.Connection:
+        if self._conn is None:
+            assert self._path is not None
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self._path), check_same_thread=False, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(_DDL)
+            conn.execute(_INDEX_DDL)
+            conn.commit()
+            self._disk_bytes = int(
+                conn.execute(
+                    "SELECT COALESCE(SUM(LENGTH(vector)), 0) FROM embedding_cache"
+                ).fetchone()[0]
+            )
+            self._conn = conn
+        return self._conn
+
+    def _disk_get_sync(self, profile: str, hashes: list[str]) -> dict[str, array]:
+        conn = self._connect_sync()
+        found: dict[str, array] = {}
+        for start in range(0, len(hashes), _LOOKUP_CHUNK):
+            chunk = hashes[start : start + _LOOKUP_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            rows = conn.execute(
+                "SELECT text_hash, vector FROM embedding_cache "
+                f"WHERE profile = ? AND text_hash IN ({placeholders})",
+                (profile, *chunk),
+            ).fetchall()
+            for digest, blob in rows:
+                packed = array("f")
+                packed.frombytes(blob)
+                found[str(digest)] = packed
+        if found:
+            now = time.time()
+            with conn:
+                conn.executemany(
+                    "UPDATE embedding_cache SET last_used_at = ? "
+                    "WHERE profile = ? AND text_hash = ?",
+                    [(now, profile, digest) for digest in found],
+                )
+        return found
+
+    def _disk_put_sync(self, profile: str, rows: list[tuple[str, array]]) -> None:
+        conn = self._connect_sync()
+        now = time.time()
+        with conn:
+            conn.executemany(
+                """
+                INSERT INTO embedding_cache (profile, text_hash, dim, vector, last_used_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(profile, text_hash) DO UPDATE SET
+                    dim = excluded.dim,
+                    vector = excluded.vector,
+                    last_used_at = excluded.last_used_at
+                """,
+                [
+                    (profile, digest, len(packed), packed.tobytes(), now)
+                    for digest, packed in rows
+                ],
+            )
+        self._disk_bytes += sum(_nbytes(packed) for _, packed in rows)
+        if self._disk_bytes > self._disk_budget:
+            self._prune_sync(conn)
+
+    def _prune_sync(self, conn: sqlite3.Connection) -> None:
+        """按 last_used_at 淘汰到预算的 90%（字节数以库内实际值为准，兼容多进程写入）"""
+        count, total = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(vector)), 0) FROM embedding_cache"
+        ).fetchone()
+        target = int(self._disk_budget * 0.9)
+        if total > target and count:
+            average = max(total // count, 1)
+            excess_rows = -(-(total - target) // average)
+            with conn:
+                conn.execute(
+                    """
+                    DELETE FROM embedding_cache WHERE (profile, text_hash) IN (
+                        SELECT profile, text_hash FROM embedding_cache
+                        ORDER BY last_used_at ASC LIMIT ?
+                    )
+                    """,
+                    (excess_rows,),
+                )
+            self.stats.disk_evictions += excess_rows
+            total = conn.execute(
+                "SELECT COALESCE(SUM(LENGTH(vector)), 0) FROM embedding_cache"
+            ).fetchone()[0]
+        self._disk_bytes = int(total)
+
+    def _disable_disk(self, stage: str, exc: Exception) -> None:
+        self.stats.disk_errors += 1
+        self._disk_disabled = True
+        _log.warning(
+            "memory_embedding_cache_disk_disabled",
+            stage=stage,
+            path=str(self._path),
+            error=str(exc)[:200],
+        )
+
+
+def shared_embedding_cache(path: Path) -> EmbeddingCache:
+    """进程内按落盘路径共享的缓存实例"""
+    key = path.resolve()
+    cache = _SHARED_CACHES.get(key)
+    if cache is None:
+        cache = _SHARED_CACHES[key] = EmbeddingCache(key)
+    return cache
+
+
+async def close_shared_embedding_caches() -> None:
+    """关闭全部共享实例的落盘连接（gateway shutdown 调用）"""
+    caches = list(_SHARED_CACHES.values())
+    _SHARED_CACHES.clear()
+    for cache in caches:
+        await cache.close()
+
+
+def _nbytes(packed: array) -> int:
+    return len(packed) * packed.itemsize
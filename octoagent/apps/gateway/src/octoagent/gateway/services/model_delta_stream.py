@@ -0,0 +1,146 @@
+"""ModelDeltaStreamer -- 模型输出增量 → 合并后的瞬态 SSE 帧
+
+SkillRunner 在每次模型调用期间把 provider 增量转发到这里（实现
+ModelDeltaSinkProtocol）。逐 token 推帧会把 SSE / 浏览器渲染打满，因此按 task
+缓冲，满足任一条件才推出一帧：
+
+- 距本批首个增量超过 flush_interval_ms
+- 缓冲字符数达到 flush_max_chars
+- 本次模型调用结束（flush）或 step 切换
+
+帧经 SSEHub.publish_transient 只推给当前在线且订阅了瞬态帧的连接：不进回放
+缓冲、不写事件库，最终内容仍只由 MODEL_CALL_COMPLETED 等持久事件承载。没有
+在线订阅者时增量直接丢弃（零缓冲开销）。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+from dataclasses import dataclass, field
+from typing import Any
+
+from octoagent.core.config import MODEL_DELTA_FLUSH_INTERVAL_MS, MODEL_DELTA_FLUSH_MAX_CHARS
+from octoagent.provider.streaming import StreamDelta
+
+from .sse_hub import SSEHub, TransientFrame
+
+MODEL_DELTA_EVENT = "MODEL_DELTA"
+
+
+@dataclass
+class _PendingDeltas:
+    """单个 task 尚未推出的增量"""
+
+    step: int
+    text: list[str] = field(default_factory=list)
+    tool_calls: dict[str, dict[str, str]] = field(default_factory=dict)
+    chars: int = 0
+    deltas: int = 0
+    timer: asyncio.TimerHandle | None = None
+
+    def add(self, delta: StreamDelta) -> None:
+        self.deltas += 1
+        self.chars += len(delta.text)
+        if delta.kind == "text":
+            self.text.append(delta.text)
+            return
+        entry = self.tool_calls.setdefault(
+            delta.tool_call_id, {"id": delta.tool_call_id, "name": "", "arguments": ""}
+        )
+        if delta.tool_name:
+            entry["name"] = delta.tool_name
+        entry["arguments"] += delta.text
+
+
+@dataclass
+class ModelDeltaStats:
+    deltas: int = 0
+    frames: int = 0
+    dropped_no_subscriber: int = 0
+
+
+class ModelDeltaStreamer:
+    """按 task 合并模型输出增量并以 MODEL_DELTA 瞬态帧推送"""
+
+    def __init__(
+        self,
+        sse_hub: SSEHub,
+        *,
+        flush_interval_ms: int = MODEL_DELTA_FLUSH_INTERVAL_MS,
+        flush_max_chars: int = MODEL_DELTA_FLUSH_MAX_CHARS,
+    ) -> None:
+        self._sse_hub = sse_hub
+        self._flush_interval_s = max(flush_interval_ms, 0) / 1000
+        self._flush_max_chars = max(flush_max_chars, 1)
+        self._pending: dict[str, _PendingDeltas] = {}
+        self._seq = itertools.count(1)
+        self.stats = ModelDeltaStats()
+
+    def publish(self, task_id: str, step: int, delta: StreamDelta) -> None:
+        self.stats.deltas += 1
+        if delta.kind == "reset":
+            # provider 瞬态重试：丢弃未推出的缓冲，通知前端清空本步已收内容
+            self._discard(task_id)
+            self._send(task_id, {"step": step, "reset": True})
+            return
+        if not self._sse_hub.has_transient_subscribers(task_id):
+            self.stats.dropped_no_subscriber += 1
+            self._discard(task_id)
+            return
+        pending = self._pending.get(task_id)
+        if pending is not None and pending.step != step:
+            self.flush(task_id)
+            pending = None
+        if pending is None:
+            pending = _PendingDeltas(step=step)
+            self._pending[task_id] = pending
+        pending.add(delta)
+        if pending.chars >= self._flush_max_chars or self._flush_interval_s == 0:
+            self.flush(task_id)
+        elif pending.timer is None:
+            pending.timer = asyncio.get_running_loop().call_later(
+                self._flush_interval_s, self.flush, task_id
+            )
+
+    def flush(self, task_id: str) -> None:
+        pending = self._pending.pop(task_id, None)
+        if pending is None:
+            return
+        if pending.timer is not None:
+            pending.timer.cancel()
+        if not pending.text and not pending.tool_calls:
+            return
+        self._send(
+            task_id,
+            {
+                "step": pending.step,
+                "text": "".join(pending.text),
+                "tool_calls": list(pending.tool_calls.values()),
+                "deltas": pending.deltas,
+            },
+        )
+
+    def _discard(self, task_id: str) -> None:
+        pending = self._pending.pop(task_id, None)
+        if pending is not None and pending.timer is not None:
+            pending.timer.cancel()
+
+    def _send(self, task_id: str, body: dict[str, Any]) -> None:
+        data = {
+            "task_id": task_id,
+            "type": MODEL_DELTA_EVENT,
+            "seq": next(self._seq),
+            "transient": True,
+            "text": "",
+            "tool_calls": [],
+            "reset": False,
+            **body,
+        }
+        frame = TransientFrame(
+            event_type=MODEL_DELTA_EVENT,
+            data=json.dumps(data, ensure_ascii=False),
+        )
+        self._sse_hub.publish_transient(task_id, frame)
+        self.stats.frames += 1
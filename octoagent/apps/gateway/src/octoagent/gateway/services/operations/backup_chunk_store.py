@@ -0,0 +1,302 @@
+"""Feature 022 增量 backup：内容寻址 chunk store + manifest 链。
+
+目录布局（默认 ``data/backups/incremental/``）：
+
+- ``chunks/<sha[:2]>/<sha>``：文件按固定大小切块，zlib 压缩后以**原始内容** sha256
+  命名；内容相同的块（跨文件、跨快照）只存一份；
+- ``manifests/<bundle_id>.json``：每次增量 backup 一个 manifest，``files`` 只含相对
+  父 manifest 新增 / 变化的条目，``removed_paths`` 为删除的条目；沿
+  ``parent_bundle_id`` 折叠即可还原链上任意时间点；
+- ``index.db``：stat 缓存（路径 → size / mtime_ns / sha256 / chunk 列表）与链头
+  bundle id。size 与 mtime_ns 都未变的文件不重读、不重算哈希。
+
+读取与哈希在调用线程顺序进行，新 chunk 的压缩与落盘交给线程池（zlib 压缩释放
+GIL）；在途任务数有上限，内存占用与数据总量无关。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import time
+import zlib
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import closing
+from dataclasses import dataclass
+from pathlib import Path
+
+from octoagent.core.config import BACKUP_CHUNK_BYTES, BACKUP_COMPRESS_WORKERS
+from octoagent.core.models import BackupFileEntry, BackupManifest, BackupScope
+
+# mtime 距当前不足该值的文件不写 stat 缓存：同一 mtime 精度窗口内再次写入且大小
+# 不变时，缓存会误判为未变化（git 的 racy-clean 问题）
+_RACY_WINDOW_NS = 2_000_000_000
+
+
+class BackupChainError(ValueError):
+    """manifest 链断裂（父 manifest 缺失 / 损坏）或成环。"""
+
+
+@dataclass(frozen=True, slots=True)
+class ChunkSource:
+    """待写入 chunk store 的单个文件。"""
+
+    scope: BackupScope
+    relative_path: str
+    path: Path
+    required: bool = True
+    # 是否查询 / 写入 stat 缓存（每次重新生成的临时 SQLite 快照应为 False）
+    cacheable: bool = True
+
+
+@dataclass(slots=True)
+class IngestStats:
+    files: int = 0
+    cached_files: int = 0
+    bytes_read: int = 0
+    new_chunks: int = 0
+    reused_chunks: int = 0
+    stored_bytes: int = 0
+
+
+class BackupChunkStore:
+    """增量 backup 的 chunk / manifest / stat 缓存存储。"""
+
+    def __init__(
+        self,
+        root: Path,
+        *,
+        chunk_bytes: int = BACKUP_CHUNK_BYTES,
+        workers: int = BACKUP_COMPRESS_WORKERS,
+    ) -> None:
+        self._root = root
+        self._chunks_dir = root / "chunks"
+        self._manifests_dir = root / "manifests"
+        self._index_path = root / "index.db"
+        self._chunk_bytes = max(chunk_bytes, 1)
+        self._workers = max(workers, 1)
+
+    @classmethod
+    def for_manifest(cls, manifest_path: Path) -> BackupChunkStore:
+        """由 ``manifests/<bundle_id>.json`` 路径定位所属 store。"""
+        return cls(manifest_path.parent.parent)
+
+    @property
+    def root(self) -> Path:
+        return self._root
+
+    @property
+    def lock_path(self) -> Path:
+        return self._root / ".lock"
+
+    def manifest_path(self, bundle_id: str) -> Path:
+        return self._manifests_dir / f"{bundle_id}.json"
+
+    def chunk_path(self, chunk_sha: str) -> Path:
+        return self._chunks_dir / chunk_sha[:2] / chunk_sha
+
+    def has_chunk(self, chunk_sha: str) -> bool:
+        return self.chunk_path(chunk_sha).is_file()
+
+    def read_chunk(self, chunk_sha: str) -> bytes:
+        """读取并解压 chunk；缺失抛 FileNotFoundError，损坏抛 zlib.error。"""
+        return zlib.decompress(self.chunk_path(chunk_sha).read_bytes())
+
+    def iter_file(self, entry: BackupFileEntry) -> Iterator[bytes]:
+        """按序产出条目对应的原始文件内容。"""
+        for chunk_sha in entry.chunks:
+            yield self.read_chunk(chunk_sha)
+
+    def ingest(self, sources: Iterable[ChunkSource]) -> tuple[list[BackupFileEntry], IngestStats]:
+        """把文件写入 chunk store，返回带 chunk 列表的条目（顺序与 sources 一致）。
+
+        stat 缓存只在全部新 chunk 落盘后提交：中途失败不会留下指向缺失 chunk 的缓存。
+        """
+        stats = IngestStats()
+        entries: list[BackupFileEntry] = []
+        self._root.mkdir(parents=True, exist_ok=True)
+        pending: deque[Future[int]] = deque()
+        scheduled: set[str] = set()
+        now_ns = time.time_ns()
+
+        with (
+            closing(self._connect()) as conn,
+            ThreadPoolExecutor(
+                max_workers=self._workers, thread_name_prefix="octo-backup-chunk"
+            ) as pool,
+        ):
+            for source in sources:
+                stats.files += 1
+                stat = source.path.stat()
+                cached = self._lookup_cache(conn, source, stat) if source.cacheable else None
+                if cached is not None:
+                    sha256, chunks = cached
+                    size_bytes = stat.st_size
+                    stats.cached_files += 1
+                    stats.reused_chunks += len(chunks)
+                else:
+                    sha256, size_bytes, chunks = self._chunk_file(
+                        source.path, pool, pending, scheduled, stats
+                    )
+                    if source.cacheable and now_ns - stat.st_mtime_ns >= _RACY_WINDOW_NS:
+                        conn.execute(
+                            "INSERT OR REPLACE INTO file_stat_cache "
+                            "(path, size_bytes, mtime_ns, sha256, chunks) VALUES (?, ?, ?, ?, ?)",
+                            (
+                                str(source.path),
+                                stat.st_size,
+                                stat.st_mtime_ns,
+                                sha256,
+                                json.dumps(chunks),
+                            ),
+                        )
+                entries.append(
+                    BackupFileEntry(
+                        scope=source.scope,
+                        relative_path=source.relative_path,
+                        kind="file",
+                        required=source.required,
+                        size_bytes=size_bytes,
+                        sha256=sha256,
+                        chunks=chunks,
+                    )
+                )
+            while pending:
+                stats.stored_bytes += pending.popleft().result()
+            conn.commit()
+        return entries, stats
+
+    def save_manifest(self, manifest: BackupManifest) -> int:
+        """原子写入 manifest，返回写入字节数。"""
+        path = self.manifest_path(manifest.bundle_id)
+        payload = manifest.model_dump_json(indent=2).encode("utf-8")
+        self._write_atomic(path, payload)
+        return len(payload)
+
+    def load_manifest(self, bundle_id: str) -> BackupManifest:
+        return self.read_manifest(self.manifest_path(bundle_id))
+
+    @staticmethod
+    def read_manifest(path: Path) -> BackupManifest:
+        return BackupManifest.model_validate(json.loads(path.read_text(encoding="utf-8")))
+
+    def resolve_chain(self, manifest: BackupManifest) -> list[BackupManifest]:
+        """沿 parent_bundle_id 回溯，返回 base → ... → manifest 的完整链。"""
+        chain = [manifest]
+        seen = {manifest.bundle_id}
+        while (parent_id := chain[-1].parent_bundle_id) is not None:
+            if parent_id in seen:
+                raise BackupChainError(f"manifest 链成环: {parent_id}")
+            try:
+                parent = self.load_manifest(parent_id)
+            except (OSError, ValueError) as exc:
+                raise BackupChainError(f"manifest 链断裂，父 manifest 不可用: {parent_id}") from exc
+            seen.add(parent_id)
+            chain.append(parent)
+        chain.reverse()
+        return chain
+
+    @staticmethod
+    def fold_chain(chain: list[BackupManifest]) -> dict[str, BackupFileEntry]:
+        """把 manifest 链折叠为链尾时间点的完整条目集合。"""
+        entries: dict[str, BackupFileEntry] = {}
+        for manifest in chain:
+            for relative_path in manifest.removed_paths:
+                entries.pop(relative_path, None)
+            for entry in manifest.files:
+                entries[entry.relative_path] = entry
+        return entries
+
+    def head(self) -> str | None:
+        """最近一次写入的 manifest（下一次增量的父节点）。"""
+        if not self._index_path.exists():
+            return None
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT value FROM store_meta WHERE key = 'head'").fetchone()
+        return row[0] if row else None
+
+    def set_head(self, bundle_id: str) -> None:
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO store_meta (key, value) VALUES ('head', ?)", (bundle_id,)
+            )
+            conn.commit()
+
+    def _connect(self) -> sqlite3.Connection:
+        self._root.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self._index_path))
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS file_stat_cache ("
+            "path TEXT PRIMARY KEY, size_bytes INTEGER NOT NULL, mtime_ns INTEGER NOT NULL, "
+            "sha256 TEXT NOT NULL, chunks TEXT NOT NULL)"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS store_meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+        )
+        return conn
+
+    def _lookup_cache(
+        self,
+        conn: sqlite3.Connection,
+        source: ChunkSource,
+        stat: os.stat_result,
+    ) -> tuple[str, list[str]] | None:
+        row = conn.execute(
+            "SELECT size_bytes, mtime_ns, sha256, chunks FROM file_stat_cache WHERE path = ?",
+            (str(source.path),),
+        ).fetchone()
+        if row is None or row[0] != stat.st_size or row[1] != stat.st_mtime_ns:
+            return None
+        chunks: list[str] = json.loads(row[3])
+        # chunk 被人工清理时退回重新切块
+        if not all(self.has_chunk(chunk_sha) for chunk_sha in chunks):
+            return None
+        return row[2], chunks
+
+    def _chunk_file(
+        self,
+        path: Path,
+        pool: ThreadPoolExecutor,
+        pending: deque[Future[int]],
+        scheduled: set[str],
+        stats: IngestStats,
+    ) -> tuple[str, int, list[str]]:
+        digest = hashlib.sha256()
+        size_bytes = 0
+        chunks: list[str] = []
+        with path.open("rb") as handle:
+            while block := handle.read(self._chunk_bytes):
+                size_bytes += len(block)
+                digest.update(block)
+                chunk_sha = hashlib.sha256(block).hexdigest()
+                chunks.append(chunk_sha)
+                if chunk_sha in scheduled or self.has_chunk(chunk_sha):
+                    stats.reused_chunks += 1
+                    continue
+                scheduled.add(chunk_sha)
+                stats.new_chunks += 1
+                # 在途压缩任务上限：读取快于压缩时在此回压，避免整文件驻留内存
+                while len(pending) >= self._workers * 2:
+                    stats.stored_bytes += pending.popleft().result()
+                pending.append(pool.submit(self._write_chunk, chunk_sha, block))
+        stats.bytes_read += size_bytes
+        return digest.hexdigest(), size_bytes, chunks
+
+    def _write_chunk(self, chunk_sha: str, block: bytes) -> int:
+        payload = zlib.compress(block)
+        self._write_atomic(self.chunk_path(chunk_sha), payload)
+        return len(payload)
+
+    @staticmethod
+    def _write_atomic(path: Path, payload: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=path.parent, suffix=".tmp", delete=False) as handle:
+            handle.write(payload)
+            tmp_path = Path(handle.name)
+        tmp_path.replace(path)
+
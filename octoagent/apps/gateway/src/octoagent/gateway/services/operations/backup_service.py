@@ -9,13 +9,20 @@ import os
 import sqlite3
 import tempfile
 import zipfile
+import zlib
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any
 
-from octoagent.core.config import get_artifacts_dir, get_db_path
+from filelock import FileLock
+from octoagent.core.config import (
+    BACKUP_CHUNK_BYTES,
+    BACKUP_INCREMENTAL_MAX_CHAIN,
+    get_artifacts_dir,
+    get_db_path,
+)
 from octoagent.core.models import (
     AgentSession,
     AgentSessionTurn,
@@ -41,6 +48,11 @@ from octoagent.core.models import (
 )
 from octoagent.core.store import StoreGroup, create_store_group
 from octoagent.gateway.services.operations.backup_audit import BackupAuditRecorder
+from octoagent.gateway.services.operations.backup_chunk_store import (
+    BackupChainError,
+    BackupChunkStore,
+    ChunkSource,
+)
 from octoagent.gateway.services.operations.project_migration import ProjectWorkspaceMigrationService
 from octoagent.gateway.services.operations.recovery_status_store import RecoveryStatusStore
 from ulid import ULID
@@ -54,6 +66,10 @@ DEFAULT_EXCLUDED_PATHS = [
     ".pytest_cache",
 ]
 _BUNDLE_MANIFEST_VERSION = 1
+_BUNDLE_NOTES = [
+    "chats / session 记录包含在 SQLite snapshot 中，无单独数据文件。",
+    "默认排除明文 secrets 与本地缓存目录。",
+]
 
 
 def resolve_project_root(project_root: Path | None = None) -> Path:
@@ -108,6 +124,8 @@ class BackupService:
         *,
         store_group: StoreGroup | None = None,
         status_store: RecoveryStatusStore | None = None,
+        chunk_bytes: int = BACKUP_CHUNK_BYTES,
+        max_incremental_chain: int = BACKUP_INCREMENTAL_MAX_CHAIN,
     ) -> None:
         self._root = resolve_project_root(project_root).resolve()
         self._data_dir = resolve_data_dir(self._root)
@@ -116,6 +134,8 @@ class BackupService:
         self._backups_dir = self._data_dir / "backups"
         self._exports_dir = self._data_dir / "exports"
         self._store_group = store_group
+        self._chunk_bytes = chunk_bytes
+        self._max_incremental_chain = max_incremental_chain
         self._project_migration_ensured = False
         self._status_store = status_store or RecoveryStatusStore(
             self._root,
@@ -130,7 +150,14 @@ class BackupService:
         *,
         output: str | Path | None = None,
         label: str | None = None,
+        incremental: bool = False,
     ) -> BackupBundle:
+        """生成 backup。
+
+        ``incremental=True`` 时写入内容寻址 chunk store（``output`` 为 store 目录，默认
+        ``data/backups/incremental``），只压缩存储新增 chunk，返回的 bundle 指向本次
+        manifest；否则生成完整 ZIP bundle。
+        """
         created_at = datetime.now(tz=UTC)
         bundle_id = str(ULID())
         scopes = [
@@ -139,7 +166,11 @@ class BackupService:
             BackupScope.CONFIG,
             BackupScope.CHATS,
         ]
-        output_path = self._resolve_bundle_output_path(output, created_at, label)
+        if incremental:
+            store = self._incremental_store(output)
+            output_path = store.manifest_path(bundle_id)
+        else:
+            output_path = self._resolve_bundle_output_path(output, created_at, label)
 
         async with self._store_group_scope() as store_group:
             audit = BackupAuditRecorder(store_group)
@@ -149,13 +180,23 @@ class BackupService:
                 scopes=scopes,
             )
             try:
-                bundle = await asyncio.to_thread(
-                    self._create_bundle_sync,
-                    output_path,
-                    bundle_id,
-                    created_at,
-                    scopes,
-                )
+                if incremental:
+                    bundle = await asyncio.to_thread(
+                        self._create_incremental_bundle_sync,
+                        store,
+                        bundle_id,
+                        created_at,
+                        scopes,
+                        label,
+                    )
+                else:
+                    bundle = await asyncio.to_thread(
+                        self._create_bundle_sync,
+                        output_path,
+                        bundle_id,
+                        created_at,
+                        scopes,
+                    )
                 self._status_store.save_latest_backup(bundle)
             except Exception as exc:
                 await audit.record_failed(
@@ -189,7 +230,13 @@ class BackupService:
                 target = (self._root / target).resolve()
             else:
                 target = target.resolve()
-        plan = await asyncio.to_thread(self._plan_restore_sync, bundle_path, target)
+        # 增量 bundle 以 manifest JSON 为入口，其余按 ZIP bundle 处理
+        plan_sync = (
+            self._plan_incremental_restore_sync
+            if bundle_path.suffix.lower() == ".json"
+            else self._plan_restore_sync
+        )
+        plan = await asyncio.to_thread(plan_sync, bundle_path, target)
         self._status_store.save_recovery_drill(self._record_from_plan(plan))
         return plan
 
@@ -339,60 +386,25 @@ class BackupService:
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
         warnings: list[str] = []
-        notes = [
-            "chats / session 记录包含在 SQLite snapshot 中，无单独数据文件。",
-            "默认排除明文 secrets 与本地缓存目录。",
-        ]
+        notes = list(_BUNDLE_NOTES)
 
         with tempfile.TemporaryDirectory(prefix="octo-backup-") as tmp_dir:
-            tmp_root = Path(tmp_dir)
-            snapshot_path = tmp_root / "sqlite" / "octoagent.db"
-            snapshot_path.parent.mkdir(parents=True, exist_ok=True)
-            self._snapshot_sqlite(snapshot_path)
-
+            snapshot_path = Path(tmp_dir) / "sqlite" / "octoagent.db"
             entries: list[BackupFileEntry] = []
             sources: dict[str, Path] = {}
-
-            sqlite_rel = "sqlite/octoagent.db"
-            entries.append(self._entry_from_path(BackupScope.SQLITE, sqlite_rel, snapshot_path))
-            sources[sqlite_rel] = snapshot_path
-
-            config_sources = {"config/octoagent.yaml": self._root / "octoagent.yaml"}
-            for relative_path, source_path in config_sources.items():
-                if source_path.exists():
-                    entries.append(
-                        self._entry_from_path(BackupScope.CONFIG, relative_path, source_path)
+            for scope, relative_path, source_path in self._collect_bundle_sources(
+                snapshot_path, warnings
+            ):
+                entries.append(
+                    self._entry_from_path(
+                        scope,
+                        relative_path,
+                        source_path,
+                        required=scope != BackupScope.ARTIFACTS,
                     )
-                    sources[relative_path] = source_path
-                else:
-                    warnings.append(f"未发现 {source_path.name}，bundle 中不会包含该配置文件。")
-
-            entries.append(
-                BackupFileEntry(
-                    scope=BackupScope.ARTIFACTS,
-                    relative_path="artifacts",
-                    kind="directory",
-                    required=False,
                 )
-            )
-            if self._artifacts_dir.exists():
-                for artifact_path in sorted(self._artifacts_dir.rglob("*")):
-                    if not artifact_path.is_file():
-                        continue
-                    relative_path = (
-                        Path("artifacts") / artifact_path.relative_to(self._artifacts_dir)
-                    ).as_posix()
-                    entries.append(
-                        self._entry_from_path(
-                            BackupScope.ARTIFACTS,
-                            relative_path,
-                            artifact_path,
-                            required=False,
-                        )
-                    )
-                    sources[relative_path] = artifact_path
-            else:
-                warnings.append("artifacts 目录不存在，bundle 仅包含空 artifacts 目录。")
+                sources[relative_path] = source_path
+            entries.append(self._artifacts_directory_entry())
 
             manifest = BackupManifest(
                 manifest_version=_BUNDLE_MANIFEST_VERSION,
@@ -424,6 +436,134 @@ class BackupService:
             manifest=manifest,
         )
 
+    def _create_incremental_bundle_sync(
+        self,
+        store: BackupChunkStore,
+        bundle_id: str,
+        created_at: datetime,
+        scopes: list[BackupScope],
+        label: str | None,
+    ) -> BackupBundle:
+        warnings: list[str] = []
+        notes = list(_BUNDLE_NOTES)
+        if label:
+            notes.append(f"label: {label}")
+
+        store.root.mkdir(parents=True, exist_ok=True)
+        # 同一 store 的 backup 串行化：链头与 stat 缓存只允许一个写入者
+        with (
+            FileLock(str(store.lock_path)),
+            tempfile.TemporaryDirectory(prefix="octo-backup-") as tmp_dir,
+        ):
+            snapshot_path = Path(tmp_dir) / "sqlite" / "octoagent.db"
+            sources = [
+                ChunkSource(
+                    scope=scope,
+                    relative_path=relative_path,
+                    path=source_path,
+                    required=scope != BackupScope.ARTIFACTS,
+                    cacheable=scope != BackupScope.SQLITE,
+                )
+                for scope, relative_path, source_path in self._collect_bundle_sources(
+                    snapshot_path, warnings
+                )
+            ]
+            entries, stats = store.ingest(sources)
+            entries.append(self._artifacts_directory_entry())
+
+            parent_id, parent_entries = self._incremental_parent(store, warnings)
+            current_paths = {entry.relative_path for entry in entries}
+            notes.append(
+                f"增量 backup：{stats.files} 个文件中 {stats.cached_files} 个命中 stat 缓存，"
+                f"读取 {stats.bytes_read} 字节；新增 {stats.new_chunks} 个 chunk"
+                f"（压缩后 {stats.stored_bytes} 字节），复用 {stats.reused_chunks} 个。"
+            )
+            manifest = BackupManifest(
+                manifest_version=_BUNDLE_MANIFEST_VERSION,
+                bundle_id=bundle_id,
+                created_at=created_at,
+                source_project_root=str(self._root),
+                scopes=scopes,
+                files=[
+                    entry
+                    for entry in entries
+                    if parent_entries.get(entry.relative_path) != entry
+                ],
+                warnings=warnings,
+                excluded_paths=DEFAULT_EXCLUDED_PATHS.copy(),
+                sensitivity_level=SensitivityLevel.OPERATOR_SENSITIVE,
+                notes=notes,
+                bundle_format="incremental",
+                parent_bundle_id=parent_id,
+                removed_paths=sorted(set(parent_entries) - current_paths),
+            )
+            manifest_bytes = store.save_manifest(manifest)
+            store.set_head(bundle_id)
+
+        return BackupBundle(
+            bundle_id=bundle_id,
+            output_path=str(store.manifest_path(bundle_id).resolve()),
+            created_at=created_at,
+            size_bytes=stats.stored_bytes + manifest_bytes,
+            manifest=manifest,
+        )
+
+    def _incremental_parent(
+        self,
+        store: BackupChunkStore,
+        warnings: list[str],
+    ) -> tuple[str | None, dict[str, BackupFileEntry]]:
+        """选定增量 manifest 的父节点并折叠其完整条目；无父节点时写完整 manifest。"""
+        head = store.head()
+        if head is None:
+            return None, {}
+        try:
+            chain = store.resolve_chain(store.load_manifest(head))
+        except (OSError, ValueError):
+            warnings.append(f"增量 manifest 链不可用（{head}），本次写入完整 manifest。")
+            return None, {}
+        # 链过长时另起完整 manifest（chunk 仍复用），限制 restore 折叠的 manifest 数
+        if len(chain) >= self._max_incremental_chain:
+            return None, {}
+        return head, BackupChunkStore.fold_chain(chain)
+
+    def _collect_bundle_sources(
+        self,
+        snapshot_path: Path,
+        warnings: list[str],
+    ) -> list[tuple[BackupScope, str, Path]]:
+        """生成 SQLite 快照，收集 bundle 文件（scope, bundle 内相对路径, 源文件）。"""
+        snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+        self._snapshot_sqlite(snapshot_path)
+        sources = [(BackupScope.SQLITE, "sqlite/octoagent.db", snapshot_path)]
+
+        config_sources = {"config/octoagent.yaml": self._root / "octoagent.yaml"}
+        for relative_path, source_path in config_sources.items():
+            if source_path.exists():
+                sources.append((BackupScope.CONFIG, relative_path, source_path))
+            else:
+                warnings.append(f"未发现 {source_path.name}，bundle 中不会包含该配置文件。")
+
+        if self._artifacts_dir.exists():
+            for artifact_path in sorted(self._artifacts_dir.rglob("*")):
+                if not artifact_path.is_file():
+                    continue
+                relative_path = (
+                    Path("artifacts") / artifact_path.relative_to(self._artifacts_dir)
+                ).as_posix()
+                sources.append((BackupScope.ARTIFACTS, relative_path, artifact_path))
+        else:
+            warnings.append("artifacts 目录不存在，bundle 仅包含空 artifacts 目录。")
+        return sources
+
+    def _artifacts_directory_entry(self) -> BackupFileEntry:
+        return BackupFileEntry(
+            scope=BackupScope.ARTIFACTS,
+            relative_path="artifacts",
+            kind="directory",
+            required=False,
+        )
+
     def _plan_restore_sync(self, bundle_path: Path, target_root: Path) -> RestorePlan:
         checked_at = datetime.now(tz=UTC)
         conflicts: list[RestoreConflict] = []
@@ -514,27 +654,10 @@ class BackupService:
 
                             target_path = self._map_restore_target(item.relative_path, target_root)
                             if target_path.exists():
-                                conflicts.append(
-                                    RestoreConflict(
-                                        conflict_type=RestoreConflictType.PATH_EXISTS,
-                                        severity=RestoreConflictSeverity.BLOCKING,
-                                        target_path=str(target_path),
-                                        message=f"目标路径已存在: {target_path}",
-                                        suggested_action="改用空目录或先手动备份现有文件。",
-                                    )
-                                )
+                                conflicts.append(self._path_exists_conflict(target_path))
 
-                writable_probe = self._first_existing_ancestor(target_root)
-                if writable_probe.exists() and not os.access(writable_probe, os.W_OK):
-                    conflicts.append(
-                        RestoreConflict(
-                            conflict_type=RestoreConflictType.TARGET_UNWRITABLE,
-                            severity=RestoreConflictSeverity.BLOCKING,
-                            target_path=str(writable_probe),
-                            message=f"目标路径不可写: {writable_probe}",
-                            suggested_action="修复目录权限后重试。",
-                        )
-                    )
+                if unwritable := self._target_unwritable_conflict(target_root):
+                    conflicts.append(unwritable)
         except zipfile.BadZipFile:
             conflicts.append(
                 RestoreConflict(
@@ -557,6 +680,138 @@ class BackupService:
             warnings=warnings,
         )
 
+    def _plan_incremental_restore_sync(
+        self,
+        manifest_path: Path,
+        target_root: Path,
+    ) -> RestorePlan:
+        """增量 bundle dry-run：折叠 manifest 链，逐文件解压 chunk 校验 sha256。"""
+        checked_at = datetime.now(tz=UTC)
+        conflicts: list[RestoreConflict] = []
+        warnings: list[str] = []
+        restore_items: list[BackupFileEntry] = []
+        manifest_version: int | None = None
+        store = BackupChunkStore.for_manifest(manifest_path)
+
+        chain: list[BackupManifest] = []
+        try:
+            manifest = store.read_manifest(manifest_path)
+            if manifest.bundle_format != "incremental":
+                raise ValueError("not an incremental manifest")
+            chain = store.resolve_chain(manifest)
+        except BackupChainError as exc:
+            conflicts.append(
+                RestoreConflict(
+                    conflict_type=RestoreConflictType.INVALID_BUNDLE,
+                    severity=RestoreConflictSeverity.BLOCKING,
+                    target_path=str(manifest_path),
+                    message=str(exc),
+                    suggested_action="找回缺失的 manifest，或改用链上更早且完整的 bundle。",
+                )
+            )
+        except (OSError, ValueError):
+            conflicts.append(
+                RestoreConflict(
+                    conflict_type=RestoreConflictType.INVALID_BUNDLE,
+                    severity=RestoreConflictSeverity.BLOCKING,
+                    target_path=str(manifest_path),
+                    message="增量 manifest 解析失败。",
+                    suggested_action=(
+                        "确认输入文件是否为 octo backup create --incremental 生成的 manifest。"
+                    ),
+                )
+            )
+
+        if chain:
+            manifest_version = chain[-1].manifest_version
+            warnings.extend(chain[-1].warnings)
+            for item in chain:
+                if item.manifest_version != _BUNDLE_MANIFEST_VERSION:
+                    conflicts.append(
+                        RestoreConflict(
+                            conflict_type=RestoreConflictType.SCHEMA_VERSION_MISMATCH,
+                            severity=RestoreConflictSeverity.BLOCKING,
+                            target_path=str(store.manifest_path(item.bundle_id)),
+                            message=f"bundle manifest_version 不兼容：{item.manifest_version}",
+                            suggested_action="使用兼容版本重新导出 backup bundle。",
+                        )
+                    )
+            restore_items = list(BackupChunkStore.fold_chain(chain).values())
+
+        for item in restore_items:
+            if item.kind == "directory":
+                continue
+            digest = hashlib.sha256()
+            try:
+                for block in store.iter_file(item):
+                    digest.update(block)
+                actual_hash = digest.hexdigest()
+            except FileNotFoundError:
+                if item.required:
+                    conflicts.append(
+                        RestoreConflict(
+                            conflict_type=RestoreConflictType.MISSING_REQUIRED_FILE,
+                            severity=RestoreConflictSeverity.BLOCKING,
+                            target_path=item.relative_path,
+                            message=f"chunk store 缺少必需文件的数据块: {item.relative_path}",
+                            suggested_action="找回缺失的 chunk 或重新生成完整 backup。",
+                        )
+                    )
+                else:
+                    warnings.append(f"可选文件数据块缺失，恢复时将跳过: {item.relative_path}")
+                continue
+            except zlib.error:
+                actual_hash = ""
+            if actual_hash != item.sha256:
+                conflicts.append(
+                    RestoreConflict(
+                        conflict_type=RestoreConflictType.CHECKSUM_MISMATCH,
+                        severity=RestoreConflictSeverity.BLOCKING,
+                        target_path=item.relative_path,
+                        message=f"文件校验失败: {item.relative_path}",
+                        suggested_action="重新获取未损坏的 chunk store 后重试。",
+                    )
+                )
+
+            target_path = self._map_restore_target(item.relative_path, target_root)
+            if target_path.exists():
+                conflicts.append(self._path_exists_conflict(target_path))
+
+        if unwritable := self._target_unwritable_conflict(target_root):
+            conflicts.append(unwritable)
+
+        return RestorePlan(
+            bundle_path=str(manifest_path.resolve()),
+            target_root=str(target_root.resolve()),
+            compatible=True,
+            checked_at=checked_at,
+            manifest_version=manifest_version,
+            restore_items=restore_items,
+            conflicts=conflicts,
+            warnings=warnings,
+        )
+
+    def _path_exists_conflict(self, target_path: Path) -> RestoreConflict:
+        return RestoreConflict(
+            conflict_type=RestoreConflictType.PATH_EXISTS,
+            severity=RestoreConflictSeverity.BLOCKING,
+            target_path=str(target_path),
+            message=f"目标路径已存在: {target_path}",
+            suggested_action="改用空目录或先手动备份现有文件。",
+        )
+
+    def _target_unwritable_conflict(self, target_root: Path) -> RestoreConflict | None:
+        writable_probe = self._first_existing_ancestor(target_root)
+        if writable_probe.exists() and not os.access(writable_probe, os.W_OK):
+            return RestoreConflict(
+                conflict_type=RestoreConflictType.TARGET_UNWRITABLE,
+                severity=RestoreConflictSeverity.BLOCKING,
+                target_path=str(writable_probe),
+                message=f"目标路径不可写: {writable_probe}",
+                suggested_action="修复目录权限后重试。",
+            )
+        return None
+
     def _record_from_plan(self, plan: RestorePlan) -> RecoveryDrillRecord:
         if plan.compatible:
             summary = "最近一次 dry-run 无阻塞冲突。"
@@ -591,6 +846,13 @@ class BackupService:
         filename = self._default_bundle_filename(created_at, label)
         return self._resolve_output_path(output, self._backups_dir, filename, ".zip")
 
+    def _incremental_store(self, output: str | Path | None) -> BackupChunkStore:
+        if output is None:
+            root = self._backups_dir / "incremental"
+        else:
+            root = _resolve_path_from_root(output, self._root)
+        return BackupChunkStore(root.resolve(), chunk_bytes=self._chunk_bytes)
+
     def _resolve_export_output_path(
         self,
         output: str | Path | None,
@@ -632,6 +894,8 @@ class BackupService:
         source = sqlite3.connect(str(source_path))
         target = sqlite3.connect(str(snapshot_path))
         try:
+            # 单步在线 backup：分步复制会在源库每次被其他连接写入时重启，
+            # gateway 持续写 event store 时可能永远无法完成；WAL 下读者本就不阻塞写者
             source.backup(target)
         finally:
             target.close()
@@ -10,7 +10,7 @@ import tempfile
 from collections.abc import Callable
 from datetime import UTC, datetime, timedelta
 from pathlib import Path
-from typing import Literal
+from typing import Any, Literal
 
 from filelock import FileLock
 from pydantic import BaseModel, Field
@@ -18,6 +18,8 @@ from pydantic import BaseModel, Field
 _PAIRING_CODE_ALPHABET = "ABCDEFGHJKLMNPQRSTUVWXYZ23456789"
 _PAIRING_CODE_LENGTH = 6
 _PAIRING_REQUEST_TTL = timedelta(days=7)
+# 放弃 ingest 的入站 update 保留条数（超出丢最旧，供运维排查 / 手动补投）
+_FAILED_UPDATES_LIMIT = 100
 
 
 def _now() -> datetime:
@@ -54,6 +56,16 @@ class TelegramApprovedUser(BaseModel):
     last_message_id: int | None = None
 
 
+class TelegramFailedUpdate(BaseModel):
+    """ingest 遇到不可重试错误、已被放行的 polling update（保留原始 payload）。"""
+
+    update_id: int
+    chat_id: str = ""
+    error: str = ""
+    failed_at: datetime = Field(default_factory=_now)
+    update: dict[str, Any] = Field(default_factory=dict)
+
+
 class TelegramState(BaseModel):
     """telegram-state.json 的结构化表示。"""
 
@@ -63,6 +75,7 @@ class TelegramState(BaseModel):
     polling_offset: int | None = None
     group_allow_users: list[str] = Field(default_factory=list)
     reply_thread_roots: dict[str, str] = Field(default_factory=dict)
+    failed_updates: list[TelegramFailedUpdate] = Field(default_factory=list)
     updated_at: datetime = Field(default_factory=_now)
 
     def first_approved_user(self) -> TelegramApprovedUser | None:
@@ -344,3 +357,28 @@ class TelegramStateStore:
     def set_polling_offset(self, offset: int | None) -> int | None:
         state = self._mutate_state(lambda current: setattr(current, "polling_offset", offset))
         return state.polling_offset
+
+    def list_failed_updates(self) -> list[TelegramFailedUpdate]:
+        return list(self.load().failed_updates)
+
+    def record_failed_update(
+        self,
+        *,
+        update_id: int,
+        chat_id: str = "",
+        error: str = "",
+        update: dict[str, Any] | None = None,
+    ) -> TelegramFailedUpdate:
+        record = TelegramFailedUpdate(
+            update_id=update_id,
+            chat_id=chat_id,
+            error=error,
+            update=update or {},
+        )
+
+        def _mutation(state: TelegramState) -> None:
+            state.failed_updates.append(record)
+            del state.failed_updates[:-_FAILED_UPDATES_LIMIT]
+
+        self._mutate_state(_mutation)
+        return record
@@ -112,14 +112,13 @@ class OperatorInboxService:
     async def _load_recent_action_results(
         self,
     ) -> tuple[dict[str, OperatorActionResult], set[str], set[str]]:
-        events = await self._stores.event_store.get_all_events()
         latest_by_item: dict[str, tuple[datetime, OperatorActionResult]] = {}
         suppressed_alerts: set[str] = set()
         handled_retry_items: set[str] = set()
 
-        for event in events:
-            if event.type != EventType.OPERATOR_ACTION_RECORDED:
-                continue
+        async for event in self._stores.event_store.iter_all_events(
+            event_types=(EventType.OPERATOR_ACTION_RECORDED,)
+        ):
             payload = event.payload
             item_id = str(payload.get("item_id", "")).strip()
             if not item_id:
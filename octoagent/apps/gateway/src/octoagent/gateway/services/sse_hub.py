@@ -1,32 +1,184 @@
 """SSEHub -- 内存中事件广播器
 
 每个订阅者持有一个 asyncio.Queue，支持 subscribe/unsubscribe/broadcast。
+
+- broadcast 时每个事件只序列化一次（SSEFrame），所有订阅者共享同一份 data 字符串
+- 每个 task 保留最近 N 个 SSEFrame 的环形缓冲（task 数按 LRU 上限淘汰），
+  Last-Event-ID 断线重连在缓冲覆盖范围内时不查 DB
+- 慢订阅者队列满时不再静默踢掉：标记 resync_required 并移出广播，由消费方在
+  排空队列后调用 resync 补齐缺口再重新挂回
+- 瞬态帧（模型输出增量等）只推给显式订阅了瞬态的队列：不进回放缓冲、不落库、
+  不带 SSE id，队列满时直接丢弃（最终内容由持久事件兜底）
 """
 
 import asyncio
-from collections import defaultdict
+import json
+from collections import OrderedDict, defaultdict, deque
+from dataclasses import dataclass
 
+import structlog
+from octoagent.core.config import SSE_REPLAY_BUFFER_SIZE, SSE_REPLAY_MAX_TASKS
+from octoagent.core.models import TERMINAL_STATES, TaskStatus
 from octoagent.core.models.event import Event
 
+log = structlog.get_logger()
+
+
+def event_to_sse_data(event: Event, is_final: bool = False) -> dict:
+    """将 Event 模型转换为 SSE data JSON"""
+    return {
+        "event_id": event.event_id,
+        "task_id": event.task_id,
+        "task_seq": event.task_seq,
+        "ts": event.ts.isoformat(),
+        "type": event.type,
+        "actor": event.actor,
+        "payload": event.payload,
+        "final": is_final,
+    }
+
+
+def is_terminal_event(event: Event) -> bool:
+    """判断事件是否标识任务到达终态"""
+    if event.type == "STATE_TRANSITION" and "to_status" in event.payload:
+        to_status = event.payload["to_status"]
+        try:
+            return TaskStatus(to_status) in TERMINAL_STATES
+        except ValueError:
+            return False
+    return False
+
+
+@dataclass(frozen=True, slots=True)
+class SSEFrame:
+    """序列化后的 SSE 消息（broadcast 时构建一次，订阅者之间共享）"""
+
+    event_id: str
+    event_type: str
+    task_id: str
+    task_seq: int
+    data: str
+    is_final: bool
+
+    @classmethod
+    def from_event(cls, event: Event) -> "SSEFrame":
+        is_final = is_terminal_event(event)
+        return cls(
+            event_id=event.event_id,
+            event_type=str(event.type),
+            task_id=event.task_id,
+            task_seq=event.task_seq,
+            data=json.dumps(event_to_sse_data(event, is_final=is_final), ensure_ascii=False),
+            is_final=is_final,
+        )
+
+    def as_message(self) -> dict[str, str]:
+        """sse_starlette 消息 dict"""
+        return {"id": self.event_id, "event": self.event_type, "data": self.data}
+
+
+@dataclass(frozen=True, slots=True)
+class TransientFrame:
+    """瞬态 SSE 消息：无 id（不推进 Last-Event-ID），断线重连不回放"""
+
+    event_type: str
+    data: str
+
+    def as_message(self) -> dict[str, str]:
+        return {"event": self.event_type, "data": self.data}
+
+
+class SSESubscription(asyncio.Queue):
+    """订阅队列；队列溢出后 resync_required=True（已移出广播，需调用 SSEHub.resync）
+
+    accepts_transient=True 的队列除 Event 外还会收到 TransientFrame。
+    """
+
+    def __init__(self, maxsize: int = 0, *, accepts_transient: bool = False) -> None:
+        super().__init__(maxsize=maxsize)
+        self.resync_required = False
+        self.accepts_transient = accepts_transient
+
+
+class _ReplayBuffer:
+    """单个 task 的 SSEFrame 环形缓冲（按广播顺序）"""
+
+    __slots__ = ("_frames", "_index")
+
+    def __init__(self, capacity: int) -> None:
+        self._frames: deque[SSEFrame] = deque(maxlen=capacity)
+        self._index: dict[str, SSEFrame] = {}
+
+    def append(self, frame: SSEFrame) -> None:
+        if frame.event_id in self._index:
+            return
+        if len(self._frames) == self._frames.maxlen:
+            evicted = self._frames[0]
+            self._index.pop(evicted.event_id, None)
+        self._frames.append(frame)
+        self._index[frame.event_id] = frame
+
+    def get(self, event_id: str) -> SSEFrame | None:
+        return self._index.get(event_id)
+
+    def frames_after(
+        self, task_id: str, event_id: str, next_task_seq: int | None
+    ) -> list[SSEFrame] | None:
+        """event_id 之后的 frame（按 task_seq 排序）；缓冲不能证明完整时返回 None
+
+        完整性判定：event_id 仍在缓冲中，且之后同 task 的 task_seq 从 anchor+1 连续到
+        next_task_seq-1（未提供 next_task_seq 时只要求连续）。跨 task 广播的 frame
+        不参与回放（DB 回放同样只含本 task 事件）。
+        """
+        anchor = self._index.get(event_id)
+        if anchor is None or anchor.task_id != task_id:
+            return None
+        frames = sorted(
+            (
+                f
+                for f in self._frames
+                if f.task_id == task_id and f.task_seq > anchor.task_seq
+            ),
+            key=lambda f: f.task_seq,
+        )
+        expected = anchor.task_seq + 1
+        for frame in frames:
+            if frame.task_seq != expected:
+                return None
+            expected += 1
+        if next_task_seq is not None and expected != next_task_seq:
+            return None
+        return frames
+
 
 class SSEHub:
     """SSE 事件广播器 -- 基于 asyncio.Queue 的发布/订阅模式"""
 
-    def __init__(self, queue_maxsize: int = 1024) -> None:
-        # task_id -> set of asyncio.Queue
-        self._subscribers: dict[str, set[asyncio.Queue]] = defaultdict(set)
+    def __init__(
+        self,
+        queue_maxsize: int = 1024,
+        *,
+        replay_buffer_size: int = SSE_REPLAY_BUFFER_SIZE,
+        replay_max_tasks: int = SSE_REPLAY_MAX_TASKS,
+    ) -> None:
+        # task_id -> set of SSESubscription
+        self._subscribers: dict[str, set[SSESubscription]] = defaultdict(set)
         self._queue_maxsize = queue_maxsize
+        self._replay_buffer_size = replay_buffer_size
+        self._replay_max_tasks = replay_max_tasks
+        self._replay: OrderedDict[str, _ReplayBuffer] = OrderedDict()
 
-    async def subscribe(self, task_id: str) -> asyncio.Queue:
+    async def subscribe(self, task_id: str, *, transient: bool = False) -> SSESubscription:
         """订阅指定任务的事件流
 
         Args:
             task_id: 要订阅的任务 ID
+            transient: 是否同时接收瞬态帧（TransientFrame）
 
         Returns:
-            asyncio.Queue 实例，新事件会被推送到此队列
+            SSESubscription（asyncio.Queue 子类），新事件会被推送到此队列
         """
-        queue: asyncio.Queue = asyncio.Queue(maxsize=self._queue_maxsize)
+        queue = SSESubscription(maxsize=self._queue_maxsize, accepts_transient=transient)
         self._subscribers[task_id].add(queue)
         return queue
 
@@ -37,26 +189,103 @@ class SSEHub:
             task_id: 任务 ID
             queue: 之前订阅时返回的队列
         """
-        self._subscribers[task_id].discard(queue)
-        if not self._subscribers[task_id]:
+        subscribers = self._subscribers.get(task_id)
+        if subscribers is None:
+            return
+        subscribers.discard(queue)
+        if not subscribers:
             del self._subscribers[task_id]
 
     async def broadcast(self, task_id: str, event: Event) -> None:
         """向指定任务的所有订阅者广播事件
 
+        事件先序列化为 SSEFrame 写入环形缓冲（每个事件一次），订阅者队列只放
+        Event 引用；消费方通过 frame_for 取共享的序列化结果。
+
         Args:
             task_id: 任务 ID
             event: 要广播的事件
         """
-        dead_queues = []
+        if self._replay_buffer_size > 0 and self._replay_max_tasks > 0:
+            self._buffer_for(task_id).append(SSEFrame.from_event(event))
+
+        lagging = []
         for queue in self._subscribers.get(task_id, set()):
             try:
                 queue.put_nowait(event)
             except asyncio.QueueFull:
-                dead_queues.append(queue)
+                lagging.append(queue)
 
-        # 清理已满的队列
-        for q in dead_queues:
+        # 慢订阅者：移出广播并标记 resync（队列中已有事件仍可被消费）
+        for q in lagging:
+            q.resync_required = True
             self._subscribers[task_id].discard(q)
+            log.warning(
+                "sse_subscriber_lagging",
+                task_id=task_id,
+                queue_maxsize=self._queue_maxsize,
+            )
         if task_id in self._subscribers and not self._subscribers[task_id]:
             del self._subscribers[task_id]
+
+    def has_transient_subscribers(self, task_id: str) -> bool:
+        return any(q.accepts_transient for q in self._subscribers.get(task_id, ()))
+
+    def publish_transient(self, task_id: str, frame: TransientFrame) -> int:
+        """向接收瞬态帧的订阅者推送，返回送达数；队列满的订阅者直接丢弃本帧"""
+        delivered = 0
+        for queue in self._subscribers.get(task_id, ()):
+            if not queue.accepts_transient or queue.resync_required:
+                continue
+            try:
+                queue.put_nowait(frame)
+            except asyncio.QueueFull:
+                continue
+            delivered += 1
+        return delivered
+
+    def frame_for(self, task_id: str, event: Event) -> SSEFrame:
+        """取 task_id 流上事件的共享 SSEFrame（缓冲命中直接复用，否则现场序列化）"""
+        buffer = self._replay.get(task_id)
+        if buffer is not None:
+            frame = buffer.get(event.event_id)
+            if frame is not None:
+                return frame
+        return SSEFrame.from_event(event)
+
+    def replay_after(
+        self,
+        task_id: str,
+        last_event_id: str,
+        *,
+        next_task_seq: int | None = None,
+    ) -> list[SSEFrame] | None:
+        """从环形缓冲回放 last_event_id 之后的事件；无法证明完整时返回 None（需查 DB）
+
+        next_task_seq：该 task 下一个待分配的 task_seq，用于确认缓冲尾部没有漏掉
+        未经广播写入的事件。
+        """
+        buffer = self._replay.get(task_id)
+        if buffer is None:
+            return None
+        return buffer.frames_after(task_id, last_event_id, next_task_seq)
+
+    def resync(self, task_id: str, queue: SSESubscription) -> None:
+        """把已溢出的订阅者重新挂回广播（队列需已排空）
+
+        调用方随后按最后已推送的 event_id 走 replay_after / DB 补齐缺口；
+        挂回与补齐之间的新事件进入队列，由调用方按 event_id 去重。
+        """
+        queue.resync_required = False
+        self._subscribers[task_id].add(queue)
+
+    def _buffer_for(self, task_id: str) -> _ReplayBuffer:
+        buffer = self._replay.get(task_id)
+        if buffer is None:
+            buffer = _ReplayBuffer(self._replay_buffer_size)
+            self._replay[task_id] = buffer
+            while len(self._replay) > self._replay_max_tasks:
+                self._replay.popitem(last=False)
+        else:
+            self._replay.move_to_end(task_id)
+        return buffer
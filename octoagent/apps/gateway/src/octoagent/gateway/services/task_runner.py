@@ -2,7 +2,7 @@
 
 将 LLM 处理任务持久化到 task_jobs 表，支持：
 1) 启动时恢复 queued/running 任务
-2) 超时监控
+2) 超时监控（deadline 最小堆驱动，定期全量对账兜底）
 3) 避免路由层直接 fire-and-forget
 """
 
@@ -10,6 +10,7 @@ from __future__ import annotations
 
 import asyncio
 import contextlib
+import time
 from collections.abc import Awaitable, Callable
 from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
@@ -17,6 +18,11 @@ from pathlib import Path
 from typing import Any
 
 import structlog
+from octoagent.core.config import (
+    TASK_RUNNER_ALIAS_CONCURRENCY,
+    TASK_RUNNER_MAX_CONCURRENT_JOBS,
+    TASK_RUNNER_PROVIDER_CONCURRENCY,
+)
 from octoagent.core.models import (
     TERMINAL_STATES,
     ActorType,
@@ -37,11 +43,18 @@ from octoagent.core.models import (
 from octoagent.core.store import SYSTEM_INTERNAL_TASK_CHANNEL, StoreGroup
 from ulid import ULID
 
+from .deadline_scheduler import DeadlineScheduler, to_epoch
 from .execution_console import (
     AttachInputResult,
     ExecutionConsoleService,
     ExecutionInputError,
 )
+from .job_scheduler import (
+    AdmissionLimits,
+    JobPriority,
+    JobScheduler,
+    parse_concurrency_limits,
+)
 from .orchestrator import OrchestratorService
 from .resume_engine import ResumeEngine
 from .runtime_service_bundle import RuntimeServiceBundle
@@ -64,6 +77,11 @@ _DEFERRED_TASK_STATUSES: dict[TaskStatus, str] = {
     TaskStatus.PAUSED: "PAUSED",
 }
 _DEFERRED_JOB_STATUSES = set(_DEFERRED_TASK_STATUSES.values())
+# 等待人工期间不计 job 超时的 task 状态
+_JOB_TIMEOUT_EXEMPT_STATUSES = frozenset(_DEFERRED_TASK_STATUSES)
+# DeadlineScheduler key 的类型前缀：(kind, task_id)
+_JOB_DEADLINE = "job"
+_APPROVAL_DEADLINE = "approval"
 _TERMINAL_JOB_STATUSES = {
     TaskStatus.SUCCEEDED.value,
     TaskStatus.FAILED.value,
@@ -88,7 +106,7 @@ class TaskRunner:
         runtime_services: RuntimeServiceBundle,
         approval_manager=None,
         timeout_seconds: float = 14400.0,  # 4 小时，需大于 Worker max_execution
-        monitor_interval_seconds: float = 5.0,
+        monitor_interval_seconds: float = 30.0,  # 全量对账周期（未经 arm 的超时最多晚一个周期）
         completion_notifier: Callable[[str], Awaitable[None]] | None = None,
         worker_runtime_config: WorkerRuntimeConfig | None = None,
         docker_available_checker=None,
@@ -96,6 +114,7 @@ class TaskRunner:
         project_root: Path | None = None,
         approval_timeout_seconds: float = 300.0,  # F101 Phase B FR-C3b：审批超时（默认 300s）
         notification_service=None,  # F101 Phase C T-C-00：NotificationService，供 WAITING_APPROVAL 通知使用
+        job_scheduler: JobScheduler | None = None,
     ) -> None:
         self._stores = store_group
         self._sse_hub = sse_hub
@@ -106,7 +125,12 @@ class TaskRunner:
         self._completion_notifier = completion_notifier
         self._running_jobs: dict[str, RunningJob] = {}
         self._monitor_task: asyncio.Task[None] | None = None
+        self._deadlines = DeadlineScheduler()
         self._lock = asyncio.Lock()
+        # 全局并发受限时积压的 QUEUED job 按空闲名额分批启动；仍有积压时置位，
+        # job 结束 / 全量对账时继续补位
+        self._dispatch_lock = asyncio.Lock()
+        self._queued_backlog = False
         self._cancellation_registry = WorkerCancellationRegistry()
         # F101 Phase B HIGH-04 v4：保存 approval_manager 引用，供 startup_recovery 调用
         # expire_dead_approval，让过期审批在用户再次 approve 时返回 409/410 而非假成功。
@@ -118,6 +142,21 @@ class TaskRunner:
             sse_hub=sse_hub,
             approval_manager=approval_manager,
         )
+        # 准入控制：job 执行前按优先级 / 公平队列 / 并发上限排队，等待人工输入时让出名额
+        self._job_scheduler = job_scheduler or JobScheduler(
+            AdmissionLimits(
+                max_concurrent=TASK_RUNNER_MAX_CONCURRENT_JOBS,
+                per_model_alias=parse_concurrency_limits(TASK_RUNNER_ALIAS_CONCURRENCY),
+                per_provider=parse_concurrency_limits(TASK_RUNNER_PROVIDER_CONCURRENCY),
+            ),
+            provider_resolver=getattr(
+                getattr(runtime_services, "provider_router", None),
+                "provider_for_alias",
+                None,
+            ),
+        )
+        self._execution_console.bind_job_scheduler(self._job_scheduler)
+        self._execution_console.bind_waiting_approval_listener(self._arm_approval_deadline)
         self._orchestrator = OrchestratorService(
             store_group=store_group,
             sse_hub=sse_hub,
@@ -138,6 +177,14 @@ class TaskRunner:
     def execution_console(self) -> ExecutionConsoleService:
         return self._execution_console
 
+    @property
+    def job_scheduler(self) -> JobScheduler:
+        return self._job_scheduler
+
+    def admission_snapshot(self) -> dict[str, Any]:
+        """准入调度指标（排队深度 / 等待耗时 / 分层运行数）"""
+        return self._job_scheduler.snapshot()
+
     async def startup(self) -> None:
         """启动恢复：清理 orphan running + 处理 WAITING_APPROVAL + 拉起 queued。
 
@@ -412,9 +459,19 @@ class TaskRunner:
         return resume_result
 
     async def _dispatch_queued_jobs(self) -> None:
-        jobs = await self._stores.task_job_store.list_jobs(["QUEUED"])
-        if jobs:
-            await asyncio.gather(*[self._start_job(j.task_id) for j in jobs])
+        """启动积压的 QUEUED job
+
+        全局并发受限时只启动空闲名额数的 job（按创建时间），其余留在 QUEUED，
+        由 job 结束 / 全量对账时继续补位，避免重启后为全部积压 job 各建一个 asyncio.Task。
+        """
+        async with self._dispatch_lock:
+            jobs = await self._stores.task_job_store.list_jobs(["QUEUED"])
+            free = self._job_scheduler.free_slots()
+            self._queued_backlog = free is not None and len(jobs) > free
+            if free is not None:
+                jobs = jobs[:free]
+            if jobs:
+                await asyncio.gather(*[self._start_job(j.task_id) for j in jobs])
 
     async def _recover_orphan_running_jobs(self) -> None:
         jobs = await self._stores.task_job_store.list_jobs(["RUNNING"])
@@ -433,6 +490,22 @@ class TaskRunner:
         try:
             from octoagent.core.models.enums import EventType as _EventType
 
+            # 列投影流式读取：只取 APPROVAL_REQUESTED 的 ts（按 task_seq 正序，末条即最新），
+            # 不解码 payload
+            _columns = getattr(self._stores.event_store, "iter_event_columns", None)
+            if callable(_columns):
+                latest_ts_text: str | None = None
+                async for (ts_text,) in _columns(
+                    ("ts",),
+                    task_id=task_id,
+                    event_types=(_EventType.APPROVAL_REQUESTED,),
+                ):
+                    latest_ts_text = ts_text
+                if latest_ts_text is None:
+                    return None
+                ts = datetime.fromisoformat(latest_ts_text)
+                return ts.replace(tzinfo=UTC) if ts.tzinfo is None else ts
+
             _getter = getattr(self._stores.event_store, "get_events_for_task", None)
             if not callable(_getter):
                 return None
@@ -771,7 +844,7 @@ class TaskRunner:
         dispatch_envelope: DispatchEnvelope | None = None,
     ) -> None:
         task = asyncio.create_task(
-            self._run_job(
+            self._run_admitted(
                 task_id=task_id,
                 user_text=user_text,
                 model_alias=model_alias,
@@ -787,10 +860,55 @@ class TaskRunner:
             )
         task.add_done_callback(lambda t, tid=task_id: asyncio.create_task(self._on_done(tid)))
 
+    async def _run_admitted(self, task_id: str, model_alias: str | None, **kwargs: Any) -> None:
+        """经 JobScheduler 准入后执行 job；排队期间可被取消，且不计入 job 超时"""
+        priority, fair_key = await self._admission_class(task_id)
+        try:
+            wait_ms = await self._job_scheduler.acquire(
+                task_id,
+                priority=priority,
+                fair_key=fair_key,
+                model_alias=model_alias,
+            )
+            if wait_ms >= 1000:
+                log.info(
+                    "task_runner_job_admitted_after_wait",
+                    task_id=task_id,
+                    priority=priority.name.lower(),
+                    wait_ms=round(wait_ms, 1),
+                )
+            async with self._lock:
+                running = self._running_jobs.get(task_id)
+                if running is not None:
+                    running.started_at = datetime.now(UTC)
+                    self._arm_job_deadline(task_id, running.started_at)
+            await self._run_job(task_id=task_id, model_alias=model_alias, **kwargs)
+        finally:
+            self._job_scheduler.release(task_id)
+
+    async def _admission_class(self, task_id: str) -> tuple[JobPriority, str]:
+        """准入优先级 + 公平队列键：委派子任务 / 系统内部任务 / 其余按交互对话处理"""
+        try:
+            task = await self._stores.task_store.get_task(task_id)
+        except Exception:
+            task = None
+        if task is None:
+            return JobPriority.INTERACTIVE, ""
+        if task.parent_task_id:
+            priority = JobPriority.DELEGATED
+        elif task.requester.channel == _SYSTEM_INTERNAL_TASK_CHANNEL:
+            priority = JobPriority.AUTOMATION
+        else:
+            priority = JobPriority.INTERACTIVE
+        return priority, f"{task.requester.channel}:{task.requester.sender_id}"
+
     async def _on_done(self, task_id: str) -> None:
         async with self._lock:
             self._running_jobs.pop(task_id, None)
+        self._deadlines.disarm((_JOB_DEADLINE, task_id))
         self._cancellation_registry.clear(task_id)
+        if self._queued_backlog:
+            await self._dispatch_queued_jobs()
 
     async def cancel_task(self, task_id: str) -> bool:
         """通知运行中任务取消。"""
@@ -877,6 +995,7 @@ class TaskRunner:
                 running = self._running_jobs.get(task_id)
                 if running is not None:
                     running.started_at = datetime.now(UTC)
+                    self._arm_job_deadline(task_id, running.started_at)
             return result
 
         job = await self._stores.task_job_store.get_job(task_id)
@@ -1070,6 +1189,8 @@ class TaskRunner:
         deferred_job_status = _DEFERRED_TASK_STATUSES.get(task.status)
         if deferred_job_status is not None:
             await self._stores.task_job_store.mark_deferred(task_id, deferred_job_status)
+            if task.status == TaskStatus.WAITING_APPROVAL:
+                self._arm_approval_deadline(task_id, task.updated_at)
             return
         if task.status == TaskStatus.CANCELLED or result.status == TaskStatus.CANCELLED:
             await self._stores.task_job_store.mark_cancelled(task_id)
@@ -1112,11 +1233,17 @@ class TaskRunner:
         # 会检查 task 是否确实终态，不会对非终态 task 的 delegation session 做错误关闭）
         await self._close_subagent_session_if_needed(task_id)
 
-    async def _monitor_loop_step(self) -> None:
-        """单次监控循环体（供测试直接调用）。
+    async def _monitor_loop_step(
+        self,
+        *,
+        approval_ids: list[str] | None = None,
+        timed_out_ids: list[str] | None = None,
+    ) -> None:
+        """单次超时处理（供测试直接调用）。
 
-        _monitor_loop 调用此方法，测试可以直接调用 _monitor_loop_step
-        而无需等待整个 while True + sleep 循环。
+        不传参数时为全量对账：_monitor_loop 按 monitor_interval_seconds 兜底执行，
+        覆盖未经 arm 的状态变更（如外部直接写库）。deadline 到期时 _monitor_loop
+        传入已确认到期的 task_id，只处理这些 task（不扫库）。
 
         三个独立超时路径：
         1. 全局 job timeout（timeout_seconds）：started_at 超过阈值 → 取消 task
@@ -1129,49 +1256,21 @@ class TaskRunner:
            monitor 只扫 _running_jobs 会遗漏这些 task → task 永远 hang。
            修复：扫数据库 task_job_store["WAITING_APPROVAL"]，合并到检查集合。
         """
-        threshold = datetime.now(UTC) - timedelta(seconds=self._timeout_seconds)
-        _approval_threshold = datetime.now(UTC) - timedelta(seconds=self._approval_timeout_seconds)
-
-        # 收集所有 running job 的 task_id，同时区分超时类型
-        all_running_ids: list[str] = []
-        timed_out_ids: list[str] = []
-        async with self._lock:
-            running_ids_set: set[str] = set(self._running_jobs.keys())
-            for task_id, running in self._running_jobs.items():
-                all_running_ids.append(task_id)
-                if running.started_at < threshold:
-                    timed_out_ids.append(task_id)
-
-        # HIGH-02 v4：从数据库补充 WAITING_APPROVAL jobs（不在 _running_jobs 的 orphan task）。
-        # 场景：wait_for_decision timeout → escalate_permission 返回 → done callback 移除 _running_jobs
-        # → 下次 monitor tick _running_jobs 无此 task_id，但数据库 task_job 仍是 WAITING_APPROVAL。
-        # 这类 orphan task 需要 monitor 通过数据库查询兜底推 FAILED。
-        try:
-            _db_waiting_approval_jobs = await self._stores.task_job_store.list_jobs(
-                ["WAITING_APPROVAL"]
-            )
-            for _wa_job in _db_waiting_approval_jobs:
-                if _wa_job.task_id not in running_ids_set:
-                    # 不在 _running_jobs，但数据库 task_job 是 WAITING_APPROVAL → orphan
-                    all_running_ids.append(_wa_job.task_id)
-                    # 不加入 timed_out_ids：让 approval_timeout 路径判断是否超时
-        except Exception as _db_exc:
-            log.warning(
-                "monitor_loop_db_waiting_approval_scan_error",
-                error=str(_db_exc),
-                hint="HIGH-02 v4：数据库扫描失败，仅扫 _running_jobs（降级）",
-            )
-
-        if not all_running_ids:
+        if approval_ids is None and timed_out_ids is None:
+            approval_ids, timed_out_ids = await self._collect_timeout_candidates()
+        approval_ids = approval_ids or []
+        timed_out_ids = timed_out_ids or []
+        if not approval_ids and not timed_out_ids:
             return
 
+        _approval_threshold = datetime.now(UTC) - timedelta(seconds=self._approval_timeout_seconds)
         service = TaskService(self._stores, self._sse_hub, storage_only=True)
 
         # F101 Phase B FR-C3 + HIGH-02 v4：先检查 WAITING_APPROVAL 超时（approval_timeout_seconds）
         # 此检查覆盖：
         #   A) _running_jobs 中的 WAITING_APPROVAL task（正常路径）
         #   B) 数据库中 orphan WAITING_APPROVAL task（HIGH-02 v4 新增路径）
-        for task_id in all_running_ids:
+        for task_id in approval_ids:
             task = await service.get_task(task_id)
             if task is None or task.status != TaskStatus.WAITING_APPROVAL:
                 continue
@@ -1183,61 +1282,13 @@ class TaskRunner:
             if _task_updated >= _approval_threshold:
                 # 还未超出 approval_timeout_seconds，继续等待
                 continue
-            # approval_timeout_seconds 已超出：强制 FAILED 终态（H2：task_runner owner）
-            _reason = f"user_inaction_{int(self._approval_timeout_seconds)}s"
-            log.warning(
-                "task_runner_approval_timeout",
-                task_id=task_id,
-                approval_timeout_seconds=self._approval_timeout_seconds,
-                reason=_reason,
-            )
-            # H2 决议：直接写 WAITING_APPROVAL → FAILED 状态转移（CAS 语义）。
-            # F101 Phase B HIGH-03 修复：先做 CAS 状态转移，只有 CAS 成功后才执行 side effects。
-            # CAS 失败（task 已不在 WAITING_APPROVAL）→ abort 整个 FAILED 路径，不调 mark_failed / notify。
-            # 原因：先写 task_job_store.mark_failed 后做 CAS 时，CAS 失败会导致：
-            #   task 表=RUNNING、job 表=FAILED、通知已发——三者状态分裂（Durability First 违反）。
-            _cas_succeeded = False
-            try:
-                await service._write_state_transition(
-                    task_id=task_id,
-                    from_status=TaskStatus.WAITING_APPROVAL,
-                    to_status=TaskStatus.FAILED,
-                    trace_id=f"trace-{task_id}",
-                    reason=_reason,
-                )
-                _cas_succeeded = True
-            except Exception as _transition_exc:
-                log.warning(
-                    "task_runner_approval_timeout_transition_failed_abort",
-                    task_id=task_id,
-                    error=str(_transition_exc),
-                    hint="CAS 失败（task 已不在 WAITING_APPROVAL），abort FAILED 路径，不 emit side effects",
-                )
-            if not _cas_succeeded:
-                continue  # CAS 失败，跳过后续 side effects，处理下一个 task_id
-            # CAS 成功后才调 mark_failed + side effects（防止状态分裂）
-            await self._stores.task_job_store.mark_failed(
-                task_id,
-                f"approval_timeout_{int(self._approval_timeout_seconds)}s",
-            )
-            await self._mark_execution_terminal(
-                task_id=task_id,
-                status=ExecutionSessionState.FAILED,
-                message=f"approval timeout: {_reason}",
-            )
-            await self._notify_completion(task_id)
+            await self._expire_waiting_approval(service, task_id)
 
         # 全局 job timeout 路径：只处理 started_at 超出 timeout_seconds 的 task
-        if not timed_out_ids:
-            return
-
         for task_id in timed_out_ids:
             task = await service.get_task(task_id)
-            if task is not None and task.status in {
-                TaskStatus.WAITING_INPUT,
-                TaskStatus.PAUSED,
-                TaskStatus.WAITING_APPROVAL,  # WAITING_APPROVAL 已在上方处理（或尚未超时）
-            }:
+            if task is not None and task.status in _JOB_TIMEOUT_EXEMPT_STATUSES:
+                # WAITING_APPROVAL 已在上方处理（或尚未超时）
                 continue
             async with self._lock:
                 running = self._running_jobs.get(task_id)
@@ -1283,10 +1334,197 @@ class TaskRunner:
                 payload={},
             )
 
+    async def _collect_timeout_candidates(self) -> tuple[list[str], list[str]]:
+        """全量对账：返回 (待检查审批超时的 task_id, started_at 已超时的 task_id)"""
+        threshold = datetime.now(UTC) - timedelta(seconds=self._timeout_seconds)
+
+        # 收集所有 running job 的 task_id，同时区分超时类型
+        all_running_ids: list[str] = []
+        timed_out_ids: list[str] = []
+        async with self._lock:
+            running_ids_set: set[str] = set(self._running_jobs.keys())
+            for task_id, running in self._running_jobs.items():
+                all_running_ids.append(task_id)
+                # 仍在准入队列中的 job 尚未开始执行，不计超时
+                if running.started_at < threshold and not self._job_scheduler.is_queued(
+                    task_id
+                ):
+                    timed_out_ids.append(task_id)
+
+        # HIGH-02 v4：从数据库补充 WAITING_APPROVAL jobs（不在 _running_jobs 的 orphan task）。
+        # 场景：wait_for_decision timeout → escalate_permission 返回 → done callback 移除 _running_jobs
+        # → 下次 monitor tick _running_jobs 无此 task_id，但数据库 task_job 仍是 WAITING_APPROVAL。
+        # 这类 orphan task 需要 monitor 通过数据库查询兜底推 FAILED。
+        try:
+            _db_waiting_approval_jobs = await self._stores.task_job_store.list_jobs(
+                ["WAITING_APPROVAL"]
+            )
+            for _wa_job in _db_waiting_approval_jobs:
+                if _wa_job.task_id not in running_ids_set:
+                    # 不在 _running_jobs，但数据库 task_job 是 WAITING_APPROVAL → orphan
+                    all_running_ids.append(_wa_job.task_id)
+                    # 不加入 timed_out_ids：让 approval_timeout 路径判断是否超时
+        except Exception as _db_exc:
+            log.warning(
+                "monitor_loop_db_waiting_approval_scan_error",
+                error=str(_db_exc),
+                hint="HIGH-02 v4：数据库扫描失败，仅扫 _running_jobs（降级）",
+            )
+        return all_running_ids, timed_out_ids
+
+    async def _expire_waiting_approval(self, service: TaskService, task_id: str) -> None:
+        """approval_timeout_seconds 已超出：强制 FAILED 终态（H2：task_runner owner）"""
+        _reason = f"user_inaction_{int(self._approval_timeout_seconds)}s"
+        log.warning(
+            "task_runner_approval_timeout",
+            task_id=task_id,
+            approval_timeout_seconds=self._approval_timeout_seconds,
+            reason=_reason,
+        )
+        # H2 决议：直接写 WAITING_APPROVAL → FAILED 状态转移（CAS 语义）。
+        # F101 Phase B HIGH-03 修复：先做 CAS 状态转移，只有 CAS 成功后才执行 side effects。
+        # CAS 失败（task 已不在 WAITING_APPROVAL）→ abort 整个 FAILED 路径，不调 mark_failed / notify。
+        # 原因：先写 task_job_store.mark_failed 后做 CAS 时，CAS 失败会导致：
+        #   task 表=RUNNING、job 表=FAILED、通知已发——三者状态分裂（Durability First 违反）。
+        try:
+            await service._write_state_transition(
+                task_id=task_id,
+                from_status=TaskStatus.WAITING_APPROVAL,
+                to_status=TaskStatus.FAILED,
+                trace_id=f"trace-{task_id}",
+                reason=_reason,
+            )
+        except Exception as _transition_exc:
+            log.warning(
+                "task_runner_approval_timeout_transition_failed_abort",
+                task_id=task_id,
+                error=str(_transition_exc),
+                hint="CAS 失败（task 已不在 WAITING_APPROVAL），abort FAILED 路径，不 emit side effects",
+            )
+            return
+        self._deadlines.disarm((_APPROVAL_DEADLINE, task_id))
+        # CAS 成功后才调 mark_failed + side effects（防止状态分裂）
+        await self._stores.task_job_store.mark_failed(
+            task_id,
+            f"approval_timeout_{int(self._approval_timeout_seconds)}s",
+        )
+        await self._mark_execution_terminal(
+            task_id=task_id,
+            status=ExecutionSessionState.FAILED,
+            message=f"approval timeout: {_reason}",
+        )
+        await self._notify_completion(task_id)
+
+    def _arm_job_deadline(self, task_id: str, started_at: datetime) -> None:
+        self._deadlines.arm((_JOB_DEADLINE, task_id), to_epoch(started_at) + self._timeout_seconds)
+
+    def _arm_approval_deadline(self, task_id: str, updated_at: datetime | None = None) -> None:
+        """task 进入 WAITING_APPROVAL 时调用（updated_at 缺省视为刚转移）"""
+        since = time.time() if updated_at is None else to_epoch(updated_at)
+        self._deadlines.arm((_APPROVAL_DEADLINE, task_id), since + self._approval_timeout_seconds)
+
+    async def _rebuild_deadlines(self) -> None:
+        """monitor 启动时重建 deadline 堆：内存中已准入 job + 一次批量查询 WAITING_APPROVAL"""
+        async with self._lock:
+            admitted = [
+                (task_id, running.started_at)
+                for task_id, running in self._running_jobs.items()
+                if not self._job_scheduler.is_queued(task_id)
+            ]
+        for task_id, started_at in admitted:
+            self._arm_job_deadline(task_id, started_at)
+        try:
+            waiting = await self._stores.task_store.list_tasks_by_statuses(
+                [TaskStatus.WAITING_APPROVAL]
+            )
+        except Exception as exc:
+            log.warning("task_runner_deadline_rebuild_failed", error=str(exc))
+            return
+        for task in waiting:
+            self._arm_approval_deadline(task.task_id, task.updated_at)
+
+    async def _job_deadline_due(self, task_id: str) -> bool:
+        """job deadline 到期：确认仍应超时（否则按需重新 arm）"""
+        async with self._lock:
+            running = self._running_jobs.get(task_id)
+        if running is None or self._job_scheduler.is_queued(task_id):
+            return False
+        deadline = to_epoch(running.started_at) + self._timeout_seconds
+        if deadline > time.time():
+            # started_at 已刷新（人工输入送达等）：按新起点重新 arm
+            self._deadlines.arm((_JOB_DEADLINE, task_id), deadline)
+            return False
+        task = await self._stores.task_store.get_task(task_id)
+        if task is not None and task.status in _JOB_TIMEOUT_EXEMPT_STATUSES:
+            # 等待人工期间不计超时：每个对账周期复查一次，离开等待态后再判定
+            self._deadlines.arm(
+                (_JOB_DEADLINE, task_id), time.time() + self._monitor_interval_seconds
+            )
+            return False
+        return True
+
+    async def _approval_deadline_due(self, task_id: str) -> bool:
+        """approval deadline 到期：确认仍在 WAITING_APPROVAL 且未更新（否则按需重新 arm）"""
+        task = await self._stores.task_store.get_task(task_id)
+        if task is None or task.status != TaskStatus.WAITING_APPROVAL:
+            return False
+        deadline = to_epoch(task.updated_at) + self._approval_timeout_seconds
+        if deadline > time.time():
+            # 期间 task 有更新：按新的 updated_at 重新 arm
+            self._deadlines.arm((_APPROVAL_DEADLINE, task_id), deadline)
+            return False
+        return True
+
     async def _monitor_loop(self) -> None:
+        """deadline 驱动的超时监控：睡到最近的 deadline，到期才读库确认。
+
+        monitor_interval_seconds 只作为全量对账（_monitor_loop_step）周期：经 arm 的超时按
+        deadline 准时触发；绕过 arm 的状态变更（外部直接写库等）最迟晚一个对账周期
+        （默认 30s）被处理。
+        """
+        await self._rebuild_deadlines()
+        next_reconcile = time.time() + self._monitor_interval_seconds
         while True:
-            await asyncio.sleep(self._monitor_interval_seconds)
-            await self._monitor_loop_step()
+            next_deadline = self._deadlines.next_deadline()
+            wake_at = (
+                next_reconcile if next_deadline is None else min(next_deadline, next_reconcile)
+            )
+            await self._deadlines.wait_until(wake_at)
+            now = time.time()
+            approval_ids: list[str] = []
+            timed_out_ids: list[str] = []
+            for kind, task_id in self._deadlines.pop_expired(now):
+                try:
+                    if kind == _JOB_DEADLINE:
+                        if await self._job_deadline_due(task_id):
+                            timed_out_ids.append(task_id)
+                    elif await self._approval_deadline_due(task_id):
+                        approval_ids.append(task_id)
+                except Exception as exc:
+                    log.warning(
+                        "task_runner_deadline_handler_error",
+                        task_id=task_id,
+                        kind=kind,
+                        error_type=type(exc).__name__,
+                        error=str(exc),
+                    )
+            if approval_ids or timed_out_ids:
+                try:
+                    await self._monitor_loop_step(
+                        approval_ids=approval_ids, timed_out_ids=timed_out_ids
+                    )
+                except Exception as exc:
+                    log.warning(
+                        "task_runner_deadline_handler_error",
+                        error_type=type(exc).__name__,
+                        error=str(exc),
+                    )
+            if now >= next_reconcile:
+                await self._monitor_loop_step()
+                if self._queued_backlog:
+                    # park（等待人工输入 / 审批）让出的名额不经 _on_done，对账时补位
+                    await self._dispatch_queued_jobs()
+                next_reconcile = time.time() + self._monitor_interval_seconds
 
     async def _notify_completion(self, task_id: str) -> None:
         # F097 Phase E: 在通知前先执行 subagent session cleanup
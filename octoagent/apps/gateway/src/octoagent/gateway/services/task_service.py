@@ -81,6 +81,7 @@ from octoagent.memory import (
 )
 from octoagent.provider import ProviderLLMCallError
 from octoagent.provider.models import ModelCallResult
+from octoagent.provider.prompt_cache import cache_usage
 from octoagent.skills import SkillAuthError
 from ulid import ULID
 
@@ -2537,6 +2538,10 @@ class TaskService:
                         "prompt_tokens": llm_result.token_usage.prompt_tokens,
                         "completion_tokens": llm_result.token_usage.completion_tokens,
                         "total_tokens": llm_result.token_usage.total_tokens,
+                        **cache_usage(
+                            read=getattr(llm_result.token_usage, "cache_read_tokens", 0),
+                            write=getattr(llm_result.token_usage, "cache_write_tokens", 0),
+                        ),
                     },
                     cost_usd=llm_result.cost_usd,
                     cost_unavailable=llm_result.cost_unavailable,
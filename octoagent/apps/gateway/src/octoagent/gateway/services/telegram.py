@@ -23,6 +23,7 @@ from octoagent.gateway.services.telegram_client import (
 
 from .operator_actions import decode_telegram_operator_action, encode_telegram_operator_action
 from .task_service import TaskService
+from .telegram_ingest import TelegramIngestDispatcher, telegram_chat_key
 
 if TYPE_CHECKING:
     from ..voice import SpeechToTextService, TextToSpeechService
@@ -69,6 +70,14 @@ _SPOOL_RETRY_FACTOR = 2.0
 # 超此上限 → status=failed（不无限重试打爆 Telegram 429；保留行供诊断）。
 _SPOOL_MAX_ATTEMPTS = int(os.environ.get("OCTOAGENT_TG_SPOOL_MAX_ATTEMPTS", "8"))
 
+# 入站 ingest 按 chat 分片并发：polling 在途 update 上限（达到后暂停 get_updates 等
+# lane 消化；0 = 不限）与单条 update ingest 失败的 lane 内尝试次数（退避同 polling、
+# 封顶 _POLL_BACKOFF_MAX_S；0 = 不限）。预算必须有限：无法归类的"毒" update 无限重试
+# 会卡死所在 lane、钉住水位线，lane 积满后 wait_for_capacity 连带停掉全部 chat 的拉取。
+# 不可重试错误立即放弃、预算用尽同样放弃，两者都先记入 state（原始 payload）再放行。
+_INGEST_MAX_PENDING = int(os.environ.get("OCTOAGENT_TG_INGEST_MAX_PENDING", "256"))
+_INGEST_MAX_ATTEMPTS = int(os.environ.get("OCTOAGENT_TG_INGEST_MAX_ATTEMPTS", "5"))
+
 
 # 指数封顶——超此 exp 后退避已封顶到 max，无需再算大幂（防持续断网时 factor^exp
 # 在 min() 生效前 OverflowError 崩 _polling_loop）。base=2/max=60 时 exp≈5 即到顶，
@@ -124,6 +133,20 @@ def _is_getupdates_conflict(exc: BaseException) -> bool:
     return "getupdates" in haystack or "conflict" in haystack
 
 
+def _is_retriable_ingest_error(exc: BaseException) -> bool:
+    """ingest 异常是否值得在 lane 内重试。
+
+    update 自身内容导致的错误（payload 结构 / 字段校验失败，含 pydantic
+    ValidationError）与 Bot API 的 4xx 拒绝（429 限流、409 冲突除外）重试不会好转；
+    其余（DB 繁忙、网络、hook 故障等）一律按瞬时错误处理。
+    """
+    if isinstance(exc, (ValueError, TypeError, KeyError)):
+        return False
+    if isinstance(exc, TelegramBotApiError) and exc.status_code is not None:
+        return not (400 <= exc.status_code < 500) or exc.status_code in (409, 429)
+    return True
+
+
 class TelegramPairingRequestLike(Protocol):
     code: str
 
@@ -192,6 +215,15 @@ class TelegramStateStoreProtocol(Protocol):
 
     def set_polling_offset(self, offset: int | None) -> int | None: ...
 
+    def record_failed_update(
+        self,
+        *,
+        update_id: int,
+        chat_id: str = "",
+        error: str = "",
+        update: dict[str, Any] | None = None,
+    ) -> object: ...
+
 
 class TelegramBotClientProtocol(Protocol):
     async def send_message(
@@ -318,6 +350,15 @@ class TelegramGatewayService:
         self._stt_service = stt_service  # F109:None = 语音转写未启用(优雅降级)
         self._tts_service = tts_service  # F110:None = TTS 未启用（优雅降级）
         self._polling_task: asyncio.Task[None] | None = None
+        # 入站 ingest 调度：同 chat FIFO 保序、不同 chat 并行；polling offset 按连续
+        # 水位线确认（polling 与 webhook 共用同一组 per-chat lane）
+        self._ingest_dispatcher = TelegramIngestDispatcher(
+            self._ingest_update,
+            on_watermark=self._commit_polling_offset,
+            retry_delay=lambda attempt: _compute_poll_backoff(attempt),
+            is_retriable=_is_retriable_ingest_error,
+            on_dropped=self._record_dropped_update,
+        )
         # F133：voice 处理剥离 ingest 热路径——全局 FIFO 队列 + 单 consumer 后台 worker
         # （并发上界=1：faster-whisper CPU-bound，串行防多语音并发打爆 CPU；全局 FIFO
         # 天然同 chat 保序）。item 是轻量 context（无音频字节），无界队列单用户可承受。
@@ -438,6 +479,8 @@ class TelegramGatewayService:
                 with contextlib.suppress(asyncio.CancelledError):
                     await task
                 setattr(self, attr, None)
+        # 处理中 / 排队中的入站 update 随 lane 取消，水位线不越过它们（重启后 Telegram 重投）
+        await self._ingest_dispatcher.shutdown()
         # F133 Codex P2：显式丢弃 pending voice 队列项——同实例 shutdown→startup 复用
         # 时不复活 stale voice（保持与"随进程丢弃"语义一致；in-flight 项已随 worker
         # cancel 丢弃）。get_nowait+task_done 成对调，保 queue.join() 计数语义完整。
@@ -495,33 +538,66 @@ class TelegramGatewayService:
         # Codex P1：drain 不在请求路径同步跑（避免慢 send 拖垮 webhook 响应 → Telegram
         # 超时重投）。webhook 模式的周期 drain 由独立 _spool_drain_loop 后台任务负责
         # （startup 拉起），与入站请求解耦。
-        return await self._ingest_update(update)
+        # 与 polling 同走 per-chat lane：同 chat 的并发 webhook 请求按到达顺序 ingest；
+        # 失败不在 lane 内重试（异常交回路由层，由 Telegram 重投）。
+        payload = self._coerce_update(update)
+        return await self._ingest_dispatcher.submit(
+            update,
+            chat_key=telegram_chat_key(payload) if payload is not None else "",
+        )
+
+    def ingest_stats(self) -> dict[str, Any]:
+        """入站 ingest 调度指标：在途 update 数、offset 水位线、每 chat 队列深度与耗时。"""
+        return self._ingest_dispatcher.snapshot()
+
+    def _commit_polling_offset(self, offset: int) -> None:
+        if self._state_store is not None:
+            self._state_store.set_polling_offset(offset)
+
+    def _record_dropped_update(
+        self, update: Any, update_id: int | None, exc: BaseException
+    ) -> None:
+        """放弃的 polling update 在水位线越过它之前落入 state（保留原始 payload）。"""
+        if self._state_store is None or update_id is None:
+            return
+        payload = self._coerce_update(update)
+        self._state_store.record_failed_update(
+            update_id=update_id,
+            chat_id=telegram_chat_key(payload) if payload is not None else "",
+            error=f"{type(exc).__name__}: {exc}"[:500],
+            update=dict(payload) if payload is not None else {},
+        )
 
     async def _polling_loop(self) -> None:
         # F131：连续失败次数——驱动指数退避（成功一轮后 reset），断网/双开时不 busy-loop。
         failure_streak = 0
+        # 取数游标（内存）与确认 offset（持久化水位线）分离：lane 仍在处理时即可拉取
+        # 下一批，确认 offset 只推进到最小未完成 update_id，崩溃重启从该处重投。
+        fetch_offset: int | None = None
         while not self._stop_event.is_set():
             assert self._state_store is not None
             assert self._bot_client is not None
             try:
-                offset = self._state_store.get_polling_offset()
+                await self._ingest_dispatcher.wait_for_capacity(_INGEST_MAX_PENDING)
+                if fetch_offset is None:
+                    fetch_offset = self._state_store.get_polling_offset()
                 updates = await self._bot_client.get_updates(
-                    offset=offset,
+                    offset=fetch_offset,
                     timeout_s=self._polling_timeout_s,
                 )
-                next_offset = offset
                 for update in updates:
-                    await self._ingest_update(update)
                     payload = self._coerce_update(update)
-                    if payload is None:
-                        continue
-                    try:
-                        candidate = int(payload.get("update_id", 0)) + 1
-                    except (TypeError, ValueError):
-                        continue
-                    next_offset = candidate if next_offset is None else max(next_offset, candidate)
-                if next_offset != offset:
-                    self._state_store.set_polling_offset(next_offset)
+                    update_id = self._read_update_id(payload)
+                    self._ingest_dispatcher.submit(
+                        update,
+                        chat_key=telegram_chat_key(payload) if payload is not None else "",
+                        update_id=update_id,
+                        max_attempts=_INGEST_MAX_ATTEMPTS,
+                    )
+                    if update_id is not None and (
+                        fetch_offset is None or update_id + 1 > fetch_offset
+                    ):
+                        fetch_offset = update_id + 1
                 # F131：成功一轮 → 退避重置。出站 spool drain 由独立 _spool_drain_loop
                 # 负责（Codex P2：不在 get_updates 关键路径同步 drain，慢 send 不拖住收 update）。
                 failure_streak = 0
@@ -1800,6 +1876,15 @@ class TelegramGatewayService:
                 return payload
         return None
 
+    @staticmethod
+    def _read_update_id(payload: Mapping[str, Any] | None) -> int | None:
+        if payload is None:
+            return None
+        try:
+            return int(payload["update_id"])
+        except (KeyError, TypeError, ValueError):
+            return None
+
     @staticmethod
     def _event_type_name(event: Any) -> str:
         event_type = getattr(event, "type", "")
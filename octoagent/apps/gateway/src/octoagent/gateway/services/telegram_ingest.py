@@ -0,0 +1,302 @@
+"""Telegram 入站 ingest 调度：按 chat 分片的有序并发 + 连续水位线 offset 提交。
+
+polling 循环原先逐条 await ``_ingest_update`` 之后才推进 offset：一条慢 ingest（建
+task、conversation binding 写入、memory hook）拖住其后所有 chat，多群组突发被整体
+串行化。本调度器：
+
+- 每个 chat 一条 FIFO lane（首条入队时拉起 worker，排空即退出，空闲 chat 零任务）：
+  同 chat 严格按到达顺序处理，不同 chat 并行；
+- 水位线：已提交但未完成的 update_id 中最小者即为可确认的 offset（全部完成时为已见
+  最大 update_id + 1），只向前推进。进程崩溃时未完成的 update 一定落在已确认 offset
+  之后，重启后由 Telegram 重投（ingest 幂等键去重），永不跳过；
+- 失败重试：可重试错误在 lane 内按退避重试（保序，不推进水位线），次数以
+  max_attempts 为限；不可重试错误或次数用尽即放弃，放弃前经 on_dropped 持久记录
+  该 update，再放行水位线（毒 update 不会永久卡住 lane 与 offset）；
+- polling 与 webhook 共用同一组 lane：webhook 请求入队后等待自己那条的结果；
+- 指标：每 chat 队列深度、处理 / 失败 / 重试计数、ingest 耗时与排队等待耗时。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import time
+from collections import OrderedDict, deque
+from collections.abc import Awaitable, Callable, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# 指标保留的 chat 数上限（按最近活跃 LRU 淘汰，防大量群组时无限增长）
+_STATS_MAX_CHATS = 256
+_UPDATE_MESSAGE_FIELDS = ("message", "edited_message", "channel_post", "edited_channel_post")
+
+
+def telegram_chat_key(update: Mapping[str, Any]) -> str:
+    """update 所属 chat 的分片键；无法识别 chat 的 update 共用空键 lane。"""
+    message: object = None
+    for field in _UPDATE_MESSAGE_FIELDS:
+        message = update.get(field)
+        if isinstance(message, Mapping):
+            break
+    else:
+        callback = update.get("callback_query")
+        message = callback.get("message") if isinstance(callback, Mapping) else None
+    chat = message.get("chat") if isinstance(message, Mapping) else None
+    chat_id = chat.get("id") if isinstance(chat, Mapping) else None
+    return "" if chat_id is None else str(chat_id)
+
+
+@dataclass(slots=True)
+class _IngestItem:
+    update: Any
+    update_id: int | None
+    max_attempts: int
+    future: asyncio.Future[Any]
+    enqueued_at: float
+
+
+@dataclass(slots=True)
+class ChatIngestStats:
+    processed: int = 0
+    failed: int = 0
+    retried: int = 0
+    total_latency_ms: float = 0.0
+    last_latency_ms: float = 0.0
+    max_latency_ms: float = 0.0
+    last_queue_wait_ms: float = 0.0
+
+    def to_dict(self, queue_depth: int) -> dict[str, Any]:
+        completed = self.processed + self.failed
+        return {
+            "queue_depth": queue_depth,
+            "processed": self.processed,
+            "failed": self.failed,
+            "retried": self.retried,
+            "last_latency_ms": round(self.last_latency_ms, 1),
+            "avg_latency_ms": round(self.total_latency_ms / completed, 1) if completed else 0.0,
+            "max_latency_ms": round(self.max_latency_ms, 1),
+            "last_queue_wait_ms": round(self.last_queue_wait_ms, 1),
+        }
+
+
+class TelegramIngestDispatcher:
+    """按 chat 分片的 ingest lane 集合 + update_id 水位线。"""
+
+    def __init__(
+        self,
+        ingest: Callable[[Any], Awaitable[Any]],
+        *,
+        on_watermark: Callable[[int], None] | None = None,
+        retry_delay: Callable[[int], float] | None = None,
+        is_retriable: Callable[[BaseException], bool] | None = None,
+        on_dropped: Callable[[Any, int | None, BaseException], None] | None = None,
+    ) -> None:
+        self._ingest = ingest
+        self._on_watermark = on_watermark
+        self._retry_delay = retry_delay or (lambda _attempt: 1.0)
+        self._is_retriable = is_retriable or (lambda _exc: True)
+        self._on_dropped = on_dropped
+        self._lanes: dict[str, deque[_IngestItem]] = {}
+        self._workers: dict[str, asyncio.Task[None]] = {}
+        self._pending = 0
+        self._pending_ids: set[int] = set()
+        self._high_id: int | None = None
+        self._committed: int | None = None
+        self._progress = asyncio.Event()
+        self._stats: OrderedDict[str, ChatIngestStats] = OrderedDict()
+
+    @property
+    def pending(self) -> int:
+        """已入队但尚未完成的 update 数（含处理中）。"""
+        return self._pending
+
+    @property
+    def watermark(self) -> int | None:
+        """当前可安全确认的 offset（None = 尚未见过带 update_id 的 update）。"""
+        if self._pending_ids:
+            return min(self._pending_ids)
+        return None if self._high_id is None else self._high_id + 1
+
+    def submit(
+        self,
+        update: Any,
+        *,
+        chat_key: str,
+        update_id: int | None = None,
+        max_attempts: int = 1,
+    ) -> asyncio.Future[Any]:
+        """入队到 chat_key 对应 lane，返回该 update 的 ingest 结果 future。
+
+        update_id 非 None 时参与水位线（polling）；webhook 不传，由 Telegram 自行重投。
+        ingest 抛可重试异常时在 lane 内按 retry_delay 退避重试（期间该 chat 后续 update
+        等待，保序）；max_attempts <= 0 表示不限次数。不可重试异常或次数用尽时，带
+        update_id 的 update 先交给 on_dropped 持久记录，再把 future 置为异常并放行水位线。
+        """
+        future: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+        # polling 路径不 await future：标记异常已取，避免 GC 时 "never retrieved" 噪声
+        future.add_done_callback(lambda fut: fut.cancelled() or fut.exception())
+        if update_id is not None:
+            self._pending_ids.add(update_id)
+            if self._high_id is None or update_id > self._high_id:
+                self._high_id = update_id
+        self._lanes.setdefault(chat_key, deque()).append(
+            _IngestItem(
+                update=update,
+                update_id=update_id,
+                max_attempts=max_attempts,
+                future=future,
+                enqueued_at=time.monotonic(),
+            )
+        )
+        self._pending += 1
+        if chat_key not in self._workers:
+            self._workers[chat_key] = asyncio.create_task(
+                self._run_lane(chat_key), name=f"telegram-ingest-{chat_key or 'unknown'}"
+            )
+        return future
+
+    async def wait_for_capacity(self, limit: int) -> None:
+        """背压：在途 update 达到 limit 时等待 lane 消化（limit <= 0 不限）。"""
+        while limit > 0 and self._pending >= limit:
+            self._progress.clear()
+            await self._progress.wait()
+
+    async def drain(self) -> None:
+        """等待全部已入队 update 处理完成。"""
+        while self._pending:
+            self._progress.clear()
+            await self._progress.wait()
+
+    async def shutdown(self) -> None:
+        """取消全部 lane；未完成的 update 不推进水位线（重启后由 Telegram 重投）。"""
+        workers = list(self._workers.values())
+        for task in workers:
+            task.cancel()
+        for task in workers:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        for lane in self._lanes.values():
+            for item in lane:
+                item.future.cancel()
+        self._lanes.clear()
+        self._workers.clear()
+        self._pending = 0
+        self._pending_ids.clear()
+        self._high_id = None
+        self._committed = None
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "pending_updates": self._pending,
+            "active_chats": len(self._lanes),
+            "watermark": self.watermark,
+            "committed_offset": self._committed,
+            "chats": {
+                chat_key: stats.to_dict(len(self._lanes.get(chat_key, ())))
+                for chat_key, stats in self._stats.items()
+            },
+        }
+
+    async def _run_lane(self, chat_key: str) -> None:
+        lane = self._lanes[chat_key]
+        try:
+            while lane:
+                item = lane[0]
+                await self._process(chat_key, item)
+                lane.popleft()
+                self._finish(item)
+        finally:
+            # 排空即退出；被 shutdown 取消时由 shutdown 统一清理剩余项
+            self._workers.pop(chat_key, None)
+            if not lane:
+                self._lanes.pop(chat_key, None)
+
+    async def _process(self, chat_key: str, item: _IngestItem) -> None:
+        stats = self._chat_stats(chat_key)
+        started = time.monotonic()
+        stats.last_queue_wait_ms = (started - item.enqueued_at) * 1000
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                result = await self._ingest(item.update)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                exhausted = 0 < item.max_attempts <= attempt
+                if not exhausted and self._is_retriable(exc):
+                    stats.retried += 1
+                    delay = self._retry_delay(attempt)
+                    logger.warning(
+                        "telegram_ingest_retry chat=%s update_id=%s attempt=%s retry_in_s=%.1f",
+                        chat_key,
+                        item.update_id,
+                        attempt,
+                        delay,
+                        exc_info=True,
+                    )
+                    await asyncio.sleep(delay)
+                    continue
+                stats.failed += 1
+                if item.update_id is not None:
+                    logger.error(
+                        "telegram_ingest_failed chat=%s update_id=%s attempts=%s",
+                        chat_key,
+                        item.update_id,
+                        attempt,
+                        exc_info=True,
+                    )
+                    self._record_dropped(item, exc)
+                if not item.future.done():
+                    item.future.set_exception(exc)
+            else:
+                stats.processed += 1
+                if not item.future.done():
+                    item.future.set_result(result)
+            break
+        latency_ms = (time.monotonic() - started) * 1000
+        stats.last_latency_ms = latency_ms
+        stats.total_latency_ms += latency_ms
+        stats.max_latency_ms = max(stats.max_latency_ms, latency_ms)
+
+    def _record_dropped(self, item: _IngestItem, exc: BaseException) -> None:
+        if self._on_dropped is None:
+            return
+        try:
+            self._on_dropped(item.update, item.update_id, exc)
+        except Exception:
+            logger.exception("telegram_ingest_drop_record_failed update_id=%s", item.update_id)
+
+    def _finish(self, item: _IngestItem) -> None:
+        self._pending -= 1
+        if item.update_id is not None:
+            self._pending_ids.discard(item.update_id)
+            self._advance_watermark()
+        self._progress.set()
+
+    def _advance_watermark(self) -> None:
+        mark = self.watermark
+        if mark is None or (self._committed is not None and mark <= self._committed):
+            return
+        self._committed = mark
+        if self._on_watermark is None:
+            return
+        try:
+            self._on_watermark(mark)
+        except Exception:
+            # 提交失败只推迟确认：下次推进时以更大的水位线重试
+            self._committed = None
+            logger.warning("telegram_ingest_watermark_commit_failed offset=%s", mark, exc_info=True)
+
+    def _chat_stats(self, chat_key: str) -> ChatIngestStats:
+        stats = self._stats.get(chat_key)
+        if stats is None:
+            stats = self._stats[chat_key] = ChatIngestStats()
+            while len(self._stats) > _STATS_MAX_CHATS:
+                self._stats.popitem(last=False)
+        else:
+            self._stats.move_to_end(chat_key)
+        return stats
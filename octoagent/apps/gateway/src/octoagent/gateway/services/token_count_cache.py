@@ -0,0 +1,179 @@
+"""Token 计数缓存：按内容哈希复用 estimate_text_tokens 的结果。
+
+同一批 turn / system block 在一次上下文构建内会被 ContextBudgetPlanner、截断阶段、
+分段与 estimate_messages_tokens 反复计数，跨轮次还会再算一遍。计数结果只取决于
+(计数方法, 文本)，因此按 blake2b(文本) 缓存：
+
+- 进程内 LRU（条目数上限），短文本（< MIN_CACHED_CHARS）直接计算不入缓存
+- 可选持久化：read_snapshot / write_snapshot 读写事件库同目录的 SQLite 文件，
+  gateway 启动时 warm 预热、关闭时 export 落盘（同步 IO 放进 asyncio.to_thread）
+- 指标：全局累计 + token_count_scope() 内的单次构建计数（ContextVar，子任务继承）
+"""
+
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+#: 低于该长度的文本直接计数（哈希与查表的开销不低于计数本身）
+MIN_CACHED_CHARS = 64
+
+_DDL = """
+CREATE TABLE IF NOT EXISTS token_counts (
+    method  TEXT NOT NULL,
+    digest  BLOB NOT NULL,
+    tokens  INTEGER NOT NULL,
+    PRIMARY KEY (method, digest)
+) WITHOUT ROWID
+"""
+
+
+@dataclass(slots=True)
+class TokenCountStats:
+    """计数指标：calls = 请求计数的文本数；hits / misses 只统计走缓存的文本"""
+
+    calls: int = 0
+    hits: int = 0
+    misses: int = 0
+    uncached: int = 0
+
+    @property
+    def computed(self) -> int:
+        """实际执行计数（tokenizer 编码 / 字符扫描）的次数"""
+        return self.misses + self.uncached
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def as_dict(self) -> dict[str, int | float]:
+        return {
+            **asdict(self),
+            "computed": self.computed,
+            "hit_rate": round(self.hit_rate, 4),
+        }
+
+
+_scope_stats: ContextVar[TokenCountStats | None] = ContextVar(
+    "token_count_scope_stats", default=None
+)
+
+
+@contextmanager
+def token_count_scope() -> Iterator[TokenCountStats]:
+    """统计 with 块内（含其中创建的子任务）的计数调用"""
+    stats = TokenCountStats()
+    token = _scope_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _scope_stats.reset(token)
+
+
+class TokenCountCache:
+    """(method, 内容哈希) -> token 数 的 LRU 缓存"""
+
+    def __init__(self, capacity: int) -> None:
+        self._capacity = max(capacity, 0)
+        self._entries: OrderedDict[tuple[str, bytes], int] = OrderedDict()
+        self.stats = TokenCountStats()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def enabled(self) -> bool:
+        return self._capacity > 0
+
+    @staticmethod
+    def digest(text: str) -> bytes:
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+    def get(self, key: tuple[str, bytes]) -> int | None:
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: tuple[str, bytes], tokens: int) -> None:
+        if not self.enabled:
+            return
+        self._entries[key] = tokens
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._capacity:
+            self._entries.popitem(last=False)
+
+    def record(self, *, calls: int = 0, hits: int = 0, misses: int = 0, uncached: int = 0) -> None:
+        scoped = _scope_stats.get()
+        for stats in (self.stats, scoped):
+            if stats is None:
+                continue
+            stats.calls += calls
+            stats.hits += hits
+            stats.misses += misses
+            stats.uncached += uncached
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def warm(self, method: str, rows: Iterable[tuple[bytes, int]]) -> int:
+        """用落盘快照预热（已有条目优先），返回新增条数"""
+        added = 0
+        for digest, tokens in rows:
+            if not self.enabled or len(self._entries) >= self._capacity:
+                break
+            key = (method, digest)
+            if key not in self._entries:
+                self._entries[key] = tokens
+                self._entries.move_to_end(key, last=False)
+                added += 1
+        return added
+
+    def export(self) -> list[tuple[str, bytes, int]]:
+        """当前 LRU 快照（旧 -> 新），供 write_snapshot 落盘"""
+        return [(method, digest, tokens) for (method, digest), tokens in self._entries.items()]
+
+
+# ── 落盘快照（同步 IO，由调用方放进 asyncio.to_thread；缓存本身只在事件循环线程读写）──
+
+
+def read_snapshot(path: Path, *, method: str, limit: int) -> list[tuple[bytes, int]]:
+    if limit <= 0 or not path.exists():
+        return []
+    conn = sqlite3.connect(str(path))
+    try:
+        conn.execute(_DDL)
+        rows = conn.execute(
+            "SELECT digest, tokens FROM token_counts WHERE method = ? LIMIT ?",
+            (method, limit),
+        ).fetchall()
+    finally:
+        conn.close()
+    return [(bytes(digest), int(tokens)) for digest, tokens in rows]
+
+
+def write_snapshot(path: Path, rows: list[tuple[str, bytes, int]]) -> None:
+    """整体替换落盘快照"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path))
+    try:
+        with conn:
+            conn.execute(_DDL)
+            conn.execute("DELETE FROM token_counts")
+            conn.executemany(
+                "INSERT INTO token_counts (method, digest, tokens) VALUES (?, ?, ?)",
+                rows,
+            )
+    finally:
+        conn.close()
@@ -0,0 +1,186 @@
+"""TaskActivityIndex -- Feature 011 watchdog 内存活跃度索引
+
+检测器原本每个扫描周期对每个活跃任务各发 1~3 条事件查询；数百个驻留任务时
+watchdog 变成持续的后台 DB 负载。本索引把检测所需的事件事实常驻内存：
+
+- 事件追加时更新（SqliteEventStore.set_append_listener → observe）：最新事件 ts、
+  最新进展事件 ts、最新 MODEL_CALL_STARTED ts、失败窗口内的失败事件；
+- 启动时一次 GROUP BY 聚合查询重建（rebuild），扫描时仅对索引从未见过的活跃
+  任务补一次批量聚合（ensure），稳态扫描零 per-task 查询；
+- 失败事件只保留 failure_window 内的条目，随读取顺带裁剪。
+
+observe 只接收已提交的事件（event store 在事务提交后回调，回滚的追加直接丢弃），
+索引与 DB 查询路径看到的是同一组事实。
+"""
+
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+
+import structlog
+from octoagent.core.models.enums import EventType
+from octoagent.core.models.event import Event
+from octoagent.core.store.event_store import SqliteEventStore, TaskActivitySummary
+
+from .detectors import FAILURE_EVENT_TYPES, PROGRESS_EVENT_TYPES
+
+log = structlog.get_logger()
+
+
+def _as_utc(ts: datetime) -> datetime:
+    """offset-naive 时间戳按 UTC 解释（与 detectors 既有 pattern 一致）"""
+    return ts.replace(tzinfo=UTC) if ts.tzinfo is None else ts
+
+
+def _latest(current: datetime | None, candidate: datetime | None) -> datetime | None:
+    if candidate is None:
+        return current
+    candidate = _as_utc(candidate)
+    return candidate if current is None or candidate > current else current
+
+
+@dataclass
+class TaskActivity:
+    """单个任务的活跃度快照（索引条目）"""
+
+    last_event_ts: datetime | None = None
+    last_progress_ts: datetime | None = None
+    last_model_started_ts: datetime | None = None
+    # 失败窗口内的失败事件：(event_id, task_seq, ts, type)，按 task_seq 正序
+    failures: list[tuple[str, int, datetime, EventType]] = field(default_factory=list)
+
+
+class TaskActivityIndex:
+    """watchdog 检测器共享的 task_id -> TaskActivity 内存索引"""
+
+    def __init__(self, failure_window_seconds: int) -> None:
+        self._failure_window = timedelta(seconds=failure_window_seconds)
+        self._entries: dict[str, TaskActivity] = {}
+        self._observed_events = 0
+        self._summary_queries = 0
+
+    def __contains__(self, task_id: object) -> bool:
+        return task_id in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, task_id: str) -> TaskActivity | None:
+        return self._entries.get(task_id)
+
+    def observe(self, event: Event) -> None:
+        """事件追加回调：更新对应任务的活跃度（纯内存，O(1)）"""
+        self._observed_events += 1
+        activity = self._entries.get(event.task_id)
+        if activity is None:
+            activity = self._entries[event.task_id] = TaskActivity()
+        ts = _as_utc(event.ts)
+        activity.last_event_ts = _latest(activity.last_event_ts, ts)
+        if event.type in PROGRESS_EVENT_TYPES:
+            activity.last_progress_ts = _latest(activity.last_progress_ts, ts)
+        if event.type == EventType.MODEL_CALL_STARTED:
+            activity.last_model_started_ts = _latest(activity.last_model_started_ts, ts)
+        if event.type in FAILURE_EVENT_TYPES:
+            activity.failures.append((event.event_id, event.task_seq, ts, event.type))
+
+    async def rebuild(
+        self,
+        event_store: SqliteEventStore,
+        task_ids: Iterable[str],
+        now: datetime,
+    ) -> int:
+        """进程启动：只保留活跃任务，按活跃任务一次聚合查询重建
+
+        监听器先于 rebuild 注册，期间 observe 到的事件与聚合结果合并，不会丢失。
+
+        Returns:
+            重建的任务数
+        """
+        ids = list(task_ids)
+        self.retain(set(ids))
+        await self._load(event_store, ids, now)
+        log.info("watchdog_activity_index_rebuilt", task_count=len(ids))
+        return len(ids)
+
+    async def ensure(
+        self,
+        event_store: SqliteEventStore,
+        task_ids: Iterable[str],
+        now: datetime,
+    ) -> int:
+        """为索引从未见过的任务补一次批量聚合（稳态下为空操作）
+
+        Returns:
+            本次补载的任务数
+        """
+        missing = [task_id for task_id in task_ids if task_id not in self._entries]
+        if missing:
+            await self._load(event_store, missing, now)
+        return len(missing)
+
+    def retain(self, task_ids: set[str]) -> None:
+        """移除已不活跃任务的条目，防止内存无限增长"""
+        stale = [task_id for task_id in self._entries if task_id not in task_ids]
+        for task_id in stale:
+            del self._entries[task_id]
+
+    def failures_since(
+        self, task_id: str, since_ts: datetime
+    ) -> list[tuple[str, int, datetime, EventType]]:
+        """返回 since_ts（含）之后的失败事件，并就地裁掉更早的条目
+
+        RepeatedFailureDetector 以 now - failure_window 调用，时间单调前进，
+        早于 since_ts 的失败事件之后不会再被需要。
+        """
+        activity = self._entries.get(task_id)
+        if activity is None or not activity.failures:
+            return []
+        since_ts = _as_utc(since_ts)
+        if any(item[2] < since_ts for item in activity.failures):
+            activity.failures = [item for item in activity.failures if item[2] >= since_ts]
+        return list(activity.failures)
+
+    def snapshot(self) -> dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "observed_events": self._observed_events,
+            "summary_queries": self._summary_queries,
+        }
+
+    async def _load(
+        self,
+        event_store: SqliteEventStore,
+        task_ids: list[str],
+        now: datetime,
+    ) -> None:
+        self._summary_queries += 1
+        summaries = await event_store.summarize_task_activity(
+            task_ids,
+            progress_types=sorted(PROGRESS_EVENT_TYPES),
+            marker_type=EventType.MODEL_CALL_STARTED,
+            failure_types=sorted(FAILURE_EVENT_TYPES),
+            failures_since=now - self._failure_window,
+        )
+        for task_id in task_ids:
+            self._merge(task_id, summaries.get(task_id))
+
+    def _merge(self, task_id: str, summary: TaskActivitySummary | None) -> None:
+        # 查询期间 observe 已写入的条目与聚合结果取并集（失败事件按 event_id 去重）
+        activity = self._entries.get(task_id)
+        if activity is None:
+            activity = self._entries[task_id] = TaskActivity()
+        if summary is None:
+            return
+        activity.last_event_ts = _latest(activity.last_event_ts, summary.latest_ts)
+        activity.last_progress_ts = _latest(activity.last_progress_ts, summary.latest_progress_ts)
+        activity.last_model_started_ts = _latest(
+            activity.last_model_started_ts, summary.latest_marker_ts
+        )
+        known = {item[0] for item in activity.failures}
+        merged = activity.failures + [
+            (event_id, task_seq, _as_utc(ts), event_type)
+            for event_id, task_seq, ts, event_type in summary.recent_failures
+            if event_id not in known
+        ]
+        merged.sort(key=lambda item: item[1])
+        activity.failures = merged
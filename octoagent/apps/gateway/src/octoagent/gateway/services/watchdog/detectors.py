@@ -4,11 +4,14 @@ DriftDetectionStrategy: 可插拔检测器协议（Strategy 模式）
 NoProgressDetector: 无进展检测（P0 核心，FR-009, FR-010）
 StateMachineDriftDetector: 状态机驻留检测（P1，FR-011）
 RepeatedFailureDetector: 重复失败检测（P1，FR-012）
+
+注入 TaskActivityIndex 时，事件类判断（进展 / LLM 等待 / 失败窗口）在内存索引上
+完成，不再逐任务查询 EventStore；索引缺该任务条目时回退原查询路径。
 """
 
 from collections.abc import Callable
 from datetime import UTC, datetime, timedelta
-from typing import Protocol
+from typing import TYPE_CHECKING, Protocol
 
 import structlog
 from octoagent.core.models.enums import TERMINAL_STATES, EventType, TaskStatus
@@ -18,6 +21,9 @@ from octoagent.core.store.event_store import SqliteEventStore
 from .config import WatchdogConfig
 from .models import DriftResult, utc_now
 
+if TYPE_CHECKING:
+    from .activity_index import TaskActivityIndex
+
 log = structlog.get_logger()
 
 # 进展事件类型集合（FR-009 规定的 7 种）
@@ -73,10 +79,15 @@ class NoProgressDetector:
     - task.updated_at 作为 last_event_ts 降级（边界情况 4）
     """
 
-    def __init__(self, clock: Callable[[], datetime] | None = None) -> None:
+    def __init__(
+        self,
+        clock: Callable[[], datetime] | None = None,
+        activity_index: "TaskActivityIndex | None" = None,
+    ) -> None:
         # F138 clock DI：None 默认 utc_now（与原裸写 datetime.now(UTC) 逐值等价）；
         # 注入固定时钟即可确定性测时间窗判断。
         self._clock = clock or utc_now
+        self._activity_index = activity_index
 
     async def check(
         self,
@@ -93,34 +104,50 @@ class NoProgressDetector:
         now = self._clock()
         since_ts = now - timedelta(seconds=threshold)
 
-        # 查询时间窗口内的进展事件
-        progress_events = await event_store.get_events_by_types_since(
-            task_id=task.task_id,
-            event_types=list(PROGRESS_EVENT_TYPES),
-            since_ts=since_ts,
+        activity = (
+            self._activity_index.get(task.task_id) if self._activity_index is not None else None
         )
+        if activity is not None:
+            # 内存索引路径：窗口内有进展 / LLM 等待期豁免（FR-010），与下方查询路径等价
+            if activity.last_progress_ts is not None and activity.last_progress_ts >= since_ts:
+                return None
+            if (
+                activity.last_model_started_ts is not None
+                and activity.last_model_started_ts >= since_ts
+            ):
+                log.debug("no_progress_detector_llm_exemption", task_id=task.task_id)
+                return None
+            latest_ts = activity.last_event_ts
+        else:
+            # 查询时间窗口内的进展事件
+            progress_events = await event_store.get_events_by_types_since(
+                task_id=task.task_id,
+                event_types=list(PROGRESS_EVENT_TYPES),
+                since_ts=since_ts,
+            )
 
-        if progress_events:
-            # 窗口内有进展事件，无漂移
-            return None
+            if progress_events:
+                # 窗口内有进展事件，无漂移
+                return None
 
-        # 检查 LLM 等待期豁免（FR-010）
-        # 若 MODEL_CALL_STARTED 在 no_progress_threshold 窗口内，说明 LLM 仍在推理，豁免本次检测
-        model_started_events = await event_store.get_events_by_types_since(
-            task_id=task.task_id,
-            event_types=[EventType.MODEL_CALL_STARTED],
-            since_ts=since_ts,
-        )
-        if model_started_events:
-            # LLM 等待期内，豁免
-            log.debug(
-                "no_progress_detector_llm_exemption",
+            # 检查 LLM 等待期豁免（FR-010）
+            # 若 MODEL_CALL_STARTED 在 no_progress_threshold 窗口内，说明 LLM 仍在推理，豁免本次检测
+            model_started_events = await event_store.get_events_by_types_since(
                 task_id=task.task_id,
+                event_types=[EventType.MODEL_CALL_STARTED],
+                since_ts=since_ts,
             )
-            return None
+            if model_started_events:
+                # LLM 等待期内，豁免
+                log.debug(
+                    "no_progress_detector_llm_exemption",
+                    task_id=task.task_id,
+                )
+                return None
+
+            # 获取最近事件时间戳（用于计算 stall_duration）
+            latest_ts = await event_store.get_latest_event_ts(task.task_id)
 
-        # 获取最近事件时间戳（用于计算 stall_duration）
-        latest_ts = await event_store.get_latest_event_ts(task.task_id)
         if latest_ts is None:
             # 无历史事件，降级使用 task.updated_at（边界情况 4）
             latest_ts = task.updated_at
@@ -221,9 +248,14 @@ class RepeatedFailureDetector:
     超过 repeated_failure_threshold 时返回 repeated_failure 漂移。
     """
 
-    def __init__(self, clock: Callable[[], datetime] | None = None) -> None:
+    def __init__(
+        self,
+        clock: Callable[[], datetime] | None = None,
+        activity_index: "TaskActivityIndex | None" = None,
+    ) -> None:
         # F138 clock DI（同 NoProgressDetector）。
         self._clock = clock or utc_now
+        self._activity_index = activity_index
 
     async def check(
         self,
@@ -241,14 +273,24 @@ class RepeatedFailureDetector:
         now = self._clock()
         since_ts = now - timedelta(seconds=config.failure_window_seconds)
 
-        # 查询失败事件
-        failure_events = await event_store.get_events_by_types_since(
-            task_id=task.task_id,
-            event_types=list(FAILURE_EVENT_TYPES),
-            since_ts=since_ts,
-        )
+        if self._activity_index is not None and task.task_id in self._activity_index:
+            # 内存索引路径：(ts, type) 与查询路径的 Event 列表同序（task_seq 正序）
+            failures = [
+                (ts, event_type)
+                for _, _, ts, event_type in self._activity_index.failures_since(
+                    task.task_id, since_ts
+                )
+            ]
+        else:
+            # 查询失败事件
+            failure_events = await event_store.get_events_by_types_since(
+                task_id=task.task_id,
+                event_types=list(FAILURE_EVENT_TYPES),
+                since_ts=since_ts,
+            )
+            failures = [(e.ts, e.type) for e in failure_events]
 
-        failure_count = len(failure_events)
+        failure_count = len(failures)
 
         if failure_count < config.repeated_failure_threshold:
             if failure_count > 0:
@@ -261,10 +303,10 @@ class RepeatedFailureDetector:
             return None
 
         # 生成失败类型列表（payload 中用于诊断，FR-012）
-        failure_event_types = [e.type.value for e in failure_events]
+        failure_event_types = [event_type.value for _, event_type in failures]
 
         # 使用最早失败事件时间作为 last_progress_ts 参照
-        earliest_failure_ts = min(e.ts for e in failure_events)
+        earliest_failure_ts = min(ts for ts, _ in failures)
         # event.ts 可能是 offset-naive（store 反序列化未带 tzinfo），与 offset-aware
         # 的 now 相减会 raise "can't compare offset-naive and offset-aware datetimes"。
         # 按本文件其它 detector（NoProgressDetector 等）既有 pattern 统一补 UTC。
@@ -19,6 +19,7 @@ from octoagent.core.models.event import Event, EventCausality
 from octoagent.core.models.payloads import TaskDriftDetectedPayload
 from octoagent.core.store import StoreGroup
 
+from .activity_index import TaskActivityIndex
 from .config import WatchdogConfig
 from .cooldown import CooldownRegistry
 from .detectors import DriftDetectionStrategy
@@ -55,6 +56,7 @@ class WatchdogScanner:
         cooldown_registry: CooldownRegistry,
         detectors: list[DriftDetectionStrategy],
         clock: Callable[[], datetime] | None = None,
+        activity_index: TaskActivityIndex | None = None,
     ) -> None:
         self._store_group = store_group
         self._config = config
@@ -62,6 +64,12 @@ class WatchdogScanner:
         self._detectors = detectors
         # F138 clock DI：None 默认 utc_now（与原裸写 datetime.now(UTC) 逐值等价）
         self._clock = clock or utc_now
+        # 检测器共享的内存活跃度索引（None 时检测器逐任务查询 EventStore）
+        self._activity_index = activity_index
+
+    @property
+    def activity_index(self) -> TaskActivityIndex | None:
+        return self._activity_index
 
     async def startup(self) -> None:
         """进程启动：重建 cooldown 注册表（FR-006 跨重启一致性）
@@ -83,6 +91,12 @@ class WatchdogScanner:
             )
             active_task_ids = [t.task_id for t in active_tasks]
 
+            if self._activity_index is not None:
+                # 一次 GROUP BY 聚合重建活跃度索引（之后由事件追加回调增量维护）
+                await self._activity_index.rebuild(
+                    self._store_group.event_store, active_task_ids, self._clock()
+                )
+
             await self._cooldown.rebuild_from_store(
                 event_store=self._store_group.event_store,
                 active_task_ids=active_task_ids,
@@ -116,7 +130,22 @@ class WatchdogScanner:
                 NON_TERMINAL_STATUSES, exclude_internal=True
             )
             active_count = len(active_tasks)
-            self._cooldown.cleanup_terminated({t.task_id for t in active_tasks})
+            active_task_ids = {t.task_id for t in active_tasks}
+            self._cooldown.cleanup_terminated(active_task_ids)
+            if self._activity_index is not None:
+                self._activity_index.retain(active_task_ids)
+                try:
+                    # 稳态为空操作：只为索引从未见过的活跃任务补一次批量聚合
+                    await self._activity_index.ensure(
+                        self._store_group.event_store, active_task_ids, self._clock()
+                    )
+                except Exception as index_exc:
+                    # 补载失败不阻断扫描：缺条目的任务由检测器回退逐任务查询
+                    log.warning(
+                        "watchdog_activity_index_ensure_failed",
+                        error_type=type(index_exc).__name__,
+                        error=str(index_exc),
+                    )
 
             for task in active_tasks:
                 # 排除系统内部任务（如 ops-control-plane 审计日志载体）
@@ -189,6 +218,9 @@ class WatchdogScanner:
             active_task_count=active_count,
             drift_detected_count=drift_count,
             scan_duration_ms=round(scan_duration_ms, 2),
+            activity_index_entries=(
+                len(self._activity_index) if self._activity_index is not None else None
+            ),
         )
 
     async def _emit_drift_event(
@@ -0,0 +1,207 @@
+"""TaskActivityIndex 集成测试 -- Feature 011 watchdog 活跃度索引
+
+使用 in-memory SQLite，覆盖：
+- 启动一次聚合重建，稳态扫描零 per-task 事件查询，检测结果与查询路径一致
+- 事件追加回调增量更新（进展事件到达后不再判定 no_progress）
+- 重复失败：索引路径与查询路径的 DriftResult 逐字段一致
+- 索引未见过的活跃任务在扫描时批量补载
+"""
+
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import aiosqlite
+import pytest
+import pytest_asyncio
+from octoagent.core.models.enums import ActorType, EventType, RiskLevel, TaskStatus
+from octoagent.core.models.event import Event, EventCausality
+from octoagent.core.models.task import RequesterInfo, Task, TaskPointers
+from octoagent.core.store import StoreGroup
+from octoagent.core.store.sqlite_init import init_db
+from octoagent.gateway.services.watchdog.activity_index import TaskActivityIndex
+from octoagent.gateway.services.watchdog.config import WatchdogConfig
+from octoagent.gateway.services.watchdog.cooldown import CooldownRegistry
+from octoagent.gateway.services.watchdog.detectors import (
+    NoProgressDetector,
+    RepeatedFailureDetector,
+)
+from octoagent.gateway.services.watchdog.scanner import WatchdogScanner
+
+
+def _make_event_id() -> str:
+    import ulid
+    return str(ulid.ULID())
+
+
+def _make_task_obj(task_id: str, updated_ago_seconds: int = 600) -> Task:
+    now = datetime.now(UTC)
+    return Task(
+        task_id=task_id,
+        created_at=now,
+        updated_at=now - timedelta(seconds=updated_ago_seconds),
+        status=TaskStatus.RUNNING,
+        title=f"Test Task {task_id}",
+        thread_id="thread-001",
+        scope_id="scope-001",
+        requester=RequesterInfo(channel="web", sender_id="user-001"),
+        risk_level=RiskLevel.LOW,
+        pointers=TaskPointers(),
+    )
+
+
+def _event(task_id: str, seq: int, event_type: EventType, ago_seconds: int) -> Event:
+    return Event(
+        event_id=_make_event_id(),
+        task_id=task_id,
+        task_seq=seq,
+        ts=datetime.now(UTC) - timedelta(seconds=ago_seconds),
+        type=event_type,
+        actor=ActorType.SYSTEM,
+        payload={},
+        trace_id="trace-001",
+        causality=EventCausality(),
+    )
+
+
+@pytest_asyncio.fixture
+async def store_group(tmp_path: Path):
+    conn = await aiosqlite.connect(":memory:")
+    await init_db(conn)
+    artifacts_dir = tmp_path / "artifacts"
+    artifacts_dir.mkdir(parents=True, exist_ok=True)
+    yield StoreGroup(conn=conn, artifacts_dir=artifacts_dir)
+    await conn.close()
+
+
+async def _seed(store_group: StoreGroup, task_id: str, events: list[tuple[EventType, int]]):
+    await store_group.task_store.create_task(_make_task_obj(task_id))
+    for seq, (event_type, ago) in enumerate(events, start=1):
+        await store_group.event_store.append_event(_event(task_id, seq, event_type, ago))
+    await store_group.conn.commit()
+
+
+def _forbid_per_task_queries(monkeypatch: pytest.MonkeyPatch, store_group: StoreGroup) -> None:
+    async def _fail(*_args, **_kwargs):
+        raise AssertionError("per-task event query during indexed scan")
+
+    monkeypatch.setattr(store_group.event_store, "get_events_by_types_since", _fail)
+    monkeypatch.setattr(store_group.event_store, "get_latest_event_ts", _fail)
+
+
+def _make_scanner(
+    store_group: StoreGroup, config: WatchdogConfig, index: TaskActivityIndex | None
+) -> WatchdogScanner:
+    return WatchdogScanner(
+        store_group=store_group,
+        config=config,
+        cooldown_registry=CooldownRegistry(),
+        detectors=[
+            NoProgressDetector(activity_index=index),
+            RepeatedFailureDetector(activity_index=index),
+        ],
+        activity_index=index,
+    )
+
+
+async def _drift_types(store_group: StoreGroup, task_id: str) -> list[str]:
+    events = await store_group.event_store.get_events_for_task(task_id)
+    return [e.payload["drift_type"] for e in events if e.type == EventType.TASK_DRIFT_DETECTED]
+
+
+@pytest.mark.asyncio
+async def test_indexed_scan_matches_queries_without_per_task_reads(
+    store_group: StoreGroup, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    config = WatchdogConfig()  # no_progress 阈值 45s，失败窗口 300s，阈值 3 次
+    await _seed(store_group, "task-stalled", [(EventType.TOOL_CALL_COMPLETED, 120)])
+    await _seed(store_group, "task-busy", [(EventType.TOOL_CALL_STARTED, 5)])
+    await _seed(store_group, "task-llm", [(EventType.MODEL_CALL_STARTED, 10)])
+    await _seed(
+        store_group,
+        "task-failing",
+        [(EventType.TOOL_CALL_FAILED, 100), (EventType.MODEL_CALL_FAILED, 90),
+         (EventType.SKILL_FAILED, 80), (EventType.TOOL_CALL_FAILED, 999)],
+    )
+
+    index = TaskActivityIndex(config.failure_window_seconds)
+    store_group.event_store.set_append_listener(index.observe)
+    scanner = _make_scanner(store_group, config, index)
+    await scanner.startup()
+    assert index.snapshot()["summary_queries"] == 1
+
+    _forbid_per_task_queries(monkeypatch, store_group)
+    await scanner.scan()
+    await scanner.scan()
+
+    assert await _drift_types(store_group, "task-stalled") == ["no_progress"]
+    assert await _drift_types(store_group, "task-busy") == []
+    assert await _drift_types(store_group, "task-llm") == []
+    # 窗口外（999s 前）的失败不计数；cooldown 内第二条漂移被抑制
+    assert await _drift_types(store_group, "task-failing") == ["no_progress"]
+    assert index.snapshot()["summary_queries"] == 1
+
+
+@pytest.mark.asyncio
+async def test_appended_progress_event_updates_index(store_group: StoreGroup) -> None:
+    config = WatchdogConfig()
+    await _seed(store_group, "task-001", [(EventType.TASK_HEARTBEAT, 300)])
+    index = TaskActivityIndex(config.failure_window_seconds)
+    store_group.event_store.set_append_listener(index.observe)
+    await index.rebuild(store_group.event_store, ["task-001"], datetime.now(UTC))
+
+    detector = NoProgressDetector(activity_index=index)
+    task = _make_task_obj("task-001")
+    assert await detector.check(task, store_group.event_store, config) is not None
+
+    await store_group.event_store.append_event_committed(
+        _event("task-001", 2, EventType.TASK_MILESTONE, 0), update_task_pointer=False
+    )
+    assert await detector.check(task, store_group.event_store, config) is None
+
+
+@pytest.mark.asyncio
+async def test_repeated_failure_result_matches_query_path(store_group: StoreGroup) -> None:
+    config = WatchdogConfig()
+    await _seed(
+        store_group,
+        "task-001",
+        [(EventType.MODEL_CALL_FAILED, 200), (EventType.TOOL_CALL_STARTED, 150),
+         (EventType.TOOL_CALL_FAILED, 100), (EventType.SKILL_FAILED, 50)],
+    )
+    now = datetime.now(UTC)
+    index = TaskActivityIndex(config.failure_window_seconds)
+    await index.rebuild(store_group.event_store, ["task-001"], now)
+    task = _make_task_obj("task-001")
+
+    indexed = await RepeatedFailureDetector(clock=lambda: now, activity_index=index).check(
+        task, store_group.event_store, config
+    )
+    queried = await RepeatedFailureDetector(clock=lambda: now).check(
+        task, store_group.event_store, config
+    )
+
+    assert indexed is not None
+    assert indexed == queried
+    assert indexed.failure_event_types == [
+        "MODEL_CALL_FAILED",
+        "TOOL_CALL_FAILED",
+        "SKILL_FAILED",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_unseen_active_tasks_are_loaded_in_one_batch(store_group: StoreGroup) -> None:
+    config = WatchdogConfig()
+    index = TaskActivityIndex(config.failure_window_seconds)
+    scanner = _make_scanner(store_group, config, index)
+    await scanner.startup()
+
+    # 监听器未注册：模拟其它写入方 / 进程写入的任务，索引从未见过
+    for task_id in ("task-a", "task-b", "task-c"):
+        await _seed(store_group, task_id, [(EventType.TOOL_CALL_COMPLETED, 120)])
+    await scanner.scan()
+
+    assert len(index) == 3
+    assert index.snapshot()["summary_queries"] == 2
+    for task_id in ("task-a", "task-b", "task-c"):
+        assert await _drift_types(store_group, task_id) == ["no_progress"]
@@ -4,7 +4,10 @@ import json
 import os
 import sqlite3
 import tempfile
+import threading
+import time
 import zipfile
+import zlib
 from datetime import UTC, datetime, timedelta
 from pathlib import Path
 
@@ -31,6 +34,7 @@ from octoagent.core.models import (
 )
 from octoagent.core.store import create_store_group
 from octoagent.core.store.transaction import create_task_with_initial_events
+from octoagent.gateway.services.operations.backup_chunk_store import BackupChunkStore
 from octoagent.gateway.services.operations.backup_service import BackupService
 from octoagent.gateway.services.operations.recovery_status_store import RecoveryStatusStore
 from ulid import ULID
@@ -527,6 +531,184 @@ async def test_plan_restore_checks_first_existing_ancestor_for_writability(
     assert any(conflict.conflict_type == "target_unwritable" for conflict in plan.conflicts)
 
 
+@pytest.mark.asyncio
+async def test_snapshot_sqlite_completes_while_source_is_written(tmp_path: Path) -> None:
+    await _seed_project(tmp_path)
+    db_path = tmp_path / "data" / "sqlite" / "octoagent.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("CREATE TABLE filler (id INTEGER PRIMARY KEY, body BLOB)")
+        conn.executemany(
+            "INSERT INTO filler (body) VALUES (?)",
+            ((os.urandom(4096),) for _ in range(2048)),
+        )
+
+    stop = threading.Event()
+    writes = 0
+
+    def _writer() -> None:
+        nonlocal writes
+        writer = sqlite3.connect(db_path)
+        deadline = time.monotonic() + 10
+        try:
+            # 写入设上限：若快照被写入无限重启，测试以超时断言失败而非挂起
+            while not stop.is_set() and time.monotonic() < deadline:
+                writer.execute("INSERT INTO filler (body) VALUES (?)", (b"x",))
+                writer.commit()
+                writes += 1
+                time.sleep(0.002)
+        finally:
+            writer.close()
+
+    thread = threading.Thread(target=_writer, daemon=True)
+    thread.start()
+    try:
+        while writes == 0:
+            time.sleep(0.001)
+        snapshot_path = tmp_path / "snapshot.db"
+        started = time.monotonic()
+        BackupService(tmp_path)._snapshot_sqlite(snapshot_path)
+        elapsed = time.monotonic() - started
+    finally:
+        stop.set()
+        thread.join()
+
+    # 源库持续写入时快照仍须一次完成（分步 backup 会在每次写入后重启）
+    assert elapsed < 10
+    with sqlite3.connect(snapshot_path) as conn:
+        assert conn.execute("PRAGMA integrity_check").fetchone()[0] == "ok"
+        assert conn.execute("SELECT COUNT(*) FROM filler").fetchone()[0] >= 2048
+        assert conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0] == 1
+
+
+def _write_backdated(path: Path, content: bytes) -> None:
+    # mtime 回拨到 stat 缓存的 racy 窗口之外，模拟「上次 backup 之前写入」的文件
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content)
+    past = path.stat().st_mtime - 60
+    os.utime(path, (past, past))
+
+
+async def _incremental_history(tmp_path: Path) -> tuple[BackupService, list[tuple]]:
+    """三次增量 backup：初始 / 无变化 / 改写大文件一个 chunk 并删除一个文件。"""
+    await _seed_project(tmp_path)
+    artifacts_dir = tmp_path / "data" / "artifacts"
+    big_path = artifacts_dir / "blobs" / "big.bin"
+    note_path = artifacts_dir / "blobs" / "note.txt"
+    big_v1 = os.urandom(4096 * 3)
+    _write_backdated(big_path, big_v1)
+    _write_backdated(note_path, b"note")
+    service = BackupService(tmp_path, chunk_bytes=4096)
+
+    history = []
+    bundle = await service.create_bundle(incremental=True, label="nightly")
+    history.append(
+        (bundle, {"artifacts/blobs/big.bin": big_v1, "artifacts/blobs/note.txt": b"note"})
+    )
+    bundle = await service.create_bundle(incremental=True)
+    history.append((bundle, history[-1][1]))
+
+    big_v2 = big_v1[:4096] + os.urandom(4096) + big_v1[8192:]
+    _write_backdated(big_path, big_v2)
+    note_path.unlink()
+    bundle = await service.create_bundle(incremental=True)
+    history.append((bundle, {"artifacts/blobs/big.bin": big_v2}))
+    return service, history
+
+
+@pytest.mark.asyncio
+async def test_incremental_bundle_stores_only_changed_content(tmp_path: Path) -> None:
+    _, history = await _incremental_history(tmp_path)
+    (first, _), (second, _), (third, _) = history
+
+    store_dir = tmp_path / "data" / "backups" / "incremental"
+    assert Path(first.output_path) == store_dir / "manifests" / f"{first.bundle_id}.json"
+    assert first.manifest.bundle_format == "incremental"
+    assert first.manifest.parent_bundle_id is None
+    assert "label: nightly" in first.manifest.notes
+
+    # 未变化的文件命中 stat 缓存，不进入 delta manifest（SQLite 快照含审计事件，必然变化）
+    assert second.manifest.parent_bundle_id == first.bundle_id
+    assert {entry.relative_path for entry in second.manifest.files} == {"sqlite/octoagent.db"}
+    assert second.size_bytes < first.size_bytes
+
+    assert third.manifest.parent_bundle_id == second.bundle_id
+    assert third.manifest.removed_paths == ["artifacts/blobs/note.txt"]
+    changed = {entry.relative_path: entry for entry in third.manifest.files}
+    assert "artifacts/blobs/big.bin" in changed
+    old_big = next(e for e in first.manifest.files if e.relative_path == "artifacts/blobs/big.bin")
+    new_chunks = changed["artifacts/blobs/big.bin"].chunks
+    assert len(new_chunks) == 3
+    assert [a == b for a, b in zip(old_big.chunks, new_chunks, strict=True)] == [True, False, True]
+
+    latest = RecoveryStatusStore(tmp_path).load_latest_backup()
+    assert latest is not None
+    assert latest.bundle_id == third.bundle_id
+
+
+@pytest.mark.asyncio
+async def test_plan_restore_reconstructs_every_point_in_incremental_chain(
+    tmp_path: Path,
+) -> None:
+    service, history = await _incremental_history(tmp_path)
+
+    for bundle, expected_files in history:
+        plan = await service.plan_restore(
+            bundle=bundle.output_path, target_root=tmp_path / "restore-clean"
+        )
+        assert plan.compatible is True, plan.conflicts
+        items = {item.relative_path: item for item in plan.restore_items}
+        assert "sqlite/octoagent.db" in items
+        assert "config/octoagent.yaml" in items
+        artifact_files = {
+            path for path, item in items.items()
+            if path.startswith("artifacts/blobs/") and item.kind == "file"
+        }
+        assert artifact_files == set(expected_files)
+
+        store = BackupChunkStore.for_manifest(Path(bundle.output_path))
+        for path, content in expected_files.items():
+            assert b"".join(store.iter_file(items[path])) == content
+
+    # 任一时间点的 SQLite 快照都可还原为可打开的数据库
+    first_sqlite = next(
+        item for item in history[0][0].manifest.files if item.relative_path == "sqlite/octoagent.db"
+    )
+    store = BackupChunkStore.for_manifest(Path(history[0][0].output_path))
+    restored_db = tmp_path / "restored.db"
+    restored_db.write_bytes(b"".join(store.iter_file(first_sqlite)))
+    with sqlite3.connect(restored_db) as conn:
+        task_ids = {row[0] for row in conn.execute("SELECT task_id FROM tasks")}
+    assert "task-022-001" in task_ids
+
+
+@pytest.mark.asyncio
+async def test_plan_restore_reports_damaged_incremental_store(tmp_path: Path) -> None:
+    service, history = await _incremental_history(tmp_path)
+    (first, _), (second, _), (third, _) = history
+    store = BackupChunkStore.for_manifest(Path(third.output_path))
+    sqlite_entry = next(
+        item for item in third.manifest.files if item.relative_path == "sqlite/octoagent.db"
+    )
+    big_entry = next(
+        item for item in third.manifest.files if item.relative_path == "artifacts/blobs/big.bin"
+    )
+
+    store.chunk_path(sqlite_entry.chunks[0]).unlink()
+    store.chunk_path(big_entry.chunks[1]).write_bytes(zlib.compress(b"tampered"))
+    plan = await service.plan_restore(bundle=third.output_path, target_root=tmp_path / "r")
+    conflict_types = {(c.conflict_type, c.target_path) for c in plan.conflicts}
+    assert plan.compatible is False
+    assert ("missing_required_file", "sqlite/octoagent.db") in conflict_types
+    assert ("checksum_mismatch", "artifacts/blobs/big.bin") in conflict_types
+
+    Path(first.output_path).unlink()
+    broken = await service.plan_restore(bundle=second.output_path, target_root=tmp_path / "r")
+    assert [c.conflict_type for c in broken.conflicts] == ["invalid_bundle"]
+    assert first.bundle_id in broken.conflicts[0].message
+    assert RecoveryStatusStore(tmp_path).load_recovery_drill().status == "FAILED"
+
+
 @pytest.mark.asyncio
 async def test_export_chats_outputs_manifest_and_payload_file(tmp_path: Path) -> None:
     task_id = await _seed_project(tmp_path)
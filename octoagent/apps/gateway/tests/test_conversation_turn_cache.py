@@ -0,0 +1,168 @@
+"""ConversationTurnCache：增量物化对话轮次、跨 service 共享、锚点失配重建。"""
+
+from __future__ import annotations
+
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+
+import pytest_asyncio
+from octoagent.core.models import ActorType, Event, EventType
+from octoagent.core.models.message import NormalizedMessage
+from octoagent.core.store import create_store_group
+from octoagent.gateway.services.context_compaction import (
+    ContextCompactionService,
+    estimate_text_tokens,
+)
+from octoagent.gateway.services.sse_hub import SSEHub
+from octoagent.gateway.services.task_service import TaskService
+from ulid import ULID
+
+
+@pytest_asyncio.fixture
+async def store_group(tmp_path: Path):
+    group = await create_store_group(str(tmp_path / "turns.db"), str(tmp_path / "artifacts"))
+    yield group
+    await group.close()
+
+
+async def _new_task(store_group) -> str:
+    service = TaskService(store_group, SSEHub(), storage_only=True)
+    task_id, _ = await service.create_task(
+        NormalizedMessage(text="第 0 轮问题", idempotency_key=f"turn-cache-{ULID()}")
+    )
+    return task_id
+
+
+async def _append_round(store_group, task_id: str, index: int) -> None:
+    service = TaskService(store_group, SSEHub(), storage_only=True)
+    event_store = store_group.event_store
+    await event_store.append_event_committed(
+        Event(
+            event_id=str(ULID()),
+            task_id=task_id,
+            task_seq=await event_store.get_next_task_seq(task_id),
+            ts=datetime.now(UTC),
+            type=EventType.MODEL_CALL_COMPLETED,
+            actor=ActorType.SYSTEM,
+            payload={"response_summary": f"第 {index} 轮回答"},
+            trace_id=f"trace-{task_id}",
+        ),
+        update_task_pointer=False,
+    )
+    await service.append_user_message(task_id, f"第 {index + 1} 轮问题")
+
+
+class _DecodeCounter:
+    def __init__(self, service: ContextCompactionService) -> None:
+        self.calls = 0
+        original = service._load_assistant_content
+
+        async def _counting(payload):
+            self.calls += 1
+            return await original(payload)
+
+        service._load_assistant_content = _counting  # type: ignore[method-assign]
+
+
+async def test_incremental_load_only_decodes_new_events(store_group) -> None:
+    task_id = await _new_task(store_group)
+    for index in range(3):
+        await _append_round(store_group, task_id, index)
+
+    service = ContextCompactionService(store_group)
+    counter = _DecodeCounter(service)
+    first = await service._load_conversation_turns(task_id)
+    await _append_round(store_group, task_id, 3)
+    second = await service._load_conversation_turns(task_id)
+
+    assert [turn.content for turn in second[: len(first)]] == [turn.content for turn in first]
+    assert [turn.role for turn in second[-2:]] == ["assistant", "user"]
+    assert len(second) == len(first) + 2
+    # 首次 3 个回答 + 增量 1 个
+    assert counter.calls == 4
+    assert all(turn.token_count == estimate_text_tokens(turn.content) for turn in second)
+
+
+async def test_cache_is_shared_across_service_instances(store_group) -> None:
+    task_id = await _new_task(store_group)
+    await _append_round(store_group, task_id, 0)
+    await ContextCompactionService(store_group)._load_conversation_turns(task_id)
+
+    fresh = ContextCompactionService(store_group)
+    counter = _DecodeCounter(fresh)
+    turns = await fresh._load_conversation_turns(task_id)
+
+    assert len(turns) == 3
+    assert counter.calls == 0
+
+
+async def test_deleted_events_trigger_rebuild(store_group) -> None:
+    task_id = await _new_task(store_group)
+    await _append_round(store_group, task_id, 0)
+    service = ContextCompactionService(store_group)
+    assert len(await service._load_conversation_turns(task_id)) == 3
+
+    await store_group.event_store.delete_events_by_task_ids([task_id])
+    await store_group.conn.commit()
+    await TaskService(store_group, SSEHub(), storage_only=True).append_user_message(
+        task_id, "重新开始"
+    )
+
+    turns = await service._load_conversation_turns(task_id)
+    assert [turn.content for turn in turns] == ["重新开始"]
+
+
+async def test_explicit_invalidate_rebuilds(store_group) -> None:
+    task_id = await _new_task(store_group)
+    await _append_round(store_group, task_id, 0)
+    service = ContextCompactionService(store_group)
+    await service._load_conversation_turns(task_id)
+    counter = _DecodeCounter(service)
+
+    service.invalidate_conversation_turns(task_id)
+    await service._load_conversation_turns(task_id)
+
+    assert counter.calls == 1
+
+
+async def test_build_context_uses_cached_token_counts(store_group) -> None:
+    task_id = await _new_task(store_group)
+    await _append_round(store_group, task_id, 0)
+    service = ContextCompactionService(store_group)
+
+    compiled = await service.build_context(
+        task_id=task_id, fallback_user_text="", llm_service=None
+    )
+
+    assert compiled.raw_tokens == sum(
+        estimate_text_tokens(message["content"]) for message in compiled.messages
+    )
+
+
+async def test_load_latency_stays_flat_as_history_grows(store_group) -> None:
+    """增量读取的耗时与历史长度无关（对比全量重建）"""
+    task_id = await _new_task(store_group)
+    service = ContextCompactionService(store_group)
+    samples: dict[int, float] = {}
+    for index in range(400):
+        await _append_round(store_group, task_id, index)
+        if index in (50, 399):
+            await service._load_conversation_turns(task_id)
+            await _append_round(store_group, task_id, index + 1000)
+            started = time.perf_counter()
+            await service._load_conversation_turns(task_id)
+            samples[index] = time.perf_counter() - started
+        elif index % 25 == 0:
+            await service._load_conversation_turns(task_id)
+
+    service.invalidate_conversation_turns(task_id)
+    started = time.perf_counter()
+    await service._load_conversation_turns(task_id)
+    full_rebuild = time.perf_counter() - started
+
+    print(
+        f"\nturn cache incremental@50={samples[50] * 1000:.2f}ms "
+        f"incremental@400={samples[399] * 1000:.2f}ms full={full_rebuild * 1000:.2f}ms"
+    )
+    assert samples[399] < full_rebuild
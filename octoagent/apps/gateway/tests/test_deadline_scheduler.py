@@ -0,0 +1,247 @@
+"""DeadlineScheduler：最小堆语义，以及 TaskRunner 超时监控按 deadline 触发（无轮询扫库）。"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+from unittest.mock import AsyncMock
+
+import pytest_asyncio
+from octoagent.core.models import TaskStatus
+from octoagent.core.models.message import NormalizedMessage
+from octoagent.core.store import create_store_group
+from octoagent.gateway.services.deadline_scheduler import DeadlineScheduler, to_epoch
+from octoagent.gateway.services.llm_service import LLMService
+from octoagent.gateway.services.sse_hub import SSEHub
+from octoagent.gateway.services.task_runner import TaskRunner
+from octoagent.gateway.services.task_service import TaskService
+
+from apps.gateway.tests.runtime_service_fixtures import runtime_service_fixture
+
+
+@pytest_asyncio.fixture
+async def store_group(tmp_path: Path):
+    sg = await create_store_group(
+        str(tmp_path / "deadline.db"),
+        str(tmp_path / "artifacts"),
+    )
+    yield sg
+    await sg.close()
+
+
+async def _running_task(
+    store_group, sse_hub: SSEHub, sender: str, *, with_job: bool = True
+) -> str:
+    service = TaskService(store_group, sse_hub, storage_only=True)
+    task_id, _ = await service.create_task(
+        NormalizedMessage(
+            text=f"hello from {sender}",
+            channel="web",
+            sender_id=sender,
+            idempotency_key=f"deadline-{sender}",
+        )
+    )
+    await service._write_state_transition(
+        task_id=task_id,
+        from_status=TaskStatus.CREATED,
+        to_status=TaskStatus.RUNNING,
+        trace_id=f"trace-{task_id}",
+        reason="test_setup",
+    )
+    if with_job:
+        await store_group.task_job_store.create_job(task_id, "hello", None)
+        await store_group.task_job_store.mark_running(task_id)
+    return task_id
+
+
+async def _wait_for(predicate, timeout: float = 3.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if await predicate():
+            return
+        await asyncio.sleep(0.02)
+    raise AssertionError("condition not met before timeout")
+
+
+def test_heap_orders_overwrites_and_disarms() -> None:
+    deadlines = DeadlineScheduler()
+    deadlines.arm("a", 30.0)
+    deadlines.arm("b", 10.0)
+    deadlines.arm("c", 20.0)
+    deadlines.arm("b", 40.0)  # 覆盖：旧条目惰性失效
+    deadlines.disarm("c")
+
+    assert deadlines.next_deadline() == 30.0
+    assert deadlines.pop_expired(35.0) == ["a"]
+    assert deadlines.pop_expired(100.0) == ["b"]
+    assert len(deadlines) == 0 and deadlines.next_deadline() is None
+
+
+def test_repeated_rearm_keeps_heap_bounded() -> None:
+    deadlines = DeadlineScheduler()
+    for i in range(1000):
+        deadlines.arm("job", float(i))
+
+    assert len(deadlines._heap) <= 64 * 4
+    assert deadlines.deadline_of("job") == 999.0
+
+
+def test_to_epoch_treats_naive_as_utc() -> None:
+    aware = datetime(2026, 1, 1, tzinfo=UTC)
+    assert to_epoch(aware.replace(tzinfo=None)) == to_epoch(aware)
+
+
+async def test_wait_until_wakes_on_earlier_arm() -> None:
+    deadlines = DeadlineScheduler()
+    deadlines.arm("late", time.time() + 60)
+    waiter = asyncio.create_task(deadlines.wait_until(deadlines.next_deadline()))
+    await asyncio.sleep(0.01)
+
+    deadlines.arm("soon", time.time() + 0.05)
+
+    await asyncio.wait_for(waiter, 1)
+
+
+async def test_approval_deadlines_fire_without_polling(store_group) -> None:
+    sse_hub = SSEHub()
+    runner = TaskRunner(
+        store_group=store_group,
+        sse_hub=sse_hub,
+        runtime_services=runtime_service_fixture(LLMService()).bundle,
+        monitor_interval_seconds=3600,
+        approval_timeout_seconds=0.3,
+    )
+    runner._notify_completion = AsyncMock()
+    runner._mark_execution_terminal = AsyncMock()
+    scans = 0
+    list_jobs = store_group.task_job_store.list_jobs
+
+    async def _counting_list_jobs(statuses):
+        nonlocal scans
+        scans += 1
+        return await list_jobs(statuses)
+
+    store_group.task_job_store.list_jobs = _counting_list_jobs
+
+    # 启动前已在 WAITING_APPROVAL：由批量查询重建
+    recovered = await _running_task(store_group, sse_hub, "recovered")
+    await runner.execution_console.mark_waiting_approval(task_id=recovered)
+    runner._deadlines.clear()
+    monitor = asyncio.create_task(runner._monitor_loop())
+    try:
+        # 运行中进入 WAITING_APPROVAL：由 console 回调 arm
+        await asyncio.sleep(0.05)
+        live = await _running_task(store_group, sse_hub, "live")
+        await runner.execution_console.mark_waiting_approval(task_id=live)
+
+        async def _both_failed() -> bool:
+            return runner._notify_completion.await_count == 2
+
+        await _wait_for(_both_failed)
+        for task_id in (recovered, live):
+            task = await store_group.task_store.get_task(task_id)
+            assert task.status == TaskStatus.FAILED
+        assert scans == 0
+        assert len(runner._deadlines) == 0
+    finally:
+        monitor.cancel()
+        await asyncio.gather(monitor, return_exceptions=True)
+
+
+async def test_approval_deadline_rearms_when_task_updated(store_group) -> None:
+    sse_hub = SSEHub()
+    runner = TaskRunner(
+        store_group=store_group,
+        sse_hub=sse_hub,
+        runtime_services=runtime_service_fixture(LLMService()).bundle,
+        approval_timeout_seconds=60,
+    )
+    task_id = await _running_task(store_group, sse_hub, "touched")
+    await runner.execution_console.mark_waiting_approval(task_id=task_id)
+    task = await store_group.task_store.get_task(task_id)
+    key = ("approval", task_id)
+
+    # deadline 提前到期，但 updated_at 仍在超时窗口内 → 重新 arm，不推 FAILED
+    runner._deadlines.arm(key, time.time() - 1)
+    assert runner._deadlines.pop_expired() == [key]
+    assert await runner._approval_deadline_due(task_id) is False
+
+    expected = to_epoch(task.updated_at) + 60
+    assert runner._deadlines.deadline_of(key) == expected
+    task = await store_group.task_store.get_task(task_id)
+    assert task.status == TaskStatus.WAITING_APPROVAL
+
+
+async def test_job_deadline_times_out_admitted_job(store_group) -> None:
+    sse_hub = SSEHub()
+    runner = TaskRunner(
+        store_group=store_group,
+        sse_hub=sse_hub,
+        runtime_services=runtime_service_fixture(LLMService()).bundle,
+        timeout_seconds=0.3,
+        monitor_interval_seconds=3600,
+    )
+    runner._notify_completion = AsyncMock()
+    runner._mark_execution_terminal = AsyncMock()
+
+    async def _hang(**_kwargs) -> None:
+        await asyncio.Event().wait()
+
+    runner._run_job = _hang  # type: ignore[method-assign]
+    task_id = await _running_task(store_group, sse_hub, "slow", with_job=False)
+    monitor = asyncio.create_task(runner._monitor_loop())
+    try:
+        await runner.enqueue(task_id, "hello")
+
+        async def _job_failed() -> bool:
+            job = await store_group.task_job_store.get_job(task_id)
+            return (
+                job is not None
+                and job.status == "FAILED"
+                and task_id not in runner._running_jobs
+            )
+
+        # 对账周期为 1 小时：3 秒内超时只能来自 deadline 触发
+        await _wait_for(_job_failed)
+        job = await store_group.task_job_store.get_job(task_id)
+        assert job.last_error.startswith("job_timeout_after")
+    finally:
+        monitor.cancel()
+        await asyncio.gather(monitor, return_exceptions=True)
+        await runner.shutdown()
+
+
+async def test_reconcile_catches_unarmed_approval_within_interval(store_group) -> None:
+    sse_hub = SSEHub()
+    runner = TaskRunner(
+        store_group=store_group,
+        sse_hub=sse_hub,
+        runtime_services=runtime_service_fixture(LLMService()).bundle,
+        monitor_interval_seconds=0.2,
+        approval_timeout_seconds=0.1,
+    )
+    runner._notify_completion = AsyncMock()
+    runner._mark_execution_terminal = AsyncMock()
+    task_id = await _running_task(store_group, sse_hub, "unarmed")
+    monitor = asyncio.create_task(runner._monitor_loop())
+    try:
+        # 绕过 console 直接写库进入 WAITING_APPROVAL：没有 deadline，只能靠全量对账兜底
+        await asyncio.sleep(0.05)
+        await store_group.conn.execute(
+            "UPDATE tasks SET status = ?, updated_at = ? WHERE task_id = ?",
+            (TaskStatus.WAITING_APPROVAL.value, datetime.now(UTC).isoformat(), task_id),
+        )
+        await store_group.conn.commit()
+        await store_group.task_job_store.mark_waiting_approval(task_id)
+        assert len(runner._deadlines) == 0
+
+        async def _failed() -> bool:
+            task = await store_group.task_store.get_task(task_id)
+            return task.status == TaskStatus.FAILED
+
+        await _wait_for(_failed, timeout=2.0)
+    finally:
+        monitor.cancel()
+        await asyncio.gather(monitor, return_exceptions=True)
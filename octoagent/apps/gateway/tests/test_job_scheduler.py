@@ -0,0 +1,314 @@
+"""JobScheduler：并发上限、优先级、公平轮转、park 让出名额与 TaskRunner 准入接入。"""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import pytest
+from octoagent.core.models.message import NormalizedMessage
+from octoagent.core.store import create_store_group
+from octoagent.gateway.services.job_scheduler import (
+    AdmissionLimits,
+    JobPriority,
+    JobScheduler,
+    parse_concurrency_limits,
+)
+from octoagent.gateway.services.llm_service import LLMService
+from octoagent.gateway.services.sse_hub import SSEHub
+from octoagent.gateway.services.task_runner import TaskRunner
+from octoagent.gateway.services.task_service import TaskService
+
+from apps.gateway.tests.runtime_service_fixtures import runtime_service_fixture
+
+
+async def _settle() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+async def _admit_in_order(
+    scheduler: JobScheduler, requests: list[tuple[str, JobPriority, str, str | None]]
+) -> tuple[list[str], list[asyncio.Task[float]]]:
+    """占满唯一名额后批量排队，逐个释放并记录准入顺序"""
+    order: list[str] = []
+    await scheduler.acquire("blocker")
+
+    async def _one(task_id: str, priority: JobPriority, fair_key: str, alias: str | None):
+        wait_ms = await scheduler.acquire(
+            task_id, priority=priority, fair_key=fair_key, model_alias=alias
+        )
+        order.append(task_id)
+        return wait_ms
+
+    tasks = [asyncio.create_task(_one(*request)) for request in requests]
+    await _settle()
+    current = "blocker"
+    for _ in requests:
+        scheduler.release(current)
+        await _settle()
+        current = order[-1]
+    scheduler.release(current)
+    return order, tasks
+
+
+def test_parse_concurrency_limits() -> None:
+    assert parse_concurrency_limits(" main=4, cheap = 2,bad,zero=0,x=y") == {
+        "main": 4,
+        "cheap": 2,
+    }
+
+
+async def test_priority_classes_admit_interactive_first() -> None:
+    scheduler = JobScheduler(AdmissionLimits(max_concurrent=1))
+
+    order, _ = await _admit_in_order(
+        scheduler,
+        [
+            ("cron", JobPriority.AUTOMATION, "system:cron", None),
+            ("child", JobPriority.DELEGATED, "web:owner", None),
+            ("chat", JobPriority.INTERACTIVE, "telegram:alice", None),
+        ],
+    )
+
+    assert order == ["chat", "child", "cron"]
+
+
+async def test_fair_round_robin_across_senders() -> None:
+    scheduler = JobScheduler(AdmissionLimits(max_concurrent=1))
+    flood = [(f"spam-{i}", JobPriority.INTERACTIVE, "telegram:spammer", None) for i in range(3)]
+
+    order, _ = await _admit_in_order(
+        scheduler,
+        [*flood, ("bob-1", JobPriority.INTERACTIVE, "telegram:bob", None)],
+    )
+
+    # 刷屏发送者连续排队时，其他发送者在第二个名额就被轮到
+    assert order == ["spam-0", "bob-1", "spam-1", "spam-2"]
+
+
+async def test_alias_and_provider_caps_skip_blocked_heads() -> None:
+    scheduler = JobScheduler(
+        AdmissionLimits(
+            max_concurrent=10,
+            per_model_alias={"main": 1},
+            per_provider={"openai": 2},
+        ),
+        provider_resolver=lambda alias: {"main": "anthropic", "cheap": "openai"}.get(alias),
+    )
+
+    await scheduler.acquire("main-1", model_alias="main")
+    blocked = asyncio.create_task(scheduler.acquire("main-2", model_alias="main"))
+    await _settle()
+    # main 已满，但 cheap（另一 provider）不受队首阻塞
+    await scheduler.acquire("cheap-1", model_alias="cheap", fair_key="other")
+    await scheduler.acquire("cheap-2", model_alias="cheap", fair_key="other")
+    third_cheap = asyncio.create_task(scheduler.acquire("cheap-3", model_alias="cheap"))
+    await _settle()
+
+    snapshot = scheduler.snapshot()
+    assert snapshot["running_by_model_alias"] == {"main": 1, "cheap": 2}
+    assert snapshot["running_by_provider"] == {"anthropic": 1, "openai": 2}
+    assert snapshot["queue_depth"]["interactive"] == 2
+    assert not blocked.done() and not third_cheap.done()
+
+    scheduler.release("main-1")
+    scheduler.release("cheap-1")
+    await asyncio.wait_for(asyncio.gather(blocked, third_cheap), 1)
+    assert scheduler.snapshot()["queue_depth"]["interactive"] == 0
+
+
+async def test_park_yields_slot_and_unpark_requeues_at_front() -> None:
+    scheduler = JobScheduler(AdmissionLimits(max_concurrent=1))
+    await scheduler.acquire("waiting-input")
+    next_job = asyncio.create_task(scheduler.acquire("next"))
+    later_job = asyncio.create_task(scheduler.acquire("later"))
+
+    async with scheduler.parked("waiting-input"):
+        await _settle()
+        assert next_job.done()
+        assert scheduler.snapshot()["parked"] == 1
+        resumed = asyncio.create_task(scheduler.unpark("waiting-input"))
+        await _settle()
+        # 已由 unpark 重新排队，退出 parked 时不会重复排队
+        scheduler.release("next")
+        await asyncio.wait_for(resumed, 1)
+
+    assert scheduler.is_admitted("waiting-input")
+    assert not later_job.done()
+    scheduler.release("waiting-input")
+    await asyncio.wait_for(later_job, 1)
+
+
+async def test_cancelled_waiter_leaves_queue() -> None:
+    scheduler = JobScheduler(AdmissionLimits(max_concurrent=1))
+    await scheduler.acquire("running")
+    waiter = asyncio.create_task(scheduler.acquire("queued"))
+    await _settle()
+    assert scheduler.is_queued("queued")
+
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    assert not scheduler.is_queued("queued")
+    assert scheduler.snapshot()["queued"] == []
+    scheduler.release("running")
+    assert scheduler.snapshot()["running"] == 0
+
+
+async def test_wait_metrics_recorded_per_priority() -> None:
+    scheduler = JobScheduler(AdmissionLimits(max_concurrent=1))
+
+    await _admit_in_order(
+        scheduler,
+        [("child", JobPriority.DELEGATED, "web:owner", None)],
+    )
+
+    wait = scheduler.snapshot()["wait"]
+    assert wait["interactive"]["admitted"] == 1
+    assert wait["delegated"]["admitted"] == 1
+    assert wait["automation"]["admitted"] == 0
+
+
+async def test_task_runner_queues_jobs_beyond_global_cap(tmp_path: Path) -> None:
+    store_group = await create_store_group(
+        str(tmp_path / "runner-admission.db"),
+        str(tmp_path / "artifacts"),
+    )
+    sse_hub = SSEHub()
+    task_service = TaskService(store_group, sse_hub, storage_only=True)
+    runner = TaskRunner(
+        store_group=store_group,
+        sse_hub=sse_hub,
+        runtime_services=runtime_service_fixture(LLMService()).bundle,
+        timeout_seconds=60,
+        monitor_interval_seconds=60,
+        job_scheduler=JobScheduler(AdmissionLimits(max_concurrent=1)),
+    )
+    started: list[str] = []
+    gates: dict[str, asyncio.Event] = {}
+
+    async def _fake_run_job(*, task_id: str, **_kwargs) -> None:
+        started.append(task_id)
+        await gates.setdefault(task_id, asyncio.Event()).wait()
+
+    runner._run_job = _fake_run_job  # type: ignore[method-assign]
+    task_ids = []
+    for sender in ("alice", "bob"):
+        task_id, _ = await task_service.create_task(
+            NormalizedMessage(
+                text=f"hello from {sender}",
+                channel="telegram",
+                sender_id=sender,
+                idempotency_key=f"admission-{sender}",
+            )
+        )
+        task_ids.append(task_id)
+        await runner.enqueue(task_id, "hello")
+
+    try:
+        for _ in range(100):
+            if runner.admission_snapshot()["queued"]:
+                break
+            await asyncio.sleep(0.01)
+        assert started == [task_ids[0]]
+        snapshot = runner.admission_snapshot()
+        assert snapshot["running"] == 1
+        assert snapshot["queued"][0]["fair_key"] == "telegram:bob"
+
+        # 排队中的 job 不计入执行超时
+        runner._running_jobs[task_ids[1]].started_at = datetime.now(UTC) - timedelta(hours=5)
+        await runner._monitor_loop_step()
+        assert task_ids[1] in runner._running_jobs
+
+        gates.setdefault(task_ids[0], asyncio.Event()).set()
+        for _ in range(50):
+            if started == task_ids:
+                break
+            await asyncio.sleep(0.01)
+        assert started == task_ids
+        gates.setdefault(task_ids[1], asyncio.Event()).set()
+    finally:
+        await runner.shutdown()
+        await store_group.close()
+
+
+async def test_free_slots_counts_running_and_waiting() -> None:
+    assert JobScheduler().free_slots() is None
+    scheduler = JobScheduler(AdmissionLimits(max_concurrent=2))
+    assert scheduler.free_slots() == 2
+    await scheduler.acquire("a")
+    assert scheduler.free_slots() == 1
+    await scheduler.acquire("b")
+    waiter = asyncio.create_task(scheduler.acquire("c"))
+    await _settle()
+    assert scheduler.free_slots() == 0
+    scheduler.release("a")
+    await waiter
+    assert scheduler.free_slots() == 0
+    scheduler.release("b")
+    scheduler.release("c")
+    assert scheduler.free_slots() == 2
+
+
+async def test_dispatch_queued_jobs_starts_only_free_slots(tmp_path: Path) -> None:
+    store_group = await create_store_group(
+        str(tmp_path / "runner-backlog.db"),
+        str(tmp_path / "artifacts"),
+    )
+    sse_hub = SSEHub()
+    task_service = TaskService(store_group, sse_hub, storage_only=True)
+    runner = TaskRunner(
+        store_group=store_group,
+        sse_hub=sse_hub,
+        runtime_services=runtime_service_fixture(LLMService()).bundle,
+        timeout_seconds=60,
+        monitor_interval_seconds=60,
+        job_scheduler=JobScheduler(AdmissionLimits(max_concurrent=1)),
+    )
+    started: list[str] = []
+    gates: dict[str, asyncio.Event] = {}
+
+    async def _fake_run_job(*, task_id: str, **_kwargs) -> None:
+        started.append(task_id)
+        await gates.setdefault(task_id, asyncio.Event()).wait()
+
+    runner._run_job = _fake_run_job  # type: ignore[method-assign]
+    task_ids = []
+    for index in range(3):
+        task_id, _ = await task_service.create_task(
+            NormalizedMessage(
+                text=f"backlog {index}",
+                channel="telegram",
+                sender_id=f"user-{index}",
+                idempotency_key=f"backlog-{index}",
+            )
+        )
+        await store_group.task_job_store.create_job(task_id=task_id, user_text="hello")
+        task_ids.append(task_id)
+
+    try:
+        # 模拟重启后的积压：只为空闲名额启动 job，其余留在 QUEUED
+        await runner._dispatch_queued_jobs()
+        assert set(runner._running_jobs) == {task_ids[0]}
+        queued = await store_group.task_job_store.list_jobs(["QUEUED"])
+        assert [job.task_id for job in queued] == task_ids[1:]
+
+        for task_id in task_ids:
+            for _ in range(100):
+                if task_id in started:
+                    break
+                await asyncio.sleep(0.01)
+            assert started[-1] == task_id
+            assert len(runner._running_jobs) == 1
+            gates.setdefault(task_id, asyncio.Event()).set()
+        for _ in range(100):
+            if not runner._running_jobs:
+                break
+            await asyncio.sleep(0.01)
+        assert not await store_group.task_job_store.list_jobs(["QUEUED"])
+    finally:
+        await runner.shutdown()
+        await store_group.close()
@@ -4,20 +4,28 @@
 - list[{...}]
 - {"servers": [{...}]}
 - Claude Code 风格 {"<name>": {...}}（Agent 写错常见 schema，兼容识别）
+
+以及 refresh 的并发发现 / 超时 / 工具 diff 与清单缓存启动路径。
 """
 
 from __future__ import annotations
 
+import asyncio
 import json
 from pathlib import Path
+from types import SimpleNamespace
 
 import pytest
+from mcp import types as mcp_types
 from octoagent.core.models.event import Event
 from octoagent.core.models import BuiltinToolAvailabilityStatus
+from octoagent.gateway.services import mcp_registry as mcp_registry_module
 from octoagent.gateway.services.mcp_registry import (
     McpRegistryService,
+    McpServerConfig,
     McpToolRecord,
 )
+from octoagent.tooling import ToolBroker
 
 
 class _StubEventStore:
@@ -429,3 +437,243 @@ async def test_refresh_partial_config_still_runs_diff_close(
     assert "alpha" not in pool.close_calls
     # 收尾：alpha 仍在 pool，broken/ghost 已清理
     assert pool.known_server_names() == {"alpha"}
+
+
+# ── 并发发现 / 工具 diff / 清单缓存 ─────────────────────────
+
+
+def _tool(name: str, description: str = "") -> mcp_types.Tool:
+    return mcp_types.Tool(
+        name=name,
+        description=description or f"{name} tool",
+        inputSchema={"type": "object", "properties": {}},
+    )
+
+
+class _FakeSession:
+    def __init__(self, pool: _FakeDiscoveryPool, server_name: str) -> None:
+        self._pool = pool
+        self._server_name = server_name
+
+    async def list_tools(self, cursor: str | None = None) -> mcp_types.ListToolsResult:
+        await self._pool.list_gate.wait()
+        return mcp_types.ListToolsResult(tools=list(self._pool.tools[self._server_name]))
+
+
+class _FakeDiscoveryPool:
+    """按 server 返回预设工具；记录 open 并发度，不真启子进程。"""
+
+    def __init__(
+        self,
+        tools: dict[str, list[mcp_types.Tool]],
+        *,
+        open_delay_s: dict[str, float] | None = None,
+    ) -> None:
+        self.tools = tools
+        self.open_delay_s = open_delay_s or {}
+        self.entries: dict[str, SimpleNamespace] = {}
+        self.open_calls: list[str] = []
+        self.close_calls: list[str] = []
+        self.active = 0
+        self.max_active = 0
+        self.list_gate = asyncio.Event()
+        self.list_gate.set()
+
+    async def open(self, server_name: str, config: McpServerConfig) -> None:
+        self.open_calls.append(server_name)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.open_delay_s.get(server_name, 0.01))
+        finally:
+            self.active -= 1
+        self.entries[server_name] = SimpleNamespace(config=config, status="connected")
+
+    def get_entry(self, server_name: str) -> SimpleNamespace | None:
+        return self.entries.get(server_name)
+
+    async def get_session(self, server_name: str) -> _FakeSession:
+        return _FakeSession(self, server_name)
+
+    def known_server_names(self) -> set[str]:
+        return set(self.entries)
+
+    async def close(self, server_name: str) -> None:
+        self.close_calls.append(server_name)
+        self.entries.pop(server_name, None)
+
+    async def close_all(self) -> None:
+        self.entries.clear()
+
+
+def _spy_broker() -> tuple[ToolBroker, dict[str, list[str]]]:
+    broker = ToolBroker(event_store=_StubEventStore())
+    calls: dict[str, list[str]] = {"register": [], "unregister": []}
+    try_register = broker.try_register
+    unregister = broker.unregister
+
+    async def _try_register(meta, handler):  # noqa: ANN001, ANN202
+        calls["register"].append(meta.name)
+        return await try_register(meta, handler)
+
+    async def _unregister(tool_name: str) -> bool:
+        calls["unregister"].append(tool_name)
+        return await unregister(tool_name)
+
+    broker.try_register = _try_register  # type: ignore[method-assign]
+    broker.unregister = _unregister  # type: ignore[method-assign]
+    return broker, calls
+
+
+def _discovery_registry(
+    tmp_path: Path,
+    broker: ToolBroker,
+    pool: _FakeDiscoveryPool,
+    configs: list[McpServerConfig],
+) -> McpRegistryService:
+    return McpRegistryService(
+        project_root=tmp_path,
+        tool_broker=broker,
+        config_path=tmp_path / "mcp-servers.json",
+        server_configs=configs,
+        session_pool=pool,
+    )
+
+
+@pytest.mark.asyncio
+async def test_refresh_discovers_servers_concurrently_with_bounded_fanout(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(mcp_registry_module, "MCP_DISCOVERY_CONCURRENCY", 2)
+    names = [f"srv{i}" for i in range(5)]
+    pool = _FakeDiscoveryPool({name: [_tool("ping")] for name in names})
+    broker, _ = _spy_broker()
+    registry = _discovery_registry(
+        tmp_path,
+        broker,
+        pool,
+        [McpServerConfig(name=name, command="/bin/echo") for name in names],
+    )
+
+    await registry.refresh()
+
+    assert pool.max_active == 2
+    assert sorted(pool.open_calls) == names
+    assert registry.healthy_server_count() == 5
+    assert {tool.registered_name for tool in registry.list_tools()} == {
+        f"mcp.{name}.ping" for name in names
+    }
+
+
+@pytest.mark.asyncio
+async def test_refresh_times_out_slow_server_without_blocking_others(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(mcp_registry_module, "MCP_DISCOVERY_TIMEOUT_S", 0.1)
+    pool = _FakeDiscoveryPool(
+        {"fast": [_tool("ping")], "slow": [_tool("ping")]},
+        open_delay_s={"slow": 5.0},
+    )
+    broker, _ = _spy_broker()
+    registry = _discovery_registry(
+        tmp_path,
+        broker,
+        pool,
+        [
+            McpServerConfig(name="slow", command="/bin/echo"),
+            McpServerConfig(name="fast", command="/bin/echo"),
+        ],
+    )
+
+    await registry.refresh()
+
+    records = {record.server_name: record for record in registry.list_servers()}
+    assert records["fast"].status == "available"
+    assert records["slow"].status == "error"
+    assert "timed out" in records["slow"].error
+    assert [tool.registered_name for tool in registry.list_tools()] == ["mcp.fast.ping"]
+
+
+@pytest.mark.asyncio
+async def test_refresh_applies_only_tool_diff(tmp_path: Path) -> None:
+    pool = _FakeDiscoveryPool(
+        {
+            "alpha": [_tool("keep"), _tool("edit")],
+            "beta": [_tool("gone")],
+            "gamma": [_tool("new")],
+        }
+    )
+    broker, calls = _spy_broker()
+    alpha = McpServerConfig(name="alpha", command="/bin/echo")
+    registry = _discovery_registry(
+        tmp_path,
+        broker,
+        pool,
+        [alpha, McpServerConfig(name="beta", command="/bin/echo")],
+    )
+    await registry.refresh()
+    kept_record = registry.list_tools(server_name="alpha")[0]
+    calls["register"].clear()
+
+    pool.tools["alpha"] = [_tool("keep"), _tool("edit", "changed description")]
+    registry._server_configs_override = [  # type: ignore[attr-defined]
+        alpha,
+        McpServerConfig(name="gamma", command="/bin/echo"),
+    ]
+    await registry.refresh()
+
+    assert sorted(calls["unregister"]) == ["mcp.alpha.edit", "mcp.beta.gone"]
+    assert sorted(calls["register"]) == ["mcp.alpha.edit", "mcp.gamma.new"]
+    # 未变化的 server 复用已有连接，已删除的 server 被关闭
+    assert pool.open_calls.count("alpha") == 1
+    assert "beta" in pool.close_calls
+    assert registry._tool_records["mcp.alpha.keep"] is kept_record  # type: ignore[attr-defined]
+    assert sorted(meta.name for meta in await broker.discover()) == [
+        "mcp.alpha.edit",
+        "mcp.alpha.keep",
+        "mcp.gamma.new",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_startup_registers_cached_manifest_then_revalidates(tmp_path: Path) -> None:
+    configs = [
+        McpServerConfig(name="alpha", command="/bin/echo"),
+        McpServerConfig(name="beta", command="/bin/echo", args=["v1"]),
+    ]
+    first_broker, _ = _spy_broker()
+    first_pool = _FakeDiscoveryPool({"alpha": [_tool("ping")], "beta": [_tool("pong")]})
+    await _discovery_registry(tmp_path, first_broker, first_pool, configs).refresh()
+    assert (tmp_path / "mcp-tool-manifests.json").exists()
+
+    # 重启：beta 启动参数变化 → 缓存失效，只有 alpha 从缓存注册
+    configs[1] = McpServerConfig(name="beta", command="/bin/echo", args=["v2"])
+    pool = _FakeDiscoveryPool({"alpha": [_tool("ping"), _tool("echo")], "beta": [_tool("pong")]})
+    pool.list_gate.clear()
+    broker, _ = _spy_broker()
+    registry = _discovery_registry(tmp_path, broker, pool, configs)
+    changes: list[int] = []
+
+    async def _on_change() -> None:
+        changes.append(registry.registered_tool_count())
+
+    registry.set_change_listener(_on_change)
+
+    await asyncio.wait_for(registry.startup(), timeout=1)
+
+    assert [tool.registered_name for tool in registry.list_tools()] == ["mcp.alpha.ping"]
+    assert {record.status for record in registry.list_servers()} == {"discovering"}
+
+    pool.list_gate.set()
+    await asyncio.wait_for(registry._revalidate_task, timeout=1)  # type: ignore[arg-type]
+
+    assert changes == [3]
+    assert registry.healthy_server_count() == 2
+    assert sorted(tool.registered_name for tool in registry.list_tools()) == [
+        "mcp.alpha.echo",
+        "mcp.alpha.ping",
+        "mcp.beta.pong",
+    ]
+    await registry.shutdown()
@@ -200,3 +200,212 @@ async def test_open_after_close_captures_fresh_pid_no_dirty_context(
     )
 
     await pool.close("gamma")
+
+
+# ── 多 session：least-loaded 分派 / 扩缩容 / 回收 ───────────────
+
+
+def _fake_pool(monkeypatch: pytest.MonkeyPatch, *, idle_ttl_s: float = 300.0):
+    """用假 session 替换子进程拉起：只验证 session 组调度逻辑。"""
+    from datetime import UTC, datetime
+
+    from octoagent.gateway.services.mcp_session_pool import (
+        McpSessionEntry,
+        McpSessionPool,
+    )
+
+    pool = McpSessionPool(idle_ttl_s=idle_ttl_s)
+    spawned: list[McpSessionEntry] = []
+
+    async def _fake_spawn(server_name: str, config) -> McpSessionEntry:  # noqa: ANN001
+        await asyncio.sleep(0)
+        entry = McpSessionEntry(
+            server_name=server_name,
+            config=config,
+            session=object(),  # type: ignore[arg-type]
+            status="connected",
+            created_at=datetime.now(tz=UTC),
+            pid=1000 + len(spawned),
+        )
+        spawned.append(entry)
+        return entry
+
+    monkeypatch.setattr(pool, "_spawn_entry", _fake_spawn)
+    return pool, spawned
+
+
+def _limits_config(name: str, *, min_sessions: int, max_sessions: int):
+    from octoagent.gateway.services.mcp_registry import McpServerConfig
+
+    return McpServerConfig(
+        name=name,
+        command="/bin/echo",
+        min_sessions=min_sessions,
+        max_sessions=max_sessions,
+    )
+
+
+async def _settle(pool, server_name: str) -> None:  # noqa: ANN001
+    group = pool._servers[server_name]
+    while group.background or group.retiring:
+        await asyncio.gather(
+            *list(group.background), *list(group.retiring), return_exceptions=True
+        )
+
+
+@pytest.mark.asyncio
+async def test_lease_dispatches_least_loaded_and_scales_up_to_max(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    pool, spawned = _fake_pool(monkeypatch)
+    await pool.open("alpha", _limits_config("alpha", min_sessions=1, max_sessions=2))
+
+    release = asyncio.Event()
+    used: list[object] = []
+
+    async def _call() -> None:
+        async with pool.lease("alpha") as session:
+            used.append(session)
+            await release.wait()
+
+    first = asyncio.create_task(_call())
+    second = asyncio.create_task(_call())
+    await asyncio.sleep(0.01)
+    # 唯一的 session 上已有请求在途 → 后台扩容到 max
+    await _settle(pool, "alpha")
+    assert len(spawned) == 2
+    third = asyncio.create_task(_call())
+    fourth = asyncio.create_task(_call())
+    await asyncio.sleep(0.01)
+
+    assert used[:2] == [spawned[0].session] * 2
+    assert used[2] is spawned[1].session  # 新 session 最空闲
+    assert pool.metrics("alpha")["in_flight"] == 4
+    assert len(spawned) == 2  # 已到 max_sessions，不再扩容
+
+    release.set()
+    await asyncio.gather(first, second, third, fourth)
+    metrics = pool.metrics("alpha")
+    assert metrics["sessions"] == 2
+    assert metrics["calls_total"] == 4
+    assert metrics["peak_in_flight"] == 4
+    assert metrics["scale_ups"] == 1
+    assert metrics["in_flight"] == 0
+    await pool.close("alpha")
+
+
+@pytest.mark.asyncio
+async def test_idle_extra_sessions_scale_down_to_min(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    pool, spawned = _fake_pool(monkeypatch, idle_ttl_s=0.05)
+    await pool.open("alpha", _limits_config("alpha", min_sessions=1, max_sessions=3))
+    group = pool._servers["alpha"]
+    for _ in range(2):
+        pool._schedule_spawn(group)
+    await asyncio.sleep(0.01)
+    assert pool.metrics("alpha")["sessions"] == 3
+
+    async with pool.lease("alpha"):
+        pass
+    await asyncio.sleep(0.2)
+
+    metrics = pool.metrics("alpha")
+    assert metrics["sessions"] == 1
+    assert metrics["scale_downs"] == 2
+    assert pool.get_entry("alpha") is spawned[0]
+    await pool.close("alpha")
+
+
+@pytest.mark.asyncio
+async def test_repeated_transport_failures_recycle_session_and_refill_min(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    from mcp.shared.exceptions import McpError
+    from mcp.types import ErrorData
+
+    pool, spawned = _fake_pool(monkeypatch)
+    await pool.open("alpha", _limits_config("alpha", min_sessions=2, max_sessions=2))
+    await _settle(pool, "alpha")
+    broken = spawned[0]
+
+    # 服务端返回的 JSON-RPC 错误不算连接故障
+    with pytest.raises(McpError):
+        async with pool.lease("alpha"):
+            raise McpError(ErrorData(code=-32602, message="bad params"))
+    assert broken.consecutive_failures == 0
+
+    for _ in range(3):
+        with pytest.raises(ConnectionResetError):
+            async with pool.lease("alpha") as session:
+                # 让两个 session 都忙，确保失败都落在同一个 session 上
+                assert session is broken.session
+                raise ConnectionResetError("pipe closed")
+        spawned[1].in_flight = 1
+    spawned[1].in_flight = 0
+    await _settle(pool, "alpha")
+
+    group = pool._servers["alpha"]
+    assert broken not in group.sessions
+    assert broken.status == "disconnected"
+    assert len(group.sessions) == 2  # 回收后补足 min_sessions
+    metrics = pool.metrics("alpha")
+    assert metrics["recycled"] == 1
+    assert metrics["errors_total"] == 4
+    await pool.close("alpha")
+
+
+@pytest.mark.asyncio
+async def test_close_waits_for_retiring_sessions_instead_of_cancelling(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    pool, spawned = _fake_pool(monkeypatch)
+    await pool.open("alpha", _limits_config("alpha", min_sessions=2, max_sessions=2))
+    await _settle(pool, "alpha")
+    retiring = spawned[0]
+    stop = asyncio.Event()
+
+    async def _supervisor() -> None:
+        await stop.wait()
+        await asyncio.sleep(0.05)  # stdio 清理耗时
+
+    supervisor = asyncio.create_task(_supervisor())
+    retiring.supervisor_task, retiring.stop_event = supervisor, stop
+
+    group = pool._servers["alpha"]
+    pool._recycle(group, retiring, "test")
+    await asyncio.sleep(0)
+    await pool.close("alpha")
+
+    # 退役中的 session 走完自然关闭，而不是被 close 取消到硬 cancel 路径
+    assert supervisor.done() and not supervisor.cancelled()
+    assert retiring.status == "disconnected"
+    assert not group.retiring
+
+
+@pytest.mark.asyncio
+async def test_open_warms_min_sessions_as_separate_processes(tmp_path: Path) -> None:
+    """真实子进程：min_sessions=2 拉起两个独立 stdio 进程，close 全部回收。"""
+    from octoagent.gateway.services.mcp_registry import McpServerConfig
+    from octoagent.gateway.services.mcp_session_pool import McpSessionPool
+
+    stub_path = _write_stub(tmp_path)
+    pool = McpSessionPool()
+    config = McpServerConfig(
+        name="alpha",
+        command=sys.executable,
+        args=[str(stub_path)],
+        min_sessions=2,
+        max_sessions=2,
+    )
+    await pool.open("alpha", config)
+    await _settle(pool, "alpha")
+
+    entries = pool.list_entries()
+    pids = {entry.pid for entry in entries}
+    assert len(entries) == 2 and len(pids) == 2 and None not in pids
+    assert await pool.health_check("alpha") is True
+
+    await pool.close("alpha")
+    assert pool.list_entries() == []
+    assert all(entry.status == "disconnected" for entry in entries)
@@ -0,0 +1,192 @@
+"""EmbeddingCache：内存 LRU + 落盘层、跨实例复用、批量去重、预算淘汰与降级。"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from octoagent.gateway.services.memory.builtin_memu_bridge import BuiltinMemUBridge
+from octoagent.gateway.services.memory.embedding_cache import (
+    EmbeddingCache,
+    close_shared_embedding_caches,
+    shared_embedding_cache,
+    text_hash,
+)
+
+DIM = 8
+
+
+class _CountingEmbedder:
+    def __init__(self) -> None:
+        self.calls: list[list[str]] = []
+
+    async def __call__(self, texts: list[str]) -> list[list[float]]:
+        self.calls.append(list(texts))
+        return [[float(len(text))] * DIM for text in texts]
+
+    @property
+    def embedded(self) -> int:
+        return sum(len(batch) for batch in self.calls)
+
+
+async def test_restart_reuses_disk_tier(tmp_path: Path) -> None:
+    path = tmp_path / "embedding_cache.db"
+    embed = _CountingEmbedder()
+    first = EmbeddingCache(path)
+    await first.get_or_embed("qwen", ["alpha", "beta"], embed)
+    await first.close()
+
+    second = EmbeddingCache(path)
+    vectors = await second.get_or_embed("qwen", ["alpha", "beta", "gamma"], embed)
+    await second.close()
+
+    assert vectors == [[5.0] * DIM, [4.0] * DIM, [5.0] * DIM]
+    # 重启后只 embed 新文本
+    assert embed.calls == [["alpha", "beta"], ["gamma"]]
+    assert second.stats.disk_hits == 2
+    assert second.stats.misses == 1
+
+
+async def test_batch_dedup_and_memory_hits() -> None:
+    cache = EmbeddingCache()
+    embed = _CountingEmbedder()
+
+    await cache.get_or_embed("qwen", ["same", "same", "other"], embed)
+    await cache.get_or_embed("qwen", ["same"], embed)
+
+    assert embed.calls == [["same", "other"]]
+    assert cache.stats.memory_hits == 1
+    assert cache.stats.embed_calls == 1
+
+
+async def test_profile_is_part_of_key(tmp_path: Path) -> None:
+    """alias 改绑模型后不复用旧向量；回滚后直接命中"""
+    cache = EmbeddingCache(tmp_path / "embedding_cache.db")
+    embed = _CountingEmbedder()
+
+    await cache.get_or_embed("emb@openai/text-embedding-3-small", ["hello"], embed)
+    await cache.get_or_embed("emb@openai/text-embedding-3-large", ["hello"], embed)
+    await cache.get_or_embed("emb@openai/text-embedding-3-small", ["hello"], embed)
+    await cache.close()
+
+    assert embed.embedded == 2
+
+
+async def test_memory_budget_evicts_lru() -> None:
+    cache = EmbeddingCache(memory_budget_bytes=2 * DIM * 4)
+    embed = _CountingEmbedder()
+
+    await cache.get_or_embed("qwen", ["a", "b"], embed)
+    await cache.get_or_embed("qwen", ["a"], embed)
+    await cache.get_or_embed("qwen", ["c"], embed)
+
+    assert cache.memory_bytes == 2 * DIM * 4
+    assert cache.stats.memory_evictions == 1
+    assert await cache.get_many("qwen", [text_hash("b")]) == [None]
+
+
+async def test_disk_budget_prunes_least_recently_used(tmp_path: Path) -> None:
+    cache = EmbeddingCache(
+        tmp_path / "embedding_cache.db",
+        memory_budget_bytes=0,
+        disk_budget_bytes=10 * DIM * 4,
+    )
+    embed = _CountingEmbedder()
+    for index in range(20):
+        await cache.get_or_embed("qwen", [f"text-{index}"], embed)
+
+    snapshot = cache.snapshot()
+    await cache.close()
+
+    assert snapshot["disk_bytes"] <= 10 * DIM * 4
+    assert snapshot["disk_evictions"] > 0
+
+
+async def test_embed_failure_is_not_cached() -> None:
+    cache = EmbeddingCache()
+
+    async def _fail(texts: list[str]) -> None:
+        return None
+
+    assert await cache.get_or_embed("alias", ["x"], _fail) is None
+    assert await cache.get_many("alias", [text_hash("x")]) == [None]
+
+
+async def test_partial_embed_result_only_misses_missing_entries() -> None:
+    cache = EmbeddingCache()
+
+    async def _short(texts: list[str]) -> list[list[float]]:
+        return [[1.0] * DIM for _ in texts[:-1]]
+
+    vectors = await cache.get_or_embed("alias", ["a", "b", "c"], _short)
+
+    assert vectors == [[1.0] * DIM, [1.0] * DIM, None]
+    assert await cache.get_many("alias", [text_hash("b"), text_hash("c")]) == [
+        [1.0] * DIM,
+        None,
+    ]
+
+
+async def test_shared_cache_is_reused_per_path_and_closed(tmp_path: Path) -> None:
+    path = tmp_path / "embedding_cache.db"
+    cache = shared_embedding_cache(path)
+    assert shared_embedding_cache(tmp_path / "." / "embedding_cache.db") is cache
+
+    await cache.get_or_embed("qwen", ["a"], _CountingEmbedder())
+    assert cache._conn is not None
+    await close_shared_embedding_caches()
+
+    assert cache._conn is None
+    assert shared_embedding_cache(path) is not cache
+    await close_shared_embedding_caches()
+
+
+async def test_unwritable_disk_degrades_to_memory(tmp_path: Path) -> None:
+    blocker = tmp_path / "not-a-dir"
+    blocker.write_text("")
+    cache = EmbeddingCache(blocker / "embedding_cache.db")
+    embed = _CountingEmbedder()
+
+    await cache.get_or_embed("qwen", ["a"], embed)
+    await cache.get_or_embed("qwen", ["a"], embed)
+
+    assert embed.embedded == 1
+    assert cache.snapshot()["disk_enabled"] is False
+    assert cache.stats.disk_errors == 1
+
+
+async def test_bridge_proxy_alias_embeddings_use_cache(tmp_path: Path) -> None:
+    bridge = object.__new__(BuiltinMemUBridge)  # 不走重型 __init__，只测 embed 链路
+    bridge._embedding_cache = EmbeddingCache(tmp_path / "embedding_cache.db")
+    fetched: list[list[str]] = []
+
+    async def _fetch(*, target_alias: str, texts: list[str]) -> list[list[float]]:
+        fetched.append(texts)
+        return [[1.0] * DIM for _ in texts]
+
+    bridge._fetch_embeddings = _fetch  # type: ignore[method-assign]
+    for _ in range(2):
+        await bridge._embed_texts_with_proxy_alias(
+            ["doc-1", "doc-2"],
+            target_alias="emb",
+            is_query=False,
+            embedding_profile="emb@openai/text-embedding-3-small",
+        )
+    await bridge._embedding_cache.close()
+
+    assert fetched == [["doc-1", "doc-2"]]
+
+
+async def test_bridge_proxy_alias_zero_fills_only_missing_vectors(tmp_path: Path) -> None:
+    bridge = object.__new__(BuiltinMemUBridge)
+    bridge._embedding_cache = EmbeddingCache()
+
+    async def _fetch(*, target_alias: str, texts: list[str]) -> list[list[float]]:
+        return [[1.0] * DIM for _ in texts[:1]]
+
+    bridge._fetch_embeddings = _fetch  # type: ignore[method-assign]
+    vectors = await bridge._embed_texts_with_proxy_alias(
+        ["doc-1", "doc-2"], target_alias="emb", is_query=False,
+    )
+
+    assert vectors[0] == [1.0] * DIM
+    assert not any(vectors[1])
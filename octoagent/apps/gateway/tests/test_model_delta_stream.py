@@ -0,0 +1,87 @@
+"""ModelDeltaStreamer：增量合并 / 推送条件 / 无订阅者丢弃 / 瞬态帧不进回放缓冲。"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+from octoagent.gateway.services.model_delta_stream import MODEL_DELTA_EVENT, ModelDeltaStreamer
+from octoagent.gateway.services.sse_hub import SSEHub, TransientFrame
+from octoagent.provider.streaming import StreamDelta
+
+
+def _text(value: str) -> StreamDelta:
+    return StreamDelta(kind="text", text=value)
+
+
+def _drain(queue: asyncio.Queue) -> list[dict]:
+    frames = []
+    while not queue.empty():
+        frame = queue.get_nowait()
+        assert isinstance(frame, TransientFrame)
+        assert frame.event_type == MODEL_DELTA_EVENT
+        frames.append(json.loads(frame.data))
+    return frames
+
+
+async def test_deltas_coalesce_until_flush() -> None:
+    hub = SSEHub()
+    queue = await hub.subscribe("t1", transient=True)
+    streamer = ModelDeltaStreamer(hub, flush_interval_ms=10_000, flush_max_chars=1000)
+
+    streamer.publish("t1", 1, _text("Hel"))
+    streamer.publish("t1", 1, _text("lo"))
+    streamer.publish(
+        "t1", 1, StreamDelta(kind="tool_call", text='{"q":', tool_call_id="c1", tool_name="s")
+    )
+    streamer.publish("t1", 1, StreamDelta(kind="tool_call", text="1}", tool_call_id="c1"))
+    assert queue.empty()
+
+    streamer.flush("t1")
+
+    [frame] = _drain(queue)
+    assert frame["text"] == "Hello"
+    assert frame["tool_calls"] == [{"id": "c1", "name": "s", "arguments": '{"q":1}'}]
+    assert frame["deltas"] == 4 and frame["transient"] is True
+    # 瞬态帧不进回放缓冲
+    assert "t1" not in hub._replay
+
+
+async def test_flush_on_size_interval_and_step_change() -> None:
+    hub = SSEHub()
+    queue = await hub.subscribe("t1", transient=True)
+    streamer = ModelDeltaStreamer(hub, flush_interval_ms=20, flush_max_chars=4)
+
+    streamer.publish("t1", 1, _text("abcd"))  # 达到字符上限立即推
+    streamer.publish("t1", 1, _text("x"))
+    streamer.publish("t1", 2, _text("y"))  # step 切换先推出上一步
+    assert [(f["step"], f["text"]) for f in _drain(queue)] == [(1, "abcd"), (1, "x")]
+
+    await asyncio.sleep(0.06)  # 间隔到期推出
+    assert [(f["step"], f["text"]) for f in _drain(queue)] == [(2, "y")]
+
+
+async def test_dropped_without_transient_subscriber() -> None:
+    hub = SSEHub()
+    plain = await hub.subscribe("t1")
+    streamer = ModelDeltaStreamer(hub, flush_interval_ms=0)
+
+    streamer.publish("t1", 1, _text("ignored"))
+    streamer.flush("t1")
+
+    assert plain.empty()
+    assert streamer.stats.dropped_no_subscriber == 1
+    assert streamer.stats.frames == 0
+
+
+async def test_reset_discards_pending_and_notifies() -> None:
+    hub = SSEHub()
+    queue = await hub.subscribe("t1", transient=True)
+    streamer = ModelDeltaStreamer(hub, flush_interval_ms=10_000, flush_max_chars=1000)
+
+    streamer.publish("t1", 1, _text("stale"))
+    streamer.publish("t1", 1, StreamDelta(kind="reset"))
+    streamer.flush("t1")
+
+    [frame] = _drain(queue)
+    assert frame["reset"] is True and frame["text"] == ""
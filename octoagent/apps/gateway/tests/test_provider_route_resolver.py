@@ -126,3 +126,25 @@ def test_gateway_resolver_uses_defaults_and_rejects_incomplete_provider_facts()
     unsupported_auth.providers[0].api_key_env = ""
     with pytest.raises(ValueError, match="缺少受支持的auth引用"):
         resolve(unsupported_auth, "main")
+
+
+def test_gateway_resolves_connection_pool_outside_provider_route() -> None:
+    from octoagent.gateway.services.config.provider_route_resolver import resolve_provider_pool
+
+    base = {
+        "id": "fixture-provider",
+        "name": "Fixture",
+        "api_base": "https://api.example.test/v1",
+        "auth": {"kind": "api_key", "env": "FIXTURE_API_KEY"},
+    }
+    pooled = _config(
+        {**base, "connection_pool": {"max_connections": 8, "http2": True, "warmup": True}}
+    )
+
+    pool = resolve_provider_pool(pooled, "fixture-provider")
+    assert pool is not None
+    assert (pool.max_connections, pool.http2, pool.warmup) == (8, True, True)
+    assert pool.max_keepalive_connections is None
+    assert "pool" not in _resolver()(pooled, "main").model_dump()
+    assert resolve_provider_pool(_config(base), "fixture-provider") is None
+    assert resolve_provider_pool(pooled, "missing") is None
@@ -427,6 +427,15 @@ async def test_task_service_injects_profile_bootstrap_recent_and_memory(
     _later_joined = "\n".join(str(item.get("content", "")) for item in prompt[1:])
     assert "AmbientRuntime:" in _later_joined
     assert "current_datetime_local:" in _later_joined
+    # prompt 前缀缓存：Core / Context 块打断点；每轮变化的内容只进断点之后的 Volatile 块
+    _system = [item for item in prompt if item.get("role") == "system"]
+    assert [bool(item.get("cache_control")) for item in _system] == [True, True, False]
+    _stable = "\n".join(str(item["content"]) for item in _system[:2])
+    assert "RuntimeContext:" not in _stable
+    for _volatile_marker in ("RuntimeHints:", "MemoryRecallHints:"):
+        assert _volatile_marker not in _stable
+        assert _volatile_marker in str(_system[2]["content"])
+    assert str(_system[2]["content"]).split("\n\n---\n\n")[-1].startswith("AmbientRuntime:")
     assert "之前已经确认 Alpha 的关键约束和当前里程碑" in joined
     assert "MemoryRuntime:" in joined
     assert "mode: hint_first" in joined
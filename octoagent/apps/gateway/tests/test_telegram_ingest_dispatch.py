@@ -0,0 +1,351 @@
+"""Telegram 入站 ingest 按 chat 分片调度：同 chat 保序 / 跨 chat 并行 / 连续水位线 offset。
+
+- 调度器单元：慢 chat 不阻塞其它 chat；水位线只越过连续完成的 update；失败在 lane
+  内退避重试且保序，瞬时错误不限次数，不可重试错误先持久记录再放行
+- polling 集成：慢 ingest 期间其它 chat 照常落 task、get_updates 不停拉取，持久化
+  offset 停在最小未完成 update_id
+- webhook 集成：同 chat 并发请求按到达顺序 ingest
+全部 hermetic Fake。
+"""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+import pytest
+from octoagent.core.store import create_store_group
+from octoagent.gateway.services.config.config_schema import (
+    ChannelsConfig,
+    OctoAgentConfig,
+    TelegramChannelConfig,
+)
+from octoagent.gateway.services.config.config_wizard import save_config
+from octoagent.gateway.services.operations.telegram_pairing import TelegramStateStore
+from octoagent.gateway.services.sse_hub import SSEHub
+from octoagent.gateway.services.telegram import (
+    TelegramGatewayService,
+    _is_retriable_ingest_error,
+)
+from octoagent.gateway.services.telegram_ingest import (
+    TelegramIngestDispatcher,
+    telegram_chat_key,
+)
+
+from .test_telegram_voice import FakeVoiceBotClient, _text_update
+
+
+class GatedTaskRunner:
+    """enqueue 在 gated 文本上挂起，模拟慢 ingest（建 task 后的投递 / hook 耗时）。"""
+
+    def __init__(self, gated: set[str]) -> None:
+        self.gated = gated
+        self.release = asyncio.Event()
+        self.entered = asyncio.Event()
+        self.enqueued: list[str] = []
+
+    async def enqueue(self, task_id: str, user_text: str, model_alias: str | None = None) -> None:
+        del task_id, model_alias
+        if user_text in self.gated:
+            self.entered.set()
+            await self.release.wait()
+        self.enqueued.append(user_text)
+
+
+async def _wait_until(predicate, timeout: float = 2.0) -> None:
+    async def _poll() -> None:
+        while not predicate():
+            await asyncio.sleep(0.01)
+
+    await asyncio.wait_for(_poll(), timeout=timeout)
+
+
+async def _build_service(tmp_path: Path, *, mode: str, bot_client, task_runner):
+    save_config(
+        OctoAgentConfig(
+            updated_at="2026-10-18",
+            channels=ChannelsConfig(
+                telegram=TelegramChannelConfig(
+                    enabled=True,
+                    mode=mode,
+                    webhook_url="https://example.com/api/telegram/webhook",
+                )
+            ),
+        ),
+        tmp_path,
+    )
+    store_group = await create_store_group(
+        str(tmp_path / "gateway.db"), str(tmp_path / "artifacts")
+    )
+    state_store = TelegramStateStore(tmp_path)
+    for user_id in ("42", "43"):
+        state_store.upsert_approved_user(user_id=user_id, chat_id=user_id, username=f"u{user_id}")
+    service = TelegramGatewayService(
+        project_root=tmp_path,
+        store_group=store_group,
+        sse_hub=SSEHub(),
+        task_runner=task_runner,
+        state_store=state_store,
+        bot_client=bot_client,
+    )
+    return service, store_group, state_store
+
+
+def test_chat_key_covers_messages_and_callbacks() -> None:
+    assert telegram_chat_key(_text_update(chat_id=7)) == "7"
+    callback = {"update_id": 1, "callback_query": {"id": "c", "message": {"chat": {"id": -100}}}}
+    assert telegram_chat_key(callback) == "-100"
+    assert telegram_chat_key({"update_id": 2, "poll": {}}) == ""
+
+
+@pytest.mark.asyncio
+async def test_slow_chat_does_not_block_other_chats_and_keeps_fifo() -> None:
+    gate = asyncio.Event()
+    order: list[str] = []
+
+    async def _ingest(update: dict[str, str]) -> str:
+        if update["name"] == "a1":
+            await gate.wait()
+        order.append(update["name"])
+        return update["name"]
+
+    dispatcher = TelegramIngestDispatcher(_ingest)
+    futures = {
+        name: dispatcher.submit({"name": name}, chat_key=chat)
+        for name, chat in (("a1", "A"), ("b1", "B"), ("a2", "A"), ("b2", "B"))
+    }
+    await asyncio.wait_for(asyncio.gather(futures["b1"], futures["b2"]), timeout=1)
+    assert order == ["b1", "b2"]
+    snapshot = dispatcher.snapshot()
+    assert snapshot["pending_updates"] == 2
+    assert snapshot["chats"]["A"]["queue_depth"] == 2
+    assert snapshot["chats"]["B"]["processed"] == 2
+
+    gate.set()
+    assert await futures["a2"] == "a2"
+    assert order == ["b1", "b2", "a1", "a2"]
+    assert dispatcher.snapshot()["active_chats"] == 0
+
+
+@pytest.mark.asyncio
+async def test_watermark_advances_only_over_contiguous_completions() -> None:
+    gates = {10: asyncio.Event(), 12: asyncio.Event()}
+    attempts: dict[int, int] = {}
+    commits: list[int] = []
+
+    async def _ingest(update_id: int) -> None:
+        attempts[update_id] = attempts.get(update_id, 0) + 1
+        if update_id in gates:
+            await gates[update_id].wait()
+        if update_id == 13:
+            raise RuntimeError("poison update")
+
+    dispatcher = TelegramIngestDispatcher(
+        _ingest, on_watermark=commits.append, retry_delay=lambda _attempt: 0.0
+    )
+    for update_id, chat in ((10, "A"), (11, "B"), (12, "C"), (13, "D"), (14, "A")):
+        dispatcher.submit(update_id, chat_key=chat, update_id=update_id, max_attempts=3)
+
+    await _wait_until(lambda: attempts.get(13) == 3 and 11 in attempts)
+    await asyncio.sleep(0)
+    # 10 / 12 未完成：即使 11 / 13 已结束，确认 offset 也不越过 10
+    assert commits == [10]
+    assert 14 not in attempts  # 同 chat A 的 14 在 10 之后排队
+
+    gates[10].set()
+    await _wait_until(lambda: dispatcher.pending == 1)
+    assert commits == [10, 12]
+    gates[12].set()
+    await asyncio.wait_for(dispatcher.drain(), timeout=1)
+    assert commits == [10, 12, 15]
+    stats = dispatcher.snapshot()["chats"]["D"]
+    assert (stats["failed"], stats["retried"]) == (1, 2)
+
+
+@pytest.mark.asyncio
+async def test_transient_failures_retry_without_limit_and_hold_watermark() -> None:
+    outage = {"remaining": 20}
+    commits: list[int] = []
+
+    async def _ingest(update_id: int) -> None:
+        if update_id == 20 and outage["remaining"]:
+            outage["remaining"] -= 1
+            raise OSError("database is locked")
+
+    dispatcher = TelegramIngestDispatcher(
+        _ingest,
+        on_watermark=commits.append,
+        retry_delay=lambda _attempt: 0.0,
+        is_retriable=_is_retriable_ingest_error,
+    )
+    dispatcher.submit(20, chat_key="A", update_id=20, max_attempts=0)
+    dispatcher.submit(21, chat_key="A", update_id=21, max_attempts=0)
+    await asyncio.wait_for(dispatcher.drain(), timeout=1)
+
+    # 故障期间不放行：20 成功前 offset 从未提交，两条都最终成功
+    assert commits == [21, 22]
+    stats = dispatcher.snapshot()["chats"]["A"]
+    assert (stats["processed"], stats["failed"], stats["retried"]) == (2, 0, 20)
+
+
+@pytest.mark.asyncio
+async def test_non_retriable_failure_is_recorded_before_release(tmp_path: Path) -> None:
+    state_store = TelegramStateStore(tmp_path)
+    commits: list[int] = []
+    offsets_at_drop: list[int | None] = []
+
+    async def _ingest(update: dict) -> None:
+        if update["update_id"] == 30:
+            raise ValueError("malformed update")
+
+    def _on_dropped(update, update_id, exc) -> None:
+        offsets_at_drop.append(state_store.get_polling_offset())
+        state_store.record_failed_update(
+            update_id=update_id, chat_id="A", error=str(exc), update=update
+        )
+
+    def _commit(offset: int) -> None:
+        commits.append(offset)
+        state_store.set_polling_offset(offset)
+
+    dispatcher = TelegramIngestDispatcher(
+        _ingest,
+        on_watermark=_commit,
+        retry_delay=lambda _attempt: 0.0,
+        is_retriable=_is_retriable_ingest_error,
+        on_dropped=_on_dropped,
+    )
+    dispatcher.submit({"update_id": 30}, chat_key="A", update_id=30, max_attempts=0)
+    await asyncio.wait_for(dispatcher.drain(), timeout=1)
+
+    # 记录发生在水位线越过 30 之前，且不重试
+    assert offsets_at_drop == [None]
+    assert commits == [31]
+    [record] = state_store.list_failed_updates()
+    assert (record.update_id, record.error) == (30, "malformed update")
+    assert record.update == {"update_id": 30}
+    assert dispatcher.snapshot()["chats"]["A"]["retried"] == 0
+
+
+@pytest.mark.asyncio
+async def test_poison_update_exhausts_budget_without_wedging_offset(tmp_path: Path) -> None:
+    """未归类异常（按瞬时错误重试）用尽预算后记录并放行，其他 chat 与 offset 继续前进"""
+    state_store = TelegramStateStore(tmp_path)
+    commits: list[int] = []
+    attempts = {"poison": 0}
+
+    async def _ingest(update: dict) -> None:
+        if update["update_id"] == 40:
+            attempts["poison"] += 1
+            raise RuntimeError("poison update")
+
+    def _on_dropped(update, update_id, exc) -> None:
+        state_store.record_failed_update(
+            update_id=update_id, chat_id="A", error=str(exc), update=update
+        )
+
+    def _commit(offset: int) -> None:
+        commits.append(offset)
+        state_store.set_polling_offset(offset)
+
+    dispatcher = TelegramIngestDispatcher(
+        _ingest,
+        on_watermark=_commit,
+        retry_delay=lambda _attempt: 0.0,
+        is_retriable=_is_retriable_ingest_error,
+        on_dropped=_on_dropped,
+    )
+    assert _is_retriable_ingest_error(RuntimeError("poison update"))
+    dispatcher.submit({"update_id": 40}, chat_key="A", update_id=40, max_attempts=5)
+    dispatcher.submit({"update_id": 41}, chat_key="B", update_id=41, max_attempts=5)
+    dispatcher.submit({"update_id": 42}, chat_key="A", update_id=42, max_attempts=5)
+    await asyncio.wait_for(dispatcher.drain(), timeout=1)
+
+    assert attempts["poison"] == 5
+    assert state_store.get_polling_offset() == 43
+    assert commits[-1] == 43
+    [record] = state_store.list_failed_updates()
+    assert (record.update_id, record.error) == (40, "poison update")
+    chats = dispatcher.snapshot()["chats"]
+    assert (chats["A"]["processed"], chats["A"]["failed"], chats["A"]["retried"]) == (1, 1, 4)
+    assert chats["B"]["processed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_polling_slow_ingest_holds_offset_without_blocking_other_chats(
+    tmp_path: Path,
+) -> None:
+    class ScriptedPollingBot(FakeVoiceBotClient):
+        def __init__(self, batches: list[list[dict[str, object]]]) -> None:
+            super().__init__()
+            self._batches = list(batches)
+            self.offsets: list[int | None] = []
+
+        async def get_updates(self, *, offset: int | None = None, timeout_s: int) -> list[object]:
+            del timeout_s
+            self.offsets.append(offset)
+            if self._batches:
+                return self._batches.pop(0)
+            await asyncio.sleep(0.01)
+            return []
+
+    bot = ScriptedPollingBot(
+        [
+            [
+                _text_update(update_id=500, message_id=1, chat_id=42, text="慢消息"),
+                _text_update(update_id=501, message_id=2, chat_id=43, text="另一个 chat"),
+                _text_update(update_id=502, message_id=3, chat_id=42, text="同 chat 后续"),
+            ],
+            [_text_update(update_id=503, message_id=4, chat_id=43, text="下一批")],
+        ]
+    )
+    runner = GatedTaskRunner({"慢消息"})
+    service, store_group, state_store = await _build_service(
+        tmp_path, mode="polling", bot_client=bot, task_runner=runner
+    )
+
+    await service.startup()
+    try:
+        await _wait_until(lambda: runner.enqueued == ["另一个 chat", "下一批"])
+        # 第二批已拉取（取数游标不等慢 ingest），确认 offset 停在最小未完成的 500
+        assert 504 in bot.offsets
+        assert state_store.get_polling_offset() == 500
+        stats = service.ingest_stats()
+        assert stats["watermark"] == 500
+        assert stats["chats"]["42"]["queue_depth"] == 2
+
+        runner.release.set()
+        await _wait_until(lambda: state_store.get_polling_offset() == 504)
+        assert runner.enqueued == ["另一个 chat", "下一批", "慢消息", "同 chat 后续"]
+    finally:
+        await service.shutdown()
+        await store_group.close()
+
+
+@pytest.mark.asyncio
+async def test_webhook_requests_share_per_chat_lanes(tmp_path: Path) -> None:
+    runner = GatedTaskRunner({"第一条"})
+    service, store_group, _ = await _build_service(
+        tmp_path, mode="webhook", bot_client=FakeVoiceBotClient(), task_runner=runner
+    )
+    try:
+        first = asyncio.create_task(
+            service.handle_webhook_update(_text_update(update_id=1, message_id=1, text="第一条"))
+        )
+        await asyncio.wait_for(runner.entered.wait(), timeout=2)
+        second = asyncio.create_task(
+            service.handle_webhook_update(_text_update(update_id=2, message_id=2, text="第二条"))
+        )
+        other = await service.handle_webhook_update(
+            _text_update(update_id=3, message_id=3, chat_id=43, text="别的 chat")
+        )
+        assert other.status == "accepted"
+        assert not second.done()
+
+        runner.release.set()
+        results = await asyncio.wait_for(asyncio.gather(first, second), timeout=2)
+        assert [result.status for result in results] == ["accepted", "accepted"]
+        assert runner.enqueued == ["别的 chat", "第一条", "第二条"]
+    finally:
+        await service.shutdown()
+        await store_group.close()
@@ -0,0 +1,151 @@
+"""Token 计数缓存：内容哈希复用、批量去重、单次构建指标、LRU 与落盘预热。"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from octoagent.gateway.services import context_compaction
+from octoagent.gateway.services.context_compaction import (
+    TOKEN_COUNT_CACHE,
+    ContextCompactionService,
+    ConversationTurn,
+    estimate_messages_tokens,
+    estimate_text_tokens,
+    estimate_texts_tokens,
+    estimation_method,
+    load_token_count_cache,
+    save_token_count_cache,
+)
+from octoagent.gateway.services.token_count_cache import (
+    MIN_CACHED_CHARS,
+    TokenCountCache,
+    token_count_scope,
+    write_snapshot,
+)
+
+LONG = "用户在讨论部署流程 deploy pipeline and rollback strategy. " * 8
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    TOKEN_COUNT_CACHE.clear()
+    yield
+    TOKEN_COUNT_CACHE.clear()
+
+
+@pytest.fixture
+def encode_calls(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    calls: list[str] = []
+    original = context_compaction._count_tokens
+
+    def _spy(cleaned: str) -> int:
+        calls.append(cleaned)
+        return original(cleaned)
+
+    monkeypatch.setattr(context_compaction, "_count_tokens", _spy)
+    return calls
+
+
+def test_cached_count_matches_direct_count(encode_calls: list[str]) -> None:
+    direct = context_compaction._count_tokens(LONG.strip())
+    encode_calls.clear()
+
+    assert estimate_text_tokens(LONG) == direct
+    assert estimate_text_tokens(f"  {LONG}\n") == direct
+    assert len(encode_calls) == 1
+
+
+def test_batch_counts_each_distinct_text_once(encode_calls: list[str]) -> None:
+    other = LONG + "补充说明"
+    with token_count_scope() as stats:
+        counts = estimate_texts_tokens([LONG, other, LONG, "", "hi"])
+
+    assert counts[0] == counts[2] > 0
+    assert counts[3] == 0
+    # 两条长文本各编码一次 + 一条短文本直接计算
+    assert len(encode_calls) == 3
+    assert stats.as_dict() == {
+        "calls": 5,
+        "hits": 1,
+        "misses": 2,
+        "uncached": 1,
+        "computed": 3,
+        "hit_rate": 0.3333,
+    }
+
+
+def test_messages_tokens_reuse_cache_across_calls(encode_calls: list[str]) -> None:
+    messages = [{"role": "user", "content": LONG}, {"role": "assistant", "content": LONG * 2}]
+    first = estimate_messages_tokens(messages)
+    with token_count_scope() as stats:
+        second = estimate_messages_tokens(messages)
+
+    assert first == second
+    assert len(encode_calls) == 2
+    assert stats.hits == 2 and stats.computed == 0
+
+
+async def test_build_context_reports_per_build_stats(encode_calls: list[str]) -> None:
+    service = ContextCompactionService(None)  # type: ignore[arg-type]
+
+    async def _fake_load(task_id: str) -> list[ConversationTurn]:
+        return [
+            ConversationTurn(role="user", content=f"{LONG} #{index}", source_event_id="")
+            for index in range(3)
+        ]
+
+    service._load_conversation_turns = _fake_load  # type: ignore[method-assign]
+    first = await service.build_context(task_id="t", fallback_user_text="", llm_service=None)
+    second = await service.build_context(task_id="t", fallback_user_text="", llm_service=None)
+
+    assert first.token_count_stats["misses"] == 3
+    assert second.token_count_stats["hits"] == 3
+    assert second.token_count_stats["computed"] == 0
+    assert len(encode_calls) == 3
+
+
+def test_short_texts_bypass_cache() -> None:
+    estimate_text_tokens("x" * (MIN_CACHED_CHARS - 1))
+    assert len(TOKEN_COUNT_CACHE) == 0
+
+
+def test_lru_evicts_oldest() -> None:
+    cache = TokenCountCache(2)
+    for name in ("a", "b"):
+        cache.put(("tokenizer", TokenCountCache.digest(name)), 1)
+    cache.get(("tokenizer", TokenCountCache.digest("a")))
+    cache.put(("tokenizer", TokenCountCache.digest("c")), 1)
+
+    assert cache.get(("tokenizer", TokenCountCache.digest("b"))) is None
+    assert cache.get(("tokenizer", TokenCountCache.digest("a"))) == 1
+
+
+async def test_snapshot_round_trip(tmp_path: Path, encode_calls: list[str]) -> None:
+    path = tmp_path / "token_counts.db"
+    expected = estimate_text_tokens(LONG)
+    assert await save_token_count_cache(path) == 1
+
+    TOKEN_COUNT_CACHE.clear()
+    encode_calls.clear()
+    assert await load_token_count_cache(path) == 1
+    assert estimate_text_tokens(LONG) == expected
+    assert encode_calls == []
+
+
+async def test_snapshot_ignores_other_method(tmp_path: Path) -> None:
+    path = tmp_path / "token_counts.db"
+    estimate_text_tokens(LONG)
+    rows = [("other-method", digest, tokens) for _, digest, tokens in TOKEN_COUNT_CACHE.export()]
+    write_snapshot(path, rows)
+    TOKEN_COUNT_CACHE.clear()
+
+    assert await load_token_count_cache(path) == 0
+    assert estimation_method() != "other-method"
+
+
+async def test_unreadable_snapshot_degrades(tmp_path: Path) -> None:
+    path = tmp_path / "token_counts.db"
+    path.write_text("not a sqlite file")
+
+    assert await load_token_count_cache(path) == 0
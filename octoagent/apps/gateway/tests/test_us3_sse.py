@@ -517,7 +517,7 @@ class TestSSE:
         await hub.unsubscribe(task_id, queue)
 
     async def test_sse_hub_removes_full_queue_subscriber(self):
-        """慢订阅者队列满时自动移除，避免内存膨胀"""
+        """慢订阅者队列满时移出广播（避免内存膨胀）并显式标记 resync"""
         sse_hub = SSEHub(queue_maxsize=1)
         task_id = "01JTESTSSEQUEUEFULL000000001"
         queue = await sse_hub.subscribe(task_id)
@@ -547,3 +547,156 @@ class TestSSE:
         await sse_hub.broadcast(task_id, second_event)
 
         assert task_id not in sse_hub._subscribers or queue not in sse_hub._subscribers[task_id]
+        assert queue.resync_required is True
+
+
+def _hub_event(task_id: str, task_seq: int, *, to_status: TaskStatus | None = None) -> Event:
+    from ulid import ULID
+
+    if to_status is not None:
+        return Event(
+            event_id=str(ULID()),
+            task_id=task_id,
+            task_seq=task_seq,
+            ts=datetime.now(UTC),
+            type=EventType.STATE_TRANSITION,
+            actor=ActorType.SYSTEM,
+            payload=StateTransitionPayload(
+                from_status=TaskStatus.RUNNING,
+                to_status=to_status,
+            ).model_dump(),
+            trace_id=f"trace-{task_id}",
+        )
+    return Event(
+        event_id=str(ULID()),
+        task_id=task_id,
+        task_seq=task_seq,
+        ts=datetime.now(UTC),
+        type=EventType.MODEL_CALL_STARTED,
+        actor=ActorType.SYSTEM,
+        payload={"model_alias": "main"},
+        trace_id=f"trace-{task_id}",
+    )
+
+
+class TestSSEHubReplay:
+    """SSEHub 共享序列化 / 环形缓冲回放 / 慢订阅者 resync"""
+
+    async def test_broadcast_serializes_once_for_all_subscribers(self):
+        hub = SSEHub()
+        task_id = "01JTESTSSEHUBSHAREDFRAME001"
+        queues = [await hub.subscribe(task_id) for _ in range(3)]
+        event = _hub_event(task_id, 1)
+
+        await hub.broadcast(task_id, event)
+
+        frames = [hub.frame_for(task_id, q.get_nowait()) for q in queues]
+        assert all(frame is frames[0] for frame in frames)
+        assert json.loads(frames[0].data)["event_id"] == event.event_id
+
+    async def test_replay_after_requires_contiguous_task_seq(self):
+        hub = SSEHub()
+        task_id = "01JTESTSSEHUBREPLAYCONTIG01"
+        events = [_hub_event(task_id, seq) for seq in (1, 2, 3)]
+        for event in events:
+            await hub.broadcast(task_id, event)
+
+        frames = hub.replay_after(task_id, events[0].event_id, next_task_seq=4)
+        assert [f.event_id for f in frames] == [e.event_id for e in events[1:]]
+        # 末尾有未广播的事件（task_seq=4 只在 DB 中）：不能证明完整
+        assert hub.replay_after(task_id, events[0].event_id, next_task_seq=5) is None
+        assert hub.replay_after(task_id, "01JUNKNOWNEVENTID0000000000") is None
+
+        gap_task = "01JTESTSSEHUBREPLAYGAP0001"
+        first, third = _hub_event(gap_task, 1), _hub_event(gap_task, 3)
+        await hub.broadcast(gap_task, first)
+        await hub.broadcast(gap_task, third)
+        assert hub.replay_after(gap_task, first.event_id) is None
+
+    async def test_replay_buffer_evicts_oldest_task(self):
+        hub = SSEHub(replay_buffer_size=2, replay_max_tasks=1)
+        first = _hub_event("task-a", 1)
+        await hub.broadcast("task-a", first)
+        await hub.broadcast("task-b", _hub_event("task-b", 1))
+
+        assert hub.replay_after("task-a", first.event_id) is None
+
+    async def test_last_event_id_reconnect_served_from_buffer(
+        self, client: AsyncClient, test_app, monkeypatch
+    ):
+        """Last-Event-ID 在缓冲覆盖范围内时不查 DB"""
+        resp = await client.post(
+            "/api/message",
+            json={"text": "SSE ring buffer 测试", "idempotency_key": "sse-ring-001"},
+        )
+        task_id = resp.json()["task_id"]
+        store_group = test_app.state.store_group
+        sse_hub = test_app.state.sse_hub
+
+        started = _hub_event(task_id, 3)
+        succeeded = _hub_event(task_id, 4, to_status=TaskStatus.SUCCEEDED)
+        for event in (started, succeeded):
+            await append_event_only(store_group.conn, store_group.event_store, event)
+            await sse_hub.broadcast(task_id, event)
+
+        def _fail(*args, **kwargs):
+            raise AssertionError("reconnect should be served from the replay buffer")
+
+        monkeypatch.setattr(store_group.event_store, "iter_events_after", _fail)
+
+        async def _no_allocator(*args, **kwargs):
+            raise AssertionError("read-only reconnect must not seed the task_seq allocator")
+
+        monkeypatch.setattr(store_group.event_store, "get_next_task_seq", _no_allocator)
+
+        events_received = []
+        async with client.stream(
+            "GET",
+            f"/api/stream/task/{task_id}",
+            headers={"Last-Event-ID": started.event_id},
+        ) as response:
+            async for line in response.aiter_lines():
+                if line.startswith("data:"):
+                    events_received.append(json.loads(line[len("data:") :].strip()))
+
+        assert [e["event_id"] for e in events_received] == [succeeded.event_id]
+        assert events_received[0]["final"] is True
+
+    async def test_lagging_subscriber_resyncs_without_losing_events(
+        self, client: AsyncClient, test_app
+    ):
+        """队列溢出的订阅者补齐缺口后继续推送，每个事件恰好一次"""
+        resp = await client.post(
+            "/api/message",
+            json={"text": "SSE resync 测试", "idempotency_key": "sse-resync-001"},
+        )
+        task_id = resp.json()["task_id"]
+        store_group = test_app.state.store_group
+        sse_hub = SSEHub(queue_maxsize=1)
+        test_app.state.sse_hub = sse_hub
+
+        events_received: list[dict] = []
+
+        async def reader() -> None:
+            async with client.stream("GET", f"/api/stream/task/{task_id}") as response:
+                async for line in response.aiter_lines():
+                    if line.startswith("data:"):
+                        events_received.append(json.loads(line[len("data:") :].strip()))
+
+        read_task = asyncio.create_task(reader())
+        await asyncio.sleep(0.1)
+
+        burst = [_hub_event(task_id, seq) for seq in (3, 4, 5)]
+        burst.append(_hub_event(task_id, 6, to_status=TaskStatus.SUCCEEDED))
+        for event in burst:
+            await append_event_only(store_group.conn, store_group.event_store, event)
+        # 连续广播不让出事件循环：队列容量 1，第二个事件起溢出
+        for event in burst:
+            await sse_hub.broadcast(task_id, event)
+
+        await asyncio.wait_for(read_task, timeout=5.0)
+
+        received_ids = [e["event_id"] for e in events_received]
+        assert received_ids[-4:] == [e.event_id for e in burst]
+        assert len(received_ids) == len(set(received_ids))
+        assert events_received[-1]["final"] is True
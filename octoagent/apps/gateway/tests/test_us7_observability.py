@@ -3,20 +3,24 @@
 测试内容：
 1. HTTP 请求含 X-Request-ID 响应头
 2. structlog 配置正确
+3. 任务详情汇总模型调用 token 用量（含 prompt 缓存命中）
 """
 
 import os
 import sys
 import types
+from datetime import UTC, datetime
 from pathlib import Path
 from types import SimpleNamespace
 from unittest.mock import AsyncMock
 
 import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
+from octoagent.core.models import ActorType, Event, EventType
 from octoagent.core.store import create_store_group
 from octoagent.gateway.services.llm_service import LLMService
 from octoagent.gateway.services.sse_hub import SSEHub
+from ulid import ULID
 
 from apps.gateway.tests.runtime_service_fixtures import runtime_service_fixture
 
@@ -100,6 +104,50 @@ class TestObservability:
         assert len(trace_ids) == 3
         assert len(span_ids) == 3
 
+    async def test_task_detail_summarizes_token_usage(self, client: AsyncClient, test_app):
+        """逐步 MODEL_CALL_COMPLETED 优先；TaskService 收尾的重复汇总事件不重复计入"""
+        resp = await client.post(
+            "/api/message",
+            json={"text": "Usage test", "idempotency_key": "obs-usage-001"},
+        )
+        task_id = resp.json()["task_id"]
+        event_store = test_app.state.store_group.event_store
+        payloads = [
+            {"step": 1, "token_usage": {"prompt_tokens": 1000, "completion_tokens": 20,
+                                        "total_tokens": 1020, "cache_write_tokens": 900}},
+            {"step": 2, "token_usage": {"prompt_tokens": 1100, "completion_tokens": 30,
+                                        "total_tokens": 1130, "cache_read_tokens": 900}},
+            {"token_usage": {"prompt_tokens": 1100, "completion_tokens": 30,
+                             "total_tokens": 1130}},
+        ]
+        for payload in payloads:
+            await event_store.append_event_committed(
+                Event(
+                    event_id=str(ULID()),
+                    task_id=task_id,
+                    task_seq=await event_store.get_next_task_seq(task_id),
+                    ts=datetime.now(UTC),
+                    type=EventType.MODEL_CALL_COMPLETED,
+                    actor=ActorType.SYSTEM,
+                    payload=payload,
+                    trace_id=f"trace-{task_id}",
+                ),
+                update_task_pointer=False,
+            )
+
+        detail = await client.get(f"/api/tasks/{task_id}")
+
+        assert detail.status_code == 200
+        assert detail.json()["usage"] == {
+            "calls": 2,
+            "prompt_tokens": 2100,
+            "completion_tokens": 50,
+            "total_tokens": 2150,
+            "cache_read_tokens": 900,
+            "cache_write_tokens": 900,
+            "cache_hit_ratio": 0.4286,
+        }
+
 
 def test_setup_logfire_fail_open(monkeypatch):
     """Feature 012: logfire 初始化失败时不抛异常（fail-open）"""
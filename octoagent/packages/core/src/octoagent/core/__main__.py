@@ -1,7 +1,7 @@
 """CLI 入口模块 -- python -m octoagent.core <command>
 
 支持的命令：
-  rebuild-projections  从 events 表重建 tasks 表
+  rebuild-projections [--full]  从 events 表重建 tasks 表（默认增量，--full 全量）
 """
 
 import asyncio
@@ -15,22 +15,22 @@ def main() -> None:
     if len(sys.argv) < 2:
         print("用法: python -m octoagent.core <command>")
         print("命令:")
-        print("  rebuild-projections  从 events 表重建 tasks 表")
+        print("  rebuild-projections [--full]  从 events 表重建 tasks 表（默认增量，--full 全量）")
         sys.exit(1)
 
     command = sys.argv[1]
 
     if command == "rebuild-projections":
-        asyncio.run(rebuild_projections())
+        asyncio.run(rebuild_projections(full="--full" in sys.argv[2:]))
     else:
         print(f"未知命令: {command}")
         print("可用命令: rebuild-projections")
         sys.exit(1)
 
 
-async def rebuild_projections() -> None:
-    """执行 Projection 重建"""
-    from .projection import rebuild_all
+async def rebuild_projections(*, full: bool = False) -> None:
+    """执行 Projection 重建（默认基于 watermark 增量，full=True 时清表全量重建）"""
+    from .projection import rebuild_all, rebuild_incremental
     from .store import create_store_group
 
     db_path = get_db_path()
@@ -38,12 +38,13 @@ async def rebuild_projections() -> None:
 
     print(f"数据库路径: {db_path}")
     print(f"Artifacts 目录: {artifacts_dir}")
-    print("开始重建 Projection...")
+    print(f"开始重建 Projection（{'全量' if full else '增量'}）...")
 
     store_group = await create_store_group(db_path, artifacts_dir)
 
     try:
-        event_count = await rebuild_all(
+        rebuild = rebuild_all if full else rebuild_incremental
+        event_count = await rebuild(
             store_group.conn,
             store_group.event_store,
             store_group.task_store,
@@ -45,5 +45,153 @@ SSE_HEARTBEAT_INTERVAL: int = int(
     os.environ.get("OCTOAGENT_SSE_HEARTBEAT_INTERVAL", "15")
 )
 
+# SSE 断线重连环形缓冲：每个 task 保留的最近事件数 / 保留缓冲的 task 数上限（LRU）
+SSE_REPLAY_BUFFER_SIZE: int = int(
+    os.environ.get("OCTOAGENT_SSE_REPLAY_BUFFER_SIZE", "256")
+)
+SSE_REPLAY_MAX_TASKS: int = int(
+    os.environ.get("OCTOAGENT_SSE_REPLAY_MAX_TASKS", "512")
+)
+
 # 消息预览截断长度
 MESSAGE_PREVIEW_LENGTH: int = 200
+
+# 事件追加 group commit（opt-in）：主写连接上并发的 append_event_committed 在时间窗口 /
+# 批次上限内合并为一个事务提交，降低每事件一次 fsync 的吞吐上限
+EVENT_GROUP_COMMIT_ENABLED: bool = os.environ.get(
+    "OCTOAGENT_EVENT_GROUP_COMMIT", ""
+).strip().lower() in {"1", "true", "yes", "on"}
+
+# group commit 额外收集窗口（毫秒）；0 = 仅合并上一批次提交期间到达的请求
+EVENT_GROUP_COMMIT_WINDOW_MS: float = float(
+    os.environ.get("OCTOAGENT_EVENT_GROUP_COMMIT_WINDOW_MS", "0")
+)
+
+# group commit 单批次最大事件数（攒满立即提交）
+EVENT_GROUP_COMMIT_MAX_BATCH: int = int(
+    os.environ.get("OCTOAGENT_EVENT_GROUP_COMMIT_MAX_BATCH", "64")
+)
+
+# task_seq 进程内分配器缓存的 task 数上限（LRU 淘汰空闲 task；0 = 关闭，每次查 MAX）
+EVENT_TASK_SEQ_CACHE_SIZE: int = int(
+    os.environ.get("OCTOAGENT_EVENT_TASK_SEQ_CACHE_SIZE", "4096")
+)
+
+# Memory embedding 缓存预算（字节，按 float32 向量计）：内存 LRU 层 / SQLite 落盘层；0 = 关闭该层
+MEMORY_EMBEDDING_CACHE_MEMORY_BYTES: int = int(
+    os.environ.get("OCTOAGENT_MEMORY_EMBEDDING_CACHE_MEMORY_BYTES", str(64 * 1024 * 1024))
+)
+MEMORY_EMBEDDING_CACHE_DISK_BYTES: int = int(
+    os.environ.get("OCTOAGENT_MEMORY_EMBEDDING_CACHE_DISK_BYTES", str(512 * 1024 * 1024))
+)
+
+# Token 计数缓存条目数上限（按内容哈希复用 estimate_text_tokens 结果；0 = 关闭）
+TOKEN_COUNT_CACHE_SIZE: int = int(os.environ.get("OCTOAGENT_TOKEN_COUNT_CACHE_SIZE", "50000"))
+
+# Token 计数缓存是否随 gateway 启停落盘（事件库同目录 token_counts.db；0 = 仅进程内）
+TOKEN_COUNT_CACHE_PERSIST: bool = os.environ.get(
+    "OCTOAGENT_TOKEN_COUNT_CACHE_PERSIST", "1"
+).strip().lower() not in {"0", "false", "no", "off"}
+
+# tool 结果内容威胁扫描（CONTEXT scope）结果缓存条目数（按内容哈希，重复输出不重扫；0 = 关闭）
+THREAT_SCAN_CACHE_SIZE: int = int(os.environ.get("OCTOAGENT_THREAT_SCAN_CACHE_SIZE", "2048"))
+
+# SkillRunner 对话历史常驻内存预算（字节，按消息 JSON 体积计；超出时最久未用的空闲会话落盘；
+# 0 = 不限）
+SKILL_HISTORY_MEMORY_BYTES: int = int(
+    os.environ.get("OCTOAGENT_SKILL_HISTORY_MEMORY_BYTES", str(256 * 1024 * 1024))
+)
+
+# 对话历史落盘层（事件库同目录 conversation_histories.db，超预算 / 停机时写入，重启后按需恢复；
+# 0 = 仅进程内，超预算只告警）
+SKILL_HISTORY_SPILL: bool = os.environ.get(
+    "OCTOAGENT_SKILL_HISTORY_SPILL", "1"
+).strip().lower() not in {"0", "false", "no", "off"}
+
+# 对话轮次增量缓存保留的 task 数上限（LRU；0 = 关闭，每次构建上下文全量重建）
+CONVERSATION_TURN_CACHE_MAX_TASKS: int = int(
+    os.environ.get("OCTOAGENT_CONVERSATION_TURN_CACHE_MAX_TASKS", "256")
+)
+
+# SQLite 只读连接池大小（WAL 下与主写连接并发的 SELECT 路径；0 = 全部走主连接）
+SQLITE_READ_POOL_SIZE: int = int(os.environ.get("OCTOAGENT_SQLITE_READ_POOL_SIZE", "4"))
+
+# TaskRunner 准入控制：全局并发 job 上限（0 = 不限，默认不限；按部署容量显式配置）
+TASK_RUNNER_MAX_CONCURRENT_JOBS: int = int(
+    os.environ.get("OCTOAGENT_TASK_RUNNER_MAX_CONCURRENT_JOBS", "0")
+)
+
+# 按 model alias / provider 的并发上限，格式 "main=4,cheap=8"（未列出的不限）
+TASK_RUNNER_ALIAS_CONCURRENCY: str = os.environ.get("OCTOAGENT_TASK_RUNNER_ALIAS_CONCURRENCY", "")
+TASK_RUNNER_PROVIDER_CONCURRENCY: str = os.environ.get(
+    "OCTOAGENT_TASK_RUNNER_PROVIDER_CONCURRENCY", ""
+)
+
+# 模型输出增量流式（合并为瞬态 SSE 帧推送，不落事件库；0 = 关闭，只推整段事件）
+MODEL_DELTA_STREAMING: bool = os.environ.get(
+    "OCTOAGENT_MODEL_DELTA_STREAMING", "1"
+).strip().lower() not in {"0", "false", "no", "off"}
+
+# 增量合并窗口（毫秒）与单帧字符上限：先到者触发推送
+MODEL_DELTA_FLUSH_INTERVAL_MS: int = int(
+    os.environ.get("OCTOAGENT_MODEL_DELTA_FLUSH_INTERVAL_MS", "50")
+)
+MODEL_DELTA_FLUSH_MAX_CHARS: int = int(
+    os.environ.get("OCTOAGENT_MODEL_DELTA_FLUSH_MAX_CHARS", "512")
+)
+
+# Provider 级共享限流治理（AIMD：429 时降速、成功后逐步恢复；0 = 关闭，只靠调用方退避）
+PROVIDER_RATE_GOVERNOR: bool = os.environ.get(
+    "OCTOAGENT_PROVIDER_RATE_GOVERNOR", "1"
+).strip().lower() not in {"0", "false", "no", "off"}
+
+# 限流后每分钟请求数下限（降速不会低于此值）
+PROVIDER_RATE_MIN_RPM: int = int(os.environ.get("OCTOAGENT_PROVIDER_RATE_MIN_RPM", "6"))
+
+# 按 provider 的每分钟 token 预算，格式 "openai=90000,anthropic=40000"（未列出的不限）
+PROVIDER_TPM_LIMITS: str = os.environ.get("OCTOAGENT_PROVIDER_TPM_LIMITS", "")
+
+# system prompt 稳定块打 prompt 缓存断点（Anthropic cache_control；0 = 关闭）
+PROMPT_CACHE_BREAKPOINTS: bool = os.environ.get(
+    "OCTOAGENT_PROMPT_CACHE_BREAKPOINTS", "1"
+).strip().lower() not in {"0", "false", "no", "off"}
+
+# MCP server 发现并发上限（refresh 时同时拉起 + list_tools 的 server 数；1 = 串行）
+MCP_DISCOVERY_CONCURRENCY: int = int(os.environ.get("OCTOAGENT_MCP_DISCOVERY_CONCURRENCY", "4"))
+
+# 单个 MCP server 发现超时（秒，含子进程启动 / initialize / list_tools）
+MCP_DISCOVERY_TIMEOUT_S: float = float(
+    os.environ.get("OCTOAGENT_MCP_DISCOVERY_TIMEOUT_S", "30")
+)
+
+# MCP 工具清单落盘缓存（启动时先注册缓存工具，再后台重新发现；0 = 关闭）
+MCP_MANIFEST_CACHE: bool = os.environ.get(
+    "OCTOAGENT_MCP_MANIFEST_CACHE", "1"
+).strip().lower() not in {"0", "false", "no", "off"}
+
+# MCP server session 组大小默认值（server 配置 min_sessions / max_sessions 为 0 时生效）；
+# max > 1 时并发工具调用可扩容到多个 stdio 子进程（有状态 server 请保持 1）
+MCP_SESSION_MIN: int = int(os.environ.get("OCTOAGENT_MCP_SESSION_MIN", "1"))
+MCP_SESSION_MAX: int = int(os.environ.get("OCTOAGENT_MCP_SESSION_MAX", "1"))
+
+# 超出 min_sessions 的 MCP session 空闲多久后退役（秒）
+MCP_SESSION_IDLE_TTL_S: float = float(
+    os.environ.get("OCTOAGENT_MCP_SESSION_IDLE_TTL_S", "300")
+)
+
+# Watchdog 内存活跃度索引（事件追加时增量维护，扫描零 per-task 查询；0 = 关闭，检测器逐任务查询）
+WATCHDOG_ACTIVITY_INDEX: bool = os.environ.get(
+    "OCTOAGENT_WATCHDOG_ACTIVITY_INDEX", "1"
+).strip().lower() not in {"0", "false", "no", "off"}
+
+# 增量 backup chunk 大小（字节；文件按固定大小切块、按 sha256 内容寻址去重，
+# 取 SQLite 页大小的整数倍，未改动的页区间在两次快照间复用同一 chunk）
+BACKUP_CHUNK_BYTES: int = int(os.environ.get("OCTOAGENT_BACKUP_CHUNK_BYTES", str(4 * 1024 * 1024)))
+
+# 增量 backup 并行压缩线程数（仅压缩 chunk store 中尚不存在的新 chunk；1 = 串行）
+BACKUP_COMPRESS_WORKERS: int = int(os.environ.get("OCTOAGENT_BACKUP_COMPRESS_WORKERS", "4"))
+
+# 增量 manifest 链最大深度（超出后写一个新的完整 manifest，chunk 仍复用；限制 restore 折叠成本）
+BACKUP_INCREMENTAL_MAX_CHAIN: int = int(
+    os.environ.get("OCTOAGENT_BACKUP_INCREMENTAL_MAX_CHAIN", "30")
+)
@@ -15,7 +15,8 @@ provider dx 的 `octo logs` / status ``last_error_line``（读侧，展示 servi
   ``Authorization: Bearer`` + Telegram bot token + 连接串密码 + JWT。
 - **掩码策略**：短 token（<18 字符）全 ``***``；长 token 留头 6 尾 4，
   中间用 ``…``（U+2026，不在任何 token 字符类里 → 重跑正则不再命中，幂等）。
-- **性能**：每条规则带廉价 substring 预检，无密钥形状的行不跑全量正则。
+- **性能**：每条规则带廉价 substring 预检，无密钥形状的行不跑全量正则；
+  执行模型与事件 payload 脱敏共用 ``octoagent.core.redaction.Redactor``。
 - **安全默认**（FR-E3）：``_REDACT_ENABLED`` 在 **import 时快照** env
   ``OCTOAGENT_LOG_REDACT``（默认 ON）——防运行时 ``export ..._REDACT=false``
   中途关掉脱敏（契合「单次授权 / 禁令优于指令」）。公共入口不提供
@@ -28,8 +29,8 @@ from __future__ import annotations
 
 import os
 import re
-from collections.abc import Callable
-from re import Match, Pattern
+
+from octoagent.core.redaction import RedactionRule, Redactor
 
 # ---------------------------------------------------------------------------
 # FR-E3：import 时快照 env（默认 ON；运行时改 env 不生效）
@@ -68,7 +69,7 @@ def _mask_value(secret: str) -> str:
 
 
 # ---------------------------------------------------------------------------
-# 规则表：(预检 substring 判定, 编译正则, 替换函数)
+# 规则表：(编译正则, 替换函数, 预检 substring 判定)
 # ---------------------------------------------------------------------------
 
 # 1) 厂商 key 前缀（FR-E2 子集）：OpenAI / Anthropic(sk-ant-) / DeepSeek /
@@ -121,57 +122,55 @@ def _has_keyword(text_lower: str) -> bool:
 #: ``redact_sensitive_text`` 的降级第二遍。
 _ANSI_CSI_PATTERN = re.compile(r"\x1b\[[0-9;?]*[A-Za-z]")
 
-_RuleProbe = Callable[[str, str], bool]
-_RuleReplace = Callable[[Match[str]], str]
-
-_RULES: list[tuple[_RuleProbe, Pattern[str], _RuleReplace]] = [
-    (
-        lambda text, _lower: "sk-" in text,
-        _PREFIX_KEY_PATTERN,
-        lambda match: _mask_token(match.group(0)),
-    ),
-    (
-        lambda text, lower: "=" in text and _has_keyword(lower),
-        _ENV_ASSIGN_PATTERN,
-        lambda match: f"{match.group(1)}={match.group(2)}{_mask_value(match.group(3))}",
-    ),
-    (
-        lambda text, lower: (":" in text or "=" in text) and _has_keyword(lower),
-        _JSON_FIELD_PATTERN,
-        lambda match: (
-            f"{match.group(1)}{match.group(2)}{match.group(1)}{match.group(3)}"
-            f"{match.group(4)}{_mask_value(match.group(5))}{match.group(4)}"
+#: 规则表按序执行（后一条规则看到的是前一条的输出），每条规则带 substring 预检。
+#: 不合并为单一 alternation：七条规则的替换相互依赖（如 ENV 值里的 ``sk-`` 先被
+#: 前缀规则遮掉），且实测合并后的总闸正则比逐条 substring 预检慢约 5 倍。
+_REDACTOR = Redactor(
+    [
+        RedactionRule(
+            _PREFIX_KEY_PATTERN,
+            lambda match: _mask_token(match.group(0)),
+            lambda text, _lower: "sk-" in text,
+        ),
+        RedactionRule(
+            _ENV_ASSIGN_PATTERN,
+            lambda match: f"{match.group(1)}={match.group(2)}{_mask_value(match.group(3))}",
+            lambda text, lower: "=" in text and _has_keyword(lower),
+        ),
+        RedactionRule(
+            _JSON_FIELD_PATTERN,
+            lambda match: (
+                f"{match.group(1)}{match.group(2)}{match.group(1)}{match.group(3)}"
+                f"{match.group(4)}{_mask_value(match.group(5))}{match.group(4)}"
+            ),
+            lambda text, lower: (":" in text or "=" in text) and _has_keyword(lower),
+        ),
+        RedactionRule(
+            _BEARER_PATTERN,
+            lambda match: f"{match.group(1)}{_mask_value(match.group(2))}",
+            lambda _text, lower: "bearer " in lower,
         ),
-    ),
-    (
-        lambda _text, lower: "bearer " in lower,
-        _BEARER_PATTERN,
-        lambda match: f"{match.group(1)}{_mask_value(match.group(2))}",
-    ),
-    (
-        lambda text, _lower: ":" in text,
-        _TELEGRAM_TOKEN_PATTERN,
-        lambda match: f"{match.group(1)}:{_mask_token(match.group(2))}",
-    ),
-    (
-        lambda text, _lower: "://" in text,
-        _CONNECTION_URI_PATTERN,
-        lambda match: f"{match.group(1)}:{_MASK}@",
-    ),
-    (
-        lambda text, _lower: "eyJ" in text,
-        _JWT_PATTERN,
-        lambda match: _mask_token(match.group(0)),
-    ),
-]
+        RedactionRule(
+            _TELEGRAM_TOKEN_PATTERN,
+            lambda match: f"{match.group(1)}:{_mask_token(match.group(2))}",
+            lambda text, _lower: ":" in text,
+        ),
+        RedactionRule(
+            _CONNECTION_URI_PATTERN,
+            lambda match: f"{match.group(1)}:{_MASK}@",
+            lambda text, _lower: "://" in text,
+        ),
+        RedactionRule(
+            _JWT_PATTERN,
+            lambda match: _mask_token(match.group(0)),
+            lambda text, _lower: "eyJ" in text,
+        ),
+    ]
+)
 
 
 def _apply_rules(text: str) -> str:
-    lower = text.lower()
-    for probe, pattern, replace in _RULES:
-        if probe(text, lower):
-            text = pattern.sub(replace, text)
-    return text
+    return _REDACTOR.redact(text)
 
 
 def _redact_with_flag(text: str, *, enabled: bool) -> str:
@@ -49,6 +49,8 @@ class BackupFileEntry(BaseModel):
     required: bool = True
     size_bytes: int = 0
     sha256: str = ""
+    # 增量 bundle：文件内容按序对应的 chunk sha256 列表（ZIP bundle 为空）
+    chunks: list[str] = Field(default_factory=list)
 
 
 class BackupManifest(BaseModel):
@@ -62,6 +64,10 @@ class BackupManifest(BaseModel):
     excluded_paths: list[str] = Field(default_factory=list)
     sensitivity_level: SensitivityLevel = SensitivityLevel.METADATA_ONLY
     notes: list[str] = Field(default_factory=list)
+    bundle_format: Literal["zip", "incremental"] = "zip"
+    # 增量 manifest 链：files 只含相对父 manifest 新增 / 变化的条目，removed_paths 为删除的条目
+    parent_bundle_id: str | None = None
+    removed_paths: list[str] = Field(default_factory=list)
 
 
 class BackupBundle(BaseModel):
@@ -1,10 +1,15 @@
 """Projection 重建模块 -- 对齐 spec FR-M0-ES-4
 
 从 events 表重建 tasks 表（物化视图），确保事件溯源的一致性。
-支持单事件应用和全量重建两种模式。
+支持单事件应用、全量重建与基于 watermark 的增量重建三种模式。
+
+增量重建以 events.rowid 作为全局 watermark（持久化在 projection_watermarks 表），
+只流式读取 watermark 之后的事件，逐页 apply 后批量 upsert 并在同一事务内推进
+watermark——中途失败重跑从最近一次提交的页继续。
 """
 
 import time
+from datetime import UTC, datetime
 
 import aiosqlite
 import structlog
@@ -74,65 +79,202 @@ def apply_event(tasks: dict[str, Task], event: Event) -> None:
             )
 
 
+#: projection_watermarks 主键：tasks 投影
+TASKS_PROJECTION = "tasks"
+
+#: 每页流式读取的事件数（同时是增量重建的 checkpoint 粒度）
+DEFAULT_REBUILD_BATCH_SIZE = 500
+
+
+async def load_watermark(
+    conn: aiosqlite.Connection,
+    projection: str = TASKS_PROJECTION,
+) -> tuple[int, str | None] | None:
+    """读取投影 watermark，返回 (last_rowid, last_event_id)；从未重建过返回 None"""
+    cursor = await conn.execute(
+        "SELECT last_rowid, last_event_id FROM projection_watermarks WHERE projection = ?",
+        (projection,),
+    )
+    row = await cursor.fetchone()
+    if row is None:
+        return None
+    return int(row[0]), row[1]
+
+
+async def _save_watermark(
+    conn: aiosqlite.Connection,
+    last_rowid: int,
+    last_event_id: str | None,
+    projection: str = TASKS_PROJECTION,
+) -> None:
+    """写入投影 watermark（不自动提交，与批量 upsert 同事务）"""
+    await conn.execute(
+        """
+        INSERT INTO projection_watermarks (projection, last_rowid, last_event_id, updated_at)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT(projection) DO UPDATE SET
+            last_rowid = excluded.last_rowid,
+            last_event_id = excluded.last_event_id,
+            updated_at = excluded.updated_at
+        """,
+        (projection, last_rowid, last_event_id, datetime.now(UTC).isoformat()),
+    )
+
+
 async def rebuild_all(
     conn: aiosqlite.Connection,
     event_store: SqliteEventStore,
     task_store: SqliteTaskStore,
+    *,
+    batch_size: int = DEFAULT_REBUILD_BATCH_SIZE,
 ) -> int:
-    """从 events 表重建 tasks 表
+    """从 events 表全量重建 tasks 表（显式 full 模式）
 
     流程：
-    1. 读取所有事件（按 task_id, task_seq 排序）
-    2. 在内存中应用所有事件，构建 Task 状态
-    3. 清空 tasks 表
-    4. 写入重建后的所有 Task
+    1. 记录当前 events 最大 rowid 作为本次重建上界
+    2. 清空 tasks 表
+    3. 按 (task_id, task_seq) 分页流式读取事件并在内存中 apply；
+       task_id 有序，翻页时已完结的 task 立即批量 upsert 并释放
+    4. 写入 watermark，整体单事务提交
 
     Args:
         conn: 数据库连接
         event_store: EventStore 实例
         task_store: TaskStore 实例
+        batch_size: 每页事件数
 
     Returns:
         处理的事件总数
     """
     start_time = time.monotonic()
-
-    # 1. 读取所有事件
-    events = await event_store.get_all_events()
-    event_count = len(events)
+    upto_rowid, upto_event_id = await event_store.get_event_watermark()
 
     await log.ainfo(
         "projection_rebuild_started",
-        event_count=event_count,
+        mode="full",
+        upto_rowid=upto_rowid,
     )
 
-    # 2. 在内存中应用所有事件
-    tasks: dict[str, Task] = {}
-    for event in events:
-        apply_event(tasks, event)
+    event_count = 0
+    task_count = 0
 
-    # 3. 临时禁用外键约束，清空 tasks 表后重建
+    # 临时禁用外键约束，清空 tasks 表后重建
     await conn.execute("PRAGMA foreign_keys = OFF")
     try:
         await conn.execute("DELETE FROM tasks")
 
-        # 4. 写入重建后的所有 Task
-        for task in tasks.values():
-            await task_store.create_task(task)
+        pending: dict[str, Task] = {}
+        async for page in event_store.iter_all_event_pages(
+            upto_rowid=upto_rowid,
+            page_size=batch_size,
+        ):
+            for event in page:
+                apply_event(pending, event)
+            event_count += len(page)
+
+            # 页末 task 的事件可能延续到下一页，其余 task 已完结
+            tail_task_id = page[-1].task_id
+            finished = [task for tid, task in pending.items() if tid != tail_task_id]
+            await task_store.upsert_tasks(finished)
+            task_count += len(finished)
+            pending = {tid: task for tid, task in pending.items() if tid == tail_task_id}
 
+        await task_store.upsert_tasks(list(pending.values()))
+        task_count += len(pending)
+
+        await _save_watermark(conn, upto_rowid, upto_event_id)
         await conn.commit()
     except Exception:
         await conn.rollback()
         raise
     finally:
-        # 5. 无论重建是否成功都恢复外键约束
+        # 无论重建是否成功都恢复外键约束
         await conn.execute("PRAGMA foreign_keys = ON")
 
     elapsed_ms = int((time.monotonic() - start_time) * 1000)
     await log.ainfo(
         "projection_rebuild_completed",
+        mode="full",
+        event_count=event_count,
+        task_count=task_count,
+        elapsed_ms=elapsed_ms,
+    )
+
+    return event_count
+
+
+async def rebuild_incremental(
+    conn: aiosqlite.Connection,
+    event_store: SqliteEventStore,
+    task_store: SqliteTaskStore,
+    *,
+    batch_size: int = DEFAULT_REBUILD_BATCH_SIZE,
+) -> int:
+    """基于 watermark 增量重建 tasks 表
+
+    只处理 rowid 大于 watermark 的事件：每页批量加载涉及的 Task、apply 事件、
+    executemany upsert，并在同一事务内推进 watermark 后提交。
+
+    以下情况回退到 rebuild_all：
+    - 从未重建过（无 watermark）
+    - watermark 行已不存在或 event_id 不一致（事件被删除 / rowid 被复用）
+
+    Returns:
+        处理的事件总数
+    """
+    watermark = await load_watermark(conn)
+    if watermark is None:
+        await log.ainfo("projection_rebuild_fallback_full", reason="no_watermark")
+        return await rebuild_all(conn, event_store, task_store, batch_size=batch_size)
+
+    last_rowid, last_event_id = watermark
+    if last_rowid > 0 and await event_store.get_event_id_at_rowid(last_rowid) != last_event_id:
+        await log.awarning(
+            "projection_rebuild_fallback_full",
+            reason="watermark_mismatch",
+            last_rowid=last_rowid,
+        )
+        return await rebuild_all(conn, event_store, task_store, batch_size=batch_size)
+
+    start_time = time.monotonic()
+    upto_rowid, _ = await event_store.get_event_watermark()
+
+    await log.ainfo(
+        "projection_rebuild_started",
+        mode="incremental",
+        after_rowid=last_rowid,
+        upto_rowid=upto_rowid,
+    )
+
+    event_count = 0
+    task_count = 0
+    async for page in event_store.iter_event_pages_since_rowid(
+        after_rowid=last_rowid,
+        upto_rowid=upto_rowid,
+        page_size=batch_size,
+    ):
+        task_ids = list(dict.fromkeys(event.task_id for _, event in page))
+        tasks = {task.task_id: task for task in await task_store.get_tasks_by_ids(task_ids)}
+        for _, event in page:
+            apply_event(tasks, event)
+
+        page_rowid, page_event = page[-1]
+        try:
+            await task_store.upsert_tasks(list(tasks.values()))
+            await _save_watermark(conn, page_rowid, page_event.event_id)
+            await conn.commit()
+        except Exception:
+            await conn.rollback()
+            raise
+        event_count += len(page)
+        task_count += len(tasks)
+
+    elapsed_ms = int((time.monotonic() - start_time) * 1000)
+    await log.ainfo(
+        "projection_rebuild_completed",
+        mode="incremental",
         event_count=event_count,
-        task_count=len(tasks),
+        task_count=task_count,
         elapsed_ms=elapsed_ms,
     )
 
@@ -0,0 +1,103 @@
+"""脱敏引擎：整体预筛 + 逐规则预检 + 写时复制树遍历。
+
+日志行脱敏（``log_redaction``，出站）与工具事件 payload 脱敏（``tooling.sanitizer``）
+共用同一套执行模型，二者都在热路径上（每条日志 / 每个事件）：
+
+- ``Redactor.redact``：先跑调用点的整体 ``prefilter``（廉价 substring 判定），不可能
+  命中的文本**原对象返回**（零分配）；否则折叠文本（默认 ``str.lower``）只算一次，
+  按序跑规则，每条规则自带 probe 预检。``re.sub`` 无命中时同样返回原对象，调用方
+  用 ``is`` 即可判断是否改动。
+- ``redact_tree``：递归遍历 dict / list，仅当子树确有改动时才浅拷贝该层；未改动的
+  子树原样返回，大 tool result（长正文 + 大列表）无敏感内容时整棵树零拷贝。
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from re import Match, Pattern
+from typing import Any
+
+#: 规则预检：``(原文, 原文折叠)`` → 是否值得跑该规则的正则。
+RuleProbe = Callable[[str, str], bool]
+#: 叶子脱敏回调：``(字符串值, 所在键名 | None)`` → 脱敏后的值（未改动须返回原对象）。
+LeafRedactor = Callable[[str, Any], str]
+
+
+@dataclass(frozen=True, slots=True)
+class RedactionRule:
+    """单条脱敏规则：正则 + 替换（模板串或函数）+ 可选预检。"""
+
+    pattern: Pattern[str]
+    replace: str | Callable[[Match[str]], str]
+    probe: RuleProbe | None = None
+
+
+class Redactor:
+    """按序执行一组规则的文本脱敏器。
+
+    ``prefilter`` 为 False 的文本直接原样返回；规则的 probe 收到的折叠文本始终由
+    **原文**经 ``fold`` 得到（只算一次，与规则执行顺序无关）。大小写不敏感的判定应
+    在折叠文本上用大小写敏感的字面量 / 正则完成——CPython ``re`` 的 IGNORECASE
+    alternation 在长文本上比「折叠 + 字面量」慢一个数量级。
+    """
+
+    __slots__ = ("_fold", "_needs_fold", "_prefilter", "_rules")
+
+    def __init__(
+        self,
+        rules: list[RedactionRule] | tuple[RedactionRule, ...],
+        *,
+        prefilter: Callable[[str], bool] | None = None,
+        fold: Callable[[str], str] = str.lower,
+    ) -> None:
+        self._rules = tuple(rules)
+        self._prefilter = prefilter
+        self._fold = fold
+        self._needs_fold = any(rule.probe is not None for rule in self._rules)
+
+    @property
+    def rules(self) -> tuple[RedactionRule, ...]:
+        return self._rules
+
+    def redact(self, text: str) -> str:
+        if not text or (self._prefilter is not None and not self._prefilter(text)):
+            return text
+        folded = self._fold(text) if self._needs_fold else text
+        for rule in self._rules:
+            if rule.probe is None or rule.probe(text, folded):
+                text = rule.pattern.sub(rule.replace, text)
+        return text
+
+
+def redact_tree(value: Any, redact_leaf: LeafRedactor, key: Any = None) -> Any:
+    """写时复制地脱敏 dict / list 树。
+
+    字符串叶子交给 ``redact_leaf(value, key)``（list 元素的 key 为 None）；其它标量
+    原样返回。某层只有在至少一个子节点改动时才浅拷贝（dict → dict，list → list），
+    未改动的层返回原对象——调用方不得假设返回值与入参是不同对象。
+    """
+    if isinstance(value, str):
+        return redact_leaf(value, key)
+    if isinstance(value, dict):
+        copied: dict[Any, Any] | None = None
+        for child_key, child in value.items():
+            redacted = redact_tree(child, redact_leaf, child_key)
+            if redacted is not child:
+                if copied is None:
+                    copied = dict(value)
+                copied[child_key] = redacted
+        return value if copied is None else copied
+    if isinstance(value, list):
+        copied_items: list[Any] | None = None
+        for index, item in enumerate(value):
+            redacted = redact_tree(item, redact_leaf, None)
+            if redacted is not item:
+                if copied_items is None:
+                    copied_items = list(value)
+                copied_items[index] = redacted
+        return value if copied_items is None else copied_items
+    return value
+
+
+__all__ = ["LeafRedactor", "RedactionRule", "Redactor", "RuleProbe", "redact_tree"]
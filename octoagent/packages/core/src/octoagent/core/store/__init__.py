@@ -9,8 +9,15 @@ from pathlib import Path
 
 import aiosqlite
 
+from ..config import (
+    EVENT_GROUP_COMMIT_ENABLED,
+    EVENT_GROUP_COMMIT_MAX_BATCH,
+    EVENT_GROUP_COMMIT_WINDOW_MS,
+    EVENT_TASK_SEQ_CACHE_SIZE,
+    SQLITE_READ_POOL_SIZE,
+)
 from .a2a_store import SqliteA2AStore
-from .connection import apply_write_connection_pragmas
+from .connection import apply_write_connection_pragmas, connect_store
 from .agent_context_store import SqliteAgentContextStore
 from .artifact_store import SqliteArtifactStore
 from .behavior_compact_store import SqliteBehaviorCompactStore
@@ -20,9 +27,11 @@ from .conversation_binding_store import SqliteConversationBindingStore
 from .event_store import SqliteEventStore
 from .notification_store import SqliteNotificationStore
 from .project_store import SqliteProjectStore
+from .read_pool import ReadConnectionPool, ReadPoolStats
 from .side_effect_ledger_store import SqliteSideEffectLedgerStore
 from .sqlite_init import init_db
 from .task_job_store import SqliteTaskJobStore
+from .task_seq_allocator import shared_task_seq_allocator
 from .task_store import SYSTEM_INTERNAL_TASK_CHANNEL, SqliteTaskStore
 from .telegram_outbound_spool_store import (
     OutboundSpoolItem,
@@ -44,8 +53,14 @@ class StoreGroup:
         conn: aiosqlite.Connection,
         artifacts_dir: Path,
         versionable_conn: aiosqlite.Connection | None = None,
+        *,
+        event_store: SqliteEventStore | None = None,
+        read_pool: ReadConnectionPool | None = None,
     ) -> None:
         self.conn = conn
+        # 只读连接池：各 store 的 SELECT 经此路由（主连接有未提交事务时仍读主连接）；
+        # 直接构造（未注入）时为主连接上的透传
+        self.read_pool = read_pool if read_pool is not None else ReadConnectionPool(conn)
         # F104：versionable append 专用独立写连接（autocommit + 手动 BEGIN IMMEDIATE）。
         # 其 commit/rollback 仅作用于自身，与主连接 conn 的事务边界彻底隔离——主连接上并发的
         # 默认 versionable=False 写不会被 versionable 写提前提交 / 错误回滚（FR-004/FR-021）。
@@ -56,8 +71,13 @@ class StoreGroup:
         # 都在同一 versionable_conn 上 BEGIN IMMEDIATE，必须共用锁串行化，否则两把独立锁
         # 并发各自 BEGIN IMMEDIATE 触发 "transaction within transaction"。
         self._versionable_write_lock = asyncio.Lock()
-        self.task_store = SqliteTaskStore(conn)
-        self.event_store = SqliteEventStore(conn)
+        self.task_store = SqliteTaskStore(conn, read_pool=self.read_pool)
+        # 默认逐条提交；create_store_group 按配置注入开启 group commit 的实例
+        self.event_store = (
+            event_store
+            if event_store is not None
+            else SqliteEventStore(conn, read_pool=self.read_pool)
+        )
         # F104：注入 event_store 到 artifact_store，使 versionable append 失败时可
         # 通过 append_event_committed 独立提交 durable 失败事件（不被 rollback 吞）。
         # event_store 走主连接：versionable_conn rollback 不影响 durable 失败事件提交。
@@ -74,15 +94,15 @@ class StoreGroup:
             versionable_conn=versionable_conn,
             write_lock=self._versionable_write_lock,
         )
-        self.task_job_store = SqliteTaskJobStore(conn)
-        self.checkpoint_store = SqliteCheckpointStore(conn)
+        self.task_job_store = SqliteTaskJobStore(conn, read_pool=self.read_pool)
+        self.checkpoint_store = SqliteCheckpointStore(conn, read_pool=self.read_pool)
         self.side_effect_ledger_store = SqliteSideEffectLedgerStore(conn)
-        self.project_store = SqliteProjectStore(conn)
-        self.agent_context_store = SqliteAgentContextStore(conn)
-        self.a2a_store = SqliteA2AStore(conn)
-        self.work_store = SqliteWorkStore(conn)
+        self.project_store = SqliteProjectStore(conn, read_pool=self.read_pool)
+        self.agent_context_store = SqliteAgentContextStore(conn, read_pool=self.read_pool)
+        self.a2a_store = SqliteA2AStore(conn, read_pool=self.read_pool)
+        self.work_store = SqliteWorkStore(conn, read_pool=self.read_pool)
         # F116：通知 dismiss/active 持久化（NotificationService rehydrate 用）
-        self.notification_store = SqliteNotificationStore(conn)
+        self.notification_store = SqliteNotificationStore(conn, read_pool=self.read_pool)
         # F111：行为文件精简提议候选（共享主连接，R4——不在方法内 commit）
         self.behavior_compact_store = SqliteBehaviorCompactStore(conn)
         # F105：渠道会话路由绑定（OC-2 ConversationBinding + OC-6 last-route 状态）
@@ -95,7 +115,13 @@ class StoreGroup:
 
         F104：versionable_conn 是独立物理连接，必须与主 conn 一并关闭，否则进程
         退出/测试 teardown 时悬挂连接。两个连接独立关闭，互不影响。
+        关闭连接前先提交 event_store group commit 队列中的剩余 append 请求，
+        再关闭只读连接池。
         """
+        with contextlib.suppress(Exception):
+            await self.event_store.close()
+        with contextlib.suppress(Exception):
+            await self.read_pool.close()
         with contextlib.suppress(Exception):
             await self.conn.close()
         # 仅当 versionable_conn 是独立物理连接时才单独关闭（退化路径下与 conn 同对象，已关）。
@@ -107,12 +133,19 @@ class StoreGroup:
 async def create_store_group(
     db_path: str,
     artifacts_dir: str | Path,
+    *,
+    event_group_commit: bool | None = None,
+    read_pool_size: int | None = None,
 ) -> StoreGroup:
     """创建 Store 实例组
 
     Args:
         db_path: SQLite 数据库文件路径
         artifacts_dir: Artifact 文件存储目录
+        event_group_commit: 是否开启事件追加 group commit；None 时取
+            OCTOAGENT_EVENT_GROUP_COMMIT 配置（默认关闭）
+        read_pool_size: 只读连接池大小；None 时取 OCTOAGENT_SQLITE_READ_POOL_SIZE，
+            0 表示所有读都走主连接
 
     Returns:
         StoreGroup 实例
@@ -124,7 +157,8 @@ async def create_store_group(
     db_dir = Path(db_path).parent
     db_dir.mkdir(parents=True, exist_ok=True)
 
-    conn = await aiosqlite.connect(db_path)
+    # 写连接经 connect_store 打开：commit / rollback 自动确认 / 丢弃 store 内部簿记
+    conn = await connect_store(db_path)
     conn.row_factory = aiosqlite.Row
     await init_db(conn)
 
@@ -134,14 +168,35 @@ async def create_store_group(
     # - foreign_keys/busy_timeout 是连接级 PRAGMA（不跨连接共享），必须本连接单独启用，
     #   否则 versionable 写绕过 task 外键 → 孤儿写入 + 与主连接外键行为分裂（F104 Codex
     #   finding 修复 1）。WAL 是库级状态主连接 init_db 已建立，无需重复设。
-    versionable_conn = await aiosqlite.connect(db_path, isolation_level=None)
+    versionable_conn = await connect_store(db_path, isolation_level=None)
     versionable_conn.row_factory = aiosqlite.Row
     await apply_write_connection_pragmas(versionable_conn)
 
+    # 只读连接池：连接按需懒打开（WAL 已由主连接 init_db 建立）
+    read_pool = ReadConnectionPool(
+        conn,
+        db_path,
+        size=SQLITE_READ_POOL_SIZE if read_pool_size is None else read_pool_size,
+    )
+
+    if event_group_commit is None:
+        event_group_commit = EVENT_GROUP_COMMIT_ENABLED
+    event_store = SqliteEventStore(
+        conn,
+        group_commit=event_group_commit,
+        group_commit_window_ms=EVENT_GROUP_COMMIT_WINDOW_MS,
+        group_commit_max_batch=EVENT_GROUP_COMMIT_MAX_BATCH,
+        # 同一 DB 上的所有 StoreGroup 共享 task_seq 分配器（进程内按路径复用）
+        task_seq_allocator=shared_task_seq_allocator(db_path, EVENT_TASK_SEQ_CACHE_SIZE),
+        read_pool=read_pool,
+    )
+
     return StoreGroup(
         conn=conn,
         artifacts_dir=artifacts_path,
         versionable_conn=versionable_conn,
+        event_store=event_store,
+        read_pool=read_pool,
     )
 
 
@@ -165,6 +220,8 @@ __all__ = [
     "SqliteAgentContextStore",
     "SqliteA2AStore",
     "SqliteWorkStore",
+    "ReadConnectionPool",
+    "ReadPoolStats",
     "init_db",
     "append_event_and_update_task",
     "append_event_only",
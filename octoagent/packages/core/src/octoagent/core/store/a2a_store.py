@@ -15,13 +15,21 @@ from ..models import (
     A2AMessageDirection,
     A2AMessageRecord,
 )
+from .read_pool import ReadConnectionPool
 
 
 class SqliteA2AStore:
     """a2a_conversations / a2a_messages 访问层。"""
 
-    def __init__(self, conn: aiosqlite.Connection) -> None:
+    def __init__(
+        self,
+        conn: aiosqlite.Connection,
+        *,
+        read_pool: ReadConnectionPool | None = None,
+    ) -> None:
         self._conn = conn
+        # SELECT 经只读连接池（未传入时透传到主连接）
+        self._reads = read_pool if read_pool is not None else ReadConnectionPool(conn)
         self._conversation_locks: dict[str, asyncio.Lock] = {}
         self._conversation_locks_guard = asyncio.Lock()
         self._max_message_seq_retries = 3
@@ -87,7 +95,7 @@ class SqliteA2AStore:
         return conversation
 
     async def get_conversation(self, a2a_conversation_id: str) -> A2AConversation | None:
-        cursor = await self._conn.execute(
+        cursor = await self._reads.execute(
             "SELECT * FROM a2a_conversations WHERE a2a_conversation_id = ?",
             (a2a_conversation_id,),
         )
@@ -95,7 +103,7 @@ class SqliteA2AStore:
         return self._row_to_conversation(row) if row is not None else None
 
     async def get_conversation_for_work(self, work_id: str) -> A2AConversation | None:
-        cursor = await self._conn.execute(
+        cursor = await self._reads.execute(
             """
             SELECT * FROM a2a_conversations
             WHERE work_id = ?
@@ -139,7 +147,7 @@ class SqliteA2AStore:
         if limit is not None:
             limit_clause = "LIMIT ?"
             args.append(limit)
-        cursor = await self._conn.execute(
+        cursor = await self._reads.execute(
             f"""
             SELECT * FROM a2a_conversations
             {where}
@@ -152,6 +160,7 @@ class SqliteA2AStore:
         return [self._row_to_conversation(row) for row in rows]
 
     async def get_next_message_seq(self, a2a_conversation_id: str) -> int:
+        # 序号分配紧跟写入，固定走主连接
         cursor = await self._conn.execute(
             """
             SELECT COALESCE(MAX(message_seq), 0)
@@ -247,7 +256,7 @@ class SqliteA2AStore:
         raise RuntimeError("failed to append a2a message after retries")
 
     async def get_message(self, a2a_message_id: str) -> A2AMessageRecord | None:
-        cursor = await self._conn.execute(
+        cursor = await self._reads.execute(
             "SELECT * FROM a2a_messages WHERE a2a_message_id = ?",
             (a2a_message_id,),
         )
@@ -274,7 +283,7 @@ class SqliteA2AStore:
             clauses.append("work_id = ?")
             args.append(work_id)
         where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
-        cursor = await self._conn.execute(
+        cursor = await self._reads.execute(
             f"""
             SELECT * FROM a2a_messages
             {where}
@@ -31,13 +31,21 @@ from ..models.agent_context import (
     normalize_runtime_role,
     normalize_session_kind,
 )
+from .read_pool import ReadConnectionPool
 
 
 class SqliteAgentContextStore:
     """agent profile / bootstrap / context frame 访问层。"""
 
-    def __init__(self, conn: aiosqlite.Connection) -> None:
+    def __init__(
+        self,
+        conn: aiosqlite.Connection,
+        *,
+        read_pool: ReadConnectionPool | None = None,
+    ) -> None:
         self._conn = conn
+        # SELECT 经只读连接池（未传入时透传到主连接）
+        self._reads = read_pool if read_pool is not None else ReadConnectionPool(conn)
 
     async def save_agent_profile(self, profile: AgentProfile) -> AgentProfile:
         await self._conn.execute(
@@ -695,7 +703,8 @@ class SqliteAgentContextStore:
         return self._row_to_agent_session_turn(row) if row is not None else None
 
     async def get_next_agent_session_turn_seq(self, agent_session_id: str) -> int:
-        row = await self._fetchone(
+        # 序号分配紧跟写入，固定走主连接
+        cursor = await self._conn.execute(
             """
             SELECT COALESCE(MAX(turn_seq), 0) AS max_turn_seq
             FROM agent_session_turns
@@ -703,6 +712,7 @@ class SqliteAgentContextStore:
             """,
             (agent_session_id,),
         )
+        row = await cursor.fetchone()
         return int(row["max_turn_seq"] or 0) + 1 if row is not None else 1
 
     async def list_agent_session_turns(
@@ -764,7 +774,7 @@ class SqliteAgentContextStore:
         Feature 067 / shutdown 竞态修复：session memory 提取重放（cursor 因
         closed-conn 未推进时）用它跳过已落库的 item，避免重复写 SoR。
         """
-        cursor = await self._conn.execute(
+        cursor = await self._reads.execute(
             "SELECT sor_id FROM memory_extraction_ledger WHERE idempotency_key = ?",
             (idempotency_key,),
         )
@@ -1271,11 +1281,11 @@ class SqliteAgentContextStore:
         return int(row["cnt"])
 
     async def _fetchone(self, query: str, params: tuple[object, ...]) -> aiosqlite.Row | None:
-        cursor = await self._conn.execute(query, params)
+        cursor = await self._reads.execute(query, params)
         return await cursor.fetchone()
 
     async def _fetchall(self, query: str, params: tuple[object, ...]) -> list[aiosqlite.Row]:
-        cursor = await self._conn.execute(query, params)
+        cursor = await self._reads.execute(query, params)
         return await cursor.fetchall()
 
     @staticmethod
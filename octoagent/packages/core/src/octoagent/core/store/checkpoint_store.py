@@ -8,6 +8,7 @@ from datetime import UTC, datetime
 import aiosqlite
 
 from ..models.checkpoint import CheckpointSnapshot, CheckpointStatus
+from .read_pool import ReadConnectionPool
 
 _CHECKPOINT_TRANSITIONS: dict[CheckpointStatus, set[CheckpointStatus]] = {
     CheckpointStatus.CREATED: {CheckpointStatus.PENDING},
@@ -21,8 +22,15 @@ _CHECKPOINT_TRANSITIONS: dict[CheckpointStatus, set[CheckpointStatus]] = {
 class SqliteCheckpointStore:
     """checkpoints 表访问层"""
 
-    def __init__(self, conn: aiosqlite.Connection) -> None:
+    def __init__(
+        self,
+        conn: aiosqlite.Connection,
+        *,
+        read_pool: ReadConnectionPool | None = None,
+    ) -> None:
         self._conn = conn
+        # SELECT 经只读连接池（未传入时透传到主连接）
+        self._reads = read_pool if read_pool is not None else ReadConnectionPool(conn)
 
     async def save_checkpoint(self, snapshot: CheckpointSnapshot) -> None:
         """保存 checkpoint（不自动提交）"""
@@ -49,7 +57,7 @@ class SqliteCheckpointStore:
 
     async def get_latest_success(self, task_id: str) -> CheckpointSnapshot | None:
         """获取最近成功 checkpoint"""
-        cursor = await self._conn.execute(
+        cursor = await self._reads.execute(
             """
             SELECT checkpoint_id, task_id, node_id, status, schema_version,
                    state_snapshot, side_effect_cursor, created_at, updated_at
@@ -67,7 +75,7 @@ class SqliteCheckpointStore:
 
     async def get_checkpoint(self, checkpoint_id: str) -> CheckpointSnapshot | None:
         """按 ID 查询 checkpoint"""
-        cursor = await self._conn.execute(
+        cursor = await self._reads.execute(
             """
             SELECT checkpoint_id, task_id, node_id, status, schema_version,
                    state_snapshot, side_effect_cursor, created_at, updated_at
@@ -84,7 +92,7 @@ class SqliteCheckpointStore:
     async def mark_status(self, checkpoint_id: str, status: str) -> None:
         """更新 checkpoint 状态（校验状态流转）"""
         target = CheckpointStatus(status)
-        cursor = await self._conn.execute(
+        cursor = await self._reads.execute(
             "SELECT status FROM checkpoints WHERE checkpoint_id = ?",
             (checkpoint_id,),
         )
@@ -109,7 +117,7 @@ class SqliteCheckpointStore:
 
     async def list_checkpoints(self, task_id: str) -> list[CheckpointSnapshot]:
         """列出任务 checkpoint（按 created_at 倒序）"""
-        cursor = await self._conn.execute(
+        cursor = await self._reads.execute(
             """
             SELECT checkpoint_id, task_id, node_id, status, schema_version,
                    state_snapshot, side_effect_cursor, created_at, updated_at
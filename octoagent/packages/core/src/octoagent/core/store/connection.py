@@ -4,8 +4,17 @@ connection-level PRAGMA（`foreign_keys` / `busy_timeout`）在 SQLite 中是**
 （不跨连接共享，区别于 `journal_mode=WAL` 这种库级状态）。任何会执行写入的连接——主连接
 （init_db 内部复用本 helper）与 F104 versionable append 专用独立写连接（create_store_group
 注入）——都必须各自启用，否则外键约束在不同连接上行为分裂（孤儿写入 / 行为不一致）。
+
+store 层写连接统一经 connect_store 打开（StoreConnection）：commit / rollback 完成后回调
+已注册的事务钩子，store 内部簿记（如 task_seq 分配器的未确认写入）随事务边界自动确认 /
+丢弃，业务代码直接 `await conn.commit()` / `rollback()` 即可，无需额外通知 store。
 """
 
+import sqlite3
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
 import aiosqlite
 
 # 连接级写锁等待兜底（毫秒），主连接与 versionable 独立连接保持一致。
@@ -20,3 +29,50 @@ async def apply_write_connection_pragmas(conn: aiosqlite.Connection) -> None:
     """
     await conn.execute("PRAGMA foreign_keys = ON;")
     await conn.execute(f"PRAGMA busy_timeout = {WRITE_CONNECTION_BUSY_TIMEOUT_MS};")
+
+
+#: 事务钩子：commit / rollback 完成后同步调用，必须廉价且不抛异常
+TransactionHook = Callable[["StoreConnection"], None]
+
+
+class StoreConnection(aiosqlite.Connection):
+    """带事务钩子的 aiosqlite 连接（由 connect_store 创建）"""
+
+    def __init__(
+        self, connector: Callable[[], sqlite3.Connection], iter_chunk_size: int
+    ) -> None:
+        super().__init__(connector, iter_chunk_size)
+        self._commit_hooks: list[TransactionHook] = []
+        self._rollback_hooks: list[TransactionHook] = []
+
+    def add_transaction_hooks(
+        self, *, on_commit: TransactionHook, on_rollback: TransactionHook
+    ) -> None:
+        """注册事务钩子（幂等：同一钩子重复注册只保留一份）"""
+        if on_commit not in self._commit_hooks:
+            self._commit_hooks.append(on_commit)
+        if on_rollback not in self._rollback_hooks:
+            self._rollback_hooks.append(on_rollback)
+
+    async def commit(self) -> None:
+        """提交当前事务；成功后回调 commit 钩子（提交失败时事务仍在，不回调）"""
+        await super().commit()
+        for hook in tuple(self._commit_hooks):
+            hook(self)
+
+    async def rollback(self) -> None:
+        """回滚当前事务；无论回滚本身是否报错都回调 rollback 钩子（丢弃总是安全的）"""
+        try:
+            await super().rollback()
+        finally:
+            for hook in tuple(self._rollback_hooks):
+                hook(self)
+
+
+def connect_store(database: str | Path, **kwargs: Any) -> StoreConnection:
+    """打开 store 写连接（用法同 aiosqlite.connect：await 或 async with）"""
+
+    def connector() -> sqlite3.Connection:
+        return sqlite3.connect(str(database), **kwargs)
+
+    return StoreConnection(connector, 64)
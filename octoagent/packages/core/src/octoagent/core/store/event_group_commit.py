@@ -0,0 +1,238 @@
+"""事件追加 group commit 写入器（opt-in）
+
+append_event_committed 默认每条事件独立 INSERT + UPDATE pointers + commit，fsync 次数与
+事件数 1:1。开启 group commit 后，主写连接上的 append 请求进入共享队列，由单一 flusher
+合并为一个事务提交：上一批次提交期间到达的请求自然组成下一批次（负载越高批次越大，
+空闲时不增加延迟），window_ms > 0 时额外等待收集窗口，攒满 max_batch 立即提交。
+
+- 快路径：整批一次 executemany INSERT + 一次 executemany UPDATE pointers
+- 批内出现完整性冲突时回滚快路径，逐条在 SAVEPOINT 内重放：task_seq 冲突只回滚该条
+  并按 MAX+1 重试（同连接可见本批次未提交的插入），其他错误只失败该条请求——与逐条
+  提交路径的冲突重试语义一致
+- 单 flusher 按到达顺序串行处理批次，同一 task 的 task_seq 单调性不变
+- 调用方只在共享 COMMIT 成功后拿到结果；COMMIT 失败时本批次全部请求收到异常
+- 批次在 writer 自有的独立写连接上 BEGIN / COMMIT / ROLLBACK（首次提交时按主连接的库
+  文件懒打开，close 时关闭）：不会提交或回滚其他协程在主连接上未完成的事务，主连接上
+  无关的回滚也撤不掉已确认的批次
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+import aiosqlite
+import structlog
+
+from ..models.event import Event
+from .connection import apply_write_connection_pragmas, connect_store
+
+if TYPE_CHECKING:
+    from .event_store import SqliteEventStore
+
+log = structlog.get_logger()
+
+_SAVEPOINT = "event_group_append"
+
+
+@dataclass(slots=True)
+class EventGroupCommitStats:
+    """group commit 运行指标（进程内累计）"""
+
+    batches_committed: int = 0
+    events_committed: int = 0
+    events_failed: int = 0
+    commit_failures: int = 0
+    max_batch_size: int = 0
+
+    @property
+    def avg_batch_size(self) -> float:
+        if self.batches_committed == 0:
+            return 0.0
+        return self.events_committed / self.batches_committed
+
+
+@dataclass(slots=True)
+class _PendingAppend:
+    event: Event
+    update_task_pointer: bool
+    future: asyncio.Future[Event] = field(repr=False)
+
+
+class EventGroupCommitWriter:
+    """把并发的 append_event_committed 请求合并为共享事务提交"""
+
+    def __init__(
+        self,
+        conn: aiosqlite.Connection,
+        event_store: SqliteEventStore,
+        *,
+        window_ms: float = 0.0,
+        max_batch: int = 64,
+    ) -> None:
+        # 主连接只用于定位库文件；批次写入走 _conn（writer 独占的写连接，懒打开）
+        self._main_conn = conn
+        self._conn: aiosqlite.Connection | None = None
+        self._event_store = event_store
+        self._window_s = max(window_ms, 0.0) / 1000
+        self._max_batch = max(max_batch, 1)
+        self._queue: list[_PendingAppend] = []
+        self._wakeup = asyncio.Event()
+        self._batch_full = asyncio.Event()
+        self._flusher: asyncio.Task[None] | None = None
+        self._closed = False
+        self.stats = EventGroupCommitStats()
+
+    @property
+    def pending(self) -> int:
+        """等待提交的请求数"""
+        return len(self._queue)
+
+    async def submit(self, event: Event, *, update_task_pointer: bool = True) -> Event:
+        """提交 append 请求，共享事务 COMMIT 成功后返回实际写入的事件（task_seq 可能已重排）"""
+        if self._closed:
+            raise RuntimeError("event group commit writer is closed")
+        future: asyncio.Future[Event] = asyncio.get_running_loop().create_future()
+        self._queue.append(_PendingAppend(event, update_task_pointer, future))
+        if len(self._queue) >= self._max_batch:
+            self._batch_full.set()
+        self._wakeup.set()
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._run(), name="event-group-commit")
+        return await future
+
+    async def close(self) -> None:
+        """停止接收新请求，提交队列中剩余请求后退出 flusher（幂等）"""
+        self._closed = True
+        self._wakeup.set()
+        self._batch_full.set()
+        if self._flusher is not None:
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._flusher
+            self._flusher = None
+        if self._conn is not None:
+            with contextlib.suppress(Exception):
+                await self._conn.close()
+            self._conn = None
+
+    async def _ensure_conn(self) -> aiosqlite.Connection:
+        if self._conn is None:
+            cursor = await self._main_conn.execute("PRAGMA database_list")
+            db_file = next((row[2] for row in await cursor.fetchall() if row[1] == "main"), "")
+            if not db_file:
+                raise RuntimeError("event group commit requires a file-backed database")
+            conn = await connect_store(db_file)
+            await apply_write_connection_pragmas(conn)
+            self._conn = conn
+        return self._conn
+
+    async def _run(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            if not self._queue:
+                if self._closed:
+                    return
+                continue
+            # 收集窗口：等待更多并发请求加入本批次，攒满 max_batch 或关闭时立即提交
+            if len(self._queue) < self._max_batch and self._window_s > 0 and not self._closed:
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(self._batch_full.wait(), self._window_s)
+            self._batch_full.clear()
+            batch = self._queue[: self._max_batch]
+            del self._queue[: self._max_batch]
+            await self._flush(batch)
+            if self._queue:
+                self._wakeup.set()
+                if len(self._queue) >= self._max_batch:
+                    self._batch_full.set()
+
+    async def _flush(self, batch: list[_PendingAppend]) -> None:
+        appended: list[tuple[_PendingAppend, Event]] = []
+        conn: aiosqlite.Connection | None = None
+        try:
+            conn = await self._ensure_conn()
+            # 显式开启外层事务：否则首个 SAVEPOINT 自成事务，RELEASE 即提交
+            await conn.execute("BEGIN")
+            appended = await self._append_batch(conn, batch)
+            await conn.commit()
+            self._event_store.confirm_task_seq(conn=conn)
+        except Exception as exc:
+            if conn is not None:
+                with contextlib.suppress(Exception):
+                    await conn.rollback()
+            self.stats.commit_failures += 1
+            self.stats.events_failed += len(appended)
+            await log.aerror(
+                "event_group_commit_failed",
+                batch_size=len(batch),
+                error=str(exc),
+            )
+            self._event_store.discard_task_seq(
+                [item.event.task_id for item in batch], conn=conn
+            )
+            for item in batch:
+                _set_exception(item.future, exc)
+            return
+
+        self.stats.batches_committed += 1
+        self.stats.events_committed += len(appended)
+        self.stats.max_batch_size = max(self.stats.max_batch_size, len(appended))
+        for item, event in appended:
+            if not item.future.done():
+                item.future.set_result(event)
+
+    async def _append_batch(
+        self, conn: aiosqlite.Connection, batch: list[_PendingAppend]
+    ) -> list[tuple[_PendingAppend, Event]]:
+        store = self._event_store
+        await conn.execute(f"SAVEPOINT {_SAVEPOINT}")
+        try:
+            await store.append_events([item.event for item in batch], conn=conn)
+            await store._update_task_pointers(
+                [item.event for item in batch if item.update_task_pointer],
+                conn=conn,
+            )
+        except aiosqlite.IntegrityError:
+            await conn.execute(f"ROLLBACK TO {_SAVEPOINT}")
+            await conn.execute(f"RELEASE {_SAVEPOINT}")
+            store.discard_task_seq([item.event.task_id for item in batch], conn=conn)
+        else:
+            await conn.execute(f"RELEASE {_SAVEPOINT}")
+            return [(item, item.event) for item in batch]
+
+        # 慢路径：逐条重放，冲突隔离到单条请求
+        appended: list[tuple[_PendingAppend, Event]] = []
+        for item in batch:
+            try:
+                appended.append((item, await self._append_one(conn, item)))
+            except Exception as exc:
+                self.stats.events_failed += 1
+                _set_exception(item.future, exc)
+        return appended
+
+    async def _append_one(self, conn: aiosqlite.Connection, item: _PendingAppend) -> Event:
+        store = self._event_store
+        # task_seq 冲突由 append_event 在本连接上按 MAX+1 重排（可见本批次未提交的插入）
+        event = item.event.model_copy()
+        await conn.execute(f"SAVEPOINT {_SAVEPOINT}")
+        try:
+            await store.append_event(event, conn=conn)
+            if item.update_task_pointer:
+                await store._update_task_pointers([event], conn=conn)
+        except Exception:
+            # 只回滚本条，批次内其他请求的写入保留在外层事务中
+            await conn.execute(f"ROLLBACK TO {_SAVEPOINT}")
+            await conn.execute(f"RELEASE {_SAVEPOINT}")
+            store._task_seq.discard([event.task_id])
+            store._forget_pending_append(event, conn)
+            raise
+        await conn.execute(f"RELEASE {_SAVEPOINT}")
+        return event
+
+
+def _set_exception(future: asyncio.Future[Event], exc: BaseException) -> None:
+    if not future.done():
+        future.set_exception(exc)
@@ -6,55 +6,219 @@ task_seq 同一 task 内严格单调递增。
 
 import asyncio
 import json
+from collections.abc import AsyncIterator, Callable, Sequence
+from dataclasses import dataclass, field
 from datetime import datetime
 
 import aiosqlite
 
 from ..models.enums import ActorType, EventType
 from ..models.event import Event, EventCausality
+from .connection import StoreConnection
+from .event_group_commit import EventGroupCommitStats, EventGroupCommitWriter
+from .read_pool import ReadConnectionPool
+from .task_seq_allocator import (
+    DEFAULT_TASK_SEQ_CACHE_SIZE,
+    TaskSeqAllocator,
+    TaskSeqAllocatorStats,
+)
+
+#: 流式读取默认每页行数
+DEFAULT_EVENT_PAGE_SIZE = 256
+
+#: events 表列（iter_event_columns 列投影白名单，防止拼接任意 SQL）
+EVENT_COLUMNS: tuple[str, ...] = (
+    "event_id",
+    "task_id",
+    "task_seq",
+    "ts",
+    "type",
+    "schema_version",
+    "actor",
+    "payload",
+    "trace_id",
+    "span_id",
+    "parent_event_id",
+    "idempotency_key",
+)
+
+
+#: summarize_task_activity 单条 SQL 的 task_id 上限（远低于 SQLite 变量数上限）
+_ACTIVITY_SUMMARY_CHUNK = 500
+
+#: 事件追加监听器：事件所在事务提交后同步调用，必须廉价且不抛异常
+EventAppendListener = Callable[[Event], None]
+
+
+@dataclass(frozen=True)
+class TaskActivitySummary:
+    """单个任务的事件活跃度聚合（summarize_task_activity 返回单元）
+
+    recent_failures 为 (event_id, task_seq, ts, type) 列表，按 task_seq 正序。
+    """
+
+    task_id: str
+    latest_ts: datetime | None = None
+    latest_progress_ts: datetime | None = None
+    latest_marker_ts: datetime | None = None
+    recent_failures: list[tuple[str, int, datetime, EventType]] = field(default_factory=list)
+
+
+_INSERT_EVENT_SQL = """
+    INSERT INTO events (event_id, task_id, task_seq, ts, type,
+                        schema_version, actor, payload, trace_id, span_id,
+                        parent_event_id, idempotency_key)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
 
 
 class SqliteEventStore:
     """EventStore 的 SQLite 实现"""
 
-    def __init__(self, conn: aiosqlite.Connection) -> None:
+    def __init__(
+        self,
+        conn: aiosqlite.Connection,
+        *,
+        group_commit: bool = False,
+        group_commit_window_ms: float = 0.0,
+        group_commit_max_batch: int = 64,
+        task_seq_cache_size: int = DEFAULT_TASK_SEQ_CACHE_SIZE,
+        task_seq_allocator: TaskSeqAllocator | None = None,
+        read_pool: ReadConnectionPool | None = None,
+    ) -> None:
         self._conn = conn
+        # SELECT 经只读连接池（未传入时透传到主连接）
+        self._reads = read_pool if read_pool is not None else ReadConnectionPool(conn)
         self._task_locks: dict[str, asyncio.Lock] = {}
         self._task_locks_guard = asyncio.Lock()
         self._max_task_seq_retries = 3
+        # 分配器由 create_store_group 按 DB 路径注入（同库所有 StoreGroup 共享）；
+        # 未注入时本实例独占
+        self._task_seq = (
+            task_seq_allocator
+            if task_seq_allocator is not None
+            else TaskSeqAllocator(task_seq_cache_size)
+        )
+        self._append_listener: EventAppendListener | None = None
+        # 事务内追加、待提交后回调监听器的事件（按写入连接，回滚时丢弃）
+        self._pending_appends: dict[aiosqlite.Connection, list[Event]] = {}
+        self._track_transactions(conn)
+        # opt-in：主连接上的 append_event_committed 合并为共享事务提交（见 event_group_commit，
+        # 批次走 writer 自有写连接）
+        self._group_commit: EventGroupCommitWriter | None = (
+            EventGroupCommitWriter(
+                conn,
+                self,
+                window_ms=group_commit_window_ms,
+                max_batch=group_commit_max_batch,
+            )
+            if group_commit
+            else None
+        )
+
+    @property
+    def group_commit_stats(self) -> EventGroupCommitStats | None:
+        """group commit 指标；未开启时返回 None"""
+        return self._group_commit.stats if self._group_commit is not None else None
+
+    @property
+    def task_seq_stats(self) -> TaskSeqAllocatorStats:
+        """task_seq 分配器指标"""
+        return self._task_seq.stats
+
+    def set_append_listener(self, listener: EventAppendListener | None) -> None:
+        """注册事件追加监听器（单一监听者，如 watchdog 活跃度索引；None 取消）
+
+        所有写路径（append_event / append_events / group commit）都会回调，且只回调已提交
+        的事件：事务内的追加按连接暂存，提交后（store 写连接 commit / confirm_task_seq）
+        按写入顺序回调，回滚后（rollback / discard_task_seq）丢弃；autocommit 写入立即回调。
+        """
+        self._append_listener = listener
+        if listener is None:
+            self._pending_appends.clear()
+
+    async def close(self) -> None:
+        """提交 group commit 队列中剩余的 append 请求（未开启时为 no-op，幂等）"""
+        if self._group_commit is not None:
+            await self._group_commit.close()
 
     async def append_event(
         self, event: Event, *, conn: aiosqlite.Connection | None = None
     ) -> None:
         """追加事件（append-only）
 
-        注意：此方法不自动提交事务，需由调用方管理事务。
+        注意：此方法不自动提交事务，需由调用方管理事务。store 写连接（StoreConnection）
+        commit / rollback 时自动确认 / 丢弃 task_seq 缓存；其他连接由调用方在提交后调用
+        confirm_task_seq、回滚后调用 discard_task_seq。
 
         conn：默认 None 用主连接 _conn（0 regression）；显式传入时（如 F104 versionable
         失败路径传 versionable 独立写连接）在该连接上 INSERT，使失败事件不卷主连接事务。
+
+        task_seq 冲突（分配器之外的写入方抢先写入）时从 DB 重新加载 MAX 并原地改写
+        event.task_seq 重试；SQLite 约束失败只回滚当前语句，调用方事务不受影响。
         """
         target_conn = conn if conn is not None else self._conn
-        await target_conn.execute(
-            """
-            INSERT INTO events (event_id, task_id, task_seq, ts, type,
-                                schema_version, actor, payload, trace_id, span_id,
-                                parent_event_id, idempotency_key)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                event.event_id,
-                event.task_id,
-                event.task_seq,
-                event.ts.isoformat(),
-                event.type.value,
-                event.schema_version,
-                event.actor.value,
-                json.dumps(event.payload, ensure_ascii=False),
-                event.trace_id,
-                event.span_id,
-                event.causality.parent_event_id,
-                event.causality.idempotency_key,
-            ),
+        self._track_transactions(target_conn)
+        for attempt in range(1, self._max_task_seq_retries + 1):
+            try:
+                await target_conn.execute(_INSERT_EVENT_SQL, self._event_params(event))
+                break
+            except aiosqlite.IntegrityError as exc:
+                if (
+                    not self._is_task_seq_conflict(exc)
+                    or attempt == self._max_task_seq_retries
+                ):
+                    raise
+                self._task_seq.discard([event.task_id])
+                # 在写入连接上读 MAX：可见该连接事务内未提交的写入
+                event.task_seq = await self._seed_task_seq(event.task_id, target_conn)
+        self._task_seq.observe(event.task_id, event.task_seq, target_conn)
+        self._notify_appended(event, target_conn)
+
+    async def append_events(
+        self, events: list[Event], *, conn: aiosqlite.Connection | None = None
+    ) -> None:
+        """批量追加事件（单次 executemany，不自动提交；group commit 快路径用）"""
+        if not events:
+            return
+        target_conn = conn if conn is not None else self._conn
+        self._track_transactions(target_conn)
+        await target_conn.executemany(
+            _INSERT_EVENT_SQL, [self._event_params(event) for event in events]
+        )
+        for event in events:
+            self._task_seq.observe(event.task_id, event.task_seq, target_conn)
+            self._notify_appended(event, target_conn)
+
+    def _notify_appended(self, event: Event, conn: aiosqlite.Connection) -> None:
+        if self._append_listener is None:
+            return
+        if conn.in_transaction:
+            self._pending_appends.setdefault(conn, []).append(event)
+        else:
+            self._append_listener(event)
+
+    def _forget_pending_append(self, event: Event, conn: aiosqlite.Connection) -> None:
+        """撤销单条暂存回调（该事件被 ROLLBACK TO SAVEPOINT 撤回，外层事务仍在）"""
+        pending = self._pending_appends.get(conn)
+        if pending:
+            self._pending_appends[conn] = [item for item in pending if item is not event]
+
+    @staticmethod
+    def _event_params(event: Event) -> tuple:
+        return (
+            event.event_id,
+            event.task_id,
+            event.task_seq,
+            event.ts.isoformat(),
+            event.type.value,
+            event.schema_version,
+            event.actor.value,
+            json.dumps(event.payload, ensure_ascii=False),
+            event.trace_id,
+            event.span_id,
+            event.causality.parent_event_id,
+            event.causality.idempotency_key,
         )
 
     async def append_event_committed(
@@ -73,7 +237,16 @@ class SqliteEventStore:
         versionable append 失败路径传 versionable 独立写连接，该连接 versionable 失败已
         rollback 处于干净状态）在该连接上完成 append + commit，使 durable 失败事件不卷入
         主连接上调用方未提交的默认写（修复 2 — mixed-writer 转移到失败路径）。
+
+        开启 group commit 时，主连接上的请求交给 EventGroupCommitWriter 与其他并发
+        请求合并提交（writer 独立写连接），返回时事件已随共享事务 COMMIT 落盘。主连接
+        已有未提交事务时仍走直连路径：该事务可能持有写锁或本事件依赖的未提交行
+        （如同事务新建的 task），交给独立连接会等锁超时。
         """
+        if conn is None and self._group_commit is not None and not self._conn.in_transaction:
+            return await self._group_commit.submit(
+                event, update_task_pointer=update_task_pointer
+            )
         target_conn = conn if conn is not None else self._conn
         lock = await self._get_task_lock(event.task_id)
         async with lock:
@@ -82,23 +255,13 @@ class SqliteEventStore:
                 try:
                     await self.append_event(current_event, conn=target_conn)
                     if update_task_pointer:
-                        await target_conn.execute(
-                            """
-                            UPDATE tasks
-                            SET updated_at = ?,
-                                pointers = json_set(pointers, '$.latest_event_id', ?)
-                            WHERE task_id = ?
-                            """,
-                            (
-                                current_event.ts.isoformat(),
-                                current_event.event_id,
-                                current_event.task_id,
-                            ),
-                        )
+                        await self._update_task_pointers([current_event], conn=target_conn)
                     await target_conn.commit()
+                    self.confirm_task_seq(conn=target_conn)
                     return current_event
                 except aiosqlite.IntegrityError as exc:
                     await target_conn.rollback()
+                    self.discard_task_seq([current_event.task_id], conn=target_conn)
                     if (
                         self._is_task_seq_conflict(exc)
                         and attempt < self._max_task_seq_retries
@@ -111,13 +274,33 @@ class SqliteEventStore:
                     raise
                 except Exception:
                     await target_conn.rollback()
+                    self.discard_task_seq([current_event.task_id], conn=target_conn)
                     raise
 
         raise RuntimeError("failed to append event after retries")
 
+    async def _update_task_pointers(
+        self, events: list[Event], *, conn: aiosqlite.Connection
+    ) -> None:
+        """把 tasks.pointers.latest_event_id / updated_at 依次指向各事件（不提交）
+
+        同一 task 的多条事件按顺序执行，最后一条生效。
+        """
+        if not events:
+            return
+        await conn.executemany(
+            """
+            UPDATE tasks
+            SET updated_at = ?,
+                pointers = json_set(pointers, '$.latest_event_id', ?)
+            WHERE task_id = ?
+            """,
+            [(event.ts.isoformat(), event.event_id, event.task_id) for event in events],
+        )
+
     async def get_events_for_task(self, task_id: str) -> list[Event]:
         """查询指定任务的所有事件，按 task_seq 正序"""
-        cursor = await self._conn.execute(
+        cursor = await self._reads.execute(
             "SELECT * FROM events WHERE task_id = ? ORDER BY task_seq ASC",
             (task_id,),
         )
@@ -133,7 +316,7 @@ class SqliteEventStore:
 
         利用 ULID 的字典序特性，event_id > after_event_id 即为后续事件。
         """
-        cursor = await self._conn.execute(
+        cursor = await self._reads.execute(
             """
             SELECT * FROM events
             WHERE task_id = ? AND event_id > ?
@@ -147,14 +330,74 @@ class SqliteEventStore:
     async def get_next_task_seq(self, task_id: str) -> int:
         """获取指定任务的下一个 task_seq（MAX+1）
 
-        在事务内调用以确保原子性。
+        在事务内调用以确保原子性。命中进程内分配器时不访问 DB；首次访问该 task
+        （或缓存被淘汰 / discard 后）从 DB 加载 MAX(task_seq)。
+        """
+        next_seq = self._task_seq.peek_next(task_id)
+        if next_seq is not None:
+            return next_seq
+        # 序号分配紧跟写入，固定走主连接
+        return await self._seed_task_seq(task_id, self._conn)
+
+    async def get_max_task_seq(self, task_id: str) -> int:
+        """已落库的最大 task_seq（无事件为 0）
+
+        只读查询走读连接池，不经分配器、不在写连接上 seed：供 SSE 回放等只读请求
+        判断历史是否完整。
         """
-        cursor = await self._conn.execute(
+        cursor = await self._reads.execute(
+            "SELECT COALESCE(MAX(task_seq), 0) FROM events WHERE task_id = ?",
+            (task_id,),
+        )
+        row = await cursor.fetchone()
+        return row[0] if row else 0
+
+    async def _seed_task_seq(self, task_id: str, conn: aiosqlite.Connection) -> int:
+        """从 DB 加载 MAX(task_seq) 写入分配器，返回下一个 task_seq"""
+        self._task_seq.begin_seed(task_id)
+        cursor = await conn.execute(
             "SELECT COALESCE(MAX(task_seq), 0) FROM events WHERE task_id = ?",
             (task_id,),
         )
         row = await cursor.fetchone()
-        return (row[0] if row else 0) + 1
+        return self._task_seq.finish_seed(task_id, row[0] if row else 0, conn)
+
+    def confirm_task_seq(self, *, conn: aiosqlite.Connection | None = None) -> None:
+        """确认连接（默认主连接）上已提交的 append（调用方 commit 后调用）
+
+        同时按写入顺序回调该连接上暂存的追加监听事件。
+        """
+        self._on_transaction_commit(conn if conn is not None else self._conn)
+
+    def discard_task_seq(
+        self, task_ids: Sequence[str], *, conn: aiosqlite.Connection | None = None
+    ) -> None:
+        """丢弃 task_seq 缓存（调用方回滚了含 append 的事务后调用），下次从 DB 重新加载
+
+        同时丢弃该连接（默认主连接）上其他未提交 append 推进的缓存与暂存的追加监听事件：
+        回滚撤销的是整个连接事务。
+        """
+        self._task_seq.discard(task_ids)
+        self._on_transaction_rollback(conn if conn is not None else self._conn)
+
+    def _track_transactions(self, conn: aiosqlite.Connection) -> None:
+        """store 写连接上注册事务钩子：commit / rollback 自动确认 / 丢弃未提交写入"""
+        if isinstance(conn, StoreConnection):
+            conn.add_transaction_hooks(
+                on_commit=self._on_transaction_commit,
+                on_rollback=self._on_transaction_rollback,
+            )
+
+    def _on_transaction_commit(self, conn: aiosqlite.Connection) -> None:
+        self._task_seq.confirm(conn)
+        events = self._pending_appends.pop(conn, None)
+        if events and self._append_listener is not None:
+            for event in events:
+                self._append_listener(event)
+
+    def _on_transaction_rollback(self, conn: aiosqlite.Connection) -> None:
+        self._task_seq.discard_uncommitted(conn)
+        self._pending_appends.pop(conn, None)
 
     @staticmethod
     def _is_task_seq_conflict(error: Exception) -> bool:
@@ -177,7 +420,7 @@ class SqliteEventStore:
         Returns:
             关联的 task_id 如果存在，否则 None
         """
-        cursor = await self._conn.execute(
+        cursor = await self._reads.execute(
             "SELECT task_id FROM events WHERE idempotency_key = ? LIMIT 1",
             (key,),
         )
@@ -186,12 +429,235 @@ class SqliteEventStore:
 
     async def get_all_events(self) -> list[Event]:
         """查询所有事件，按 task_id 和 task_seq 排序（用于 Projection 重建）"""
-        cursor = await self._conn.execute(
+        cursor = await self._reads.execute(
             "SELECT * FROM events ORDER BY task_id, task_seq ASC"
         )
         rows = await cursor.fetchall()
         return [self._row_to_event(row) for row in rows]
 
+    async def get_event_watermark(self) -> tuple[int, str | None]:
+        """返回 events 表当前最大 rowid 及其 event_id（空表返回 (0, None)）
+
+        events 为 append-only rowid 表，rowid 单调增长，可作为 Projection 增量重建的全局
+        watermark；event_id 一并返回用于校验 watermark 行未被删除 / 复用。
+        """
+        cursor = await self._reads.execute(
+            "SELECT rowid, event_id FROM events ORDER BY rowid DESC LIMIT 1"
+        )
+        row = await cursor.fetchone()
+        if row is None:
+            return 0, None
+        return int(row[0]), row[1]
+
+    async def get_event_id_at_rowid(self, rowid: int) -> str | None:
+        """按 rowid 查询 event_id（watermark 校验用，行不存在返回 None）"""
+        cursor = await self._reads.execute(
+            "SELECT event_id FROM events WHERE rowid = ?",
+            (rowid,),
+        )
+        row = await cursor.fetchone()
+        return row[0] if row else None
+
+    async def iter_event_pages_since_rowid(
+        self,
+        *,
+        after_rowid: int,
+        upto_rowid: int,
+        page_size: int = 500,
+    ) -> AsyncIterator[list[tuple[int, Event]]]:
+        """按 rowid 分页流式读取 (after_rowid, upto_rowid] 区间的事件（Projection 增量重建）
+
+        keyset 分页（rowid > 上一页末尾），每页独立 fetch，内存占用与 page_size 成正比。
+        同一 task 的事件在 per-task 锁内按 task_seq 递增写入，rowid 顺序与 task_seq 一致。
+        """
+        last_rowid = after_rowid
+        while last_rowid < upto_rowid:
+            cursor = await self._reads.execute(
+                """
+                SELECT rowid, * FROM events
+                WHERE rowid > ? AND rowid <= ?
+                ORDER BY rowid ASC
+                LIMIT ?
+                """,
+                (last_rowid, upto_rowid, page_size),
+            )
+            rows = await cursor.fetchall()
+            if not rows:
+                return
+            yield [(int(row[0]), self._row_to_event(row[1:])) for row in rows]
+            last_rowid = int(rows[-1][0])
+
+    async def iter_all_event_pages(
+        self,
+        *,
+        upto_rowid: int,
+        page_size: int = 500,
+    ) -> AsyncIterator[list[Event]]:
+        """按 (task_id, task_seq) 顺序分页流式读取 rowid <= upto_rowid 的全部事件（全量重建）
+
+        keyset 分页走 idx_events_task_seq 唯一索引，替代 get_all_events 的整表物化。
+        """
+        async for rows in self._iter_row_pages(
+            select="*",
+            upto_rowid=upto_rowid,
+            page_size=page_size,
+        ):
+            yield [self._row_to_event(row) for row in rows]
+
+    async def iter_events_for_task(
+        self,
+        task_id: str,
+        *,
+        event_types: Sequence[EventType] | None = None,
+        after_task_seq: int = 0,
+        page_size: int = DEFAULT_EVENT_PAGE_SIZE,
+    ) -> AsyncIterator[Event]:
+        """流式读取指定任务的事件，按 task_seq 正序（get_events_for_task 的迭代器版本）
+
+        event_types 非 None 时在 SQL 侧过滤（WHERE type IN (...)），未命中的行不做
+        JSON 解码与模型构造；空序列直接返回空结果。after_task_seq > 0 时只读取
+        task_seq 更大的事件（增量消费）。
+        """
+        async for rows in self._iter_row_pages(
+            select="*",
+            task_id=task_id,
+            event_types=event_types,
+            after_task_seq=after_task_seq,
+            page_size=page_size,
+        ):
+            for row in rows:
+                yield self._row_to_event(row)
+
+    async def iter_events_after(
+        self,
+        task_id: str,
+        after_event_id: str,
+        *,
+        event_types: Sequence[EventType] | None = None,
+        page_size: int = DEFAULT_EVENT_PAGE_SIZE,
+    ) -> AsyncIterator[Event]:
+        """流式读取指定事件之后的增量事件（get_events_after 的迭代器版本，SSE 断线重连）"""
+        async for rows in self._iter_row_pages(
+            select="*",
+            task_id=task_id,
+            after_event_id=after_event_id,
+            event_types=event_types,
+            page_size=page_size,
+        ):
+            for row in rows:
+                yield self._row_to_event(row)
+
+    async def iter_all_events(
+        self,
+        *,
+        event_types: Sequence[EventType] | None = None,
+        page_size: int = DEFAULT_EVENT_PAGE_SIZE,
+    ) -> AsyncIterator[Event]:
+        """流式读取全部事件，按 task_id / task_seq 排序（get_all_events 的迭代器版本）"""
+        async for rows in self._iter_row_pages(
+            select="*",
+            event_types=event_types,
+            page_size=page_size,
+        ):
+            for row in rows:
+                yield self._row_to_event(row)
+
+    async def iter_event_columns(
+        self,
+        columns: Sequence[str],
+        *,
+        task_id: str | None = None,
+        after_event_id: str | None = None,
+        event_types: Sequence[EventType] | None = None,
+        page_size: int = DEFAULT_EVENT_PAGE_SIZE,
+    ) -> AsyncIterator[tuple]:
+        """列投影流式读取：只 SELECT 指定列，按 columns 顺序 yield 原始值 tuple
+
+        适用于只需要 event_id / type / ts 等标量列的调用方，跳过 payload 的 JSON 解码
+        与 Event 模型构造。排序与过滤语义同 iter_events_for_task / iter_all_events。
+
+        Raises:
+            ValueError: columns 为空或含非 events 表列
+        """
+        unknown = [column for column in columns if column not in EVENT_COLUMNS]
+        if not columns or unknown:
+            raise ValueError(f"invalid event columns: {list(columns)!r}")
+        async for rows in self._iter_row_pages(
+            select=", ".join(columns),
+            task_id=task_id,
+            after_event_id=after_event_id,
+            event_types=event_types,
+            page_size=page_size,
+        ):
+            for row in rows:
+                yield tuple(row)
+
+    async def _iter_row_pages(
+        self,
+        *,
+        select: str,
+        task_id: str | None = None,
+        after_event_id: str | None = None,
+        event_types: Sequence[EventType] | None = None,
+        upto_rowid: int | None = None,
+        after_task_seq: int = 0,
+        page_size: int = DEFAULT_EVENT_PAGE_SIZE,
+    ) -> AsyncIterator[list[aiosqlite.Row | tuple]]:
+        """按 (task_id, task_seq) keyset 分页读取，yield 每页 select 列组成的行
+
+        每页独立 execute + fetchall，不跨 yield 持有游标——调用方在消费期间可以
+        自由地在同一连接上执行其他语句。keyset 列额外 SELECT 在前两列，yield 前剥离。
+        """
+        conditions: list[str] = []
+        params: list[object] = []
+        if task_id is not None:
+            conditions.append("task_id = ?")
+            params.append(task_id)
+        if after_event_id:
+            conditions.append("event_id > ?")
+            params.append(after_event_id)
+        if event_types is not None:
+            if not event_types:
+                return
+            conditions.append(f"type IN ({','.join('?' * len(event_types))})")
+            params.extend(t.value for t in event_types)
+        if upto_rowid is not None:
+            conditions.append("rowid <= ?")
+            params.append(upto_rowid)
+
+        # after_task_seq 复用 keyset 起点（仅限单 task 读取）
+        last_key: tuple[str, int] | None = (
+            (task_id, after_task_seq) if task_id is not None and after_task_seq > 0 else None
+        )
+        while True:
+            page_conditions = list(conditions)
+            page_params = list(params)
+            if last_key is not None:
+                if task_id is not None:
+                    page_conditions.append("task_seq > ?")
+                    page_params.append(last_key[1])
+                else:
+                    page_conditions.append("(task_id, task_seq) > (?, ?)")
+                    page_params.extend(last_key)
+            where = " AND ".join(page_conditions) if page_conditions else "1 = 1"
+            cursor = await self._reads.execute(
+                f"""
+                SELECT task_id AS _page_task_id, task_seq AS _page_task_seq, {select}
+                FROM events
+                WHERE {where}
+                ORDER BY task_id, task_seq ASC
+                LIMIT ?
+                """,
+                (*page_params, page_size),
+            )
+            rows = await cursor.fetchall()
+            if not rows:
+                return
+            yield [row[2:] for row in rows]
+            if len(rows) < page_size:
+                return
+            last_key = (rows[-1][0], int(rows[-1][1]))
+
     async def get_latest_event_ts(self, task_id: str) -> datetime | None:
         """获取指定任务的最新事件时间戳（Feature 011 FR-009 支撑接口）
 
@@ -203,7 +669,7 @@ class SqliteEventStore:
         Returns:
             最新事件时间戳，若无事件则返回 None
         """
-        cursor = await self._conn.execute(
+        cursor = await self._reads.execute(
             "SELECT MAX(ts) FROM events WHERE task_id = ?",
             (task_id,),
         )
@@ -237,7 +703,7 @@ class SqliteEventStore:
         placeholders = ",".join("?" * len(event_types))
         type_values = [t.value for t in event_types]
 
-        cursor = await self._conn.execute(
+        cursor = await self._reads.execute(
             f"""
             SELECT * FROM events
             WHERE task_id = ?
@@ -250,8 +716,82 @@ class SqliteEventStore:
         rows = await cursor.fetchall()
         return [self._row_to_event(row) for row in rows]
 
+    async def summarize_task_activity(
+        self,
+        task_ids: Sequence[str],
+        *,
+        progress_types: Sequence[EventType],
+        marker_type: EventType,
+        failure_types: Sequence[EventType],
+        failures_since: datetime,
+    ) -> dict[str, TaskActivitySummary]:
+        """批量聚合任务活跃度（Feature 011 watchdog 活跃度索引重建接口）
+
+        每 _ACTIVITY_SUMMARY_CHUNK 个 task 一条 GROUP BY 查询，一次性取回：最新事件
+        ts、最新进展事件 ts、最新 marker 事件 ts，以及 failures_since 之后的失败事件。
+        无事件的 task 不出现在结果中。
+
+        Args:
+            task_ids: 任务 ID 列表
+            progress_types: 进展事件类型
+            marker_type: 单独追踪最新 ts 的事件类型（如 MODEL_CALL_STARTED）
+            failure_types: 失败事件类型
+            failures_since: 失败事件时间下界（含）
+
+        Returns:
+            task_id -> TaskActivitySummary
+        """
+        if not task_ids or not progress_types or not failure_types:
+            return {}
+        progress_values = [t.value for t in progress_types]
+        failure_values = [t.value for t in failure_types]
+        progress_placeholders = ",".join("?" * len(progress_values))
+        failure_placeholders = ",".join("?" * len(failure_values))
+        unique_ids = list(dict.fromkeys(task_ids))
+        result: dict[str, TaskActivitySummary] = {}
+        for start in range(0, len(unique_ids), _ACTIVITY_SUMMARY_CHUNK):
+            chunk = unique_ids[start : start + _ACTIVITY_SUMMARY_CHUNK]
+            task_placeholders = ",".join("?" * len(chunk))
+            cursor = await self._reads.execute(
+                f"""
+                SELECT task_id,
+                       MAX(ts),
+                       MAX(CASE WHEN type IN ({progress_placeholders}) THEN ts END),
+                       MAX(CASE WHEN type = ? THEN ts END),
+                       json_group_array(
+                           CASE WHEN type IN ({failure_placeholders}) AND ts >= ?
+                                THEN json_array(event_id, task_seq, ts, type) END
+                       )
+                FROM events
+                WHERE task_id IN ({task_placeholders})
+                GROUP BY task_id
+                """,
+                (
+                    *progress_values,
+                    marker_type.value,
+                    *failure_values,
+                    failures_since.isoformat(),
+                    *chunk,
+                ),
+            )
+            for row in await cursor.fetchall():
+                failures = [
+                    (item[0], int(item[1]), datetime.fromisoformat(item[2]), EventType(item[3]))
+                    for item in json.loads(row[4])
+                    if item is not None
+                ]
+                failures.sort(key=lambda item: item[1])
+                result[row[0]] = TaskActivitySummary(
+                    task_id=row[0],
+                    latest_ts=datetime.fromisoformat(row[1]) if row[1] else None,
+                    latest_progress_ts=datetime.fromisoformat(row[2]) if row[2] else None,
+                    latest_marker_ts=datetime.fromisoformat(row[3]) if row[3] else None,
+                    recent_failures=failures,
+                )
+        return result
+
     @staticmethod
-    def _row_to_event(row: aiosqlite.Row) -> Event:
+    def _row_to_event(row: aiosqlite.Row | tuple) -> Event:
         """将数据库行转换为 Event 模型"""
         payload = json.loads(row[7]) if row[7] else {}
         return Event(
@@ -280,6 +820,7 @@ class SqliteEventStore:
             f"DELETE FROM events WHERE task_id IN ({placeholders})",
             tuple(task_ids),
         )
+        self._task_seq.discard(task_ids)
         cursor = await self._conn.execute("SELECT changes()")
         row = await cursor.fetchone()
         return int(row[0]) if row else 0
@@ -16,12 +16,21 @@ from typing import Any
 
 import aiosqlite
 
+from .read_pool import ReadConnectionPool
+
 
 class SqliteNotificationStore:
     """notification_dismissals + notification_active 表访问层。"""
 
-    def __init__(self, conn: aiosqlite.Connection) -> None:
+    def __init__(
+        self,
+        conn: aiosqlite.Connection,
+        *,
+        read_pool: ReadConnectionPool | None = None,
+    ) -> None:
         self._conn = conn
+        # SELECT 经只读连接池（未传入时透传到主连接）
+        self._reads = read_pool if read_pool is not None else ReadConnectionPool(conn)
 
     # ------------------------------------------------------------------
     # dismissals
@@ -42,7 +51,7 @@ class SqliteNotificationStore:
 
     async def list_dismissed(self) -> set[str]:
         """返回所有已 dismiss 的 notification_id 集合（供 rehydrate）。"""
-        cursor = await self._conn.execute(
+        cursor = await self._reads.execute(
             "SELECT notification_id FROM notification_dismissals"
         )
         rows = await cursor.fetchall()
@@ -95,7 +104,7 @@ class SqliteNotificationStore:
         if not task_ids:
             return 0
         placeholders = ",".join("?" * len(task_ids))
-        cursor = await self._conn.execute(
+        cursor = await self._reads.execute(
             f"SELECT notification_id FROM notification_active WHERE task_id IN ({placeholders})",
             tuple(task_ids),
         )
@@ -122,7 +131,7 @@ class SqliteNotificationStore:
         （不含 session_id 键，与内存路径 _record_active 写入的 entry 字段一致）。
         按 created_at 升序，与内存 append 顺序对齐。
         """
-        cursor = await self._conn.execute(
+        cursor = await self._reads.execute(
             """
             SELECT notification_id, session_id, task_id, notification_type,
                    priority, payload, created_at
@@ -17,13 +17,21 @@ from ..models.project import (
     ProjectSelectorState,
     SecretTargetKind,
 )
+from .read_pool import ReadConnectionPool
 
 
 class SqliteProjectStore:
     """project/workspace/binding/migration_run 访问层。"""
 
-    def __init__(self, conn: aiosqlite.Connection) -> None:
+    def __init__(
+        self,
+        conn: aiosqlite.Connection,
+        *,
+        read_pool: ReadConnectionPool | None = None,
+    ) -> None:
         self._conn = conn
+        # SELECT 经只读连接池（未传入时透传到主连接）
+        self._reads = read_pool if read_pool is not None else ReadConnectionPool(conn)
 
     @staticmethod
     def _load_json(value: str | None, default: object) -> object:
@@ -107,7 +115,7 @@ class SqliteProjectStore:
         raise RuntimeError(f"project 创建失败且无法回读: {project.project_id}")
 
     async def get_project(self, project_id: str) -> Project | None:
-        cursor = await self._conn.execute(
+        cursor = await self._reads.execute(
             "SELECT * FROM projects WHERE project_id = ?",
             (project_id,),
         )
@@ -115,7 +123,7 @@ class SqliteProjectStore:
         return self._row_to_project(row) if row is not None else None
 
     async def get_project_by_slug(self, slug: str) -> Project | None:
-        cursor = await self._conn.execute(
+        cursor = await self._reads.execute(
             "SELECT * FROM projects WHERE slug = ?",
             (slug,),
         )
@@ -123,14 +131,14 @@ class SqliteProjectStore:
         return self._row_to_project(row) if row is not None else None
 
     async def get_default_project(self) -> Project | None:
-        cursor = await self._conn.execute(
+        cursor = await self._reads.execute(
             "SELECT * FROM projects WHERE is_default = 1 ORDER BY created_at ASC LIMIT 1"
         )
         row = await cursor.fetchone()
         return self._row_to_project(row) if row is not None else None
 
     async def list_projects(self) -> list[Project]:
-        cursor = await self._conn.execute(
+        cursor = await self._reads.execute(
             "SELECT * FROM projects ORDER BY created_at ASC"
         )
         rows = await cursor.fetchall()
@@ -138,7 +146,7 @@ class SqliteProjectStore:
 
     async def list_projects_by_agent(self, agent_runtime_id: str) -> list[Project]:
         """查询指定 Agent 作为主负责人的所有 Project。"""
-        cursor = await self._conn.execute(
+        cursor = await self._reads.execute(
             "SELECT * FROM projects WHERE primary_agent_id = ? ORDER BY created_at ASC",
             (agent_runtime_id,),
         )
@@ -166,7 +174,7 @@ class SqliteProjectStore:
         binding_type: ProjectBindingType,
         binding_key: str,
     ) -> ProjectBinding | None:
-        cursor = await self._conn.execute(
+        cursor = await self._reads.execute(
             """
             SELECT * FROM project_bindings
             WHERE project_id = ? AND binding_type = ? AND binding_key = ?
@@ -219,7 +227,7 @@ class SqliteProjectStore:
         binding_type: ProjectBindingType | None = None,
     ) -> list[ProjectBinding]:
         if binding_type is None:
-            cursor = await self._conn.execute(
+            cursor = await self._reads.execute(
                 """
                 SELECT * FROM project_bindings
                 WHERE project_id = ?
@@ -228,7 +236,7 @@ class SqliteProjectStore:
                 (project_id,),
             )
         else:
-            cursor = await self._conn.execute(
+            cursor = await self._reads.execute(
                 """
                 SELECT * FROM project_bindings
                 WHERE project_id = ? AND binding_type = ?
@@ -240,7 +248,7 @@ class SqliteProjectStore:
         return [self._row_to_binding(row) for row in rows]
 
     async def list_bindings_by_run(self, run_id: str) -> list[ProjectBinding]:
-        cursor = await self._conn.execute(
+        cursor = await self._reads.execute(
             """
             SELECT * FROM project_bindings
             WHERE migration_run_id = ?
@@ -257,7 +265,7 @@ class SqliteProjectStore:
         target_kind: SecretTargetKind,
         target_key: str,
     ) -> ProjectSecretBinding | None:
-        cursor = await self._conn.execute(
+        cursor = await self._reads.execute(
             """
             SELECT * FROM project_secret_bindings
             WHERE project_id = ? AND target_kind = ? AND target_key = ?
@@ -330,7 +338,7 @@ class SqliteProjectStore:
         target_kind: SecretTargetKind | None = None,
     ) -> list[ProjectSecretBinding]:
         if target_kind is None:
-            cursor = await self._conn.execute(
+            cursor = await self._reads.execute(
                 """
                 SELECT * FROM project_secret_bindings
                 WHERE project_id = ?
@@ -339,7 +347,7 @@ class SqliteProjectStore:
                 (project_id,),
             )
         else:
-            cursor = await self._conn.execute(
+            cursor = await self._reads.execute(
                 """
                 SELECT * FROM project_secret_bindings
                 WHERE project_id = ? AND target_kind = ?
@@ -382,7 +390,7 @@ class SqliteProjectStore:
         return stored
 
     async def get_selector_state(self, surface: str) -> ProjectSelectorState | None:
-        cursor = await self._conn.execute(
+        cursor = await self._reads.execute(
             """
             SELECT * FROM project_selector_state
             WHERE surface = ?
@@ -423,7 +431,7 @@ class SqliteProjectStore:
         )
 
     async def get_migration_run(self, run_id: str) -> ProjectMigrationRun | None:
-        cursor = await self._conn.execute(
+        cursor = await self._reads.execute(
             "SELECT * FROM project_migration_runs WHERE run_id = ?",
             (run_id,),
         )
@@ -446,7 +454,7 @@ class SqliteProjectStore:
             sql += f" AND status IN ({placeholders})"
             params.extend(status.value for status in statuses)
         sql += " ORDER BY started_at DESC LIMIT 1"
-        cursor = await self._conn.execute(sql, tuple(params))
+        cursor = await self._reads.execute(sql, tuple(params))
         row = await cursor.fetchone()
         return self._row_to_migration_run(row) if row is not None else None
 
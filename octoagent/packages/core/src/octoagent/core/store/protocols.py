@@ -4,10 +4,12 @@
 使用 Python Protocol 实现结构化子类型（duck typing）。
 """
 
+from collections.abc import AsyncIterator, Sequence
 from typing import Protocol
 
 from ..models.artifact import Artifact
 from ..models.checkpoint import CheckpointSnapshot, SideEffectLedgerEntry
+from ..models.enums import EventType
 from ..models.event import Event
 from ..models.task import Task
 
@@ -76,6 +78,37 @@ class EventStore(Protocol):
         """检查幂等键是否已存在，返回关联的 task_id 或 None"""
         ...
 
+    def iter_events_for_task(
+        self,
+        task_id: str,
+        *,
+        event_types: Sequence[EventType] | None = None,
+        after_task_seq: int = 0,
+        page_size: int = ...,
+    ) -> AsyncIterator[Event]:
+        """分页流式读取指定任务的事件（可按类型过滤；after_task_seq 之后的增量）"""
+        ...
+
+    def iter_events_after(
+        self,
+        task_id: str,
+        after_event_id: str,
+        *,
+        event_types: Sequence[EventType] | None = None,
+        page_size: int = ...,
+    ) -> AsyncIterator[Event]:
+        """分页流式读取指定事件之后的增量事件"""
+        ...
+
+    def iter_all_events(
+        self,
+        *,
+        event_types: Sequence[EventType] | None = None,
+        page_size: int = ...,
+    ) -> AsyncIterator[Event]:
+        """分页流式读取全部事件（可按类型过滤）"""
+        ...
+
 
 class ArtifactStore(Protocol):
     """Artifact 存储接口 -- 对齐 Blueprint §9.2"""
@@ -0,0 +1,206 @@
+"""SQLite 只读连接池：WAL 下与单写连接并发的读路径。
+
+aiosqlite 把一个连接上的所有语句串行到同一个 worker 线程，共享主连接时重读
+（控制台列表、SSE 历史回放）会把事件追加堵在后面。WAL 允许多个读者与写者并发，
+因此 store 的 SELECT 经本池路由到独立的只读连接（`PRAGMA query_only`）：
+
+- 有界：最多 size 个连接，按需懒打开；满载时排队等待（计入等待指标）
+- 读己之写：主连接有未提交事务（`in_transaction`）时，读仍走主连接——只读连接
+  看不到未提交数据；否则两者看到的都是最新已提交快照，语义不变
+- 只读连接为 autocommit，结果在归还前一次性取完，不跨语句持有读快照
+- size=0、内存库或池已关闭时全部退回主连接（直接构造 StoreGroup 的旧路径）
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import sqlite3
+import time
+from collections.abc import AsyncIterator, Iterable
+from dataclasses import asdict, dataclass
+from typing import Any
+
+import aiosqlite
+
+from .connection import WRITE_CONNECTION_BUSY_TIMEOUT_MS
+
+
+@dataclass(slots=True)
+class ReadPoolStats:
+    """读路由指标（进程内累计，毫秒）"""
+
+    reads: int = 0
+    pooled_reads: int = 0
+    writer_reads: int = 0
+    waits: int = 0
+    wait_ms_total: float = 0.0
+    wait_ms_max: float = 0.0
+    query_ms_total: float = 0.0
+    query_ms_max: float = 0.0
+    connections_opened: int = 0
+
+
+class ReadResult:
+    """已取完的查询结果（cursor 的只读子集：fetchone / fetchall / fetchmany / async for）"""
+
+    __slots__ = ("_rows", "_position", "description")
+
+    def __init__(self, rows: list[Any], description: Any = None) -> None:
+        self._rows = rows
+        self._position = 0
+        self.description = description
+
+    async def fetchone(self) -> Any | None:
+        if self._position >= len(self._rows):
+            return None
+        row = self._rows[self._position]
+        self._position += 1
+        return row
+
+    async def fetchmany(self, size: int = 1) -> list[Any]:
+        rows = self._rows[self._position : self._position + size]
+        self._position += len(rows)
+        return rows
+
+    async def fetchall(self) -> list[Any]:
+        rows = self._rows[self._position :]
+        self._position = len(self._rows)
+        return rows
+
+    async def close(self) -> None:
+        return None
+
+    def __aiter__(self) -> AsyncIterator[Any]:
+        return self._iterate()
+
+    async def _iterate(self) -> AsyncIterator[Any]:
+        while (row := await self.fetchone()) is not None:
+            yield row
+
+
+class ReadConnectionPool:
+    """有界只读连接池（db_path 为空 / size=0 时只是主连接上的透传）"""
+
+    def __init__(
+        self,
+        writer: aiosqlite.Connection,
+        db_path: str | None = None,
+        *,
+        size: int = 0,
+    ) -> None:
+        self._writer = writer
+        self._db_path = db_path
+        self._size = max(size, 0) if db_path and not _is_memory_path(db_path) else 0
+        self._semaphore = asyncio.Semaphore(self._size) if self._size else None
+        self._idle: list[aiosqlite.Connection] = []
+        self._open: set[aiosqlite.Connection] = set()
+        self._closed = False
+        self.stats = ReadPoolStats()
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def snapshot(self) -> dict[str, Any]:
+        """指标快照"""
+        return {
+            **asdict(self.stats),
+            "size": self._size,
+            "open": len(self._open),
+            "idle": len(self._idle),
+        }
+
+    async def execute(self, sql: str, parameters: Iterable[Any] = ()) -> ReadResult:
+        """执行只读查询并一次性取回结果"""
+        if self._use_writer():
+            self.stats.writer_reads += 1
+            return await self._run(self._writer, sql, parameters)
+        async with self._acquire() as conn:
+            self.stats.pooled_reads += 1
+            return await self._run(conn, sql, parameters)
+
+    async def _run(
+        self, conn: aiosqlite.Connection, sql: str, parameters: Iterable[Any]
+    ) -> ReadResult:
+        started = time.perf_counter()
+        cursor = await conn.execute(sql, parameters)
+        try:
+            result = ReadResult(list(await cursor.fetchall()), cursor.description)
+        finally:
+            await cursor.close()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self.stats.reads += 1
+        self.stats.query_ms_total += elapsed_ms
+        self.stats.query_ms_max = max(self.stats.query_ms_max, elapsed_ms)
+        return result
+
+    async def close(self) -> None:
+        """关闭所有只读连接（幂等；借出中的连接在归还时关闭）"""
+        self._closed = True
+        idle, self._idle = self._idle, []
+        for conn in idle:
+            self._open.discard(conn)
+            with contextlib.suppress(Exception):
+                await conn.close()
+
+    def _use_writer(self) -> bool:
+        if self._semaphore is None or self._closed:
+            return True
+        try:
+            return bool(self._writer.in_transaction)
+        except ValueError:
+            # 主连接已关闭：交给主连接路径抛出原有错误
+            return True
+
+    @contextlib.asynccontextmanager
+    async def _acquire(self) -> AsyncIterator[aiosqlite.Connection]:
+        assert self._semaphore is not None
+        if self._semaphore.locked():
+            self.stats.waits += 1
+        wait_started = time.perf_counter()
+        await self._semaphore.acquire()
+        wait_ms = (time.perf_counter() - wait_started) * 1000
+        self.stats.wait_ms_total += wait_ms
+        self.stats.wait_ms_max = max(self.stats.wait_ms_max, wait_ms)
+        conn: aiosqlite.Connection | None = None
+        try:
+            conn = self._idle.pop() if self._idle else await self._connect()
+            yield conn
+        except BaseException as exc:
+            # SQL 错误不影响连接本身；取消等其他异常后连接状态未知，不放回池
+            if conn is not None and not isinstance(exc, sqlite3.Error):
+                await self._discard(conn)
+                conn = None
+            raise
+        finally:
+            if conn is not None:
+                if self._closed:
+                    await self._discard(conn)
+                else:
+                    self._idle.append(conn)
+            self._semaphore.release()
+
+    async def _connect(self) -> aiosqlite.Connection:
+        assert self._db_path is not None
+        conn = await aiosqlite.connect(self._db_path, isolation_level=None)
+        try:
+            conn.row_factory = self._writer.row_factory
+            await conn.execute("PRAGMA query_only = ON;")
+            await conn.execute(f"PRAGMA busy_timeout = {WRITE_CONNECTION_BUSY_TIMEOUT_MS};")
+        except BaseException:
+            await conn.close()
+            raise
+        self._open.add(conn)
+        self.stats.connections_opened += 1
+        return conn
+
+    async def _discard(self, conn: aiosqlite.Connection) -> None:
+        self._open.discard(conn)
+        with contextlib.suppress(Exception):
+            await conn.close()
+
+
+def _is_memory_path(db_path: str) -> bool:
+    return db_path == ":memory:" or "mode=memory" in db_path or db_path.startswith("file::memory")
+
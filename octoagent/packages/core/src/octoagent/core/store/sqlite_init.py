@@ -68,6 +68,17 @@ _EVENTS_INDEXES = [
     "CREATE INDEX IF NOT EXISTS idx_events_type_ts ON events(task_id, type, ts);",
 ]
 
+# Projection 增量重建 watermark：每个投影记录已应用到的 events.rowid 及其 event_id
+# （event_id 用于校验 watermark 行未被删除 / rowid 复用，不一致时回退全量重建）。
+_PROJECTION_WATERMARKS_DDL = """
+CREATE TABLE IF NOT EXISTS projection_watermarks (
+    projection      TEXT PRIMARY KEY,
+    last_rowid      INTEGER NOT NULL DEFAULT 0,
+    last_event_id   TEXT,
+    updated_at      TEXT NOT NULL
+);
+"""
+
 # artifacts 表 DDL
 _ARTIFACTS_DDL = """
 CREATE TABLE IF NOT EXISTS artifacts (
@@ -1889,6 +1900,7 @@ async def init_db(conn: aiosqlite.Connection) -> None:
     # 创建表
     await conn.execute(_TASKS_DDL)
     await conn.execute(_EVENTS_DDL)
+    await conn.execute(_PROJECTION_WATERMARKS_DDL)
     await conn.execute(_ARTIFACTS_DDL)
     await conn.execute(_TASK_JOBS_DDL)
     await conn.execute(_CHECKPOINTS_DDL)
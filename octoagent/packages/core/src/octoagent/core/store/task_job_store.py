@@ -10,6 +10,8 @@ from datetime import UTC, datetime
 
 import aiosqlite
 
+from .read_pool import ReadConnectionPool
+
 
 @dataclass
 class TaskJob:
@@ -32,8 +34,15 @@ class SqliteTaskJobStore:
 
     _DEFERRED_STATUSES = ("WAITING_INPUT", "WAITING_APPROVAL", "PAUSED")
 
-    def __init__(self, conn: aiosqlite.Connection) -> None:
+    def __init__(
+        self,
+        conn: aiosqlite.Connection,
+        *,
+        read_pool: ReadConnectionPool | None = None,
+    ) -> None:
         self._conn = conn
+        # SELECT 经只读连接池（未传入时透传到主连接）
+        self._reads = read_pool if read_pool is not None else ReadConnectionPool(conn)
 
     async def create_job(
         self,
@@ -207,7 +216,7 @@ class SqliteTaskJobStore:
         if not statuses:
             return []
         placeholders = ",".join(["?"] * len(statuses))
-        cursor = await self._conn.execute(
+        cursor = await self._reads.execute(
             f"""
             SELECT task_id, user_text, model_alias, status, attempts, last_error,
                    created_at, updated_at, started_at, finished_at
@@ -222,7 +231,7 @@ class SqliteTaskJobStore:
 
     async def get_job(self, task_id: str) -> TaskJob | None:
         """查询单个任务"""
-        cursor = await self._conn.execute(
+        cursor = await self._reads.execute(
             """
             SELECT task_id, user_text, model_alias, status, attempts, last_error,
                    created_at, updated_at, started_at, finished_at
@@ -0,0 +1,200 @@
+"""task_seq 进程内分配器
+
+get_next_task_seq 原先每次都执行 SELECT MAX(task_seq)，热路径上每条事件多一次往返。
+分配器按 task 缓存"已知最大 task_seq"（high-water mark）：
+
+- 首次访问某 task 时从 DB 懒加载（MAX(task_seq)），之后直接返回 high-water + 1，
+  语义与 MAX+1 一致（peek，不预留；调用方取号后未写入不会留下空洞）
+- 分配器按 DB 路径进程内共享（shared_task_seq_allocator）：同一库上的多个 StoreGroup
+  （chat import / 迁移 / 备份等临时打开的 store group）及其主连接、versionable 独立写连接
+  的写入都经 observe 推进同一 high-water；懒加载期间到达的写入先暂存，加载完成后合并，
+  避免 MAX 查询读到旧快照导致回退
+- 事务内尚未提交的写入记为"未确认"（连同所在连接）：提交后 confirm(conn) 确认；
+  回滚后 discard_uncommitted(conn) 丢弃。store 写连接（connection.StoreConnection）由
+  commit / rollback 钩子自动通知；其他连接提交 / 回滚而未通知时，peek 发现该连接已不在
+  事务中即丢弃缓存、从 DB 重新加载，回滚不会留下空洞
+- 回滚 / 删除事件 / task_seq 冲突时 discard 该 task，下次访问重新从 DB 加载
+  （冲突即兜底重同步：覆盖未经分配器的写入方）
+- LRU 淘汰空闲 task，内存占用以 capacity 为上限；capacity <= 0 关闭缓存
+"""
+
+from __future__ import annotations
+
+import weakref
+from collections import OrderedDict
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Protocol
+
+DEFAULT_TASK_SEQ_CACHE_SIZE = 4096
+
+
+class _WriteConnection(Protocol):
+    """写连接（aiosqlite.Connection）：只依赖其事务状态"""
+
+    @property
+    def in_transaction(self) -> bool: ...
+
+
+def _in_transaction(conn: _WriteConnection) -> bool:
+    try:
+        return conn.in_transaction
+    except ValueError:
+        # aiosqlite 连接已关闭：事务随之结束
+        return False
+
+
+@dataclass(slots=True)
+class TaskSeqAllocatorStats:
+    """分配器运行指标（进程内累计）"""
+
+    hits: int = 0
+    seeds: int = 0
+    discards: int = 0
+    evictions: int = 0
+
+
+class TaskSeqAllocator:
+    """按 task 缓存 task_seq high-water mark 的 LRU 分配器（单事件循环内使用）"""
+
+    def __init__(self, capacity: int = DEFAULT_TASK_SEQ_CACHE_SIZE) -> None:
+        self._capacity = capacity
+        self._high_water: OrderedDict[str, int] = OrderedDict()
+        # 懒加载进行中的 task -> 加载期间观察到的最大 task_seq
+        self._seeding: dict[str, int] = {}
+        # high-water 含未提交写入的 task -> 写入所在连接（及反向索引，confirm / 回滚按连接批量处理）
+        self._uncommitted: dict[str, _WriteConnection] = {}
+        self._uncommitted_by_conn: dict[_WriteConnection, set[str]] = {}
+        self.stats = TaskSeqAllocatorStats()
+
+    @property
+    def enabled(self) -> bool:
+        return self._capacity > 0
+
+    def __len__(self) -> int:
+        return len(self._high_water)
+
+    def peek_next(self, task_id: str) -> int | None:
+        """命中时返回下一个 task_seq；未缓存返回 None（调用方需 seed）"""
+        high_water = self._high_water.get(task_id)
+        if high_water is None:
+            return None
+        conn = self._uncommitted.get(task_id)
+        if conn is not None and not _in_transaction(conn):
+            # 写入所在事务已结束却未经 confirm / 回滚通知：无法区分提交与回滚，重新加载
+            self._drop(task_id)
+            return None
+        self._high_water.move_to_end(task_id)
+        self.stats.hits += 1
+        return high_water + 1
+
+    def begin_seed(self, task_id: str) -> None:
+        """标记懒加载开始（在 await MAX 查询之前调用）"""
+        self._seeding.setdefault(task_id, 0)
+
+    def finish_seed(
+        self, task_id: str, db_max_seq: int, conn: _WriteConnection | None = None
+    ) -> int:
+        """合并 DB MAX 与加载期间的写入，写入缓存并返回下一个 task_seq
+
+        conn 为执行 MAX 查询的连接；其处于事务中时 MAX 可能含未提交写入，同样记为未确认。
+        """
+        high_water = max(
+            db_max_seq,
+            self._seeding.pop(task_id, 0),
+            self._high_water.get(task_id, 0),
+        )
+        self.stats.seeds += 1
+        if self.enabled:
+            self._store(task_id, high_water)
+            if conn is not None and conn.in_transaction:
+                self._mark_uncommitted(task_id, conn)
+        return high_water + 1
+
+    def observe(
+        self, task_id: str, task_seq: int, conn: _WriteConnection | None = None
+    ) -> None:
+        """记录已写入的 task_seq（未缓存且未在加载的 task 忽略，下次访问从 DB 加载）
+
+        conn 仍处于事务中时记为未确认，待 confirm / discard_uncommitted。
+        """
+        if task_id in self._high_water:
+            if task_seq > self._high_water[task_id]:
+                self._high_water[task_id] = task_seq
+        elif task_id in self._seeding:
+            self._seeding[task_id] = max(self._seeding[task_id], task_seq)
+        else:
+            return
+        if self.enabled and conn is not None and conn.in_transaction:
+            self._mark_uncommitted(task_id, conn)
+
+    def confirm(self, conn: _WriteConnection) -> None:
+        """conn 已提交：其上未确认的写入全部生效"""
+        for task_id in self._uncommitted_by_conn.pop(conn, ()):
+            self._uncommitted.pop(task_id, None)
+
+    def discard_uncommitted(self, conn: _WriteConnection) -> None:
+        """conn 已回滚：丢弃其上未确认写入推进过的 task，下次访问重新从 DB 加载"""
+        for task_id in list(self._uncommitted_by_conn.get(conn, ())):
+            self._drop(task_id)
+
+    def discard(self, task_ids: Iterable[str]) -> None:
+        """丢弃缓存（回滚 / 删除 / 冲突后调用），下次访问重新从 DB 加载"""
+        for task_id in task_ids:
+            self._drop(task_id)
+
+    def _drop(self, task_id: str) -> None:
+        self._clear_uncommitted(task_id)
+        if self._high_water.pop(task_id, None) is not None:
+            self.stats.discards += 1
+
+    def _mark_uncommitted(self, task_id: str, conn: _WriteConnection) -> None:
+        previous = self._uncommitted.get(task_id)
+        if previous is conn:
+            return
+        if previous is not None:
+            self._clear_uncommitted(task_id)
+        self._uncommitted[task_id] = conn
+        self._uncommitted_by_conn.setdefault(conn, set()).add(task_id)
+
+    def _clear_uncommitted(self, task_id: str) -> None:
+        conn = self._uncommitted.pop(task_id, None)
+        if conn is None:
+            return
+        task_ids = self._uncommitted_by_conn.get(conn)
+        if task_ids is not None:
+            task_ids.discard(task_id)
+            if not task_ids:
+                del self._uncommitted_by_conn[conn]
+
+    def _store(self, task_id: str, high_water: int) -> None:
+        self._high_water[task_id] = high_water
+        self._high_water.move_to_end(task_id)
+        while len(self._high_water) > self._capacity:
+            evicted, _ = self._high_water.popitem(last=False)
+            self._clear_uncommitted(evicted)
+            self.stats.evictions += 1
+
+
+# DB 路径 -> 分配器；弱引用，最后一个使用该库的 event store 释放后随之回收
+_SHARED_ALLOCATORS: weakref.WeakValueDictionary[str, TaskSeqAllocator] = (
+    weakref.WeakValueDictionary()
+)
+
+
+def shared_task_seq_allocator(
+    db_path: str | Path, capacity: int = DEFAULT_TASK_SEQ_CACHE_SIZE
+) -> TaskSeqAllocator:
+    """返回 db_path 对应的进程内共享分配器（:memory: 库各自独立）
+
+    capacity 以首次创建时为准。
+    """
+    if str(db_path) == ":memory:":
+        return TaskSeqAllocator(capacity)
+    key = str(Path(db_path).resolve())
+    allocator = _SHARED_ALLOCATORS.get(key)
+    if allocator is None:
+        allocator = TaskSeqAllocator(capacity)
+        _SHARED_ALLOCATORS[key] = allocator
+    return allocator
@@ -11,6 +11,7 @@ import aiosqlite
 
 from ..models.enums import TaskStatus
 from ..models.task import RequesterInfo, Task, TaskPointers
+from .read_pool import ReadConnectionPool
 
 #: 系统内部占位 Task 的 requester.channel 值——这些 Task（F102 _daily_routine_audit /
 #: F127 记忆巩固 root + 后台巩固 child）由系统后台流程合成，仅作 event_store FK 占位 /
@@ -25,8 +26,15 @@ SYSTEM_INTERNAL_TASK_CHANNEL: str = "system"
 class SqliteTaskStore:
     """TaskStore 的 SQLite 实现"""
 
-    def __init__(self, conn: aiosqlite.Connection) -> None:
+    def __init__(
+        self,
+        conn: aiosqlite.Connection,
+        *,
+        read_pool: ReadConnectionPool | None = None,
+    ) -> None:
         self._conn = conn
+        # SELECT 经只读连接池（未传入时透传到主连接）
+        self._reads = read_pool if read_pool is not None else ReadConnectionPool(conn)
         # 防御性设置 row_factory：_row_to_task 走 name-based access（row["requester"]
         # 等），若连接由调用方 raw 打开没设过，拿到的就是 raw tuple，字符串索引
         # 会直接踩 TypeError。这里强制 idempotent 设置一次，任何 caller
@@ -59,9 +67,65 @@ class SqliteTaskStore:
             ),
         )
 
+    async def upsert_tasks(self, tasks: list[Task]) -> None:
+        """批量写入 / 覆盖任务投影（Projection 重建用，不自动提交）
+
+        单条 executemany 完成整批写入。冲突时只覆盖可由事件推导的投影列；
+        trace_id / parent_task_id 不在 TASK_CREATED payload 中，保留已有行的值。
+        """
+        if not tasks:
+            return
+        await self._conn.executemany(
+            """
+            INSERT INTO tasks (task_id, created_at, updated_at, status, title,
+                               thread_id, scope_id, requester, risk_level, pointers,
+                               trace_id, parent_task_id)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(task_id) DO UPDATE SET
+                created_at = excluded.created_at,
+                updated_at = excluded.updated_at,
+                status = excluded.status,
+                title = excluded.title,
+                thread_id = excluded.thread_id,
+                scope_id = excluded.scope_id,
+                requester = excluded.requester,
+                risk_level = excluded.risk_level,
+                pointers = excluded.pointers
+            """,
+            [
+                (
+                    task.task_id,
+                    task.created_at.isoformat(),
+                    task.updated_at.isoformat(),
+                    task.status.value,
+                    task.title,
+                    task.thread_id,
+                    task.scope_id,
+                    task.requester.model_dump_json(),
+                    task.risk_level.value,
+                    task.pointers.model_dump_json(),
+                    task.trace_id,
+                    task.parent_task_id,
+                )
+                for task in tasks
+            ],
+        )
+
+    async def get_tasks_by_ids(self, task_ids: list[str]) -> list[Task]:
+        """按 task_id 批量查询任务（单次 IN 查询，不存在的 id 忽略，顺序不保证）"""
+        if not task_ids:
+            return []
+        placeholders = ",".join("?" * len(task_ids))
+        cursor = await self._reads.execute(
+            f"SELECT * FROM tasks WHERE task_id IN ({placeholders})",
+            tuple(task_ids),
+        )
+        rows = await cursor.fetchall()
+        return [self._row_to_task(row) for row in rows]
+
     async def get_task(self, task_id: str) -> Task | None:
         """根据 task_id 查询任务"""
-        cursor = await self._conn.execute(
+        cursor = await self._reads.execute(
             "SELECT * FROM tasks WHERE task_id = ?",
             (task_id,),
         )
@@ -82,12 +146,12 @@ class SqliteTaskStore:
                 accessor**（与 list_works 不过滤同范式）；仅用户可见消费方（/api/tasks）显式开启。
         """
         if status:
-            cursor = await self._conn.execute(
+            cursor = await self._reads.execute(
                 "SELECT * FROM tasks WHERE status = ? ORDER BY created_at DESC",
                 (status,),
             )
         else:
-            cursor = await self._conn.execute(
+            cursor = await self._reads.execute(
                 "SELECT * FROM tasks ORDER BY created_at DESC"
             )
         rows = await cursor.fetchall()
@@ -127,7 +191,7 @@ class SqliteTaskStore:
         placeholders = ",".join("?" * len(statuses))
         status_values = [s.value for s in statuses]
 
-        cursor = await self._conn.execute(
+        cursor = await self._reads.execute(
             f"SELECT * FROM tasks WHERE status IN ({placeholders}) ORDER BY created_at DESC",
             tuple(status_values),
         )
@@ -143,7 +207,7 @@ class SqliteTaskStore:
 
     async def list_child_tasks(self, parent_task_id: str) -> list[Task]:
         """查询指定父任务的所有子任务（Feature 064），按 created_at 正序"""
-        cursor = await self._conn.execute(
+        cursor = await self._reads.execute(
             "SELECT * FROM tasks WHERE parent_task_id = ? ORDER BY created_at ASC",
             (parent_task_id,),
         )
@@ -201,7 +265,7 @@ class SqliteTaskStore:
         end_iso = end.astimezone(_UTC).isoformat()
 
         if statuses is None:
-            cursor = await self._conn.execute(
+            cursor = await self._reads.execute(
                 "SELECT * FROM tasks WHERE created_at >= ? AND created_at < ? "
                 "ORDER BY created_at DESC",
                 (start_iso, end_iso),
@@ -211,7 +275,7 @@ class SqliteTaskStore:
                 return []
             placeholders = ",".join("?" * len(statuses))
             status_values = [s.value for s in statuses]
-            cursor = await self._conn.execute(
+            cursor = await self._reads.execute(
                 f"SELECT * FROM tasks WHERE created_at >= ? AND created_at < ? "
                 f"AND status IN ({placeholders}) ORDER BY created_at DESC",
                 (start_iso, end_iso, *status_values),
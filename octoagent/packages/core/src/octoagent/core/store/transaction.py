@@ -54,8 +54,10 @@ async def create_task_with_initial_events(
             )
 
         await conn.commit()
+        event_store.confirm_task_seq(conn=conn)
     except Exception:
         await conn.rollback()
+        event_store.discard_task_seq([task.task_id], conn=conn)
         raise
 
 
@@ -129,8 +131,10 @@ async def append_event_and_update_task(
 
         # 原子提交
         await conn.commit()
+        event_store.confirm_task_seq(conn=conn)
     except Exception:
         await conn.rollback()
+        event_store.discard_task_seq([event.task_id], conn=conn)
         raise
 
 
@@ -161,8 +165,10 @@ async def append_event_only(
         )
 
         await conn.commit()
+        event_store.confirm_task_seq(conn=conn)
     except Exception:
         await conn.rollback()
+        event_store.discard_task_seq([event.task_id], conn=conn)
         raise
 
 
@@ -197,6 +203,8 @@ async def append_event_and_save_checkpoint(
             ),
         )
         await conn.commit()
+        event_store.confirm_task_seq(conn=conn)
     except Exception:
         await conn.rollback()
+        event_store.discard_task_seq([event.task_id], conn=conn)
         raise
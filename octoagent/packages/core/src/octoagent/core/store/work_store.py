@@ -8,13 +8,21 @@ from datetime import datetime
 import aiosqlite
 
 from ..models import PipelineCheckpoint, SkillPipelineRun, Work
+from .read_pool import ReadConnectionPool
 
 
 class SqliteWorkStore:
     """works / skill_pipeline_runs / skill_pipeline_checkpoints 访问层。"""
 
-    def __init__(self, conn: aiosqlite.Connection) -> None:
+    def __init__(
+        self,
+        conn: aiosqlite.Connection,
+        *,
+        read_pool: ReadConnectionPool | None = None,
+    ) -> None:
         self._conn = conn
+        # SELECT 经只读连接池（未传入时透传到主连接）
+        self._reads = read_pool if read_pool is not None else ReadConnectionPool(conn)
 
     async def save_work(self, work: Work) -> Work:
         await self._conn.execute(
@@ -101,7 +109,7 @@ class SqliteWorkStore:
         return work
 
     async def get_work(self, work_id: str) -> Work | None:
-        cursor = await self._conn.execute(
+        cursor = await self._reads.execute(
             "SELECT * FROM works WHERE work_id = ?",
             (work_id,),
         )
@@ -128,7 +136,7 @@ class SqliteWorkStore:
             clauses.append(f"status IN ({placeholders})")
             args.extend(statuses)
         where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
-        cursor = await self._conn.execute(
+        cursor = await self._reads.execute(
             f"SELECT * FROM works {where} ORDER BY created_at DESC",
             tuple(args),
         )
@@ -180,7 +188,7 @@ class SqliteWorkStore:
         return run
 
     async def get_pipeline_run(self, run_id: str) -> SkillPipelineRun | None:
-        cursor = await self._conn.execute(
+        cursor = await self._reads.execute(
             "SELECT * FROM skill_pipeline_runs WHERE run_id = ?",
             (run_id,),
         )
@@ -188,7 +196,7 @@ class SqliteWorkStore:
         return self._row_to_pipeline_run(row) if row is not None else None
 
     async def get_pipeline_run_by_work(self, work_id: str) -> SkillPipelineRun | None:
-        cursor = await self._conn.execute(
+        cursor = await self._reads.execute(
             """
             SELECT * FROM skill_pipeline_runs
             WHERE work_id = ?
@@ -229,7 +237,7 @@ class SqliteWorkStore:
         if page_size > 0:
             offset = (max(page, 1) - 1) * page_size
             limit_clause = f" LIMIT {page_size} OFFSET {offset}"
-        cursor = await self._conn.execute(
+        cursor = await self._reads.execute(
             f"SELECT * FROM skill_pipeline_runs {where} ORDER BY created_at DESC{limit_clause}",
             tuple(args),
         )
@@ -260,7 +268,7 @@ class SqliteWorkStore:
             clauses.append("status = ?")
             args.append(status)
         where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
-        cursor = await self._conn.execute(
+        cursor = await self._reads.execute(
             f"SELECT COUNT(*) FROM skill_pipeline_runs {where}",
             tuple(args),
         )
@@ -300,7 +308,7 @@ class SqliteWorkStore:
         return checkpoint
 
     async def get_pipeline_checkpoint(self, checkpoint_id: str) -> PipelineCheckpoint | None:
-        cursor = await self._conn.execute(
+        cursor = await self._reads.execute(
             """
             SELECT * FROM skill_pipeline_checkpoints
             WHERE checkpoint_id = ?
@@ -311,7 +319,7 @@ class SqliteWorkStore:
         return self._row_to_pipeline_checkpoint(row) if row is not None else None
 
     async def list_pipeline_checkpoints(self, run_id: str) -> list[PipelineCheckpoint]:
-        cursor = await self._conn.execute(
+        cursor = await self._reads.execute(
             """
             SELECT * FROM skill_pipeline_checkpoints
             WHERE run_id = ?
@@ -323,7 +331,7 @@ class SqliteWorkStore:
         return [self._row_to_pipeline_checkpoint(row) for row in rows]
 
     async def get_latest_pipeline_checkpoint(self, run_id: str) -> PipelineCheckpoint | None:
-        cursor = await self._conn.execute(
+        cursor = await self._reads.execute(
             """
             SELECT * FROM skill_pipeline_checkpoints
             WHERE run_id = ?
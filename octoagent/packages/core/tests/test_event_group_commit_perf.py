@@ -0,0 +1,86 @@
+"""事件追加吞吐 perf 基准：逐条提交 vs group commit
+
+测量入口：N 个并发 task 各自连续 append_event_committed（真实文件库 + WAL）。
+输出 events/sec（-s 可见），仅断言结构性结论：
+- 两种模式写入事件数一致、task_seq 连续
+- 并发度 ≥ 8 时 group commit 的提交次数少于事件数（吞吐对比依赖 fsync 成本，只输出不断言）
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+
+import pytest
+import ulid
+from octoagent.core.models.enums import ActorType, EventType
+from octoagent.core.models.event import Event
+from octoagent.core.store import create_store_group
+
+EVENTS_PER_TASK = 50
+CONCURRENCY_LEVELS = (1, 8, 32)
+
+
+async def _run_workload(
+    tmp_path: Path, *, concurrency: int, group_commit: bool
+) -> tuple[float, int | None]:
+    store_group = await create_store_group(
+        str(tmp_path / f"throughput-{concurrency}-{group_commit}.db"),
+        str(tmp_path / "artifacts"),
+        event_group_commit=group_commit,
+    )
+    try:
+        now = datetime.now(UTC)
+        task_ids = [f"task-{i:03d}" for i in range(concurrency)]
+        for task_id in task_ids:
+            await store_group.conn.execute(
+                "INSERT INTO tasks (task_id, created_at, updated_at) VALUES (?, ?, ?)",
+                (task_id, now.isoformat(), now.isoformat()),
+            )
+        await store_group.conn.commit()
+        es = store_group.event_store
+
+        async def _worker(task_id: str) -> None:
+            for seq in range(1, EVENTS_PER_TASK + 1):
+                await es.append_event_committed(
+                    Event(
+                        event_id=str(ulid.ULID()),
+                        task_id=task_id,
+                        task_seq=seq,
+                        ts=now,
+                        type=EventType.TOOL_CALL_STARTED,
+                        actor=ActorType.TOOL,
+                        payload={"tool_name": "filesystem.read_text", "args_summary": "x" * 64},
+                        trace_id=f"trace-{task_id}",
+                    )
+                )
+
+        start = time.perf_counter()
+        await asyncio.gather(*(_worker(task_id) for task_id in task_ids))
+        elapsed = time.perf_counter() - start
+
+        for task_id in task_ids:
+            events = await es.get_events_for_task(task_id)
+            assert [e.task_seq for e in events] == list(range(1, EVENTS_PER_TASK + 1))
+        stats = es.group_commit_stats
+        batches = stats.batches_committed if stats is not None else None
+        return concurrency * EVENTS_PER_TASK / elapsed, batches
+    finally:
+        await store_group.close()
+
+
+@pytest.mark.parametrize("concurrency", CONCURRENCY_LEVELS)
+async def test_append_throughput_vs_concurrency(tmp_path: Path, concurrency: int) -> None:
+    per_event, _ = await _run_workload(tmp_path, concurrency=concurrency, group_commit=False)
+    grouped, batches = await _run_workload(tmp_path, concurrency=concurrency, group_commit=True)
+
+    print(
+        f"\n[event append] tasks={concurrency} "
+        f"per_event={per_event:.0f} ev/s group_commit={grouped:.0f} ev/s batches={batches}"
+    )
+
+    assert batches is not None
+    if concurrency >= 8:
+        assert batches < concurrency * EVENTS_PER_TASK
@@ -2,7 +2,7 @@
 
 测试内容：
 1. 同一 task 内 task_seq 严格单调递增
-2. 重复 task_seq 数据库层报错
+2. 重复 task_seq 数据库层报错，append_event 按 DB MAX 重同步
 """
 
 from datetime import UTC, datetime
@@ -109,6 +109,40 @@ class TestEventSeq:
             actor=ActorType.USER,
             trace_id="trace-dup",
         )
-        with pytest.raises(Exception):  # IntegrityError
-            await event_store.append_event(event_dup)
+        with pytest.raises(aiosqlite.IntegrityError):
+            await conn.execute(
+                "INSERT INTO events (event_id, task_id, task_seq, ts, type, actor, payload,"
+                " trace_id) VALUES (?, ?, ?, ?, ?, ?, '{}', ?)",
+                (
+                    event_dup.event_id,
+                    event_dup.task_id,
+                    event_dup.task_seq,
+                    now.isoformat(),
+                    event_dup.type.value,
+                    event_dup.actor.value,
+                    event_dup.trace_id,
+                ),
+            )
+
+    async def test_append_event_resyncs_duplicate_task_seq(self, stores):
+        """append_event 遇到重复 task_seq 时按 DB MAX+1 改写后写入"""
+        event_store, conn = stores
+        now = datetime.now(UTC)
+        for event_id, event_type in (
+            ("01JEVT_DUP_00000000000001", EventType.TASK_CREATED),
+            ("01JEVT_DUP_00000000000002", EventType.USER_MESSAGE),
+        ):
+            event = Event(
+                event_id=event_id,
+                task_id="01JTEST_SEQ_00000000000001",
+                task_seq=1,
+                ts=now,
+                type=event_type,
+                actor=ActorType.SYSTEM,
+                trace_id="trace-dup",
+            )
+            await event_store.append_event(event)
             await conn.commit()
+
+        assert event.task_seq == 2
+        assert await event_store.get_next_task_seq("01JTEST_SEQ_00000000000001") == 3
@@ -137,6 +137,11 @@ class TestSafetyProperties:
     def test_empty_string(self) -> None:
         assert redact_sensitive_text("") == ""
 
+    def test_line_without_secret_returns_same_object(self) -> None:
+        """无命中的行原对象返回（热路径零分配）。"""
+        text = "2026-01-01T00:00:00Z INFO worker: key=value missing, url=http://x/y"
+        assert _redact_with_flag(text, enabled=True) is text
+
     @pytest.mark.parametrize(
         "sample",
         [
@@ -0,0 +1,113 @@
+"""Projection 重建 perf 基准：重建耗时 vs events 表规模
+
+测量入口：rebuild_all（全量）与 rebuild_incremental（watermark 之后固定 delta）。
+数据规模：events 表 2k / 10k / 40k 行（每 task 10 条事件），delta 固定 200 条。
+
+输出各规模耗时（-s 可见），仅断言结构性结论：
+- 全量重建结果正确（任务数 / 终态）
+- 增量重建耗时与 delta 成正比，不随 events 表规模线性增长（最大规模下显著快于全量）
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+
+import pytest
+from octoagent.core.models.enums import TaskStatus
+from octoagent.core.projection import rebuild_all, rebuild_incremental
+from octoagent.core.store import create_store_group
+
+EVENTS_PER_TASK = 10
+DELTA_EVENTS = 200
+TABLE_SIZES = (2_000, 10_000, 40_000)
+
+
+def _event_rows(task_index: int, start_seq: int, count: int) -> list[tuple]:
+    task_id = f"TSK{task_index:08d}"
+    ts = datetime(2026, 1, 1, tzinfo=UTC).isoformat()
+    rows: list[tuple] = []
+    for seq in range(start_seq, start_seq + count):
+        if seq == 1:
+            event_type = "TASK_CREATED"
+            payload = {"title": f"task {task_index}", "channel": "web", "sender_id": "owner"}
+        elif seq == 2:
+            event_type = "STATE_TRANSITION"
+            payload = {"from_status": "CREATED", "to_status": "RUNNING"}
+        else:
+            event_type = "MODEL_CALL_STARTED"
+            payload = {"model_alias": "main", "request_summary": "x" * 200}
+        rows.append(
+            (
+                f"EVT{task_index:08d}{seq:06d}",
+                task_id,
+                seq,
+                ts,
+                event_type,
+                1,
+                "system",
+                json.dumps(payload),
+                f"trace-{task_id}",
+                "",
+            )
+        )
+    return rows
+
+
+async def _insert_events(conn, rows: list[tuple]) -> None:
+    await conn.executemany(
+        """
+        INSERT INTO events (event_id, task_id, task_seq, ts, type, schema_version,
+                            actor, payload, trace_id, span_id)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        rows,
+    )
+    await conn.commit()
+
+
+@pytest.mark.parametrize("table_size", TABLE_SIZES)
+async def test_rebuild_time_vs_event_table_size(tmp_path: Path, table_size: int) -> None:
+    store_group = await create_store_group(
+        str(tmp_path / "perf.db"),
+        str(tmp_path / "artifacts"),
+    )
+    try:
+        conn = store_group.conn
+        es = store_group.event_store
+        ts = store_group.task_store
+        task_count = table_size // EVENTS_PER_TASK
+
+        rows: list[tuple] = []
+        for index in range(task_count):
+            rows.extend(_event_rows(index, 1, EVENTS_PER_TASK))
+        await _insert_events(conn, rows)
+
+        start = time.perf_counter()
+        assert await rebuild_all(conn, es, ts) == table_size
+        full_ms = (time.perf_counter() - start) * 1000
+
+        assert len(await ts.list_tasks()) == task_count
+        assert (await ts.get_task("TSK00000000")).status == TaskStatus.RUNNING
+
+        # delta：在前 DELTA_EVENTS 个 task 上各追加 1 条事件
+        delta_rows: list[tuple] = []
+        for index in range(DELTA_EVENTS):
+            delta_rows.extend(_event_rows(index, EVENTS_PER_TASK + 1, 1))
+        await _insert_events(conn, delta_rows)
+
+        start = time.perf_counter()
+        assert await rebuild_incremental(conn, es, ts) == DELTA_EVENTS
+        incremental_ms = (time.perf_counter() - start) * 1000
+
+        print(
+            f"\n[projection rebuild] events={table_size} "
+            f"full={full_ms:.1f}ms incremental(delta={DELTA_EVENTS})={incremental_ms:.1f}ms"
+        )
+
+        if table_size == TABLE_SIZES[-1]:
+            assert incremental_ms < full_ms
+    finally:
+        await store_group.close()
@@ -5,6 +5,7 @@
 2. 多任务重建正确性
 3. 空数据库重建不报错
 4. 重建后事件数返回正确
+5. 增量重建只处理 watermark 之后的事件
 """
 
 from datetime import UTC, datetime
@@ -25,7 +26,12 @@ from octoagent.core.models.payloads import (
     UserMessagePayload,
 )
 from octoagent.core.models.task import RequesterInfo, Task
-from octoagent.core.projection import apply_event, rebuild_all
+from octoagent.core.projection import (
+    apply_event,
+    load_watermark,
+    rebuild_all,
+    rebuild_incremental,
+)
 from octoagent.core.store import create_store_group
 from octoagent.core.store.transaction import append_event_and_update_task, append_event_only
 
@@ -438,10 +444,10 @@ class TestRebuildAll:
         )
         await append_event_only(conn, es, evt)
 
-        async def _boom(_task):
+        async def _boom(_tasks):
             raise RuntimeError("inject rebuild failure")
 
-        monkeypatch.setattr(ts, "create_task", _boom)
+        monkeypatch.setattr(ts, "upsert_tasks", _boom)
 
         with pytest.raises(RuntimeError, match="inject rebuild failure"):
             await rebuild_all(conn, es, ts)
@@ -450,3 +456,154 @@ class TestRebuildAll:
         row = await cursor.fetchone()
         assert row is not None
         assert int(row[0]) == 1
+
+
+def _created_event(task_id: str, event_id: str, ts: datetime, title: str) -> Event:
+    return Event(
+        event_id=event_id,
+        task_id=task_id,
+        task_seq=1,
+        ts=ts,
+        type=EventType.TASK_CREATED,
+        actor=ActorType.SYSTEM,
+        payload=TaskCreatedPayload(
+            title=title,
+            thread_id="default",
+            scope_id="",
+            channel="web",
+            sender_id="owner",
+        ).model_dump(),
+        trace_id=f"trace-{task_id}",
+    )
+
+
+def _transition_event(
+    task_id: str,
+    event_id: str,
+    seq: int,
+    ts: datetime,
+    from_status: TaskStatus,
+    to_status: TaskStatus,
+) -> Event:
+    return Event(
+        event_id=event_id,
+        task_id=task_id,
+        task_seq=seq,
+        ts=ts,
+        type=EventType.STATE_TRANSITION,
+        actor=ActorType.SYSTEM,
+        payload=StateTransitionPayload(
+            from_status=from_status,
+            to_status=to_status,
+        ).model_dump(),
+        trace_id=f"trace-{task_id}",
+    )
+
+
+async def _seed_task(store_group, task_id: str, event_id: str, title: str) -> None:
+    now = datetime(2026, 1, 1, tzinfo=UTC)
+    await store_group.task_store.create_task(
+        Task(
+            task_id=task_id,
+            created_at=now,
+            updated_at=now,
+            status=TaskStatus.CREATED,
+            title=title,
+            requester=RequesterInfo(channel="web", sender_id="owner"),
+            trace_id=f"trace-{task_id}",
+        )
+    )
+    await store_group.conn.commit()
+    await append_event_only(
+        store_group.conn,
+        store_group.event_store,
+        _created_event(task_id, event_id, now, title),
+    )
+
+
+class TestRebuildIncremental:
+    """基于 watermark 的增量重建测试"""
+
+    async def test_full_rebuild_records_watermark(self, store_group):
+        """全量重建后 watermark 指向最后一条事件"""
+        await _seed_task(store_group, "TSK001", "EVT001", "one")
+        await rebuild_all(store_group.conn, store_group.event_store, store_group.task_store)
+
+        watermark = await load_watermark(store_group.conn)
+        assert watermark is not None
+        assert watermark[1] == "EVT001"
+
+    async def test_incremental_without_watermark_falls_back_to_full(self, store_group):
+        """无 watermark 时退化为全量重建"""
+        await _seed_task(store_group, "TSK001", "EVT001", "one")
+
+        event_count = await rebuild_incremental(
+            store_group.conn, store_group.event_store, store_group.task_store
+        )
+
+        assert event_count == 1
+        assert await load_watermark(store_group.conn) is not None
+
+    async def test_incremental_applies_only_new_events(self, store_group):
+        """增量重建只流式处理 watermark 之后的事件，并跨页推进 watermark"""
+        conn = store_group.conn
+        es = store_group.event_store
+        ts = store_group.task_store
+        await _seed_task(store_group, "TSK001", "EVT001", "one")
+        await rebuild_all(conn, es, ts)
+
+        t1 = datetime(2026, 1, 1, 0, 0, 5, tzinfo=UTC)
+        await append_event_only(
+            conn,
+            es,
+            _transition_event(
+                "TSK001", "EVT002", 2, t1, TaskStatus.CREATED, TaskStatus.RUNNING
+            ),
+        )
+        await _seed_task(store_group, "TSK002", "EVT003", "two")
+        await append_event_only(
+            conn,
+            es,
+            _transition_event(
+                "TSK002", "EVT004", 2, t1, TaskStatus.CREATED, TaskStatus.CANCELLED
+            ),
+        )
+        await append_event_only(
+            conn,
+            es,
+            _transition_event(
+                "TSK001", "EVT005", 3, t1, TaskStatus.RUNNING, TaskStatus.SUCCEEDED
+            ),
+        )
+
+        event_count = await rebuild_incremental(conn, es, ts, batch_size=2)
+
+        assert event_count == 4
+        rebuilt_1 = await ts.get_task("TSK001")
+        rebuilt_2 = await ts.get_task("TSK002")
+        assert rebuilt_1.status == TaskStatus.SUCCEEDED
+        assert rebuilt_1.pointers.latest_event_id == "EVT005"
+        assert rebuilt_2.status == TaskStatus.CANCELLED
+        # 重放 TASK_CREATED 时，非事件推导列保留已有投影行的值
+        assert rebuilt_2.trace_id == "trace-TSK002"
+        assert (await load_watermark(conn))[1] == "EVT005"
+
+        # 再次增量重建：无新事件
+        assert await rebuild_incremental(conn, es, ts) == 0
+
+    async def test_incremental_watermark_mismatch_falls_back_to_full(self, store_group):
+        """watermark 行被删除时回退全量重建"""
+        conn = store_group.conn
+        es = store_group.event_store
+        ts = store_group.task_store
+        await _seed_task(store_group, "TSK001", "EVT001", "one")
+        await _seed_task(store_group, "TSK002", "EVT002", "two")
+        await rebuild_all(conn, es, ts)
+
+        await es.delete_events_by_task_ids(["TSK002"])
+        await conn.commit()
+
+        event_count = await rebuild_incremental(conn, es, ts)
+
+        assert event_count == 1
+        assert (await load_watermark(conn))[1] == "EVT001"
@@ -0,0 +1,171 @@
+"""EventGroupCommitWriter 单元测试
+
+覆盖：并发 append 合并提交、task_seq 冲突重试、提交后才确认、单条失败隔离、关闭排空、
+批次与主连接上其他事务互不提交 / 回滚。
+"""
+
+import asyncio
+from datetime import UTC, datetime
+from pathlib import Path
+
+import aiosqlite
+import pytest
+import pytest_asyncio
+import ulid
+from octoagent.core.models.enums import ActorType, EventType
+from octoagent.core.models.event import Event, EventCausality
+from octoagent.core.store.event_store import SqliteEventStore
+from octoagent.core.store.sqlite_init import init_db
+
+TASK_IDS = [f"task-{i:03d}" for i in range(8)]
+
+
+def _make_event(task_id: str, task_seq: int, event_id: str | None = None) -> Event:
+    return Event(
+        event_id=event_id or str(ulid.ULID()),
+        task_id=task_id,
+        task_seq=task_seq,
+        ts=datetime(2026, 3, 3, tzinfo=UTC),
+        type=EventType.TASK_HEARTBEAT,
+        actor=ActorType.SYSTEM,
+        payload={},
+        trace_id="trace-test",
+        causality=EventCausality(),
+    )
+
+
+@pytest_asyncio.fixture
+async def db_path(tmp_path: Path) -> str:
+    path = str(tmp_path / "group_commit.db")
+    conn = await aiosqlite.connect(path)
+    await init_db(conn)
+    now = datetime.now(UTC).isoformat()
+    for task_id in TASK_IDS:
+        await conn.execute(
+            "INSERT INTO tasks (task_id, created_at, updated_at, status) VALUES (?, ?, ?, ?)",
+            (task_id, now, now, "RUNNING"),
+        )
+    await conn.commit()
+    await conn.close()
+    return path
+
+
+@pytest_asyncio.fixture
+async def conn(db_path: str):
+    connection = await aiosqlite.connect(db_path)
+    yield connection
+    await connection.close()
+
+
+@pytest_asyncio.fixture
+async def event_store(conn: aiosqlite.Connection):
+    store = SqliteEventStore(conn, group_commit=True, group_commit_window_ms=5)
+    yield store
+    await store.close()
+
+
+async def _count_committed(db_path: str) -> int:
+    async with aiosqlite.connect(db_path) as reader:
+        cursor = await reader.execute("SELECT COUNT(*) FROM events")
+        row = await cursor.fetchone()
+        return int(row[0])
+
+
+class TestEventGroupCommit:
+    async def test_concurrent_appends_share_commits(self, event_store: SqliteEventStore):
+        """多 task 并发 append 合并为少量批次提交"""
+        events = [_make_event(task_id, seq) for seq in (1, 2) for task_id in TASK_IDS]
+        results = await asyncio.gather(
+            *(event_store.append_event_committed(event) for event in events)
+        )
+
+        stats = event_store.group_commit_stats
+        assert stats is not None
+        assert stats.events_committed == len(events)
+        assert stats.batches_committed < len(events)
+        assert [r.event_id for r in results] == [e.event_id for e in events]
+
+    async def test_ack_only_after_commit(
+        self, event_store: SqliteEventStore, db_path: str
+    ):
+        """append_event_committed 返回时事件对其他连接可见"""
+        await event_store.append_event_committed(_make_event(TASK_IDS[0], 1))
+
+        assert await _count_committed(db_path) == 1
+
+    async def test_task_seq_conflict_retried_within_batch(
+        self, event_store: SqliteEventStore
+    ):
+        """同 task 同 task_seq 并发请求：后到者在批次内重排为 MAX+1"""
+        first, second = await asyncio.gather(
+            event_store.append_event_committed(_make_event(TASK_IDS[0], 1)),
+            event_store.append_event_committed(_make_event(TASK_IDS[0], 1)),
+        )
+
+        assert (first.task_seq, second.task_seq) == (1, 2)
+        events = await event_store.get_events_for_task(TASK_IDS[0])
+        assert [e.task_seq for e in events] == [1, 2]
+
+    async def test_failed_append_does_not_poison_batch(
+        self, event_store: SqliteEventStore
+    ):
+        """非冲突的完整性错误只失败该条请求，同批次其他事件正常提交"""
+        duplicate_id = str(ulid.ULID())
+        await event_store.append_event_committed(_make_event(TASK_IDS[0], 1, duplicate_id))
+
+        results = await asyncio.gather(
+            event_store.append_event_committed(_make_event(TASK_IDS[0], 2, duplicate_id)),
+            event_store.append_event_committed(_make_event(TASK_IDS[1], 1)),
+            return_exceptions=True,
+        )
+
+        assert isinstance(results[0], aiosqlite.IntegrityError)
+        assert isinstance(results[1], Event)
+        assert len(await event_store.get_events_for_task(TASK_IDS[1])) == 1
+        assert event_store.group_commit_stats.events_failed == 1
+
+    async def test_updates_task_pointer(self, event_store: SqliteEventStore, db_path: str):
+        """update_task_pointer 随批次提交"""
+        event = await event_store.append_event_committed(_make_event(TASK_IDS[2], 1))
+
+        async with aiosqlite.connect(db_path) as reader:
+            cursor = await reader.execute(
+                "SELECT json_extract(pointers, '$.latest_event_id') FROM tasks WHERE task_id = ?",
+                (TASK_IDS[2],),
+            )
+            row = await cursor.fetchone()
+        assert row[0] == event.event_id
+
+    async def test_batch_isolated_from_main_connection_transaction(
+        self, event_store: SqliteEventStore, conn: aiosqlite.Connection, db_path: str
+    ):
+        """批次不提交主连接上他人未完成的事务，主连接回滚也撤不掉已确认的批次"""
+
+        async def _unrelated_rolled_back_write() -> None:
+            await conn.execute(
+                "UPDATE tasks SET status = 'FAILED' WHERE task_id = ?", (TASK_IDS[3],)
+            )
+            await asyncio.sleep(0.05)
+            await conn.rollback()
+
+        append = asyncio.create_task(
+            event_store.append_event_committed(_make_event(TASK_IDS[0], 1))
+        )
+        await asyncio.sleep(0)
+        await _unrelated_rolled_back_write()
+        await append
+
+        assert await _count_committed(db_path) == 1
+        async with aiosqlite.connect(db_path) as reader:
+            cursor = await reader.execute(
+                "SELECT status FROM tasks WHERE task_id = ?", (TASK_IDS[3],)
+            )
+            row = await cursor.fetchone()
+        assert row[0] == "RUNNING"
+
+    async def test_close_rejects_new_appends(self, event_store: SqliteEventStore):
+        """close 后拒绝新请求"""
+        await event_store.close()
+
+        with pytest.raises(RuntimeError):
+            await event_store.append_event_committed(_make_event(TASK_IDS[0], 1))
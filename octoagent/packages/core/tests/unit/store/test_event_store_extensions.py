@@ -1,7 +1,9 @@
 """EventStore 扩展方法单元测试 -- Feature 011 T012
 
 测试 get_latest_event_ts 和 get_events_by_types_since 的正确性，
-覆盖空事件/正常查询/类型过滤/时间边界场景。
+覆盖空事件/正常查询/类型过滤/时间边界场景；以及流式迭代器 API
+（iter_events_for_task / iter_events_after / iter_all_events / iter_event_columns）
+的分页、类型过滤与列投影；追加监听器只回调已提交事件。
 """
 
 from datetime import UTC, datetime, timedelta
@@ -12,6 +14,7 @@ import pytest_asyncio
 
 from octoagent.core.models.enums import ActorType, EventType
 from octoagent.core.models.event import Event, EventCausality
+from octoagent.core.store.connection import connect_store
 from octoagent.core.store.event_store import SqliteEventStore
 from octoagent.core.store.sqlite_init import init_db
 
@@ -214,3 +217,182 @@ class TestGetEventsByTypesSince:
         assert len(result) == 3
         seqs = [r.task_seq for r in result]
         assert seqs == sorted(seqs)
+
+
+class TestStreamingIterators:
+    """流式迭代器 API 测试（分页 / 类型过滤 / 列投影）"""
+
+    async def _seed(self, event_store: SqliteEventStore, count: int) -> list[Event]:
+        base = datetime(2026, 3, 3, 10, 0, 0, tzinfo=UTC)
+        events: list[Event] = []
+        for seq in range(1, count + 1):
+            event_type = EventType.USER_MESSAGE if seq % 3 == 0 else EventType.TASK_HEARTBEAT
+            event = _make_event("task-001", event_type, base + timedelta(seconds=seq), seq)
+            await event_store.append_event_committed(event, update_task_pointer=False)
+            events.append(event)
+        return events
+
+    @pytest.mark.asyncio
+    async def test_iter_events_for_task_pages_in_task_seq_order(
+        self, event_store: SqliteEventStore
+    ):
+        """小 page_size 跨多页读取，结果与 get_events_for_task 一致"""
+        await self._seed(event_store, 10)
+
+        streamed = [e async for e in event_store.iter_events_for_task("task-001", page_size=3)]
+
+        expected = await event_store.get_events_for_task("task-001")
+        assert [e.event_id for e in streamed] == [e.event_id for e in expected]
+        assert [e.task_seq for e in streamed] == list(range(1, 11))
+
+    @pytest.mark.asyncio
+    async def test_iter_events_type_filter(self, event_store: SqliteEventStore):
+        """event_types 在 SQL 侧过滤；空序列返回空"""
+        await self._seed(event_store, 9)
+
+        user_messages = [
+            e
+            async for e in event_store.iter_events_for_task(
+                "task-001", event_types=[EventType.USER_MESSAGE], page_size=2
+            )
+        ]
+        empty = [e async for e in event_store.iter_events_for_task("task-001", event_types=[])]
+
+        assert [e.task_seq for e in user_messages] == [3, 6, 9]
+        assert empty == []
+
+    @pytest.mark.asyncio
+    async def test_iter_events_for_task_after_task_seq(self, event_store: SqliteEventStore):
+        """after_task_seq 只返回更大 task_seq 的事件（可与类型过滤组合）"""
+        await self._seed(event_store, 9)
+
+        tail = [
+            e
+            async for e in event_store.iter_events_for_task(
+                "task-001", after_task_seq=4, page_size=2
+            )
+        ]
+        user_tail = [
+            e
+            async for e in event_store.iter_events_for_task(
+                "task-001", event_types=[EventType.USER_MESSAGE], after_task_seq=3
+            )
+        ]
+
+        assert [e.task_seq for e in tail] == [5, 6, 7, 8, 9]
+        assert [e.task_seq for e in user_tail] == [6, 9]
+
+    @pytest.mark.asyncio
+    async def test_iter_events_after(self, event_store: SqliteEventStore):
+        """iter_events_after 只返回游标之后的事件"""
+        events = await self._seed(event_store, 6)
+
+        streamed = [
+            e
+            async for e in event_store.iter_events_after(
+                "task-001", events[2].event_id, page_size=2
+            )
+        ]
+
+        assert [e.task_seq for e in streamed] == [4, 5, 6]
+
+    @pytest.mark.asyncio
+    async def test_iter_all_events_across_tasks(
+        self, event_store: SqliteEventStore, db_conn: aiosqlite.Connection
+    ):
+        """iter_all_events 按 task_id / task_seq 排序跨任务翻页"""
+        await db_conn.execute(
+            "INSERT INTO tasks (task_id, created_at, updated_at, status) VALUES (?, ?, ?, ?)",
+            ("task-000", datetime.now(UTC).isoformat(), datetime.now(UTC).isoformat(), "RUNNING"),
+        )
+        await db_conn.commit()
+        await self._seed(event_store, 4)
+        ts = datetime(2026, 3, 3, tzinfo=UTC)
+        for seq in (1, 2):
+            await event_store.append_event_committed(
+                _make_event("task-000", EventType.TASK_HEARTBEAT, ts, seq),
+                update_task_pointer=False,
+            )
+
+        streamed = [e async for e in event_store.iter_all_events(page_size=3)]
+
+        assert [(e.task_id, e.task_seq) for e in streamed] == [
+            ("task-000", 1),
+            ("task-000", 2),
+            ("task-001", 1),
+            ("task-001", 2),
+            ("task-001", 3),
+            ("task-001", 4),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_iter_event_columns_projection(self, event_store: SqliteEventStore):
+        """列投影只返回请求的列"""
+        events = await self._seed(event_store, 4)
+
+        rows = [
+            row
+            async for row in event_store.iter_event_columns(
+                ("event_id", "type"), task_id="task-001", page_size=3
+            )
+        ]
+
+        assert rows == [(e.event_id, e.type.value) for e in events]
+
+    @pytest.mark.asyncio
+    async def test_iter_event_columns_rejects_unknown_column(
+        self, event_store: SqliteEventStore
+    ):
+        """非 events 表列直接拒绝"""
+        with pytest.raises(ValueError):
+            async for _ in event_store.iter_event_columns(("event_id", "1; DROP TABLE events")):
+                pass
+
+
+class TestAppendListener:
+    """set_append_listener：事务提交后才回调，回滚的追加不回调"""
+
+    @pytest.mark.asyncio
+    async def test_store_connection_commit_and_rollback(self):
+        conn = await connect_store(":memory:")
+        try:
+            await init_db(conn)
+            now = datetime.now(UTC)
+            await conn.execute(
+                "INSERT INTO tasks (task_id, created_at, updated_at, status)"
+                " VALUES (?, ?, ?, ?)",
+                ("task-001", now.isoformat(), now.isoformat(), "RUNNING"),
+            )
+            await conn.commit()
+            store = SqliteEventStore(conn)
+            observed: list[Event] = []
+            store.set_append_listener(observed.append)
+
+            await store.append_event(_make_event("task-001", EventType.TASK_CREATED, now))
+            assert observed == []
+            await conn.rollback()
+            assert observed == []
+
+            committed = _make_event("task-001", EventType.TASK_CREATED, now)
+            await store.append_event(committed)
+            await conn.commit()
+            assert observed == [committed]
+        finally:
+            await conn.close()
+
+    @pytest.mark.asyncio
+    async def test_plain_connection_confirm_and_discard(
+        self, db_conn: aiosqlite.Connection, event_store: SqliteEventStore
+    ):
+        now = datetime.now(UTC)
+        observed: list[Event] = []
+        event_store.set_append_listener(observed.append)
+
+        await event_store.append_event(_make_event("task-001", EventType.TASK_CREATED, now))
+        await db_conn.rollback()
+        event_store.discard_task_seq(["task-001"])
+
+        committed = await event_store.append_event_committed(
+            _make_event("task-001", EventType.TASK_CREATED, now), update_task_pointer=False
+        )
+        assert observed == [committed]
@@ -0,0 +1,328 @@
+"""TaskSeqAllocator / get_next_task_seq 缓存单元测试
+
+覆盖：懒加载只查一次 MAX、append 推进 high-water、versionable 独立写连接写入同步、
+同库 StoreGroup 共享分配器、外部写入冲突后重同步（含裸 append_event）、加载期间写入合并、
+回滚丢弃（含未通知分配器的回滚）、store 写连接 commit / rollback 自动确认 / 丢弃、
+LRU 淘汰、关闭缓存。
+"""
+
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+
+import aiosqlite
+import pytest
+import pytest_asyncio
+import ulid
+from octoagent.core.models.enums import ActorType, EventType
+from octoagent.core.models.event import Event, EventCausality
+from octoagent.core.store import create_store_group
+from octoagent.core.store.event_store import SqliteEventStore
+from octoagent.core.store.sqlite_init import init_db
+from octoagent.core.store.task_seq_allocator import (
+    TaskSeqAllocator,
+    shared_task_seq_allocator,
+)
+from octoagent.core.store.transaction import append_event_only
+
+TASK_IDS = ["task-a", "task-b", "task-c"]
+
+
+def _make_event(task_id: str, task_seq: int) -> Event:
+    return Event(
+        event_id=str(ulid.ULID()),
+        task_id=task_id,
+        task_seq=task_seq,
+        ts=datetime(2026, 3, 3, tzinfo=UTC),
+        type=EventType.TASK_HEARTBEAT,
+        actor=ActorType.SYSTEM,
+        payload={},
+        trace_id="trace-test",
+        causality=EventCausality(),
+    )
+
+
+@pytest_asyncio.fixture
+async def db_path(tmp_path: Path) -> str:
+    path = str(tmp_path / "task_seq.db")
+    conn = await aiosqlite.connect(path)
+    await init_db(conn)
+    now = datetime.now(UTC).isoformat()
+    for task_id in TASK_IDS:
+        await conn.execute(
+            "INSERT INTO tasks (task_id, created_at, updated_at, status) VALUES (?, ?, ?, ?)",
+            (task_id, now, now, "RUNNING"),
+        )
+    await conn.commit()
+    await conn.close()
+    return path
+
+
+@pytest_asyncio.fixture
+async def conn(db_path: str):
+    connection = await aiosqlite.connect(db_path)
+    yield connection
+    await connection.close()
+
+
+@pytest_asyncio.fixture
+async def max_queries(conn: aiosqlite.Connection) -> list[str]:
+    statements: list[str] = []
+    await conn.set_trace_callback(
+        lambda sql: statements.append(sql) if "MAX(task_seq)" in sql else None
+    )
+    return statements
+
+
+class TestGetNextTaskSeq:
+    async def test_seeds_once_then_served_from_memory(
+        self, conn: aiosqlite.Connection, max_queries: list[str]
+    ):
+        store = SqliteEventStore(conn)
+        for expected in range(1, 6):
+            seq = await store.get_next_task_seq(TASK_IDS[0])
+            assert seq == expected
+            await store.append_event_committed(_make_event(TASK_IDS[0], seq))
+
+        assert len(max_queries) == 1
+        assert store.task_seq_stats.hits == 4
+
+    async def test_peek_does_not_reserve(self, conn: aiosqlite.Connection):
+        """取号后未写入不会留下空洞（与 MAX+1 语义一致）"""
+        store = SqliteEventStore(conn)
+        assert await store.get_next_task_seq(TASK_IDS[0]) == 1
+        assert await store.get_next_task_seq(TASK_IDS[0]) == 1
+
+    async def test_versionable_connection_writes_advance_allocator(
+        self, conn: aiosqlite.Connection, db_path: str, max_queries: list[str]
+    ):
+        store = SqliteEventStore(conn)
+        await store.append_event_committed(_make_event(TASK_IDS[0], 1))
+        assert await store.get_next_task_seq(TASK_IDS[0]) == 2
+
+        async with aiosqlite.connect(db_path, isolation_level=None) as versionable:
+            await store.append_event_committed(_make_event(TASK_IDS[0], 2), conn=versionable)
+
+        assert await store.get_next_task_seq(TASK_IDS[0]) == 3
+        assert len(max_queries) == 1
+
+    async def test_external_writer_conflict_resyncs(
+        self, conn: aiosqlite.Connection, db_path: str
+    ):
+        """未经本实例的写入导致冲突时，丢弃缓存并按 DB MAX+1 重试"""
+        store = SqliteEventStore(conn)
+        assert await store.get_next_task_seq(TASK_IDS[0]) == 1
+
+        async with aiosqlite.connect(db_path) as other:
+            other_store = SqliteEventStore(other)
+            await other_store.append_event_committed(_make_event(TASK_IDS[0], 1))
+            await other_store.append_event_committed(_make_event(TASK_IDS[0], 2))
+
+        stale = await store.get_next_task_seq(TASK_IDS[0])
+        written = await store.append_event_committed(_make_event(TASK_IDS[0], stale))
+
+        assert written.task_seq == 3
+        assert await store.get_next_task_seq(TASK_IDS[0]) == 4
+
+    async def test_raw_append_conflict_resyncs(self, conn: aiosqlite.Connection, db_path: str):
+        """不经 append_event_committed 的裸 append（transaction helper）同样按 DB MAX 重试"""
+        store = SqliteEventStore(conn)
+        assert await store.get_next_task_seq(TASK_IDS[0]) == 1
+
+        async with aiosqlite.connect(db_path) as other:
+            other_store = SqliteEventStore(other)
+            await other_store.append_event_committed(_make_event(TASK_IDS[0], 1))
+            await other_store.append_event_committed(_make_event(TASK_IDS[0], 2))
+
+        event = _make_event(TASK_IDS[0], await store.get_next_task_seq(TASK_IDS[0]))
+        await append_event_only(conn, store, event)
+
+        assert event.task_seq == 3
+        assert await store.get_next_task_seq(TASK_IDS[0]) == 4
+
+    async def test_store_groups_on_same_db_share_allocator(
+        self, db_path: str, tmp_path: Path
+    ):
+        """临时打开的 StoreGroup 写入同一库时，主 StoreGroup 的分配器同步推进"""
+        main = await create_store_group(db_path, tmp_path / "artifacts")
+        side = await create_store_group(db_path, tmp_path / "artifacts")
+        try:
+            assert await main.event_store.get_next_task_seq(TASK_IDS[0]) == 1
+            await side.event_store.append_event_committed(_make_event(TASK_IDS[0], 1))
+            await side.event_store.append_event_committed(_make_event(TASK_IDS[0], 2))
+
+            assert await main.event_store.get_next_task_seq(TASK_IDS[0]) == 3
+            assert main.event_store.task_seq_stats is side.event_store.task_seq_stats
+        finally:
+            await side.close()
+            await main.close()
+
+    async def test_rollback_discards_high_water(self, conn: aiosqlite.Connection):
+        store = SqliteEventStore(conn)
+        await store.append_event_committed(_make_event(TASK_IDS[0], 1))
+
+        await store.append_event(_make_event(TASK_IDS[0], 2))
+        assert await store.get_next_task_seq(TASK_IDS[0]) == 3
+        await conn.rollback()
+        store.discard_task_seq([TASK_IDS[0]])
+
+        assert await store.get_next_task_seq(TASK_IDS[0]) == 2
+
+    async def test_unreported_rollback_leaves_no_gap(self, conn: aiosqlite.Connection):
+        """调用方回滚后未通知分配器：未提交写入推进的 high-water 不会留下空洞"""
+        store = SqliteEventStore(conn)
+        await store.append_event_committed(_make_event(TASK_IDS[0], 1))
+
+        await store.append_event(_make_event(TASK_IDS[0], 2))
+        assert await store.get_next_task_seq(TASK_IDS[0]) == 3
+        await conn.rollback()
+
+        assert await store.get_next_task_seq(TASK_IDS[0]) == 2
+
+    async def test_store_connection_rollback_discards_without_notification(
+        self, db_path: str, tmp_path: Path
+    ):
+        """store 写连接直接 rollback 即丢弃缓存，即使随后立刻开启新事务"""
+        group = await create_store_group(db_path, tmp_path / "artifacts")
+        try:
+            store = group.event_store
+            await store.append_event_committed(_make_event(TASK_IDS[0], 1))
+            assert await store.get_next_task_seq(TASK_IDS[0]) == 2
+            await store.append_event(_make_event(TASK_IDS[0], 2))
+            await group.conn.rollback()
+            await group.conn.execute(
+                "UPDATE tasks SET updated_at = updated_at WHERE task_id = ?",
+                (TASK_IDS[1],),
+            )
+
+            assert group.conn.in_transaction
+            assert await store.get_next_task_seq(TASK_IDS[0]) == 2
+        finally:
+            await group.close()
+
+    async def test_store_connection_commit_confirms_without_notification(
+        self, db_path: str, tmp_path: Path
+    ):
+        group = await create_store_group(db_path, tmp_path / "artifacts")
+        try:
+            store = group.event_store
+            await store.append_event_committed(_make_event(TASK_IDS[0], 1))
+            assert await store.get_next_task_seq(TASK_IDS[0]) == 2
+            await store.append_event(_make_event(TASK_IDS[0], 2))
+            await group.conn.commit()
+            seeds = store.task_seq_stats.seeds
+
+            assert await store.get_next_task_seq(TASK_IDS[0]) == 3
+            assert store.task_seq_stats.seeds == seeds
+        finally:
+            await group.close()
+
+    async def test_confirmed_commit_served_from_memory(
+        self, conn: aiosqlite.Connection, max_queries: list[str]
+    ):
+        store = SqliteEventStore(conn)
+        await store.append_event_committed(_make_event(TASK_IDS[0], 1))
+
+        await store.append_event(_make_event(TASK_IDS[0], 2))
+        await conn.commit()
+        store.confirm_task_seq()
+
+        assert await store.get_next_task_seq(TASK_IDS[0]) == 3
+        assert len(max_queries) == 1
+
+    async def test_transaction_helper_failure_discards(self, conn: aiosqlite.Connection):
+        store = SqliteEventStore(conn)
+        first = await store.append_event_committed(_make_event(TASK_IDS[0], 1))
+        duplicate = _make_event(TASK_IDS[0], 2)
+        duplicate.event_id = first.event_id
+
+        with pytest.raises(aiosqlite.IntegrityError):
+            await append_event_only(conn, store, duplicate)
+
+        assert await store.get_next_task_seq(TASK_IDS[0]) == 2
+
+    async def test_delete_events_discards(self, conn: aiosqlite.Connection):
+        store = SqliteEventStore(conn)
+        await store.append_event_committed(_make_event(TASK_IDS[0], 1))
+        await store.delete_events_by_task_ids([TASK_IDS[0]])
+        await conn.commit()
+
+        assert await store.get_next_task_seq(TASK_IDS[0]) == 1
+
+    async def test_cache_disabled_queries_every_time(
+        self, conn: aiosqlite.Connection, max_queries: list[str]
+    ):
+        store = SqliteEventStore(conn, task_seq_cache_size=0)
+        await store.get_next_task_seq(TASK_IDS[0])
+        await store.get_next_task_seq(TASK_IDS[0])
+
+        assert len(max_queries) == 2
+
+
+@dataclass(eq=False)
+class _FakeConnection:
+    in_transaction: bool = True
+
+
+class TestTaskSeqAllocator:
+    def test_observe_during_seed_is_merged(self):
+        """MAX 查询读到旧快照时，加载期间观察到的写入不丢失"""
+        allocator = TaskSeqAllocator()
+        allocator.begin_seed("task-a")
+        allocator.observe("task-a", 7)
+
+        assert allocator.finish_seed("task-a", 5) == 8
+        assert allocator.peek_next("task-a") == 8
+
+    def test_observe_ignores_unknown_task(self):
+        allocator = TaskSeqAllocator()
+        allocator.observe("task-a", 3)
+
+        assert allocator.peek_next("task-a") is None
+
+    def test_lru_evicts_idle_tasks(self):
+        allocator = TaskSeqAllocator(capacity=2)
+        allocator.finish_seed("task-a", 1)
+        allocator.finish_seed("task-b", 1)
+        allocator.peek_next("task-a")
+        allocator.finish_seed("task-c", 1)
+
+        assert allocator.peek_next("task-b") is None
+        assert allocator.peek_next("task-a") == 2
+        assert len(allocator) == 2
+        assert allocator.stats.evictions == 1
+
+    def test_rollback_discards_only_uncommitted_on_connection(self):
+        allocator = TaskSeqAllocator()
+        writer, other = _FakeConnection(), _FakeConnection()
+        allocator.finish_seed("task-a", 1)
+        allocator.finish_seed("task-b", 1)
+        allocator.observe("task-a", 2, writer)
+        allocator.observe("task-b", 2, other)
+
+        allocator.discard_uncommitted(writer)
+
+        assert allocator.peek_next("task-a") is None
+        assert allocator.peek_next("task-b") == 3
+
+    def test_confirm_keeps_committed_high_water(self):
+        allocator = TaskSeqAllocator()
+        writer = _FakeConnection()
+        allocator.finish_seed("task-a", 1)
+        allocator.observe("task-a", 2, writer)
+
+        allocator.confirm(writer)
+        writer.in_transaction = False
+        allocator.discard_uncommitted(writer)
+
+        assert allocator.peek_next("task-a") == 3
+
+    def test_shared_allocator_keyed_by_db_path(self, tmp_path: Path):
+        path = tmp_path / "shared.db"
+        allocator = shared_task_seq_allocator(path)
+
+        assert shared_task_seq_allocator(str(path)) is allocator
+        assert shared_task_seq_allocator(tmp_path / "other.db") is not allocator
+        assert shared_task_seq_allocator(":memory:") is not shared_task_seq_allocator(
+            ":memory:"
+        )
@@ -108,9 +108,19 @@ class SqliteMemoryBackend(MemoryBackend):
         if policy.allow_vault:
             vault_records = await self._store.search_vault(scope_id, query=query, limit=limit)
 
-        hits = [self._to_sor_hit(item) for item in sor_records]
-        hits.extend(self._to_fragment_hit(item) for item in fragment_records)
-        hits.extend(self._to_vault_hit(item) for item in vault_records)
+        sor_hits = [self._to_sor_hit(item) for item in sor_records]
+        fragment_hits = [self._to_fragment_hit(item) for item in fragment_records]
+        vault_hits = [self._to_vault_hit(item) for item in vault_records]
+        if query:
+            # 带 query 时各层已按全文相关度排序：按层内名次交错合并，同名次再按时间
+            ranked = [
+                (position, hit)
+                for layer_hits in (sor_hits, fragment_hits, vault_hits)
+                for position, hit in enumerate(layer_hits)
+            ]
+            ranked.sort(key=lambda item: (item[0], -item[1].created_at.timestamp()))
+            return [hit for _, hit in ranked[:limit]]
+        hits = [*sor_hits, *fragment_hits, *vault_hits]
         hits.sort(key=lambda item: item.created_at, reverse=True)
         return hits[:limit]
 
@@ -0,0 +1,215 @@
+"""Memory 全文索引（SQLite FTS5）。
+
+memory_sor / memory_fragments / memory_vault 各有一张 FTS5 影子表（record_id 关联主键），
+search_sor / list_fragments / search_vault 带 query 时走 MATCH + BM25 排序，替代
+`LIKE '%q%'` 全 scope 扫描。
+
+- 分词：FTS5 内置 unicode61；默认 `cjk_bigram` 选项在写入索引前把连续 CJK 字符
+  切成重叠二元组（与 recall 的 `_expand_recall_queries` 关键词粒度一致），
+  使中文子串查询可走索引；`unicode61` 选项不做预处理
+- 同步：由 SqliteMemoryStore 的写方法在同一事务内写入（分词在 Python 侧完成，
+  无法用 SQLite trigger 表达）；主表只有 INSERT 会改变文本，status / metadata
+  更新不影响索引
+- 迁移：init_memory_db 建表后检查 memory_fts_state，首次启用或分词选项变更时
+  分页回填已有数据
+- 查询：拉丁词按前缀匹配、CJK 串按二元组短语匹配，多个词 AND；查询无法转成
+  可索引的词（如单个汉字）或 SQLite 未编译 FTS5 时，调用方退回 LIKE 扫描；FTS 零命中时
+  调用方同样退回 LIKE（保留拉丁词中子串匹配，如 `ocker` 命中 `docker`）
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from datetime import UTC, datetime
+
+import aiosqlite
+
+FTS_TOKENIZER_CJK_BIGRAM = "cjk_bigram"
+FTS_TOKENIZER_UNICODE61 = "unicode61"
+FTS_TOKENIZERS = (FTS_TOKENIZER_CJK_BIGRAM, FTS_TOKENIZER_UNICODE61)
+DEFAULT_FTS_TOKENIZER = FTS_TOKENIZER_CJK_BIGRAM
+
+#: 回填每页行数
+_BACKFILL_PAGE_SIZE = 2000
+
+# CJK 统一表意文字（含扩展 A / 兼容区）、日文假名、韩文音节
+_CJK_RUN = re.compile(r"[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff]+")
+# unicode61 的 token 字符：字母数字（下划线与标点为分隔符）
+_WORD = re.compile(r"[^\W_]+")
+
+
+@dataclass(frozen=True, slots=True)
+class FtsSource:
+    """主表 -> FTS 表映射（subject 列权重高于正文）"""
+
+    table: str
+    fts_table: str
+    id_column: str
+    subject_column: str | None
+    body_column: str
+
+
+FTS_SOURCES: dict[str, FtsSource] = {
+    "memory_sor": FtsSource("memory_sor", "memory_sor_fts", "memory_id", "subject_key", "content"),
+    "memory_fragments": FtsSource(
+        "memory_fragments", "memory_fragments_fts", "fragment_id", None, "content"
+    ),
+    "memory_vault": FtsSource(
+        "memory_vault", "memory_vault_fts", "vault_id", "subject_key", "summary"
+    ),
+}
+
+#: bm25 列权重：record_id（UNINDEXED）/ subject / body
+BM25_WEIGHTS = "0.0, 2.0, 1.0"
+
+_FTS_STATE_DDL = """
+CREATE TABLE IF NOT EXISTS memory_fts_state (
+    fts_table   TEXT PRIMARY KEY,
+    tokenizer   TEXT NOT NULL,
+    indexed_at  TEXT NOT NULL
+);
+"""
+
+
+def to_fts_text(text: str, tokenizer: str) -> str:
+    """把原文转成写入 FTS 的文本（cjk_bigram：CJK 串展开为重叠二元组）"""
+    if tokenizer != FTS_TOKENIZER_CJK_BIGRAM or not text:
+        return text
+    return _CJK_RUN.sub(lambda m: f" {' '.join(_bigrams(m.group(0)))} ", text)
+
+
+def build_match_query(query: str, tokenizer: str) -> str | None:
+    """把用户查询转成 FTS5 MATCH 表达式；无法走索引时返回 None（调用方退回 LIKE）"""
+    terms: list[str] = []
+    position = 0
+    for match in _CJK_RUN.finditer(query):
+        terms.extend(_word_terms(query[position : match.start()]))
+        run = match.group(0)
+        if tokenizer == FTS_TOKENIZER_CJK_BIGRAM:
+            if len(run) < 2:
+                # 单字不在索引中（索引只含二元组）
+                return None
+            terms.append(_quote(" ".join(_bigrams(run))))
+        else:
+            # unicode61 把整段 CJK 视为一个 token，只能前缀匹配整段
+            terms.append(f"{_quote(run)}*")
+        position = match.end()
+    terms.extend(_word_terms(query[position:]))
+    if not terms:
+        return None
+    return " AND ".join(dict.fromkeys(terms))
+
+
+async def fts_available(conn: aiosqlite.Connection) -> str | None:
+    """返回已建好的 FTS 分词选项；FTS 未初始化（或未回填完成）返回 None"""
+    try:
+        cursor = await conn.execute(
+            "SELECT tokenizer FROM memory_fts_state WHERE fts_table = ?",
+            (FTS_SOURCES["memory_sor"].fts_table,),
+        )
+    except aiosqlite.OperationalError:
+        return None
+    row = await cursor.fetchone()
+    return str(row[0]) if row else None
+
+
+async def index_record(
+    conn: aiosqlite.Connection,
+    source: FtsSource,
+    *,
+    record_id: str,
+    subject: str,
+    body: str,
+    tokenizer: str,
+) -> None:
+    """写入单条索引（不提交，随调用方事务）"""
+    await conn.execute(
+        f"INSERT INTO {source.fts_table} (record_id, subject, body) VALUES (?, ?, ?)",
+        (record_id, to_fts_text(subject, tokenizer), to_fts_text(body, tokenizer)),
+    )
+
+
+async def ensure_memory_fts(
+    conn: aiosqlite.Connection,
+    *,
+    tokenizer: str = DEFAULT_FTS_TOKENIZER,
+) -> bool:
+    """建 FTS 表并在首次启用 / 分词选项变更时回填（不提交）
+
+    Returns:
+        FTS 是否可用（SQLite 未编译 FTS5 时返回 False，搜索退回 LIKE）
+    """
+    if tokenizer not in FTS_TOKENIZERS:
+        raise ValueError(f"unknown memory FTS tokenizer: {tokenizer}")
+    try:
+        for source in FTS_SOURCES.values():
+            await conn.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {source.fts_table} USING fts5("
+                "record_id UNINDEXED, subject, body, tokenize='unicode61')"
+            )
+    except aiosqlite.OperationalError as exc:
+        if "fts5" in str(exc):
+            return False
+        raise
+    await conn.execute(_FTS_STATE_DDL)
+
+    cursor = await conn.execute("SELECT fts_table, tokenizer FROM memory_fts_state")
+    state = {str(row[0]): str(row[1]) for row in await cursor.fetchall()}
+    for source in FTS_SOURCES.values():
+        if state.get(source.fts_table) == tokenizer:
+            continue
+        await _backfill(conn, source, tokenizer)
+        await conn.execute(
+            """
+            INSERT INTO memory_fts_state (fts_table, tokenizer, indexed_at)
+            VALUES (?, ?, ?)
+            ON CONFLICT(fts_table) DO UPDATE SET
+                tokenizer = excluded.tokenizer,
+                indexed_at = excluded.indexed_at
+            """,
+            (source.fts_table, tokenizer, datetime.now(UTC).isoformat()),
+        )
+    return True
+
+
+async def _backfill(conn: aiosqlite.Connection, source: FtsSource, tokenizer: str) -> None:
+    """清空并按主表 rowid 分页重建索引"""
+    await conn.execute(f"DELETE FROM {source.fts_table}")
+    subject_expr = source.subject_column or "''"
+    last_rowid = 0
+    while True:
+        cursor = await conn.execute(
+            f"SELECT rowid, {source.id_column}, {subject_expr}, {source.body_column} "
+            f"FROM {source.table} WHERE rowid > ? ORDER BY rowid LIMIT ?",
+            (last_rowid, _BACKFILL_PAGE_SIZE),
+        )
+        rows = await cursor.fetchall()
+        if not rows:
+            return
+        await conn.executemany(
+            f"INSERT INTO {source.fts_table} (record_id, subject, body) VALUES (?, ?, ?)",
+            [
+                (
+                    row[1],
+                    to_fts_text(str(row[2] or ""), tokenizer),
+                    to_fts_text(str(row[3] or ""), tokenizer),
+                )
+                for row in rows
+            ],
+        )
+        last_rowid = int(rows[-1][0])
+
+
+def _bigrams(run: str) -> list[str]:
+    if len(run) < 2:
+        return [run]
+    return [run[i : i + 2] for i in range(len(run) - 1)]
+
+
+def _word_terms(text: str) -> list[str]:
+    return [f"{_quote(word.lower())}*" for word in _WORD.findall(text)]
+
+
+def _quote(term: str) -> str:
+    return '"' + term.replace('"', '""') + '"'
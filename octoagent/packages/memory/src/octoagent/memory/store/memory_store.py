@@ -31,6 +31,14 @@ from ..models import (
     VaultRetrievalAuditRecord,
     WriteProposal,
 )
+from .fts import (
+    BM25_WEIGHTS,
+    FTS_SOURCES,
+    FtsSource,
+    build_match_query,
+    fts_available,
+    index_record,
+)
 
 
 class MemoryStoreConflictError(RuntimeError):
@@ -43,6 +51,8 @@ class SqliteMemoryStore:
     def __init__(self, conn: aiosqlite.Connection) -> None:
         conn.row_factory = aiosqlite.Row
         self._conn = conn
+        # FTS 分词选项（memory_fts_state 懒加载，只缓存可用结果；None 时下次访问重新探测）
+        self._fts_tokenizer: str | None = None
 
     async def save_proposal(self, proposal: WriteProposal) -> None:
         await self._conn.execute(
@@ -169,6 +179,12 @@ class SqliteMemoryStore:
                 fragment.created_at.isoformat(),
             ),
         )
+        await self._index_fts(
+            FTS_SOURCES["memory_fragments"],
+            record_id=fragment.fragment_id,
+            subject="",
+            body=fragment.content,
+        )
 
     async def get_fragment(self, fragment_id: str) -> FragmentRecord | None:
         cursor = await self._conn.execute(
@@ -201,15 +217,22 @@ class SqliteMemoryStore:
         query: str | None = None,
         limit: int = 10,
     ) -> list[FragmentRecord]:
-        sql = "SELECT * FROM memory_fragments WHERE scope_id = ?"
-        params: list[object] = [scope_id]
-        if query:
-            sql += " AND content LIKE ?"
-            params.append(f"%{query}%")
-        sql += " ORDER BY created_at DESC LIMIT ?"
-        params.append(limit)
-        cursor = await self._conn.execute(sql, tuple(params))
-        rows = await cursor.fetchall()
+        for match in await self._fts_attempts(query):
+            if match is not None:
+                sql, params = self._fts_select(FTS_SOURCES["memory_fragments"], match)
+            else:
+                sql, params = "SELECT * FROM memory_fragments WHERE 1 = 1", []
+            sql += " AND scope_id = ?"
+            params.append(scope_id)
+            if query and match is None:
+                sql += " AND content LIKE ?"
+                params.append(f"%{query}%")
+            sql += self._order_by(match, "created_at")
+            params.append(limit)
+            cursor = await self._conn.execute(sql, tuple(params))
+            rows = await cursor.fetchall()
+            if rows:
+                break
         return [self._row_to_fragment(row) for row in rows]
 
     async def update_fragment_metadata(self, fragment_id: str, metadata: dict) -> None:
@@ -250,6 +273,12 @@ class SqliteMemoryStore:
                     f"scope={record.scope_id} subject_key={record.subject_key} 已存在 current"
                 ) from exc
             raise
+        await self._index_fts(
+            FTS_SOURCES["memory_sor"],
+            record_id=record.memory_id,
+            subject=record.subject_key,
+            body=record.content,
+        )
 
     async def get_sor(self, memory_id: str) -> SorRecord | None:
         cursor = await self._conn.execute(
@@ -355,6 +384,12 @@ class SqliteMemoryStore:
                 record.created_at.isoformat(),
             ),
         )
+        await self._index_fts(
+            FTS_SOURCES["memory_vault"],
+            record_id=record.vault_id,
+            subject=record.subject_key,
+            body=record.summary,
+        )
 
     async def get_vault(self, vault_id: str) -> VaultRecord | None:
         cursor = await self._conn.execute(
@@ -508,39 +543,46 @@ class SqliteMemoryStore:
         updated_after: str = "",
         updated_before: str = "",
     ) -> list[SorRecord]:
-        sql = "SELECT * FROM memory_sor WHERE scope_id = ?"
-        params: list[object] = [scope_id]
-        if not include_history:
-            # 如果指定了 status 则按指定值过滤，否则默认只看 current
-            if status:
+        for match in await self._fts_attempts(query):
+            if match is not None:
+                sql, params = self._fts_select(FTS_SOURCES["memory_sor"], match)
+            else:
+                sql, params = "SELECT * FROM memory_sor WHERE 1 = 1", []
+            sql += " AND scope_id = ?"
+            params.append(scope_id)
+            if not include_history:
+                # 如果指定了 status 则按指定值过滤，否则默认只看 current
+                if status:
+                    sql += " AND status = ?"
+                    params.append(status)
+                else:
+                    sql += " AND status = 'current'"
+            elif status:
+                # include_history=True 时也可以按 status 筛选
                 sql += " AND status = ?"
                 params.append(status)
-            else:
-                sql += " AND status = 'current'"
-        elif status:
-            # include_history=True 时也可以按 status 筛选
-            sql += " AND status = ?"
-            params.append(status)
-        if partition:
-            sql += " AND partition = ?"
-            params.append(partition)
-        if query:
-            sql += " AND (subject_key LIKE ? OR content LIKE ?)"
-            params.extend([f"%{query}%", f"%{query}%"])
-        if updated_after:
-            sql += " AND updated_at >= ?"
-            params.append(updated_after)
-        if updated_before:
-            sql += " AND updated_at <= ?"
-            params.append(updated_before)
-        # derived_type 存储在 metadata JSON 中，通过 JSON 提取过滤
-        if derived_type:
-            sql += " AND json_extract(metadata, '$.derived_type') = ?"
-            params.append(derived_type)
-        sql += " ORDER BY updated_at DESC LIMIT ?"
-        params.append(limit)
-        cursor = await self._conn.execute(sql, tuple(params))
-        rows = await cursor.fetchall()
+            if partition:
+                sql += " AND partition = ?"
+                params.append(partition)
+            if query and match is None:
+                sql += " AND (subject_key LIKE ? OR content LIKE ?)"
+                params.extend([f"%{query}%", f"%{query}%"])
+            if updated_after:
+                sql += " AND updated_at >= ?"
+                params.append(updated_after)
+            if updated_before:
+                sql += " AND updated_at <= ?"
+                params.append(updated_before)
+            # derived_type 存储在 metadata JSON 中，通过 JSON 提取过滤
+            if derived_type:
+                sql += " AND json_extract(metadata, '$.derived_type') = ?"
+                params.append(derived_type)
+            sql += self._order_by(match, "updated_at")
+            params.append(limit)
+            cursor = await self._conn.execute(sql, tuple(params))
+            rows = await cursor.fetchall()
+            if rows:
+                break
         return [self._row_to_sor(row) for row in rows]
 
     async def search_vault(
@@ -550,15 +592,22 @@ class SqliteMemoryStore:
         query: str | None = None,
         limit: int = 10,
     ) -> list[VaultRecord]:
-        sql = "SELECT * FROM memory_vault WHERE scope_id = ?"
-        params: list[object] = [scope_id]
-        if query:
-            sql += " AND (subject_key LIKE ? OR summary LIKE ?)"
-            params.extend([f"%{query}%", f"%{query}%"])
-        sql += " ORDER BY created_at DESC LIMIT ?"
-        params.append(limit)
-        cursor = await self._conn.execute(sql, tuple(params))
-        rows = await cursor.fetchall()
+        for match in await self._fts_attempts(query):
+            if match is not None:
+                sql, params = self._fts_select(FTS_SOURCES["memory_vault"], match)
+            else:
+                sql, params = "SELECT * FROM memory_vault WHERE 1 = 1", []
+            sql += " AND scope_id = ?"
+            params.append(scope_id)
+            if query and match is None:
+                sql += " AND (subject_key LIKE ? OR summary LIKE ?)"
+                params.extend([f"%{query}%", f"%{query}%"])
+            sql += self._order_by(match, "created_at")
+            params.append(limit)
+            cursor = await self._conn.execute(sql, tuple(params))
+            rows = await cursor.fetchall()
+            if rows:
+                break
         return [self._row_to_vault(row) for row in rows]
 
     async def enqueue_sync_backlog(
@@ -1140,6 +1189,64 @@ class SqliteMemoryStore:
         rows = await cursor.fetchall()
         return [self._row_to_vault_retrieval_audit(row) for row in rows]
 
+    async def _fts_tokenizer_or_none(self) -> str | None:
+        # FTS 未初始化 / 回填未完成时不缓存：一次瞬时未命中不会让本实例永久退回 LIKE
+        # 并跳过索引写入（探测只是一次主键查询）
+        if self._fts_tokenizer is None:
+            self._fts_tokenizer = await fts_available(self._conn)
+        return self._fts_tokenizer
+
+    async def _index_fts(
+        self, source: FtsSource, *, record_id: str, subject: str, body: str
+    ) -> None:
+        tokenizer = await self._fts_tokenizer_or_none()
+        if tokenizer is None:
+            return
+        await index_record(
+            self._conn,
+            source,
+            record_id=record_id,
+            subject=subject,
+            body=body,
+            tokenizer=tokenizer,
+        )
+
+    async def _fts_attempts(self, query: str | None) -> list[str | None]:
+        """按顺序尝试的检索方式：FTS MATCH 表达式（可用时），再 None（LIKE 子串扫描）
+
+        FTS 对拉丁词只做前缀匹配（`ocker` 不命中 `docker`）；调用方 FTS 零命中时继续尝试
+        下一项退回 LIKE，保留原有的词中子串匹配，有命中即停止。
+        """
+        match = await self._fts_match(query)
+        return [None] if match is None else [match, None]
+
+    async def _fts_match(self, query: str | None) -> str | None:
+        """query 对应的 FTS MATCH 表达式；None = 无 query 或需退回 LIKE"""
+        if not query:
+            return None
+        tokenizer = await self._fts_tokenizer_or_none()
+        if tokenizer is None:
+            return None
+        return build_match_query(query, tokenizer)
+
+    @staticmethod
+    def _fts_select(source: FtsSource, match: str) -> tuple[str, list[object]]:
+        """主表 JOIN FTS 命中（带 bm25 分数 fts_rank，越小越相关）"""
+        sql = (
+            f"SELECT {source.table}.* FROM {source.table} JOIN ("
+            f"SELECT record_id, bm25({source.fts_table}, {BM25_WEIGHTS}) AS fts_rank "
+            f"FROM {source.fts_table} WHERE {source.fts_table} MATCH ?"
+            f") AS fts_hits ON fts_hits.record_id = {source.table}.{source.id_column} "
+            "WHERE 1 = 1"
+        )
+        return sql, [match]
+
+    @staticmethod
+    def _order_by(match: str | None, time_column: str) -> str:
+        if match is not None:
+            return f" ORDER BY fts_hits.fts_rank ASC, {time_column} DESC LIMIT ?"
+        return f" ORDER BY {time_column} DESC LIMIT ?"
+
     @staticmethod
     def _row_to_proposal(row: aiosqlite.Row) -> WriteProposal:
         return WriteProposal(
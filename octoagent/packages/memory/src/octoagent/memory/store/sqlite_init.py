@@ -2,6 +2,8 @@
 
 import aiosqlite
 
+from .fts import DEFAULT_FTS_TOKENIZER, ensure_memory_fts
+
 _FRAGMENTS_DDL = """
 CREATE TABLE IF NOT EXISTS memory_fragments (
     fragment_id    TEXT PRIMARY KEY,
@@ -393,8 +395,15 @@ async def _migrate_legacy_memory_tables(conn: aiosqlite.Connection) -> None:
         )
 
 
-async def init_memory_db(conn: aiosqlite.Connection) -> None:
-    """初始化 memory 相关 SQLite schema。"""
+async def init_memory_db(
+    conn: aiosqlite.Connection,
+    *,
+    fts_tokenizer: str = DEFAULT_FTS_TOKENIZER,
+) -> None:
+    """初始化 memory 相关 SQLite schema。
+
+    fts_tokenizer：全文索引分词选项（见 store.fts），变更后下次初始化时重建索引。
+    """
 
     await conn.execute("PRAGMA journal_mode = WAL;")
     await conn.execute("PRAGMA foreign_keys = ON;")
@@ -419,6 +428,9 @@ async def init_memory_db(conn: aiosqlite.Connection) -> None:
     for sql in _INDEXES:
         await conn.execute(sql)
 
+    # 全文索引：首次启用 / 分词选项变更时回填已有 SoR / fragment / vault
+    await ensure_memory_fts(conn, tokenizer=fts_tokenizer)
+
     await conn.commit()
 
 
@@ -0,0 +1,296 @@
+"""Memory 全文索引（FTS5）测试。
+
+覆盖：中文子串命中、BM25 相关度排序、旧库回填迁移、分词选项切换重建、
+单字查询退回 LIKE、拉丁词中子串零命中退回 LIKE、FTS 查询保持 scope / status 过滤、
+FTS 暂不可用后恢复时重新启用索引。
+"""
+
+import os
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import aiosqlite
+import pytest
+from octoagent.memory import (
+    EvidenceRef,
+    FragmentRecord,
+    MemoryPartition,
+    SorRecord,
+    VaultRecord,
+)
+from octoagent.memory.store import SqliteMemoryStore, init_memory_db
+from octoagent.memory.store.fts import (
+    FTS_TOKENIZER_CJK_BIGRAM,
+    FTS_TOKENIZER_UNICODE61,
+    build_match_query,
+    to_fts_text,
+)
+
+SCOPE = "memory/global"
+
+
+def _sor(idx: int, subject_key: str, content: str, *, updated_at: datetime | None = None):
+    ts = updated_at or datetime.now(UTC)
+    return SorRecord(
+        memory_id=f"01JSOR_FTS_{idx:016d}",
+        scope_id=SCOPE,
+        partition=MemoryPartition.WORK,
+        subject_key=subject_key,
+        content=content,
+        version=1,
+        evidence_refs=[EvidenceRef(ref_id=f"artifact-{idx}", ref_type="artifact")],
+        created_at=ts,
+        updated_at=ts,
+    )
+
+
+def _fragment(idx: int, content: str) -> FragmentRecord:
+    return FragmentRecord(
+        fragment_id=f"01JFRAG_FTS_{idx:016d}",
+        scope_id=SCOPE,
+        partition=MemoryPartition.WORK,
+        content=content,
+        evidence_refs=[],
+        created_at=datetime.now(UTC),
+    )
+
+
+class TestFtsText:
+    def test_cjk_runs_expand_to_bigrams(self):
+        assert to_fts_text("喜欢Python编程", FTS_TOKENIZER_CJK_BIGRAM).split() == [
+            "喜欢",
+            "Python",
+            "编程",
+        ]
+        assert to_fts_text("项目进度", FTS_TOKENIZER_CJK_BIGRAM).split() == [
+            "项目",
+            "目进",
+            "进度",
+        ]
+
+    def test_unicode61_keeps_text(self):
+        assert to_fts_text("项目进度", FTS_TOKENIZER_UNICODE61) == "项目进度"
+
+    def test_match_query(self):
+        assert build_match_query("项目进度", FTS_TOKENIZER_CJK_BIGRAM) == '"项目 目进 进度"'
+        assert build_match_query("Python 3", FTS_TOKENIZER_CJK_BIGRAM) == '"python"* AND "3"*'
+        # 单个汉字 / 纯标点无法走索引
+        assert build_match_query("猫", FTS_TOKENIZER_CJK_BIGRAM) is None
+        assert build_match_query("--", FTS_TOKENIZER_CJK_BIGRAM) is None
+
+
+class TestMemoryFtsSearch:
+    async def test_cjk_substring_hits_index(self, memory_store: SqliteMemoryStore):
+        await memory_store.insert_sor(_sor(1, "work.status", "本周的项目进度已经同步给老板"))
+        await memory_store.insert_sor(_sor(2, "work.other", "周末去爬山"))
+
+        results = await memory_store.search_sor(SCOPE, query="项目进度")
+
+        assert [item.memory_id for item in results] == [_sor(1, "", "").memory_id]
+
+    async def test_bm25_ranks_subject_and_frequency(self, memory_store: SqliteMemoryStore):
+        base = datetime.now(UTC)
+        # 较新但只在正文出现一次
+        await memory_store.insert_sor(
+            _sor(1, "misc.note", "顺便提到 deploy 一次", updated_at=base + timedelta(hours=1))
+        )
+        # 较旧但 subject 命中
+        await memory_store.insert_sor(
+            _sor(2, "deploy.checklist", "deploy 前检查 deploy 配置", updated_at=base)
+        )
+
+        results = await memory_store.search_sor(SCOPE, query="deploy")
+
+        assert [item.memory_id for item in results] == [
+            _sor(2, "", "").memory_id,
+            _sor(1, "", "").memory_id,
+        ]
+
+    async def test_fts_keeps_scope_and_status_filters(self, memory_store: SqliteMemoryStore):
+        await memory_store.insert_sor(_sor(1, "work.status", "项目进度正常"))
+        await memory_store.update_sor_status(
+            _sor(1, "", "").memory_id,
+            status="superseded",
+            updated_at=datetime.now(UTC).isoformat(),
+        )
+        other_scope = _sor(2, "work.status", "项目进度正常").model_copy(
+            update={"scope_id": "work/other"}
+        )
+        await memory_store.insert_sor(other_scope)
+
+        assert await memory_store.search_sor(SCOPE, query="项目进度") == []
+        history = await memory_store.search_sor(SCOPE, query="项目进度", include_history=True)
+        assert len(history) == 1
+
+    async def test_single_char_falls_back_to_like(self, memory_store: SqliteMemoryStore):
+        await memory_store.append_fragment(_fragment(1, "家里养了一只猫"))
+
+        results = await memory_store.list_fragments(SCOPE, query="猫")
+
+        assert len(results) == 1
+
+    async def test_latin_infix_falls_back_to_like(self, memory_store: SqliteMemoryStore):
+        """FTS 只做前缀匹配：词中子串零命中时退回 LIKE，保持原有子串语义"""
+        await memory_store.insert_sor(_sor(1, "infra.runtime", "生产环境使用 docker compose"))
+
+        results = await memory_store.search_sor(SCOPE, query="ocker")
+
+        assert [item.memory_id for item in results] == [_sor(1, "", "").memory_id]
+
+    async def test_vault_search_uses_index(self, memory_store: SqliteMemoryStore):
+        now = datetime.now(UTC)
+        await memory_store.insert_vault(
+            VaultRecord(
+                vault_id="01JVAULT_FTS_000000000001",
+                scope_id=SCOPE,
+                partition=MemoryPartition.HEALTH,
+                subject_key="health.allergy",
+                summary="对花生过敏",
+                content_ref="vault://01JVAULT_FTS_000000000001",
+                evidence_refs=[],
+                created_at=now,
+            )
+        )
+
+        results = await memory_store.search_vault(SCOPE, query="花生")
+
+        assert [item.vault_id for item in results] == ["01JVAULT_FTS_000000000001"]
+
+
+class TestMemoryFtsMigration:
+    async def test_backfills_existing_rows(self, memory_db_path: Path):
+        conn = await aiosqlite.connect(str(memory_db_path))
+        await init_memory_db(conn)
+        store = SqliteMemoryStore(conn)
+        await store.insert_sor(_sor(1, "work.status", "项目进度正常"))
+        # 模拟升级前的库：索引与状态表都不存在
+        await conn.execute("DROP TABLE memory_sor_fts")
+        await conn.execute("DROP TABLE memory_fts_state")
+        await conn.commit()
+        await conn.close()
+
+        conn = await aiosqlite.connect(str(memory_db_path))
+        try:
+            await init_memory_db(conn)
+            results = await SqliteMemoryStore(conn).search_sor(SCOPE, query="项目进度")
+            assert len(results) == 1
+        finally:
+            await conn.close()
+
+    async def test_tokenizer_switch_rebuilds_index(self, memory_db_path: Path):
+        conn = await aiosqlite.connect(str(memory_db_path))
+        try:
+            await init_memory_db(conn)
+            await SqliteMemoryStore(conn).insert_sor(_sor(1, "work.status", "项目进度正常"))
+            await conn.commit()
+
+            await init_memory_db(conn, fts_tokenizer=FTS_TOKENIZER_UNICODE61)
+            store = SqliteMemoryStore(conn)
+            # unicode61 把整段 CJK 视为一个 token：只能前缀匹配整段
+            assert len(await store.search_sor(SCOPE, query="项目进度")) == 1
+            cursor = await conn.execute(
+                "SELECT body FROM memory_sor_fts WHERE record_id = ?",
+                (_sor(1, "", "").memory_id,),
+            )
+            assert (await cursor.fetchone())[0] == "项目进度正常"
+        finally:
+            await conn.close()
+
+    async def test_transient_fts_miss_is_not_cached(self, memory_conn: aiosqlite.Connection):
+        """FTS 状态暂缺时探测未命中，之后初始化完成的写入仍进索引"""
+        await memory_conn.execute("DROP TABLE memory_fts_state")
+        store = SqliteMemoryStore(memory_conn)
+        await store.search_sor(SCOPE, query="项目进度")
+
+        await init_memory_db(memory_conn)
+        await store.insert_sor(_sor(1, "work.status", "项目进度正常"))
+
+        cursor = await memory_conn.execute(
+            "SELECT COUNT(*) FROM memory_sor_fts WHERE record_id = ?",
+            (_sor(1, "", "").memory_id,),
+        )
+        assert (await cursor.fetchone())[0] == 1
+
+    async def test_unknown_tokenizer_rejected(self, memory_conn: aiosqlite.Connection):
+        with pytest.raises(ValueError):
+            await init_memory_db(memory_conn, fts_tokenizer="jieba")
+
+
+@pytest.mark.parametrize(
+    "row_count",
+    [
+        10_000,
+        pytest.param(
+            100_000,
+            marks=pytest.mark.skipif(
+                not os.environ.get("OCTOAGENT_MEMORY_FTS_BENCH"),
+                reason="10 万行基准耗时较长，需显式开启",
+            ),
+        ),
+    ],
+)
+async def test_fts_search_latency(tmp_path: Path, row_count: int):
+    """基准：FTS MATCH vs LIKE 扫描
+
+    默认仅跑 1 万行档位；OCTOAGENT_MEMORY_FTS_BENCH=1 追加 10 万行档位，
+    OCTOAGENT_MEMORY_FTS_BENCH_1M=1 追加 100 万行档位。
+    """
+    await _run_search_benchmark(tmp_path, row_count)
+
+
+@pytest.mark.skipif(
+    not os.environ.get("OCTOAGENT_MEMORY_FTS_BENCH_1M"),
+    reason="100 万行基准耗时较长，需显式开启",
+)
+async def test_fts_search_latency_1m(tmp_path: Path):
+    await _run_search_benchmark(tmp_path, 1_000_000)
+
+
+async def _run_search_benchmark(tmp_path: Path, row_count: int) -> None:
+    conn = await aiosqlite.connect(str(tmp_path / f"bench_{row_count}.db"))
+    try:
+        await init_memory_db(conn)
+        store = SqliteMemoryStore(conn)
+        now = datetime.now(UTC)
+        # 批量灌入：直接写主表后由 init_memory_db 的迁移路径回填索引
+        await conn.execute("DELETE FROM memory_fts_state")
+        await conn.executemany(
+            """
+            INSERT INTO memory_sor (
+                memory_id, scope_id, partition, subject_key, content, version, status,
+                metadata, evidence_refs, created_at, updated_at
+            ) VALUES (?, ?, 'work', ?, ?, 1, 'current', '{}', '[]', ?, ?)
+            """,
+            [
+                (
+                    f"bench-{i}",
+                    SCOPE,
+                    f"bench.subject.{i}",
+                    f"第 {i} 条记录 topic{i % 997} 日常笔记"
+                    + ("项目进度汇报" if i % 1000 == 0 else ""),
+                    now.isoformat(),
+                    now.isoformat(),
+                )
+                for i in range(row_count)
+            ],
+        )
+        await init_memory_db(conn)
+
+        started = time.perf_counter()
+        fts_hits = await store.search_sor(SCOPE, query="项目进度", limit=20)
+        fts_ms = (time.perf_counter() - started) * 1000
+
+        started = time.perf_counter()
+        cursor = await conn.execute(
+            "SELECT memory_id FROM memory_sor WHERE scope_id = ? AND content LIKE ? "
+            "ORDER BY updated_at DESC LIMIT 20",
+            (SCOPE, "%项目进度%"),
+        )
+        like_hits = await cursor.fetchall()
+        like_ms = (time.perf_counter() - started) * 1000
+
+        assert len(fts_hits) == len(like_hits) == min(20, row_count // 1000)
+        print(f"\nmemory fts rows={row_count} match={fts_ms:.1f}ms like={like_ms:.1f}ms")
+    finally:
+        await conn.close()
@@ -839,21 +839,21 @@ class ApprovalManager:
     async def _load_events_for_recovery(self) -> list[Any]:
         if self._event_store is None:
             return []
+        recovery_types = (
+            EventType.APPROVAL_REQUESTED,
+            EventType.APPROVAL_APPROVED,
+            EventType.APPROVAL_REJECTED,
+            EventType.APPROVAL_EXPIRED,
+        )
+        # 优先走流式 + SQL 侧类型过滤，非审批事件不做 payload 解码
+        iterator = getattr(self._event_store, "iter_all_events", None)
+        if callable(iterator):
+            return [e async for e in iterator(event_types=recovery_types)]
         getter = getattr(self._event_store, "get_all_events", None)
         if not callable(getter):
             return []
         events = await getter()
-        return [
-            e
-            for e in events
-            if e.type
-            in {
-                EventType.APPROVAL_REQUESTED,
-                EventType.APPROVAL_APPROVED,
-                EventType.APPROVAL_REJECTED,
-                EventType.APPROVAL_EXPIRED,
-            }
-        ]
+        return [e for e in events if e.type in recovery_types]
 
     def _approval_request_from_event(self, event: Any) -> ApprovalRequest | None:
         payload = event.payload if isinstance(event.payload, dict) else {}
@@ -73,6 +73,9 @@ from .model_request_gate import (
     set_allow_model_requests,
 )
 from .models import ModelCallResult, ReasoningConfig, TokenUsage
+
+# Prompt 前缀缓存断点标记（Gateway prompt 组装 → ProviderClient）
+from .prompt_cache import CACHE_BREAKPOINT_KEY, mark_cache_breakpoint
 from .provider_client import LLMCallError as ProviderLLMCallError
 from .provider_client import ProviderClient
 from .provider_router import ProviderRouter, ResolvedAlias
@@ -83,6 +86,14 @@ from .provider_runtime import ProviderRuntime
 # Feature 064: OAuth Token 刷新协调器
 from .refresh_coordinator import TokenRefreshCoordinator
 from .router_message_adapter import ProviderRouterMessageAdapter
+
+# 模型输出增量流式回调（SkillRunner → ProviderClient）
+from .streaming import (
+    DeltaCallback,
+    StreamDelta,
+    bind_delta_callback,
+    current_delta_callback,
+)
 from .transport import ProviderTransport
 
 __all__ = [
@@ -148,4 +159,12 @@ __all__ = [
     "ResolvedAlias",
     "ResolvedAuth",
     "StaticApiKeyResolver",
+    # 模型输出增量流式
+    "DeltaCallback",
+    "StreamDelta",
+    "bind_delta_callback",
+    "current_delta_callback",
+    # Prompt 前缀缓存
+    "CACHE_BREAKPOINT_KEY",
+    "mark_cache_breakpoint",
 ]
@@ -6,6 +6,8 @@
 """
 
 import contextlib
+from collections.abc import Iterable, Mapping
+from typing import Any
 
 import structlog
 
@@ -78,16 +80,47 @@ class CostTracker:
         try:
             usage = getattr(response, "usage", None)
             if usage is not None:
+                details = getattr(usage, "prompt_tokens_details", None)
                 return TokenUsage(
                     prompt_tokens=getattr(usage, "prompt_tokens", 0) or 0,
                     completion_tokens=getattr(usage, "completion_tokens", 0) or 0,
                     total_tokens=getattr(usage, "total_tokens", 0) or 0,
+                    cache_read_tokens=_int_attr(details, "cached_tokens")
+                    or _int_attr(usage, "cache_read_input_tokens"),
+                    cache_write_tokens=_int_attr(usage, "cache_creation_input_tokens"),
                 )
         except Exception as e:
             log.debug("parse_usage_failed", error=str(e))
 
         return TokenUsage()
 
+    @staticmethod
+    def summarize_usage(usages: Iterable[Mapping[str, Any]]) -> dict[str, Any]:
+        """汇总多次调用的 token_usage（事件 payload 形状），含 prompt 缓存命中率
+
+        Args:
+            usages: 每次模型调用的 token_usage dict
+
+        Returns:
+            calls / 各 token 合计 / cache_hit_ratio（缓存命中 token 占输入 token 比例）
+        """
+        totals = dict.fromkeys(_USAGE_KEYS, 0)
+        calls = 0
+        for usage in usages:
+            calls += 1
+            for key in _USAGE_KEYS:
+                value = usage.get(key, 0)
+                if isinstance(value, int) and value > 0:
+                    totals[key] += value
+        prompt_tokens = totals["prompt_tokens"]
+        return {
+            "calls": calls,
+            **totals,
+            "cache_hit_ratio": (
+                round(totals["cache_read_tokens"] / prompt_tokens, 4) if prompt_tokens else 0.0
+            ),
+        }
+
     @staticmethod
     def extract_model_info(response) -> tuple[str, str]:
         """从 LiteLLM 响应提取模型和 provider 信息
@@ -110,3 +143,20 @@ class CostTracker:
                 provider = hidden.get("custom_llm_provider", "") or ""
 
         return model_name, provider
+
+
+_USAGE_KEYS = (
+    "prompt_tokens",
+    "completion_tokens",
+    "total_tokens",
+    "cache_read_tokens",
+    "cache_write_tokens",
+)
+
+
+def _int_attr(obj: Any, name: str) -> int:
+    """只接受真实 int 属性（Mock / None / 缺失一律视为 0）"""
+    value = getattr(obj, name, None)
+    if isinstance(value, int) and not isinstance(value, bool) and value > 0:
+        return value
+    return 0
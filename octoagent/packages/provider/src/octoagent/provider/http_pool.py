@@ -0,0 +1,152 @@
+"""Provider HTTP 连接池：按 provider 独立的 httpx 客户端 + 池利用率计量。
+
+原先所有 ProviderClient 共用一个默认 limits 的 ``httpx.AsyncClient``：并发 agent
+loop 下一个繁忙 provider 会占满共享池，其它 provider 的请求跟着排队。本模块：
+
+- ``ProviderPoolConfig``：单个 provider 的池配置（由 Gateway 从 octoagent.yaml 注入，
+  不进 ``ProviderRoute`` 窄 DTO）
+- ``build_pooled_client()``：按 ``ProviderPoolConfig`` 构造独立客户端（最大连接数 /
+  keep-alive 上限与过期时间 / HTTP/2 多路复用）
+- ``MeteredTransport``：包装 ``httpx.AsyncHTTPTransport``，统计在途请求（直到
+  响应流关闭，覆盖 SSE 长连接）、峰值与累计请求数，并读取底层连接池的连接状态
+
+HTTP/2 依赖可选包 ``h2``（``httpx[http2]``）；未安装时降级 HTTP/1.1 并告警。
+"""
+
+from __future__ import annotations
+
+import importlib.util
+from typing import Any
+
+import httpx
+import structlog
+from pydantic import BaseModel, ConfigDict, Field
+
+log = structlog.get_logger()
+
+# httpx 默认值（与 httpx.Limits() 一致），未显式配置的字段沿用
+_DEFAULT_MAX_CONNECTIONS = 100
+_DEFAULT_MAX_KEEPALIVE = 20
+_DEFAULT_KEEPALIVE_EXPIRY_S = 5.0
+
+
+class ProviderPoolConfig(BaseModel):
+    """单个 provider 的 HTTP 连接池配置（None 字段沿用 httpx 默认值）。"""
+
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
+    max_connections: int | None = Field(default=None, ge=1)
+    max_keepalive_connections: int | None = Field(default=None, ge=0)
+    keepalive_expiry_s: float | None = Field(default=None, gt=0)
+    http2: bool = False
+    warmup: bool = False
+
+
+def http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+class _MeteredStream(httpx.AsyncByteStream):
+    """响应流关闭时归还在途计数（SSE 在整个流读完前都算在途）"""
+
+    def __init__(self, stream: httpx.AsyncByteStream, transport: MeteredTransport) -> None:
+        self._stream = stream
+        self._transport = transport
+        self._closed = False
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        if not self._closed:
+            self._closed = True
+            self._transport._release()
+        await self._stream.aclose()
+
+
+class MeteredTransport(httpx.AsyncBaseTransport):
+    """带计量的 HTTP transport（包装 httpx.AsyncHTTPTransport）"""
+
+    def __init__(self, *, limits: httpx.Limits, http2: bool = False) -> None:
+        self._inner = httpx.AsyncHTTPTransport(limits=limits, http2=http2)
+        self._limits = limits
+        self._http2 = http2
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.requests_total = 0
+        self.errors_total = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.in_flight += 1
+        self.requests_total += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            response = await self._inner.handle_async_request(request)
+        except BaseException:
+            self.errors_total += 1
+            self._release()
+            raise
+        assert isinstance(response.stream, httpx.AsyncByteStream)
+        response.stream = _MeteredStream(response.stream, self)
+        return response
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+    def _release(self) -> None:
+        self.in_flight = max(self.in_flight - 1, 0)
+
+    def stats(self) -> dict[str, Any]:
+        # httpcore 连接池只读快照（AsyncConnectionPool.connections 为公开属性）
+        connections = list(self._inner._pool.connections)
+        idle = sum(1 for conn in connections if conn.is_idle())
+        http2_conns = sum(1 for conn in connections if "HTTP/2" in conn.info())
+        max_connections = self._limits.max_connections
+        busy = len(connections) - idle
+        return {
+            "http2": self._http2,
+            "max_connections": max_connections,
+            "max_keepalive_connections": self._limits.max_keepalive_connections,
+            "keepalive_expiry_s": self._limits.keepalive_expiry,
+            "connections": len(connections),
+            "idle_connections": idle,
+            "http2_connections": http2_conns,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "requests_total": self.requests_total,
+            "errors_total": self.errors_total,
+            "utilization": round(busy / max_connections, 3) if max_connections else None,
+        }
+
+
+def build_pooled_client(
+    pool: ProviderPoolConfig | None,
+    *,
+    timeout: httpx.Timeout,
+    provider_id: str = "",
+) -> tuple[httpx.AsyncClient, MeteredTransport]:
+    """按池配置构造 httpx 客户端；pool=None 时使用 httpx 默认 limits"""
+    pool = pool or ProviderPoolConfig()
+    http2 = pool.http2
+    if http2 and not http2_available():
+        log.warning(
+            "provider_http2_unavailable",
+            provider_id=provider_id,
+            hint="未安装 h2（pip install 'httpx[http2]'），降级 HTTP/1.1",
+        )
+        http2 = False
+    limits = httpx.Limits(
+        max_connections=pool.max_connections or _DEFAULT_MAX_CONNECTIONS,
+        max_keepalive_connections=(
+            pool.max_keepalive_connections
+            if pool.max_keepalive_connections is not None
+            else _DEFAULT_MAX_KEEPALIVE
+        ),
+        keepalive_expiry=pool.keepalive_expiry_s or _DEFAULT_KEEPALIVE_EXPIRY_S,
+    )
+    transport = MeteredTransport(limits=limits, http2=http2)
+    return httpx.AsyncClient(timeout=timeout, transport=transport), transport
+
+
+__all__ = ["MeteredTransport", "ProviderPoolConfig", "build_pooled_client", "http2_available"]
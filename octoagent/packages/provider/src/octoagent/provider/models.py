@@ -3,9 +3,9 @@
 对齐 data-model.md SS2.1 / SS2.2，替代 M0 LLMResponse dataclass。
 """
 
-from typing import Literal
+from typing import Any, Literal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, SerializerFunctionWrapHandler, model_serializer
 
 # Codex / o-系列模型支持的 reasoning effort 级别
 ReasoningEffort = Literal["none", "low", "medium", "high", "xhigh"]
@@ -44,11 +44,23 @@ class TokenUsage(BaseModel):
 
     key 命名对齐 OpenAI/LiteLLM 行业标准：
     prompt_tokens / completion_tokens / total_tokens
+    cache_read_tokens / cache_write_tokens 为 prompt 缓存用量（已计入
+    prompt_tokens），为 0 时不序列化，保持事件 payload 旧形状
     """
 
     prompt_tokens: int = Field(default=0, ge=0, description="输入 token 数")
     completion_tokens: int = Field(default=0, ge=0, description="输出 token 数")
     total_tokens: int = Field(default=0, ge=0, description="总 token 数")
+    cache_read_tokens: int = Field(default=0, ge=0, description="命中 prompt 缓存的输入 token 数")
+    cache_write_tokens: int = Field(default=0, ge=0, description="写入 prompt 缓存的输入 token 数")
+
+    @model_serializer(mode="wrap")
+    def _omit_zero_cache_fields(self, handler: SerializerFunctionWrapHandler) -> dict[str, Any]:
+        data = handler(self)
+        for key in ("cache_read_tokens", "cache_write_tokens"):
+            if not data.get(key):
+                data.pop(key, None)
+        return data
 
 
 class ModelCallResult(BaseModel):
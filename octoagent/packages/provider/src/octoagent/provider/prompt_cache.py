@@ -0,0 +1,61 @@
+"""Provider 侧 prompt 前缀缓存（prompt caching）约定。
+
+Gateway 按易变程度组装 system blocks（稳定块在前、每轮变化的块在后），并在
+稳定块的 message 上打 ``cache_control`` 标记（值为 ``"ephemeral"``，与
+``dict[str, str]`` message 形状兼容）。标记沿 LLMService / ProviderModelClient
+原样透传到 ``ProviderClient``：
+
+- Anthropic Messages：标记块转成带 ``cache_control`` 的 system text block，并在
+  最后一条消息上追加一个滚动断点（agent 多步循环复用整段对话前缀）
+- OpenAI Chat / Responses：服务端自动前缀缓存，只需稳定前缀；标记在请求前剥离
+
+各 transport 回传的缓存命中 / 写入 token 统一记为 ``token_usage`` 的
+``cache_read_tokens`` / ``cache_write_tokens``（为 0 时不写，保持旧字段形状）。
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any
+
+CACHE_BREAKPOINT_KEY = "cache_control"
+CACHE_BREAKPOINT_EPHEMERAL = "ephemeral"
+# Anthropic 单请求最多 4 个 cache_control 断点
+MAX_CACHE_BREAKPOINTS = 4
+
+
+def mark_cache_breakpoint(message: dict[str, str]) -> dict[str, str]:
+    """在 message 上标记缓存断点（断点之前的前缀可被 provider 缓存）。"""
+    message[CACHE_BREAKPOINT_KEY] = CACHE_BREAKPOINT_EPHEMERAL
+    return message
+
+
+def has_cache_breakpoint(message: Mapping[str, Any]) -> bool:
+    return bool(message.get(CACHE_BREAKPOINT_KEY))
+
+
+def strip_cache_breakpoint(message: dict[str, Any]) -> dict[str, Any]:
+    """返回去掉断点标记的 message（不支持该字段的 provider 会拒绝未知 key）。"""
+    if CACHE_BREAKPOINT_KEY not in message:
+        return message
+    return {key: value for key, value in message.items() if key != CACHE_BREAKPOINT_KEY}
+
+
+def cache_usage(*, read: Any = 0, write: Any = 0) -> dict[str, int]:
+    """构造 token_usage 的缓存字段（非正整数视为 0，为 0 的字段不输出）。"""
+    fields: dict[str, int] = {}
+    for key, value in (("cache_read_tokens", read), ("cache_write_tokens", write)):
+        if isinstance(value, int) and not isinstance(value, bool) and value > 0:
+            fields[key] = value
+    return fields
+
+
+__all__ = [
+    "CACHE_BREAKPOINT_EPHEMERAL",
+    "CACHE_BREAKPOINT_KEY",
+    "MAX_CACHE_BREAKPOINTS",
+    "cache_usage",
+    "has_cache_breakpoint",
+    "mark_cache_breakpoint",
+    "strip_cache_breakpoint",
+]
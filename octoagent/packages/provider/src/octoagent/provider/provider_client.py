@@ -28,7 +28,15 @@ import structlog
 
 from .auth_resolver import ResolvedAuth
 from .model_request_gate import check_model_requests_allowed
+from .prompt_cache import (
+    MAX_CACHE_BREAKPOINTS,
+    cache_usage,
+    has_cache_breakpoint,
+    strip_cache_breakpoint,
+)
 from .provider_runtime import ProviderRuntime
+from .rate_governor import RateLimitGovernor
+from .streaming import DeltaCallback, DeltaTap
 from .transport import ProviderTransport
 
 log = structlog.get_logger()
@@ -62,6 +70,9 @@ class LLMCallError(Exception):
         context_overflow   — 上下文超长，不可重试需压缩
         empty_input        — Responses API input 被过滤为空，不可重试
         api_error          — 其他 API 错误（含 401，由 status_code 区分）
+
+    paced_by_governor：429 已被 provider 共享限流治理器记录（冷却 / 降速在下次
+    发送前统一生效），调用方无需再叠加自己的退避。
     """
 
     def __init__(
@@ -76,6 +87,7 @@ class LLMCallError(Exception):
         self.error_type = error_type
         self.retriable = retriable
         self.status_code = status_code
+        self.paced_by_governor = False
 
 
 def _classify_provider_error(exc: Exception, status_code: int = 0) -> LLMCallError:
@@ -153,7 +165,8 @@ def _merge_system_messages_to_front(
     if len(system_parts) == 1 and messages[0].get("role") == "system":
         content = messages[0].get("content", "")
         if len(content) <= _SYSTEM_MESSAGE_CHAR_BUDGET:
-            return messages
+            # OpenAI 兼容端自动前缀缓存，不认识 cache_control 标记
+            return [strip_cache_breakpoint(messages[0]), *messages[1:]]
         truncated = content[:_SYSTEM_MESSAGE_CHAR_BUDGET].rstrip()
         return [
             {"role": "system", "content": truncated + "\n\n[system prompt truncated]"},
@@ -167,6 +180,50 @@ def _merge_system_messages_to_front(
     return [{"role": "system", "content": merged}, *non_system]
 
 
+def _anthropic_cached_system(
+    instructions: str,
+    system_parts: list[str],
+    breakpoints: list[int],
+) -> list[dict[str, Any]]:
+    """按断点把 system 拆成 text block 列表（断点块带 cache_control）。
+
+    最后一条消息还要占一个断点，system 最多保留 ``MAX_CACHE_BREAKPOINTS - 1`` 个
+    （取最靠后的，缓存前缀最长）。
+    """
+    kept = set(breakpoints[-(MAX_CACHE_BREAKPOINTS - 1) :])
+    blocks: list[dict[str, Any]] = []
+    if instructions:
+        blocks.append({"type": "text", "text": instructions})
+    for index, part in enumerate(system_parts):
+        block: dict[str, Any] = {"type": "text", "text": part}
+        if index in kept:
+            block["cache_control"] = {"type": "ephemeral"}
+        blocks.append(block)
+    return blocks
+
+
+def _mark_last_message_breakpoint(messages: list[dict[str, Any]]) -> None:
+    """在最后一条消息的末个 content block 上加滚动断点。
+
+    agent 循环的下一步只在末尾追加 assistant / tool_result，上一步的整段对话前缀
+    可直接命中缓存。空文本消息不加（Anthropic 拒绝空 text block）。
+    """
+    if not messages:
+        return
+    last = messages[-1]
+    content = last.get("content")
+    if isinstance(content, str):
+        if not content:
+            return
+        blocks: list[dict[str, Any]] = [{"type": "text", "text": content}]
+    elif isinstance(content, list) and content:
+        blocks = [dict(block) for block in content]
+    else:
+        return
+    blocks[-1]["cache_control"] = {"type": "ephemeral"}
+    messages[-1] = {**last, "content": blocks}
+
+
 def _build_v1_url(api_base: str, endpoint: str) -> str:
     """拼接 ``{api_base}/v1/{endpoint}``，幂等处理已含 ``/v1`` 的 api_base。
 
@@ -299,15 +356,21 @@ class ProviderClient:
 
     构造由 ``ProviderRouter._build_client()`` 完成；调用方拿到这个对象就只
     管 ``call()``。401 retry / 错误分类 / 流式解析全部内化。
+
+    ``governor`` 为同一 provider 所有 client 共享的限流治理器：每次发送前
+    ``acquire()``，每个响应的状态码与限流头回灌给它。
     """
 
     def __init__(
         self,
         runtime: ProviderRuntime,
         http_client: httpx.AsyncClient,
+        *,
+        governor: RateLimitGovernor | None = None,
     ) -> None:
         self._runtime = runtime
         self._http = http_client
+        self._governor = governor
 
     @property
     def runtime(self) -> ProviderRuntime:
@@ -322,6 +385,7 @@ class ProviderClient:
         model_name: str,
         reasoning: dict[str, Any] | None = None,
         tool_choice: dict[str, Any] | str | None = None,
+        on_delta: DeltaCallback | None = None,
     ) -> tuple[str, list[dict[str, Any]], dict[str, Any]]:
         """按 transport 路由到对应协议实现。
 
@@ -343,6 +407,9 @@ class ProviderClient:
                 或 Anthropic 的 ``{"type": "tool", "name": "graph_pipeline"}``。
                 F087 followup 引入：让 e2e 测试 / 上层服务能强制 LLM 选定目标
                 工具，避免 LLM 自主决策的不确定性。**仅 ``tools`` 非空时生效**。
+            on_delta: 可选的增量回调（文本 / 工具调用片段，边解析边推）；瞬态
+                重试重发前推 ``reset``。无论是否提供，首个增量耗时都写入
+                ``metadata["ttft_ms"]``
 
         Returns:
             ``(content, tool_calls, metadata)`` triple
@@ -352,16 +419,30 @@ class ProviderClient:
         # gate=deny 带过期凭证也不得打真 OAuth token 端点）。
         check_model_requests_allowed()
         last_exc: Exception | None = None
+        tap = DeltaTap(on_delta)
         for attempt in range(_TRANSIENT_MAX_RETRIES + 1):
+            if attempt:
+                tap.restart()
+            if self._governor is not None:
+                await self._governor.acquire()
             try:
-                return await self._dispatch_with_auth_refresh(
+                content, tool_calls, metadata = await self._dispatch_with_auth_refresh(
                     instructions=instructions,
                     history=history,
                     tools=tools,
                     model_name=model_name,
                     reasoning=reasoning,
                     tool_choice=tool_choice,
+                    tap=tap,
                 )
+                if tap.ttft_ms is not None:
+                    metadata["ttft_ms"] = tap.ttft_ms
+                self._record_usage(metadata)
+                return content, tool_calls, metadata
+            except LLMCallError as exc:
+                if exc.error_type == "rate_limit" and self._governor is not None:
+                    exc.paced_by_governor = True
+                raise
             except _TRANSIENT_TRANSPORT_ERRORS as exc:
                 # 瞬态传输错误：有界指数退避重试。``CancelledError`` 不在此 family，
                 # harness teardown 的取消会照常向上传播，不会被这里吞掉或拖慢。
@@ -391,6 +472,20 @@ class ProviderClient:
         # 不可达：最后一次 attempt 要么 return 要么 raise；保险起见显式抛。
         raise last_exc  # type: ignore[misc]
 
+    def _observe_response(self, resp: httpx.Response) -> None:
+        """把响应状态码 / 限流头回灌给共享限流治理器（读 body 前调用）"""
+        if self._governor is not None:
+            self._governor.observe(resp.status_code, resp.headers)
+
+    def _record_usage(self, metadata: dict[str, Any]) -> None:
+        if self._governor is None:
+            return
+        usage = metadata.get("token_usage")
+        if isinstance(usage, dict):
+            total = usage.get("total_tokens") or 0
+            if isinstance(total, int):
+                self._governor.record_usage(total)
+
     async def _dispatch_with_auth_refresh(
         self,
         *,
@@ -400,6 +495,7 @@ class ProviderClient:
         model_name: str,
         reasoning: dict[str, Any] | None = None,
         tool_choice: dict[str, Any] | str | None = None,
+        tap: DeltaTap | None = None,
     ) -> tuple[str, list[dict[str, Any]], dict[str, Any]]:
         """单次完整调用：auth resolve + dispatch + 401/403 force-refresh 重试一次。
 
@@ -415,6 +511,7 @@ class ProviderClient:
                 model_name=model_name,
                 reasoning=reasoning,
                 tool_choice=tool_choice,
+                tap=tap,
             )
         except LLMCallError as exc:
             # F3 修复：401 和 403 都触发 auth refresh。某些 provider/网关把
@@ -452,6 +549,7 @@ class ProviderClient:
                 model_name=model_name,
                 reasoning=reasoning,
                 tool_choice=tool_choice,
+                tap=tap,
             )
 
     async def _dispatch(
@@ -464,6 +562,7 @@ class ProviderClient:
         model_name: str,
         reasoning: dict[str, Any] | None,
         tool_choice: dict[str, Any] | str | None = None,
+        tap: DeltaTap | None = None,
     ) -> tuple[str, list[dict[str, Any]], dict[str, Any]]:
         if self._runtime.transport == ProviderTransport.OPENAI_RESPONSES:
             return await self._call_openai_responses(
@@ -474,6 +573,7 @@ class ProviderClient:
                 model_name=model_name,
                 reasoning=reasoning,
                 tool_choice=tool_choice,
+                tap=tap,
             )
         if self._runtime.transport == ProviderTransport.OPENAI_CHAT:
             return await self._call_openai_chat(
@@ -483,6 +583,7 @@ class ProviderClient:
                 tools=tools,
                 model_name=model_name,
                 tool_choice=tool_choice,
+                tap=tap,
             )
         if self._runtime.transport == ProviderTransport.ANTHROPIC_MESSAGES:
             return await self._call_anthropic_messages(
@@ -493,6 +594,7 @@ class ProviderClient:
                 model_name=model_name,
                 reasoning=reasoning,
                 tool_choice=tool_choice,
+                tap=tap,
             )
         raise NotImplementedError(f"unsupported transport: {self._runtime.transport}")
 
@@ -508,12 +610,14 @@ class ProviderClient:
         model_name: str,
         reasoning: dict[str, Any] | None,
         tool_choice: dict[str, Any] | str | None = None,
+        tap: DeltaTap | None = None,
     ) -> tuple[str, list[dict[str, Any]], dict[str, Any]]:
         """OpenAI Responses API 协议实现（直连，无中间代理）。
 
         这是 Feature 080 的核心路径：用户日常的 ChatGPT Pro Codex 调用走这里，
         Phase 4 退役 LiteLLM Proxy 后所有 OpenAI Responses 请求都走它。
         """
+        tap = tap or DeltaTap(None)
         responses_input = _history_to_responses_input(history)
         if not responses_input:
             log.error(
@@ -605,6 +709,7 @@ class ProviderClient:
             raise _classify_provider_error(exc) from exc
 
         async with stream_ctx as resp:
+            self._observe_response(resp)
             if resp.status_code >= 400:
                 body_text = await resp.aread()
                 error_body = body_text.decode(errors="replace")[:500]
@@ -638,6 +743,7 @@ class ProviderClient:
                     delta = str(event.get("delta", ""))
                     if delta:
                         text_parts.append(delta)
+                        tap.text(delta)
                     continue
                 if event_type == "response.output_item.added":
                     item = event.get("item", {})
@@ -649,19 +755,25 @@ class ProviderClient:
                                 item_id=item.get("id"),
                                 name=item.get("name"),
                             )
-                        tool_calls_raw[str(item.get("id", ""))] = {
+                        added = {
                             "id": call_id,
                             "raw_name": str(item.get("name", "")),
                             "tool_name": _from_fn_name(str(item.get("name", ""))),
                             "arguments": str(item.get("arguments") or ""),
                         }
+                        tool_calls_raw[str(item.get("id", ""))] = added
+                        tap.tool_call(
+                            added["arguments"],
+                            tool_call_id=call_id,
+                            tool_name=added["tool_name"],
+                        )
                     continue
                 if event_type == "response.function_call_arguments.delta":
                     item_id = str(event.get("item_id", ""))
                     if item_id in tool_calls_raw:
-                        tool_calls_raw[item_id]["arguments"] += str(
-                            event.get("delta", "")
-                        )
+                        delta = str(event.get("delta", ""))
+                        tool_calls_raw[item_id]["arguments"] += delta
+                        tap.tool_call(delta, tool_call_id=tool_calls_raw[item_id]["id"])
                     continue
                 if event_type == "response.function_call_arguments.done":
                     item_id = str(event.get("item_id", ""))
@@ -729,6 +841,9 @@ class ProviderClient:
                 "prompt_tokens": int(usage.get("input_tokens", 0) or 0),
                 "completion_tokens": int(usage.get("output_tokens", 0) or 0),
                 "total_tokens": int(usage.get("total_tokens", 0) or 0),
+                **cache_usage(
+                    read=(usage.get("input_tokens_details") or {}).get("cached_tokens"),
+                ),
             },
             # cost 留给后续 Feature 接 cost calculator；本 Feature 标 unavailable
             "cost_usd": 0.0,
@@ -757,6 +872,7 @@ class ProviderClient:
         tools: list[dict[str, Any]],
         model_name: str,
         tool_choice: dict[str, Any] | str | None = None,
+        tap: DeltaTap | None = None,
     ) -> tuple[str, list[dict[str, Any]], dict[str, Any]]:
         """OpenAI Chat Completions API 协议（直连 provider，无中间代理）。
 
@@ -766,6 +882,7 @@ class ProviderClient:
         与 ``skills.providers.ChatCompletionsProvider._call_once`` 95% 同源；
         差异只是用 ``self._runtime.api_base`` 替代了硬编码的 proxy_url。
         """
+        tap = tap or DeltaTap(None)
         # 把 instructions（manifest description）prepend 到 history 作为 system；
         # 与现有 LiteLLMSkillClient._build_initial_history 行为对齐
         merged_history: list[dict[str, Any]] = list(history)
@@ -827,6 +944,7 @@ class ProviderClient:
             raise _classify_provider_error(exc) from exc
 
         async with stream_ctx as resp:
+            self._observe_response(resp)
             if resp.status_code >= 400:
                 body_text = await resp.aread()
                 error_body = body_text.decode(errors="replace")[:500]
@@ -864,6 +982,13 @@ class ProviderClient:
                             chunk_usage.get("completion_tokens", 0) or 0
                         ),
                         "total_tokens": int(chunk_usage.get("total_tokens", 0) or 0),
+                        **cache_usage(
+                            read=(chunk_usage.get("prompt_tokens_details") or {}).get(
+                                "cached_tokens"
+                            )
+                            # DeepSeek 兼容端用 prompt_cache_hit_tokens
+                            or chunk_usage.get("prompt_cache_hit_tokens"),
+                        ),
                     }
 
                 choices = chunk.get("choices", [])
@@ -872,6 +997,7 @@ class ProviderClient:
                 delta = choices[0].get("delta", {})
                 if delta.get("content"):
                     content_parts.append(delta["content"])
+                    tap.text(delta["content"])
                 for tc_delta in delta.get("tool_calls", []):
                     idx = tc_delta.get("index", 0)
                     if idx not in tc_raw:
@@ -884,6 +1010,11 @@ class ProviderClient:
                         tc["name"] += fn["name"]
                     if fn.get("arguments"):
                         tc["arguments"] += fn["arguments"]
+                    tap.tool_call(
+                        fn.get("arguments") or "",
+                        tool_call_id=tc["id"],
+                        tool_name=_from_fn_name(fn["name"]) if fn.get("name") else "",
+                    )
 
         content = "".join(content_parts)
         tool_calls: list[dict[str, Any]] = []
@@ -965,6 +1096,8 @@ class ProviderClient:
             **auth.extra_headers,
         }
 
+        if self._governor is not None:
+            await self._governor.acquire()
         try:
             response = await self._http.post(
                 target_url,
@@ -974,6 +1107,7 @@ class ProviderClient:
         except (httpx.TimeoutException, httpx.ConnectError) as exc:
             raise _classify_provider_error(exc) from exc
 
+        self._observe_response(response)
         if response.status_code >= 400:
             error_body = response.text[:500]
             log.error(
@@ -1012,6 +1146,7 @@ class ProviderClient:
         model_name: str,
         reasoning: dict[str, Any] | None,
         tool_choice: dict[str, Any] | str | None = None,
+        tap: DeltaTap | None = None,
     ) -> tuple[str, list[dict[str, Any]], dict[str, Any]]:
         """Anthropic Messages API 协议（直连 api.anthropic.com）。
 
@@ -1032,14 +1167,18 @@ class ProviderClient:
         - OpenAI ``tool_calls`` 列表 → Anthropic ``content: [{type: "tool_use",
           id, name, input}]``
         """
-        # 拆系统消息和对话消息
+        tap = tap or DeltaTap(None)
+        # 拆系统消息和对话消息；带 cache_control 标记的 system 块记为缓存断点
         system_parts: list[str] = []
+        system_breakpoints: list[int] = []
         anthropic_messages: list[dict[str, Any]] = []
         for msg in history:
             role = msg.get("role")
             if role == "system":
                 content = str(msg.get("content", "")).strip()
                 if content:
+                    if has_cache_breakpoint(msg):
+                        system_breakpoints.append(len(system_parts))
                     system_parts.append(content)
                 continue
             if role == "tool":
@@ -1112,7 +1251,12 @@ class ProviderClient:
         body.setdefault("stream", True)
         # extra_body 可以覆盖 max_tokens 默认值
         body.setdefault("max_tokens", 4096)
-        if full_system:
+        if system_breakpoints:
+            body["system"] = _anthropic_cached_system(
+                instructions, system_parts, system_breakpoints
+            )
+            _mark_last_message_breakpoint(anthropic_messages)
+        elif full_system:
             body["system"] = full_system
 
         # F087 followup Codex review high-1 闭环：Anthropic 'none' 语义必须真禁用工具。
@@ -1202,6 +1346,7 @@ class ProviderClient:
             raise _classify_provider_error(exc) from exc
 
         async with stream_ctx as resp:
+            self._observe_response(resp)
             if resp.status_code >= 400:
                 body_text = await resp.aread()
                 error_body = body_text.decode(errors="replace")[:500]
@@ -1240,12 +1385,17 @@ class ProviderClient:
                             "model": msg.get("model"),
                         }
                         usage = msg.get("usage", {}) or {}
-                        usage_data["prompt_tokens"] = int(
-                            usage.get("input_tokens", 0) or 0
+                        cache_read = int(usage.get("cache_read_input_tokens", 0) or 0)
+                        cache_write = int(usage.get("cache_creation_input_tokens", 0) or 0)
+                        # Anthropic input_tokens 不含缓存部分；prompt_tokens 与 OpenAI
+                        # 口径对齐为全部输入 token
+                        usage_data["prompt_tokens"] = (
+                            int(usage.get("input_tokens", 0) or 0) + cache_read + cache_write
                         )
                         usage_data["completion_tokens"] = int(
                             usage.get("output_tokens", 0) or 0
                         )
+                        usage_data.update(cache_usage(read=cache_read, write=cache_write))
                     continue
                 if event_type == "content_block_start":
                     idx = int(event.get("index", -1))
@@ -1258,18 +1408,25 @@ class ProviderClient:
                             "name": _from_fn_name(str(block.get("name", ""))),
                             "input_json": "",
                         }
+                        tap.tool_call(
+                            "",
+                            tool_call_id=tool_use_raw[idx]["id"],
+                            tool_name=tool_use_raw[idx]["name"],
+                        )
                     continue
                 if event_type == "content_block_delta":
                     idx = int(event.get("index", -1))
                     delta = event.get("delta", {}) or {}
                     btype = str(delta.get("type", ""))
                     if btype == "text_delta":
-                        text_parts.append(str(delta.get("text", "")))
+                        text = str(delta.get("text", ""))
+                        text_parts.append(text)
+                        tap.text(text)
                     elif btype == "input_json_delta":
                         if idx in tool_use_raw:
-                            tool_use_raw[idx]["input_json"] += str(
-                                delta.get("partial_json", "")
-                            )
+                            partial = str(delta.get("partial_json", ""))
+                            tool_use_raw[idx]["input_json"] += partial
+                            tap.tool_call(partial, tool_call_id=tool_use_raw[idx]["id"])
                     continue
                 if event_type == "content_block_stop":
                     # 不做特殊处理，content_block_delta 已累积完
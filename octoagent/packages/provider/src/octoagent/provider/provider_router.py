@@ -2,26 +2,31 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable
+import asyncio
+from collections.abc import Callable, Iterable
 from dataclasses import dataclass
 from typing import Any
 
 import httpx
 import structlog
+from octoagent.core.config import PROVIDER_RATE_GOVERNOR, PROVIDER_TPM_LIMITS
 
 from .auth.oauth_provider import BUILTIN_PROVIDERS
 from .auth.store import CredentialStore
 from .auth_resolver import AuthResolver, OAuthResolver, StaticApiKeyResolver
 from .exceptions import CredentialError
+from .http_pool import MeteredTransport, ProviderPoolConfig, build_pooled_client
 from .provider_client import ProviderClient
 from .provider_route import ProviderRoute
 from .provider_runtime import ProviderRuntime
+from .rate_governor import RateLimitGovernor, parse_tpm_limits
 from .refresh_coordinator import TokenRefreshCoordinator
 from .transport import ProviderTransport
 
 log = structlog.get_logger()
 
 RouteResolver = Callable[[str], ProviderRoute]
+PoolResolver = Callable[[str], ProviderPoolConfig | None]
 
 
 @dataclass(frozen=True)
@@ -33,6 +38,15 @@ class ResolvedAlias:
     provider_id: str
 
 
+@dataclass
+class _ProviderPool:
+    """配置了 pool 的 provider 独占的 HTTP 客户端"""
+
+    config: ProviderPoolConfig
+    client: httpx.AsyncClient
+    transport: MeteredTransport
+
+
 class ProviderRouter:
     """只消费注入ProviderRoute的Provider client路由器。"""
 
@@ -44,18 +58,38 @@ class ProviderRouter:
         coordinator: TokenRefreshCoordinator | None = None,
         event_store: Any | None = None,
         timeout_s: float = 60.0,
+        pool_resolver: PoolResolver | None = None,
+        rate_governor: bool = PROVIDER_RATE_GOVERNOR,
+        tpm_limits: dict[str, int] | None = None,
     ) -> None:
         self._route_resolver = route_resolver
+        self._pool_resolver = pool_resolver
         self._store = credential_store or CredentialStore()
         self._coord = coordinator or TokenRefreshCoordinator()
         self._event_store = event_store
-        self._http = httpx.AsyncClient(timeout=httpx.Timeout(timeout_s, connect=10.0))
+        self._timeout = httpx.Timeout(timeout_s, connect=10.0)
+        # 未配置 pool 的 provider 共用此客户端；配置了 pool 的各自独占（见 _http_for）
+        self._http, self._shared_transport = build_pooled_client(None, timeout=self._timeout)
+        self._pools: dict[str, _ProviderPool] = {}
+        self._retired_http: list[httpx.AsyncClient] = []
         self._client_cache: dict[str, ProviderClient] = {}
         self._client_routes: dict[str, ProviderRoute] = {}
         self._task_alias_cache: dict[tuple[str, str], ResolvedAlias] = {}
+        # 按 provider 的共享限流治理器：client 重建（凭证 / 池配置变更）时沿用，
+        # 已 pinned 旧 client 的 task 与新 client 共享同一份限流状态
+        self._rate_governor = rate_governor
+        self._tpm_limits = (
+            tpm_limits if tpm_limits is not None else parse_tpm_limits(PROVIDER_TPM_LIMITS)
+        )
+        self._governors: dict[str, RateLimitGovernor] = {}
 
     async def aclose(self) -> None:
-        await self._http.aclose()
+        clients = [self._http, *(pool.client for pool in self._pools.values())]
+        clients.extend(self._retired_http)
+        self._pools.clear()
+        self._retired_http.clear()
+        for client in clients:
+            await client.aclose()
 
     def invalidate_task(self, task_scope: str) -> None:
         keys_to_drop = [key for key in self._task_alias_cache if key[0] == task_scope]
@@ -68,6 +102,65 @@ class ProviderRouter:
         self._client_cache.pop(provider_id, None)
         self._client_routes.pop(provider_id, None)
 
+    def pool_stats(self) -> dict[str, Any]:
+        """连接池利用率快照（ops 路由直出）"""
+
+        return {
+            "shared": self._shared_transport.stats(),
+            "providers": {
+                provider_id: pool.transport.stats() for provider_id, pool in self._pools.items()
+            },
+        }
+
+    def rate_limit_stats(self) -> dict[str, Any]:
+        """各 provider 限流治理器快照（当前速率上限 / 冷却 / 排队深度 / TPM 预算）"""
+
+        return {
+            provider_id: governor.snapshot() for provider_id, governor in self._governors.items()
+        }
+
+    async def warm_up(self, aliases: Iterable[str]) -> dict[str, bool]:
+        """为 pool.warmup=True 的 provider 预建连接（对 api_base 发 HEAD，完成 DNS/TLS 握手）。
+
+        只做体验优化：解析或请求失败只记日志。返回 provider_id -> 是否建连成功。
+        """
+
+        routes: dict[str, ProviderRoute] = {}
+        for alias in aliases:
+            try:
+                route = self._route_resolver(alias)
+            except Exception as exc:
+                log.debug("provider_pool_warmup_skip_alias", alias=alias, error=str(exc))
+                continue
+            pool = self._pool_config(route.provider)
+            if pool is not None and pool.warmup:
+                routes.setdefault(route.provider, route)
+        if not routes:
+            return {}
+        results = await asyncio.gather(*(self._warm_up_route(route) for route in routes.values()))
+        return dict(zip(routes, results, strict=True))
+
+    async def _warm_up_route(self, route: ProviderRoute) -> bool:
+        try:
+            # 任何 HTTP 状态码都说明连接已建立并回到池中
+            await self._http_for(route.provider, self._pool_config(route.provider)).head(
+                route.api_base
+            )
+        except httpx.HTTPError as exc:
+            log.warning(
+                "provider_pool_warmup_failed",
+                provider_id=route.provider,
+                error_type=type(exc).__name__,
+            )
+            return False
+        log.info("provider_pool_warmed", provider_id=route.provider)
+        return True
+
+    def provider_for_alias(self, model_alias: str) -> str:
+        """只解析 alias 对应的 provider id（不构建 client，供调度准入分组）"""
+
+        return self._route_resolver(model_alias).provider
+
     def resolve_for_alias(
         self,
         model_alias: str,
@@ -80,9 +173,10 @@ class ProviderRouter:
                 return cached
 
         route = self._route_resolver(model_alias)
+        pool = self._pool_config(route.provider)
         client = self._client_cache.get(route.provider)
-        if client is None or self._client_outdated(route):
-            client = self._build_client(route)
+        if client is None or self._client_outdated(route) or self._pool_outdated(route, pool):
+            client = self._build_client(route, pool)
             self._client_cache[route.provider] = client
             self._client_routes[route.provider] = route
         resolved = ResolvedAlias(
@@ -111,14 +205,74 @@ class ProviderRouter:
             or previous.auth != route.auth
         )
 
-    def _build_client(self, route: ProviderRoute) -> ProviderClient:
+    def _pool_config(self, provider_id: str) -> ProviderPoolConfig | None:
+        if self._pool_resolver is None:
+            return None
+        try:
+            return self._pool_resolver(provider_id)
+        except Exception as exc:
+            # 池配置只影响连接调优：解析失败退回共享池，不阻断调用
+            log.warning(
+                "provider_pool_config_unavailable",
+                provider_id=provider_id,
+                error_type=type(exc).__name__,
+            )
+            return None
+
+    def _pool_outdated(self, route: ProviderRoute, pool: ProviderPoolConfig | None) -> bool:
+        current = self._pools.get(route.provider)
+        return (current.config if current is not None else None) != pool
+
+    def _build_client(
+        self, route: ProviderRoute, pool: ProviderPoolConfig | None = None
+    ) -> ProviderClient:
         runtime = ProviderRuntime(
             provider_id=route.provider,
             transport=ProviderTransport(route.transport),
             api_base=route.api_base.rstrip("/"),
             auth_resolver=self._build_auth_resolver(route),
         )
-        return ProviderClient(runtime, self._http)
+        return ProviderClient(
+            runtime,
+            self._http_for(route.provider, pool),
+            governor=self._governor_for(route.provider),
+        )
+
+    def _governor_for(self, provider_id: str) -> RateLimitGovernor | None:
+        if not self._rate_governor:
+            return None
+        governor = self._governors.get(provider_id)
+        if governor is None:
+            governor = RateLimitGovernor(
+                provider_id,
+                tpm_limit=self._tpm_limits.get(provider_id, 0),
+            )
+            self._governors[provider_id] = governor
+        return governor
+
+    def _http_for(self, provider_id: str, pool: ProviderPoolConfig | None) -> httpx.AsyncClient:
+        """provider 对应的 HTTP 客户端：未配置 pool 走共享客户端，否则按 provider 独占"""
+
+        current = self._pools.get(provider_id)
+        if current is not None and current.config == pool:
+            return current.client
+        if current is not None:
+            # 池配置变更：已 pinned 的 task 可能仍持有旧 client，推迟到 aclose 统一关闭
+            del self._pools[provider_id]
+            self._retired_http.append(current.client)
+        if pool is None:
+            return self._http
+        client, transport = build_pooled_client(
+            pool,
+            timeout=self._timeout,
+            provider_id=provider_id,
+        )
+        self._pools[provider_id] = _ProviderPool(
+            config=pool,
+            client=client,
+            transport=transport,
+        )
+        return client
 
     def _build_auth_resolver(self, route: ProviderRoute) -> AuthResolver:
         auth = route.auth
@@ -140,4 +294,4 @@ class ProviderRouter:
         raise CredentialError(f"provider {route.provider!r}的auth引用无效")
 
 
-__all__ = ["ProviderRouter", "ResolvedAlias", "RouteResolver"]
+__all__ = ["PoolResolver", "ProviderRouter", "ResolvedAlias", "RouteResolver"]
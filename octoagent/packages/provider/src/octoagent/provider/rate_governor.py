@@ -0,0 +1,321 @@
+"""Provider 级共享限流治理器（AIMD 速率 + 冷却 + 可选 TPM 预算）。
+
+原先 429 只在单个 SkillRunner 内按自己的 retry_policy 退避：同一 provider 上
+并发的多个 task 互不知情，各自退避后又同时重发，持续撞限流。本模块为每个
+provider 维护一个所有 task 共享的 ``RateLimitGovernor``：
+
+- 未遇到限流前不设速率上限（零额外延迟）
+- 429：按最近一分钟实测请求速率乘性降速（不低于 ``min_rpm``），并按
+  ``retry-after`` / ``x-ratelimit-reset-*`` / ``anthropic-ratelimit-*-reset``
+  设置冷却期，冷却期内所有调用方在发送前等待
+- 成功：加性恢复速率，恢复到首次限流时速率的两倍后解除上限
+- 成功响应的 ``remaining`` 头为 0 时提前进入冷却（不等 429）
+- ``tpm_limit`` > 0 时按最近一分钟已用 token（调用 metadata 的 token_usage）
+  预算，超出后等最早的用量滑出窗口
+
+``acquire()`` 按 FIFO 预约发送时刻（令牌桶节拍），等待者数即排队深度。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable, Mapping
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+from typing import Any
+
+import structlog
+from octoagent.core.config import PROVIDER_RATE_MIN_RPM
+
+log = structlog.get_logger()
+
+_WINDOW_S = 60.0
+# 单次冷却上限：防止异常 retry-after 把 provider 整体卡死
+_COOLDOWN_CAP_S = 300.0
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+# 剩余额度头 → 对应的重置时间头（OpenAI 兼容 / Anthropic）
+_REMAINING_HEADERS: tuple[tuple[str, str], ...] = (
+    ("x-ratelimit-remaining-requests", "x-ratelimit-reset-requests"),
+    ("x-ratelimit-remaining-tokens", "x-ratelimit-reset-tokens"),
+    ("anthropic-ratelimit-requests-remaining", "anthropic-ratelimit-requests-reset"),
+    ("anthropic-ratelimit-tokens-remaining", "anthropic-ratelimit-tokens-reset"),
+)
+
+
+def parse_tpm_limits(raw: str) -> dict[str, int]:
+    """解析 "openai=90000,anthropic=40000" 形式的 TPM 配置（非法项忽略，<=0 视为不限）"""
+    limits: dict[str, int] = {}
+    for item in raw.split(","):
+        key, sep, value = item.partition("=")
+        key = key.strip()
+        if not sep or not key:
+            continue
+        try:
+            limit = int(value.strip())
+        except ValueError:
+            log.warning("provider_rate_invalid_tpm_limit", item=item.strip())
+            continue
+        if limit > 0:
+            limits[key] = limit
+    return limits
+
+
+def parse_reset_seconds(value: str | None, *, now: datetime | None = None) -> float | None:
+    """把限流响应头里的等待时间解析成秒数。
+
+    支持：纯秒数（``"2"`` / ``"0.5"``）、Go duration（``"1s"`` / ``"6m0s"`` /
+    ``"250ms"``）、HTTP-date（``retry-after``）、RFC 3339 时间戳（Anthropic）。
+    无法解析时返回 None。
+    """
+    if not value:
+        return None
+    text = value.strip()
+    try:
+        return max(float(text), 0.0)
+    except ValueError:
+        pass
+    seconds = _parse_duration(text)
+    if seconds is not None:
+        return seconds
+    now = now or datetime.now(UTC)
+    for parse in (_parse_rfc3339, parsedate_to_datetime):
+        try:
+            moment = parse(text)
+        except (TypeError, ValueError, IndexError):
+            continue
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=UTC)
+        return max((moment - now).total_seconds(), 0.0)
+    return None
+
+
+def _parse_duration(text: str) -> float | None:
+    total = 0.0
+    number = ""
+    index = 0
+    matched = False
+    while index < len(text):
+        char = text[index]
+        if char.isdigit() or char == ".":
+            number += char
+            index += 1
+            continue
+        unit = "ms" if text.startswith("ms", index) else char
+        if unit not in _DURATION_UNITS or not number:
+            return None
+        try:
+            total += float(number) * _DURATION_UNITS[unit]
+        except ValueError:
+            return None
+        number = ""
+        matched = True
+        index += len(unit)
+    if number or not matched:
+        return None
+    return total
+
+
+def _parse_rfc3339(text: str) -> datetime:
+    return datetime.fromisoformat(text.replace("Z", "+00:00"))
+
+
+class RateLimitGovernor:
+    """单个 provider 的共享限流治理器（同一事件循环内跨 task 共享）。"""
+
+    def __init__(
+        self,
+        provider_id: str,
+        *,
+        min_rpm: int = PROVIDER_RATE_MIN_RPM,
+        tpm_limit: int = 0,
+        additive_rpm: float = 1.0,
+        decrease_factor: float = 0.5,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ) -> None:
+        self.provider_id = provider_id
+        self._min_rpm = max(float(min_rpm), 1.0)
+        self._tpm_limit = max(tpm_limit, 0)
+        self._additive_rpm = additive_rpm
+        self._decrease_factor = decrease_factor
+        self._clock = clock
+        self._sleep = sleep
+        # None = 未限速；限流后为当前每分钟请求数上限
+        self._rpm: float | None = None
+        self._ceiling_rpm = 0.0
+        self._next_slot = 0.0
+        self._cooldown_until = 0.0
+        self._starts: deque[float] = deque()
+        self._tokens: deque[tuple[float, int]] = deque()
+        self._tokens_in_window = 0
+        self._waiters = 0
+        self._header_remaining: dict[str, int] = {}
+        self.rate_limited_total = 0
+        self.paced_total = 0
+        self.wait_seconds_total = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        return self._waiters
+
+    @property
+    def rpm_limit(self) -> float | None:
+        return self._rpm
+
+    async def acquire(self) -> float:
+        """发送前调用：等待冷却 / TPM 预算 / 速率节拍，返回实际等待秒数"""
+        waited = 0.0
+        self._waiters += 1
+        try:
+            while True:
+                now = self._clock()
+                ready_at = max(self._cooldown_until, self._tpm_ready_at(now))
+                if ready_at <= now:
+                    break
+                await self._sleep(ready_at - now)
+                waited += ready_at - now
+            if self._rpm is not None:
+                now = self._clock()
+                slot = max(now, self._next_slot)
+                self._next_slot = slot + _WINDOW_S / self._rpm
+                if slot > now:
+                    await self._sleep(slot - now)
+                    waited += slot - now
+        finally:
+            self._waiters -= 1
+        now = self._clock()
+        self._prune(now)
+        self._starts.append(now)
+        if waited > 0:
+            self.paced_total += 1
+            self.wait_seconds_total += waited
+        return waited
+
+    def observe(self, status_code: int, headers: Mapping[str, str]) -> None:
+        """每个 HTTP 响应（读 body 前）调用：学习限流信号"""
+        if status_code == 429:
+            self._on_rate_limited(headers)
+        elif status_code < 400:
+            self._on_success(headers)
+
+    def record_usage(self, total_tokens: int) -> None:
+        """成功调用后记入实际 token 用量（TPM 预算）"""
+        if self._tpm_limit <= 0 or total_tokens <= 0:
+            return
+        self._tokens.append((self._clock(), total_tokens))
+        self._tokens_in_window += total_tokens
+
+    def snapshot(self) -> dict[str, Any]:
+        now = self._clock()
+        self._prune(now)
+        return {
+            "provider_id": self.provider_id,
+            "throttled": self._rpm is not None,
+            "rpm_limit": round(self._rpm, 2) if self._rpm is not None else None,
+            "observed_rpm": len(self._starts),
+            "cooldown_remaining_s": round(max(self._cooldown_until - now, 0.0), 3),
+            "queue_depth": self._waiters,
+            "tpm_limit": self._tpm_limit or None,
+            "tokens_last_minute": self._tokens_in_window,
+            "tokens_remaining": (
+                max(self._tpm_limit - self._tokens_in_window, 0) if self._tpm_limit else None
+            ),
+            "header_remaining": dict(self._header_remaining),
+            "rate_limited_total": self.rate_limited_total,
+            "paced_total": self.paced_total,
+            "wait_seconds_total": round(self.wait_seconds_total, 3),
+        }
+
+    # ──────────────── 内部 ────────────────
+
+    def _on_rate_limited(self, headers: Mapping[str, str]) -> None:
+        now = self._clock()
+        self._prune(now)
+        self.rate_limited_total += 1
+        observed = float(len(self._starts))
+        if self._rpm is None:
+            self._ceiling_rpm = max(observed, self._min_rpm) * 2
+            base = observed
+        else:
+            base = min(self._rpm, observed) if observed else self._rpm
+        self._rpm = max(base * self._decrease_factor, self._min_rpm)
+        self._next_slot = max(self._next_slot, now)
+        wait_s = self._retry_after(headers)
+        if wait_s is None:
+            # 无等待提示：至少空出一个新速率下的节拍
+            wait_s = _WINDOW_S / self._rpm
+        self._cool_down(now, wait_s)
+        log.warning(
+            "provider_rate_limited",
+            provider_id=self.provider_id,
+            rpm_limit=round(self._rpm, 2),
+            observed_rpm=observed,
+            cooldown_s=round(wait_s, 3),
+            queue_depth=self._waiters,
+        )
+
+    def _on_success(self, headers: Mapping[str, str]) -> None:
+        now = self._clock()
+        for remaining_header, reset_header in _REMAINING_HEADERS:
+            remaining = _header_int(headers.get(remaining_header))
+            if remaining is None:
+                continue
+            self._header_remaining[remaining_header] = remaining
+            if remaining <= 0:
+                wait_s = parse_reset_seconds(headers.get(reset_header))
+                if wait_s:
+                    self._cool_down(now, wait_s)
+        if self._rpm is None:
+            return
+        self._rpm += self._additive_rpm
+        if self._rpm >= self._ceiling_rpm:
+            self._rpm = None
+            log.info("provider_rate_limit_lifted", provider_id=self.provider_id)
+
+    def _retry_after(self, headers: Mapping[str, str]) -> float | None:
+        retry_after_ms = _header_int(headers.get("retry-after-ms"))
+        if retry_after_ms is not None:
+            return retry_after_ms / 1000
+        for name in (
+            "retry-after",
+            "x-ratelimit-reset-requests",
+            "anthropic-ratelimit-requests-reset",
+        ):
+            seconds = parse_reset_seconds(headers.get(name))
+            if seconds is not None:
+                return seconds
+        return None
+
+    def _cool_down(self, now: float, wait_s: float) -> None:
+        self._cooldown_until = max(self._cooldown_until, now + min(wait_s, _COOLDOWN_CAP_S))
+
+    def _tpm_ready_at(self, now: float) -> float:
+        if self._tpm_limit <= 0:
+            return now
+        self._prune(now)
+        if self._tokens_in_window < self._tpm_limit or not self._tokens:
+            return now
+        return self._tokens[0][0] + _WINDOW_S
+
+    def _prune(self, now: float) -> None:
+        horizon = now - _WINDOW_S
+        while self._starts and self._starts[0] <= horizon:
+            self._starts.popleft()
+        while self._tokens and self._tokens[0][0] <= horizon:
+            _, tokens = self._tokens.popleft()
+            self._tokens_in_window -= tokens
+
+
+def _header_int(value: str | None) -> int | None:
+    if value is None:
+        return None
+    try:
+        return int(float(value.strip()))
+    except ValueError:
+        return None
+
+
+__all__ = ["RateLimitGovernor", "parse_reset_seconds", "parse_tpm_limits"]
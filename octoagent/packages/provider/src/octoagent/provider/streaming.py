@@ -0,0 +1,139 @@
+"""模型输出增量（delta）流式回调。
+
+``ProviderClient`` 三种 transport 都已逐行消费 provider SSE，但原先只在整段
+completion 累积完后返回。本模块提供可选的增量出口：
+
+- ``StreamDelta``：单个文本 / 工具调用增量（``reset`` 表示瞬态重试前已推出的
+  增量作废，消费方应清空本次调用的已收内容）
+- ``bind_delta_callback()``：在当前协程上下文绑定回调（SkillRunner 在每次
+  ``generate`` 前绑定，ProviderModelClient 读取后传给 ``ProviderClient.call``），
+  不改 ``StructuredModelClientProtocol`` 签名
+- ``DeltaTap``：ProviderClient 内部包装，记录首个增量耗时（``ttft_ms``，无论
+  是否绑定回调都写入调用 metadata）
+
+回调是同步的、在解析循环内调用：实现方只做缓冲 / 调度，不得阻塞。
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+import structlog
+
+log = structlog.get_logger()
+
+
+@dataclass(frozen=True, slots=True)
+class StreamDelta:
+    """单个模型输出增量。
+
+    kind:
+        text       — 文本增量（``text``）
+        tool_call  — 工具调用增量（``tool_call_id`` / ``tool_name`` 首次出现时给出，
+                     ``text`` 为 arguments JSON 片段）
+        reset      — 之前推出的增量作废（瞬态传输错误后整次调用重发）
+    """
+
+    kind: str
+    text: str = ""
+    tool_call_id: str = ""
+    tool_name: str = ""
+
+
+DeltaCallback = Callable[[StreamDelta], None]
+
+_CURRENT_DELTA_CALLBACK: ContextVar[DeltaCallback | None] = ContextVar(
+    "octoagent_model_delta_callback",
+    default=None,
+)
+
+
+@contextmanager
+def bind_delta_callback(callback: DeltaCallback | None) -> Iterator[None]:
+    """在当前上下文绑定增量回调（None = 本次调用不推增量）。"""
+    token = _CURRENT_DELTA_CALLBACK.set(callback)
+    try:
+        yield
+    finally:
+        _CURRENT_DELTA_CALLBACK.reset(token)
+
+
+def current_delta_callback() -> DeltaCallback | None:
+    return _CURRENT_DELTA_CALLBACK.get()
+
+
+class DeltaTap:
+    """ProviderClient 一次 ``call()`` 的增量出口：计时 + 转发 + 重试作废。"""
+
+    __slots__ = ("_callback", "_emitted", "_first_at", "_started_at")
+
+    def __init__(self, callback: DeltaCallback | None) -> None:
+        self._callback = callback
+        self._started_at = time.perf_counter()
+        self._first_at: float | None = None
+        self._emitted = False
+
+    @property
+    def ttft_ms(self) -> float | None:
+        """请求发出到首个增量的毫秒数（无增量时 None）"""
+        if self._first_at is None:
+            return None
+        return round((self._first_at - self._started_at) * 1000, 1)
+
+    def text(self, text: str) -> None:
+        if text:
+            self._emit(StreamDelta(kind="text", text=text))
+
+    def tool_call(self, arguments: str, *, tool_call_id: str = "", tool_name: str = "") -> None:
+        if arguments or tool_call_id or tool_name:
+            self._emit(
+                StreamDelta(
+                    kind="tool_call",
+                    text=arguments,
+                    tool_call_id=tool_call_id,
+                    tool_name=tool_name,
+                )
+            )
+
+    def restart(self) -> None:
+        """瞬态重试前调用：重新计时，已推出过增量时通知消费方作废"""
+        self._started_at = time.perf_counter()
+        self._first_at = None
+        if self._emitted:
+            self._emitted = False
+            self._forward(StreamDelta(kind="reset"))
+
+    def _emit(self, delta: StreamDelta) -> None:
+        if self._first_at is None:
+            self._first_at = time.perf_counter()
+        if self._callback is None:
+            return
+        self._emitted = True
+        self._forward(delta)
+
+    def _forward(self, delta: StreamDelta) -> None:
+        if self._callback is None:
+            return
+        try:
+            self._callback(delta)
+        except Exception as exc:
+            # 增量只是体验优化：回调异常不得打断主调用
+            log.warning(
+                "provider_delta_callback_failed",
+                error_type=type(exc).__name__,
+                error=str(exc),
+            )
+            self._callback = None
+
+
+__all__ = [
+    "DeltaCallback",
+    "DeltaTap",
+    "StreamDelta",
+    "bind_delta_callback",
+    "current_delta_callback",
+]
@@ -1,7 +1,7 @@
 """CostTracker 单元测试
 
 对齐 tasks.md T015: 验证 calculate_cost() 双通道策略、parse_usage()、
-extract_model_info()、cost_unavailable 标记。
+extract_model_info()、cost_unavailable 标记；summarize_usage() 缓存命中率汇总。
 """
 
 from unittest.mock import MagicMock, patch
@@ -113,6 +113,44 @@ class TestCostTrackerParseUsage:
         usage = CostTracker.parse_usage(response)
         assert usage.total_tokens == 0
 
+    def test_cached_tokens(self):
+        """prompt_tokens_details.cached_tokens 解析为 cache_read_tokens"""
+        response = _make_mock_response(prompt_tokens=1000)
+        response.usage.prompt_tokens_details.cached_tokens = 640
+
+        usage = CostTracker.parse_usage(response)
+        assert usage.cache_read_tokens == 640
+        assert usage.cache_write_tokens == 0
+
+
+class TestCostTrackerSummarizeUsage:
+    """summarize_usage() 多次调用汇总测试"""
+
+    def test_totals_and_cache_hit_ratio(self):
+        summary = CostTracker.summarize_usage(
+            [
+                {"prompt_tokens": 1000, "completion_tokens": 50, "total_tokens": 1050,
+                 "cache_write_tokens": 900},
+                {"prompt_tokens": 1200, "completion_tokens": 30, "total_tokens": 1230,
+                 "cache_read_tokens": 900},
+                {},
+            ]
+        )
+        assert summary == {
+            "calls": 3,
+            "prompt_tokens": 2200,
+            "completion_tokens": 80,
+            "total_tokens": 2280,
+            "cache_read_tokens": 900,
+            "cache_write_tokens": 900,
+            "cache_hit_ratio": 0.4091,
+        }
+
+    def test_empty(self):
+        summary = CostTracker.summarize_usage([])
+        assert summary["calls"] == 0
+        assert summary["cache_hit_ratio"] == 0.0
+
 
 class TestCostTrackerExtractModelInfo:
     """extract_model_info() 模型信息提取测试"""
@@ -0,0 +1,178 @@
+"""Provider HTTP 连接池：本地 stub server 上的 provider 隔离 / 连接上限 / 计量 / 预热。
+
+head-of-line 用例即 before/after 基准：慢 provider 占满共享池时，快 provider 的
+请求延迟（共用池）与独占池下的延迟对比（-s 可见实测值）。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import AsyncIterator
+
+import httpx
+import pytest
+import pytest_asyncio
+from octoagent.provider.http_pool import ProviderPoolConfig, build_pooled_client
+from octoagent.provider.provider_route import ProviderAuthRoute, ProviderRoute
+from octoagent.provider.provider_router import ProviderRouter
+
+_TIMEOUT = httpx.Timeout(10.0)
+_CONCURRENCY = 40
+_BURSTS = 3
+
+
+class _StubServer:
+    """最小 HTTP/1.1 keep-alive 服务：每个请求延迟 delay_s 后回 200"""
+
+    def __init__(self, delay_s: float = 0.005) -> None:
+        self.delay_s = delay_s
+        self.connections = 0
+        self.requests = 0
+        self._server: asyncio.Server | None = None
+
+    @property
+    def url(self) -> str:
+        assert self._server is not None
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+
+    async def close(self) -> None:
+        assert self._server is not None
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        try:
+            while True:
+                try:
+                    await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    return
+                self.requests += 1
+                await asyncio.sleep(self.delay_s)
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\nConnection: keep-alive\r\n\r\nok"
+                )
+                await writer.drain()
+        finally:
+            writer.close()
+
+
+@pytest_asyncio.fixture
+async def stub_server() -> AsyncIterator[_StubServer]:
+    server = _StubServer()
+    await server.start()
+    yield server
+    await server.close()
+
+
+async def _run_bursts(client: httpx.AsyncClient, url: str) -> None:
+    for _ in range(_BURSTS):
+        responses = await asyncio.gather(*(client.get(url) for _ in range(_CONCURRENCY)))
+        assert all(response.status_code == 200 for response in responses)
+
+
+def _route(alias: str, url: str) -> ProviderRoute:
+    return ProviderRoute(
+        alias=alias,
+        provider=alias,
+        model="m",
+        transport="openai_chat",
+        api_base=url,
+        auth=ProviderAuthRoute(kind="api_key", env="LOCAL_API_KEY"),
+    )
+
+
+async def _fast_latency_while_slow_saturated(router: ProviderRouter, busy: int) -> float:
+    slow_http = router.resolve_for_alias("slow").client._http
+    fast = router.resolve_for_alias("fast")
+    slow_calls = [
+        asyncio.create_task(slow_http.get(router._route_resolver("slow").api_base))
+        for _ in range(busy)
+    ]
+    while router.pool_stats()["shared"]["in_flight"] < busy:
+        await asyncio.sleep(0.005)
+    started = time.perf_counter()
+    response = await fast.client._http.get(router._route_resolver("fast").api_base)
+    elapsed = time.perf_counter() - started
+    assert response.status_code == 200
+    await asyncio.gather(*slow_calls)
+    return elapsed
+
+
+@pytest.mark.asyncio
+async def test_dedicated_pool_removes_head_of_line_wait(stub_server: _StubServer) -> None:
+    slow_server = _StubServer(delay_s=0.4)
+    await slow_server.start()
+    busy = 100  # 填满共享池（httpx 默认 max_connections=100）
+    try:
+        # before：两个 provider 共用默认池，slow 占满连接后 fast 只能排队
+        routes = {"slow": _route("slow", slow_server.url), "fast": _route("fast", stub_server.url)}
+        router = ProviderRouter(route_resolver=routes.__getitem__)
+        try:
+            before = await _fast_latency_while_slow_saturated(router, busy)
+        finally:
+            await router.aclose()
+
+        # after：fast 配置独占池，不受 slow 占满共享池影响
+        pools = {"fast": ProviderPoolConfig(max_connections=4)}
+        router = ProviderRouter(route_resolver=routes.__getitem__, pool_resolver=pools.get)
+        try:
+            after = await _fast_latency_while_slow_saturated(router, busy)
+            stats = router.pool_stats()
+        finally:
+            await router.aclose()
+    finally:
+        await slow_server.close()
+
+    print(f"fast-provider latency with slow provider saturated: {before:.3f}s -> {after:.3f}s")
+    assert before >= slow_server.delay_s / 2
+    # stub server 与客户端同一事件循环，负载下绝对值会抖动：只断言相对差距
+    assert after * 2 < before
+    assert stats["shared"]["peak_in_flight"] == busy
+    assert stats["providers"]["fast"]["requests_total"] == 1
+
+
+@pytest.mark.asyncio
+async def test_max_connections_caps_concurrent_sockets(stub_server: _StubServer) -> None:
+    client, transport = build_pooled_client(
+        ProviderPoolConfig(max_connections=4), timeout=_TIMEOUT
+    )
+    async with client:
+        await _run_bursts(client, stub_server.url)
+        stats = transport.stats()
+
+    assert stub_server.connections <= 4
+    assert stats["connections"] <= 4
+    # 排队等待连接的请求同样计入在途
+    assert stats["peak_in_flight"] == _CONCURRENCY
+
+
+@pytest.mark.asyncio
+async def test_streamed_response_counts_in_flight_until_closed(stub_server: _StubServer) -> None:
+    client, transport = build_pooled_client(None, timeout=_TIMEOUT)
+    async with client:
+        async with client.stream("GET", stub_server.url) as response:
+            assert transport.stats()["in_flight"] == 1
+            await response.aread()
+        assert transport.stats()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_router_warm_up_opens_connection(stub_server: _StubServer) -> None:
+    route = _route("local", stub_server.url)
+    routes = {"main": route, "cheap": route.model_copy(update={"alias": "cheap"})}
+    pools = {"local": ProviderPoolConfig(warmup=True)}
+    router = ProviderRouter(route_resolver=routes.__getitem__, pool_resolver=pools.get)
+    try:
+        assert await router.warm_up(["main", "cheap", "missing"]) == {"local": True}
+        assert stub_server.connections == 1
+        stats = router.pool_stats()["providers"]["local"]
+        assert stats["idle_connections"] == 1
+    finally:
+        await router.aclose()
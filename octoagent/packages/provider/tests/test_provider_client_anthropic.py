@@ -326,3 +326,73 @@ async def test_anthropic_thinking_passthrough() -> None:
     )
     body = http.calls[0]["json"]
     assert body["thinking"] == {"type": "enabled", "budget_tokens": 8000}
+
+
+@pytest.mark.asyncio
+async def test_anthropic_cache_breakpoints_and_cached_usage() -> None:
+    """带 cache_control 标记的 system 块 → 带断点的 system text block；
+    最后一条消息加滚动断点；缓存命中 / 写入 token 记入 token_usage。"""
+    lines = _ok_anthropic_text_lines()
+    lines[0] = (
+        'data: {"type":"message_start","message":{"id":"msg_x","model":"claude-4",'
+        '"usage":{"input_tokens":10,"cache_read_input_tokens":800,'
+        '"cache_creation_input_tokens":200,"output_tokens":1}}}'
+    )
+    http = _FakeAsyncClient([_FakeResponse(lines)])
+    client = ProviderClient(_runtime(), http_client=http)  # type: ignore[arg-type]
+    _, _, metadata = await client.call(
+        instructions="primary",
+        history=[
+            {"role": "system", "content": "core", "cache_control": "ephemeral"},
+            {"role": "system", "content": "context", "cache_control": "ephemeral"},
+            {"role": "system", "content": "volatile"},
+            {"role": "user", "content": "hi"},
+        ],
+        tools=[],
+        model_name="claude-sonnet-4",
+    )
+
+    body = http.calls[0]["json"]
+    ephemeral = {"type": "ephemeral"}
+    assert body["system"] == [
+        {"type": "text", "text": "primary"},
+        {"type": "text", "text": "core", "cache_control": ephemeral},
+        {"type": "text", "text": "context", "cache_control": ephemeral},
+        {"type": "text", "text": "volatile"},
+    ]
+    assert body["messages"] == [
+        {
+            "role": "user",
+            "content": [{"type": "text", "text": "hi", "cache_control": ephemeral}],
+        }
+    ]
+    assert metadata["token_usage"] == {
+        "prompt_tokens": 1010,
+        "completion_tokens": 3,
+        "total_tokens": 1013,
+        "cache_read_tokens": 800,
+        "cache_write_tokens": 200,
+    }
+
+
+@pytest.mark.asyncio
+async def test_anthropic_cache_breakpoints_capped() -> None:
+    """system 断点最多 3 个（留 1 个给最后一条消息），保留最靠后的。"""
+    http = _FakeAsyncClient([_FakeResponse(_ok_anthropic_text_lines())])
+    client = ProviderClient(_runtime(), http_client=http)  # type: ignore[arg-type]
+    await client.call(
+        instructions="",
+        history=[
+            *(
+                {"role": "system", "content": f"s{i}", "cache_control": "ephemeral"}
+                for i in range(5)
+            ),
+            {"role": "user", "content": "hi"},
+        ],
+        tools=[],
+        model_name="claude-sonnet-4",
+    )
+
+    body = http.calls[0]["json"]
+    marked = [block["text"] for block in body["system"] if "cache_control" in block]
+    assert marked == ["s2", "s3", "s4"]
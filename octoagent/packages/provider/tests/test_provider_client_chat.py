@@ -207,6 +207,37 @@ async def test_chat_system_message_merge() -> None:
         assert m.get("role") != "system"
 
 
+@pytest.mark.asyncio
+async def test_chat_cached_tokens_and_marker_stripped() -> None:
+    """prompt_tokens_details.cached_tokens 记为 cache_read_tokens；
+    OpenAI 兼容端不认识 cache_control，请求前剥离。"""
+    lines = _ok_chat_lines()
+    lines[2] = (
+        'data: {"choices":[{"delta":{}}],"usage":{"prompt_tokens":1000,'
+        '"completion_tokens":3,"total_tokens":1003,'
+        '"prompt_tokens_details":{"cached_tokens":768}}}'
+    )
+    http = _FakeAsyncClient([_FakeResponse(lines)])
+    client = ProviderClient(_runtime(), http_client=http)  # type: ignore[arg-type]
+    _, _, metadata = await client.call(
+        instructions="",
+        history=[
+            {"role": "system", "content": "core", "cache_control": "ephemeral"},
+            {"role": "user", "content": "hi"},
+        ],
+        tools=[],
+        model_name="Qwen",
+    )
+
+    assert metadata["token_usage"] == {
+        "prompt_tokens": 1000,
+        "completion_tokens": 3,
+        "total_tokens": 1003,
+        "cache_read_tokens": 768,
+    }
+    assert http.calls[0]["json"]["messages"][0] == {"role": "system", "content": "core"}
+
+
 @pytest.mark.asyncio
 async def test_chat_streamed_tool_calls() -> None:
     """流式 tool_calls 按 index 累积，arguments 拆 chunk。"""
@@ -0,0 +1,214 @@
+"""ProviderClient 增量回调（on_delta）+ ttft_ms 单测。
+
+覆盖：
+- 三种 transport 边解析边推 text / tool_call 增量，累积结果不变
+- 未提供回调时仍记录 metadata["ttft_ms"]
+- 瞬态传输错误重发前推 reset
+- 回调抛异常不打断主调用
+- bind_delta_callback 上下文绑定 / 恢复
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+import httpx
+import pytest
+from octoagent.provider.auth_resolver import ResolvedAuth
+from octoagent.provider.provider_client import ProviderClient
+from octoagent.provider.provider_runtime import ProviderRuntime
+from octoagent.provider.streaming import (
+    StreamDelta,
+    bind_delta_callback,
+    current_delta_callback,
+)
+from octoagent.provider.transport import ProviderTransport
+
+pytestmark = pytest.mark.usefixtures("allow_model_requests_for_dispatch_tests")
+
+
+class _StubResolver:
+    async def resolve(self) -> ResolvedAuth:
+        return ResolvedAuth(bearer_token="tok-x")
+
+    async def force_refresh(self) -> ResolvedAuth | None:
+        return None
+
+
+class _FakeResponse:
+    def __init__(self, lines: list[str], *, fail_after: int | None = None) -> None:
+        self._lines = lines
+        self._fail_after = fail_after
+        self.status_code = 200
+        self.request = None
+
+    async def aread(self) -> bytes:
+        return b""
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+    async def aiter_lines(self):
+        for index, line in enumerate(self._lines):
+            if self._fail_after is not None and index >= self._fail_after:
+                raise httpx.ReadError("connection reset")
+            yield line
+
+
+class _FakeAsyncClient:
+    def __init__(self, responses: list[_FakeResponse]) -> None:
+        self._responses = responses
+
+    def stream(self, method: str, url: str, *, json=None, headers=None) -> _FakeResponse:
+        return self._responses.pop(0)
+
+
+def _client(transport: ProviderTransport, responses: list[_FakeResponse]) -> ProviderClient:
+    runtime = ProviderRuntime(
+        provider_id="test",
+        transport=transport,
+        api_base="https://api.example.com",
+        auth_resolver=_StubResolver(),
+    )
+    return ProviderClient(runtime, http_client=_FakeAsyncClient(responses))  # type: ignore[arg-type]
+
+
+async def _call(client: ProviderClient, on_delta=None) -> tuple[str, list, dict[str, Any]]:
+    return await client.call(
+        instructions="sys",
+        history=[{"role": "user", "content": "hi"}],
+        tools=[],
+        model_name="m",
+        on_delta=on_delta,
+    )
+
+
+_CHAT_LINES = [
+    'data: {"choices":[{"delta":{"content":"Hel"}}]}',
+    'data: {"choices":[{"delta":{"content":"lo"}}]}',
+    'data: {"choices":[{"delta":{"tool_calls":[{"index":0,"id":"call_1",'
+    '"function":{"name":"web__search","arguments":"{\\"q\\":"}}]}}]}',
+    'data: {"choices":[{"delta":{"tool_calls":[{"index":0,'
+    '"function":{"arguments":"\\"x\\"}"}}]}}]}',
+    "data: [DONE]",
+]
+
+
+@pytest.mark.asyncio
+async def test_chat_streams_text_and_tool_call_deltas() -> None:
+    deltas: list[StreamDelta] = []
+
+    content, tool_calls, metadata = await _call(
+        _client(ProviderTransport.OPENAI_CHAT, [_FakeResponse(_CHAT_LINES)]), deltas.append
+    )
+
+    assert content == "Hello"
+    assert tool_calls[0]["arguments"] == {"q": "x"}
+    assert [(d.kind, d.text) for d in deltas] == [
+        ("text", "Hel"),
+        ("text", "lo"),
+        ("tool_call", '{"q":'),
+        ("tool_call", '"x"}'),
+    ]
+    assert deltas[2].tool_name == "web.search"
+    assert {d.tool_call_id for d in deltas[2:]} == {"call_1"}
+    assert metadata["ttft_ms"] >= 0
+
+
+@pytest.mark.asyncio
+async def test_anthropic_streams_deltas() -> None:
+    lines = [
+        'data: {"type":"message_start",'
+        '"message":{"id":"m","model":"c","usage":{"input_tokens":1}}}',
+        'data: {"type":"content_block_delta","index":0,"delta":{"type":"text_delta","text":"Hi"}}',
+        'data: {"type":"content_block_start","index":1,'
+        '"content_block":{"type":"tool_use","id":"toolu_1","name":"demo"}}',
+        'data: {"type":"content_block_delta","index":1,'
+        '"delta":{"type":"input_json_delta","partial_json":"{}"}}',
+        'data: {"type":"message_stop"}',
+    ]
+    deltas: list[StreamDelta] = []
+
+    content, tool_calls, _ = await _call(
+        _client(ProviderTransport.ANTHROPIC_MESSAGES, [_FakeResponse(lines)]), deltas.append
+    )
+
+    assert content == "Hi"
+    assert tool_calls[0]["tool_name"] == "demo"
+    assert [(d.kind, d.text, d.tool_call_id) for d in deltas] == [
+        ("text", "Hi", ""),
+        ("tool_call", "", "toolu_1"),
+        ("tool_call", "{}", "toolu_1"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_responses_streams_text_deltas() -> None:
+    lines = [
+        'data: {"type": "response.output_text.delta", "delta": "A"}',
+        'data: {"type": "response.output_text.delta", "delta": "B"}',
+        'data: {"type": "response.completed", "response": {"usage": {}}}',
+    ]
+    deltas: list[StreamDelta] = []
+
+    content, _, _ = await _call(
+        _client(ProviderTransport.OPENAI_RESPONSES, [_FakeResponse(lines)]), deltas.append
+    )
+
+    assert content == "AB"
+    assert [d.text for d in deltas] == ["A", "B"]
+
+
+@pytest.mark.asyncio
+async def test_ttft_recorded_without_callback() -> None:
+    _, _, metadata = await _call(
+        _client(ProviderTransport.OPENAI_CHAT, [_FakeResponse(_CHAT_LINES)])
+    )
+
+    assert "ttft_ms" in metadata
+
+
+@pytest.mark.asyncio
+async def test_transient_retry_emits_reset(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("octoagent.provider.provider_client._TRANSIENT_BACKOFF_BASE_S", 0)
+    deltas: list[StreamDelta] = []
+    client = _client(
+        ProviderTransport.OPENAI_CHAT,
+        [_FakeResponse(_CHAT_LINES, fail_after=1), _FakeResponse(_CHAT_LINES)],
+    )
+
+    content, _, _ = await _call(client, deltas.append)
+
+    assert content == "Hello"
+    kinds = [d.kind for d in deltas]
+    assert kinds[:2] == ["text", "reset"]
+    assert "".join(d.text for d in deltas[2:] if d.kind == "text") == "Hello"
+
+
+@pytest.mark.asyncio
+async def test_failing_callback_does_not_break_call() -> None:
+    calls = 0
+
+    def _boom(delta: StreamDelta) -> None:
+        nonlocal calls
+        calls += 1
+        raise RuntimeError("sink down")
+
+    content, _, _ = await _call(
+        _client(ProviderTransport.OPENAI_CHAT, [_FakeResponse(_CHAT_LINES)]), _boom
+    )
+
+    assert content == "Hello"
+    assert calls == 1  # 首次异常后回调被摘除
+
+
+def test_bind_delta_callback_restores_previous() -> None:
+    outer: list[StreamDelta] = []
+    with bind_delta_callback(outer.append):
+        with bind_delta_callback(None):
+            assert current_delta_callback() is None
+        assert current_delta_callback() == outer.append
+    assert current_delta_callback() is None
@@ -13,6 +13,7 @@ from octoagent.provider.auth.profile import ProviderProfile
 from octoagent.provider.auth.store import CredentialStore
 from octoagent.provider.auth_resolver import OAuthResolver, StaticApiKeyResolver
 from octoagent.provider.exceptions import CredentialError
+from octoagent.provider.http_pool import ProviderPoolConfig
 from octoagent.provider.provider_route import ProviderAuthRoute, ProviderRoute
 from octoagent.provider.provider_router import ProviderRouter
 from octoagent.provider.transport import ProviderTransport
@@ -237,3 +238,92 @@ async def test_router_rebuilds_inconsistent_cache_and_rejects_unsupported_auth_r
             router.resolve_for_alias("invalid")
     finally:
         await router.aclose()
+
+
+@pytest.mark.asyncio
+async def test_router_gives_pooled_providers_dedicated_http_clients() -> None:
+    pools = {"anthropic-api": ProviderPoolConfig(max_connections=4, keepalive_expiry_s=30)}
+    state = {
+        "main": _route(),
+        "other": _route(alias="other", provider="openrouter", api_base="https://openrouter.ai/api"),
+        "pooled": _route(alias="pooled", provider="anthropic-api"),
+    }
+    router = ProviderRouter(route_resolver=_resolver(state), pool_resolver=pools.get)
+    try:
+        main = router.resolve_for_alias("main")
+        other = router.resolve_for_alias("other")
+        pooled = router.resolve_for_alias("pooled")
+
+        assert main.client._http is other.client._http is router._http
+        assert pooled.client._http is not router._http
+        stats = router.pool_stats()
+        assert set(stats["providers"]) == {"anthropic-api"}
+        assert stats["providers"]["anthropic-api"]["max_connections"] == 4
+        assert stats["providers"]["anthropic-api"]["keepalive_expiry_s"] == 30
+        assert stats["shared"]["in_flight"] == 0
+    finally:
+        await router.aclose()
+
+
+@pytest.mark.asyncio
+async def test_router_rebuilds_pool_when_config_changes() -> None:
+    pools = {"siliconflow": ProviderPoolConfig(max_connections=2)}
+    router = ProviderRouter(route_resolver=_resolver({"main": _route()}), pool_resolver=pools.get)
+    try:
+        pinned = router.resolve_for_alias("main", task_scope="task-A")
+        pools["siliconflow"] = ProviderPoolConfig(max_connections=8)
+        fresh = router.resolve_for_alias("main")
+
+        assert fresh.client is not pinned.client
+        assert fresh.client._http is not pinned.client._http
+        assert router.pool_stats()["providers"]["siliconflow"]["max_connections"] == 8
+        # 已 pinned 的旧 client 不会被立刻关闭
+        assert not pinned.client._http.is_closed
+    finally:
+        await router.aclose()
+    assert pinned.client._http.is_closed
+
+
+@pytest.mark.asyncio
+async def test_router_falls_back_to_shared_pool_when_pool_resolver_fails() -> None:
+    def broken(_provider_id: str) -> ProviderPoolConfig | None:
+        raise ValueError("bad yaml")
+
+    router = ProviderRouter(route_resolver=_resolver({"main": _route()}), pool_resolver=broken)
+    try:
+        assert router.resolve_for_alias("main").client._http is router._http
+    finally:
+        await router.aclose()
+
+
+@pytest.mark.asyncio
+async def test_router_shares_rate_governor_across_client_rebuilds() -> None:
+    pools = {"siliconflow": ProviderPoolConfig(max_connections=2)}
+    router = ProviderRouter(
+        route_resolver=_resolver({"main": _route()}),
+        pool_resolver=pools.get,
+        tpm_limits={"siliconflow": 5000},
+    )
+    try:
+        pinned = router.resolve_for_alias("main", task_scope="task-A")
+        pools["siliconflow"] = ProviderPoolConfig(max_connections=8)
+        fresh = router.resolve_for_alias("main")
+
+        assert fresh.client is not pinned.client
+        assert fresh.client._governor is pinned.client._governor
+        stats = router.rate_limit_stats()
+        assert set(stats) == {"siliconflow"}
+        assert stats["siliconflow"]["tpm_limit"] == 5000
+        assert stats["siliconflow"]["throttled"] is False
+    finally:
+        await router.aclose()
+
+
+@pytest.mark.asyncio
+async def test_router_rate_governor_can_be_disabled() -> None:
+    router = ProviderRouter(route_resolver=_resolver({"main": _route()}), rate_governor=False)
+    try:
+        assert router.resolve_for_alias("main").client._governor is None
+        assert router.rate_limit_stats() == {}
+    finally:
+        await router.aclose()
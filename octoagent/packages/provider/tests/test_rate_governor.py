@@ -0,0 +1,250 @@
+"""Provider 共享限流治理器：AIMD / 冷却 / 限流头解析 / 跨调用方节拍 / TPM 预算。
+
+虚拟时钟：sleep 只推进时钟，用例不真等待（并发节拍用例除外，需真实事件循环计时）。
+"""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+from email.utils import format_datetime
+from typing import Any
+
+import httpx
+import pytest
+from octoagent.provider.auth_resolver import ResolvedAuth
+from octoagent.provider.provider_client import LLMCallError, ProviderClient
+from octoagent.provider.provider_runtime import ProviderRuntime
+from octoagent.provider.rate_governor import (
+    RateLimitGovernor,
+    parse_reset_seconds,
+    parse_tpm_limits,
+)
+from octoagent.provider.transport import ProviderTransport
+
+pytestmark = pytest.mark.usefixtures("allow_model_requests_for_dispatch_tests")
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+        await asyncio.sleep(0)
+
+
+def _governor(clock: _Clock, **kwargs: Any) -> RateLimitGovernor:
+    kwargs.setdefault("min_rpm", 6)
+    return RateLimitGovernor("test", clock=clock, sleep=clock.sleep, **kwargs)
+
+
+async def _burst(governor: RateLimitGovernor, count: int) -> None:
+    for _ in range(count):
+        await governor.acquire()
+
+
+def test_parse_reset_seconds_formats() -> None:
+    now = datetime(2026, 1, 1, tzinfo=UTC)
+    assert parse_reset_seconds("2") == 2.0
+    assert parse_reset_seconds("0.5") == 0.5
+    assert parse_reset_seconds("6m0s") == 360.0
+    assert parse_reset_seconds("1m30.5s") == 90.5
+    assert parse_reset_seconds("250ms") == 0.25
+    assert parse_reset_seconds("2026-01-01T00:00:07Z", now=now) == 7.0
+    http_date = format_datetime(now + timedelta(seconds=30), usegmt=True)
+    assert parse_reset_seconds(http_date, now=now) == 30.0
+    assert parse_reset_seconds("soon") is None
+    assert parse_reset_seconds(None) is None
+
+
+def test_parse_tpm_limits_ignores_invalid_items() -> None:
+    assert parse_tpm_limits("openai=90000, anthropic = 40000,bad=x,zero=0,,x") == {
+        "openai": 90000,
+        "anthropic": 40000,
+    }
+
+
+@pytest.mark.asyncio
+async def test_unthrottled_until_first_rate_limit() -> None:
+    clock = _Clock()
+    governor = _governor(clock)
+
+    await _burst(governor, 50)
+
+    assert clock.sleeps == []
+    snapshot = governor.snapshot()
+    assert snapshot["throttled"] is False
+    assert snapshot["observed_rpm"] == 50
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_honours_retry_after_and_halves_observed_rate() -> None:
+    clock = _Clock()
+    governor = _governor(clock)
+    await _burst(governor, 40)
+
+    governor.observe(429, {"retry-after": "2"})
+
+    assert governor.rpm_limit == 20
+    assert governor.snapshot()["cooldown_remaining_s"] == 2.0
+    waited = await governor.acquire()
+    assert waited == pytest.approx(2.0)
+
+
+@pytest.mark.asyncio
+async def test_additive_recovery_lifts_limit_at_ceiling() -> None:
+    clock = _Clock()
+    governor = _governor(clock)
+    await _burst(governor, 10)
+    governor.observe(429, {"retry-after-ms": "0"})
+    assert governor.rpm_limit == 6  # 10 * 0.5 = 5 < min_rpm
+
+    for _ in range(13):
+        governor.observe(200, {})
+    assert governor.rpm_limit == 19
+
+    governor.observe(200, {})  # 达到首次限流时速率的两倍（20）后解除
+    assert governor.rpm_limit is None
+    assert governor.snapshot()["rate_limited_total"] == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_are_paced_fifo() -> None:
+    # 真实时钟：并发等待者需要真实的事件循环计时（min_rpm=1200 → 50ms 一个节拍）
+    governor = RateLimitGovernor("test", min_rpm=1200)
+    governor.observe(429, {"retry-after": "0"})  # 无实测速率 → 降到 min_rpm
+    depths: list[int] = []
+
+    async def _probe() -> None:
+        await asyncio.sleep(0.01)
+        depths.append(governor.queue_depth)
+
+    waits = await asyncio.gather(*(governor.acquire() for _ in range(3)), _probe())
+
+    assert waits[0] == 0
+    assert waits[1] == pytest.approx(0.05, abs=0.01)
+    assert waits[2] == pytest.approx(0.10, abs=0.01)
+    assert depths == [2]
+    assert governor.queue_depth == 0
+    assert governor.snapshot()["paced_total"] == 2
+
+
+@pytest.mark.asyncio
+async def test_zero_remaining_header_starts_cooldown_before_429() -> None:
+    clock = _Clock()
+    governor = _governor(clock)
+
+    governor.observe(
+        200,
+        {"x-ratelimit-remaining-requests": "0", "x-ratelimit-reset-requests": "1.5s"},
+    )
+
+    assert governor.snapshot()["header_remaining"] == {"x-ratelimit-remaining-requests": 0}
+    assert await governor.acquire() == pytest.approx(1.5)
+    assert governor.rpm_limit is None
+
+
+@pytest.mark.asyncio
+async def test_tpm_budget_waits_for_window_to_slide() -> None:
+    clock = _Clock()
+    governor = _governor(clock, tpm_limit=1000)
+    await governor.acquire()
+    governor.record_usage(600)
+    clock.now += 10
+    await governor.acquire()
+    governor.record_usage(500)
+
+    assert governor.snapshot()["tokens_remaining"] == 0
+    # 最早的 600 token 在 50s 后滑出一分钟窗口
+    assert await governor.acquire() == pytest.approx(50.0)
+    assert governor.snapshot()["tokens_last_minute"] == 500
+
+
+class _StubResolver:
+    async def resolve(self) -> ResolvedAuth:
+        return ResolvedAuth(bearer_token="tok-x")
+
+    async def force_refresh(self) -> ResolvedAuth | None:
+        return None
+
+
+class _FakeResponse:
+    def __init__(
+        self, status_code: int, lines: list[str], headers: dict[str, str] | None = None
+    ) -> None:
+        self.status_code = status_code
+        self.headers = httpx.Headers(headers or {})
+        self._lines = lines
+        self.request = httpx.Request("POST", "https://api.example.com")
+
+    async def aread(self) -> bytes:
+        return b"rate limited"
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+    async def aiter_lines(self):
+        for line in self._lines:
+            yield line
+
+
+class _FakeAsyncClient:
+    def __init__(self, responses: list[_FakeResponse]) -> None:
+        self._responses = responses
+
+    def stream(self, method: str, url: str, *, json=None, headers=None) -> _FakeResponse:
+        return self._responses.pop(0)
+
+
+@pytest.mark.asyncio
+async def test_provider_client_feeds_governor() -> None:
+    clock = _Clock()
+    governor = _governor(clock, tpm_limit=10_000)
+    runtime = ProviderRuntime(
+        provider_id="test",
+        transport=ProviderTransport.OPENAI_CHAT,
+        api_base="https://api.example.com",
+        auth_resolver=_StubResolver(),
+    )
+    ok_lines = [
+        'data: {"choices":[{"delta":{"content":"ok"}}]}',
+        'data: {"choices":[],"usage":{"prompt_tokens":5,"completion_tokens":2,'
+        '"total_tokens":7}}',
+        "data: [DONE]",
+    ]
+    http = _FakeAsyncClient(
+        [
+            _FakeResponse(429, [], {"retry-after": "3"}),
+            _FakeResponse(200, ok_lines, {"x-ratelimit-remaining-tokens": "900"}),
+        ]
+    )
+    client = ProviderClient(runtime, http_client=http, governor=governor)  # type: ignore[arg-type]
+    kwargs: dict[str, Any] = {
+        "instructions": "sys",
+        "history": [{"role": "user", "content": "hi"}],
+        "tools": [],
+        "model_name": "m",
+    }
+
+    with pytest.raises(LLMCallError) as exc_info:
+        await client.call(**kwargs)
+    assert exc_info.value.error_type == "rate_limit"
+    assert exc_info.value.paced_by_governor is True
+
+    content, _, _ = await client.call(**kwargs)
+
+    assert content == "ok"
+    assert clock.sleeps == [pytest.approx(3.0)]
+    snapshot = governor.snapshot()
+    assert snapshot["rate_limited_total"] == 1
+    assert snapshot["tokens_last_minute"] == 7
+    assert snapshot["header_remaining"] == {"x-ratelimit-remaining-tokens": 900}
@@ -50,6 +50,7 @@ from .pipeline_registry import PipelineRegistry
 from .pipeline_tool import GraphPipelineTool
 from .registry_base import AssetSource, BaseFilesystemRegistry
 from .protocols import (
+    ModelDeltaSinkProtocol,
     SkillRegistryProtocol,
     SkillRunnerProtocol,
     StructuredModelClientProtocol,
@@ -92,6 +93,7 @@ __all__ = [
     "extract_mounted_tool_names",
     "resolve_effective_tool_allowlist",
     "StructuredModelClientProtocol",
+    "ModelDeltaSinkProtocol",
     "SkillRunnerProtocol",
     "SkillRegistryProtocol",
     "RegisteredSkill",
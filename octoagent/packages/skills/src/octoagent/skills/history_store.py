@@ -0,0 +1,451 @@
+"""ProviderModelClient 对话历史存储：按字节计量的内存预算 + SQLite 落盘 + 按需恢复。
+
+以 ``task_id:trace_id`` 为 key 保存 SkillRunner 多步循环的完整消息列表
+（含 tool_calls / tool 结果）。长时间、工具密集的会话会让单条历史涨到 MB 级，
+仅按条目数淘汰无法约束常驻内存。
+
+- 常驻层：OrderedDict LRU，按消息 JSON（UTF-8）字节数计量；超出预算时把最久未用、
+  且不在 generate 调用中的历史落盘，直到回落到预算的 90%
+- 增量计量：逐条消息记录字节数，``release`` 只序列化上次计量后追加的消息；原地改写
+  已有消息（上下文折叠）的调用方用 ``remeasure`` 报告改写位置
+- 落盘层：SQLite（WAL），一行一个会话（JSON TEXT）；下一次 ``acquire`` 时按需恢复，
+  aclose 时常驻历史整体落盘，进程重启后同 key 的会话可继续
+- 正在 generate 中的历史（acquire → release 之间）不会被落盘：调用方持有列表引用并
+  原地追加消息，落盘的副本会过期
+- 落盘层任何异常只记日志并退化为纯内存存储（超预算时只告警、不丢历史——丢失历史
+  会让下一步 ``conversation_state_lost``）
+- 内存 / 命中 / 落盘指标见 ``snapshot()``，用于估算 gateway worker 的内存规格
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import sqlite3
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+import structlog
+from octoagent.core.config import SKILL_HISTORY_MEMORY_BYTES
+
+log = structlog.get_logger()
+
+History = list[dict[str, Any]]
+
+#: 落盘会话的保留时长（秒）：崩溃遗留、从未被 clear 的行在打开库时清理
+_SPILL_RETENTION_S = 7 * 24 * 3600
+
+_DDL = """
+CREATE TABLE IF NOT EXISTS conversation_history (
+    history_key TEXT PRIMARY KEY,
+    payload     TEXT NOT NULL,
+    size_bytes  INTEGER NOT NULL,
+    updated_at  REAL NOT NULL
+) WITHOUT ROWID
+"""
+
+
+@dataclass(slots=True)
+class HistoryStoreStats:
+    """存储运行指标（进程内累计）"""
+
+    hits: int = 0
+    rehydrations: int = 0
+    misses: int = 0
+    spills: int = 0
+    spilled_bytes: int = 0
+    disk_errors: int = 0
+    over_budget_warnings: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.rehydrations + self.misses
+        if total == 0:
+            return 0.0
+        return (self.hits + self.rehydrations) / total
+
+
+def history_bytes(history: History) -> int:
+    """历史的计量字节数（消息 JSON 的 UTF-8 长度，与送往 provider 的体积同阶）"""
+    return _total_bytes([message_bytes(message) for message in history])
+
+
+def message_bytes(message: dict[str, Any]) -> int:
+    """单条消息的计量字节数"""
+    return len(_dumps(message).encode("utf-8"))
+
+
+def _total_bytes(sizes: list[int]) -> int:
+    # 与 json.dumps(history) 的长度一致：外层 "[]" + 条目间 ", "
+    return sum(sizes) + 2 * len(sizes) if sizes else 2
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, default=str)
+
+
+def _decode(payload: str) -> tuple[History, list[int]]:
+    history: History = json.loads(payload)
+    return history, [message_bytes(message) for message in history]
+
+
+class ConversationHistoryStore:
+    """有界对话历史存储（path=None 时只有常驻层，超预算只告警）
+
+    同步接口（``in`` / ``[]`` / ``pop`` / ``clear`` / ``len``）只作用于常驻层与
+    已知落盘 key 的登记，不触碰磁盘；读写磁盘的只有 ``acquire`` / ``release`` /
+    ``aclose``。
+    """
+
+    def __init__(
+        self,
+        path: Path | None = None,
+        *,
+        memory_budget_bytes: int = SKILL_HISTORY_MEMORY_BYTES,
+    ) -> None:
+        self._path = path
+        self._memory_budget = max(memory_budget_bytes, 0)
+        self._memory: OrderedDict[str, History] = OrderedDict()
+        self._sizes: dict[str, int] = {}
+        # 逐条消息字节数（release 只计量新追加的消息）；落盘写完前保留，写失败放回时复用
+        self._message_sizes: dict[str, list[int]] = {}
+        self._memory_bytes = 0
+        self._peak_memory_bytes = 0
+        self._in_use: set[str] = set()
+        # 正在写盘的历史：写完前被 acquire 直接放回常驻层
+        self._spilling: dict[str, History] = {}
+        # 库中存在的 key（打开库时加载），未登记的 key 不查盘
+        self._disk_keys: set[str] = set()
+        self._pending_deletes: set[str] = set()
+        self._conn: sqlite3.Connection | None = None
+        self._disk_disabled = path is None
+        self._disk_lock = asyncio.Lock()
+        self.stats = HistoryStoreStats()
+
+    # ── 同步接口（常驻层） ─────────────────────────────────────
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._memory or key in self._spilling or key in self._disk_keys
+
+    def __getitem__(self, key: str) -> History:
+        return self._memory[key]
+
+    def __setitem__(self, key: str, history: History) -> None:
+        self._forget_resident(key)
+        self._pending_deletes.discard(key)
+        self._memory[key] = history
+        self._message_sizes.pop(key, None)
+        self._measure(key, history)
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    def pop(self, key: str, default: History | None = None) -> History | None:
+        """丢弃会话（常驻 + 落盘副本；磁盘删除延迟到下一次磁盘操作）"""
+        history = self._forget_resident(key)
+        self._message_sizes.pop(key, None)
+        spilling = self._spilling.pop(key, None)
+        if key in self._disk_keys or spilling is not None:
+            self._disk_keys.discard(key)
+            self._pending_deletes.add(key)
+        self._in_use.discard(key)
+        if history is not None:
+            return history
+        return spilling if spilling is not None else default
+
+    def clear(self) -> None:
+        """只清常驻层（落盘会话保留，供重启后恢复）"""
+        self._memory.clear()
+        self._sizes.clear()
+        self._message_sizes.clear()
+        self._memory_bytes = 0
+        self._in_use.clear()
+
+    @property
+    def memory_bytes(self) -> int:
+        return self._memory_bytes
+
+    def snapshot(self) -> dict[str, float | int | bool]:
+        """指标快照（供 /api/ops/conversation-histories 展示）"""
+        return {
+            **asdict(self.stats),
+            "hit_rate": round(self.stats.hit_rate, 4),
+            "memory_entries": len(self._memory),
+            "memory_bytes": self._memory_bytes,
+            "peak_memory_bytes": self._peak_memory_bytes,
+            "memory_budget_bytes": self._memory_budget,
+            "in_use_entries": len(self._in_use),
+            "spilled_entries": len(self._disk_keys),
+            "disk_enabled": not self._disk_disabled,
+        }
+
+    # ── generate 生命周期 ─────────────────────────────────────
+
+    async def acquire(
+        self,
+        key: str,
+        *,
+        create: Callable[[], History] | None = None,
+    ) -> History | None:
+        """取出会话历史并标记为使用中（常驻 → 写盘中 → 落盘恢复 → create）
+
+        都未命中且未给 create 时返回 None（不标记）。调用方在本次 generate 结束后
+        必须调用 ``release``。
+        """
+        history = self._memory.get(key)
+        if history is not None:
+            self._memory.move_to_end(key)
+            self.stats.hits += 1
+        elif key in self._spilling:
+            history = self._spilling.pop(key)
+            self._memory[key] = history
+            self._measure(key, history)
+            self.stats.hits += 1
+        else:
+            history = await self._rehydrate(key)
+            if history is None:
+                self.stats.misses += 1
+                if create is None:
+                    return None
+                history = create()
+                self[key] = history
+        self._in_use.add(key)
+        return history
+
+    async def release(self, key: str) -> None:
+        """generate 结束：计量本步追加的消息，超预算时落盘其他空闲会话"""
+        self._in_use.discard(key)
+        history = self._memory.get(key)
+        if history is not None:
+            self._measure(key, history)
+        await self._enforce_budget()
+
+    def remeasure(self, key: str, indexes: Iterable[int]) -> None:
+        """重新计量被原地改写的消息（追加的消息由 release 计量，无需报告）"""
+        history = self._memory.get(key)
+        sizes = self._message_sizes.get(key)
+        if history is None or sizes is None:
+            return
+        delta = 0
+        for index in indexes:
+            if 0 <= index < len(sizes):
+                size = message_bytes(history[index])
+                delta += size - sizes[index]
+                sizes[index] = size
+        if delta:
+            self._account(key, self._sizes[key] + delta)
+
+    async def aclose(self) -> None:
+        """常驻会话整体落盘后关闭连接（无落盘层时直接丢弃）"""
+        if not self._disk_disabled and self._memory:
+            rows = [(key, _dumps(history)) for key, history in self._memory.items()]
+            if await self._disk_put(rows):
+                self._disk_keys.update(key for key, _ in rows)
+        await self._disk_flush_deletes()
+        self.clear()
+        async with self._disk_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # ── 常驻层计量 ────────────────────────────────────────────
+
+    def _measure(self, key: str, history: History) -> None:
+        """计量常驻历史：已知前缀复用逐条字节数，只序列化新追加的消息
+
+        历史变短（被整体替换或截断）时退化为全量计量。
+        """
+        sizes = self._message_sizes.get(key)
+        if sizes is None or len(sizes) > len(history):
+            sizes = self._message_sizes[key] = [message_bytes(m) for m in history]
+            self._account(key, _total_bytes(sizes))
+            return
+        added = [message_bytes(m) for m in history[len(sizes) :]]
+        sizes.extend(added)
+        current = self._sizes.get(key)
+        if current is None or len(sizes) == len(added):
+            self._account(key, _total_bytes(sizes))
+        elif added:
+            self._account(key, current + sum(added) + 2 * len(added))
+
+    def _account(self, key: str, size: int) -> None:
+        self._memory_bytes += size - self._sizes.get(key, 0)
+        self._sizes[key] = size
+        self._peak_memory_bytes = max(self._peak_memory_bytes, self._memory_bytes)
+
+    def _forget_resident(self, key: str) -> History | None:
+        history = self._memory.pop(key, None)
+        self._memory_bytes -= self._sizes.pop(key, 0)
+        return history
+
+    async def _enforce_budget(self) -> None:
+        if self._memory_budget == 0 or self._memory_bytes <= self._memory_budget:
+            return
+        if self._disk_disabled:
+            self.stats.over_budget_warnings += 1
+            log.warning(
+                "conversation_history_over_budget",
+                memory_bytes=self._memory_bytes,
+                budget_bytes=self._memory_budget,
+                entries=len(self._memory),
+            )
+            return
+        target = int(self._memory_budget * 0.9)
+        rows: list[tuple[str, str]] = []
+        for key in list(self._memory):
+            if self._memory_bytes <= target:
+                break
+            if key in self._in_use:
+                continue
+            history = self._forget_resident(key)
+            assert history is not None
+            self._spilling[key] = history
+            rows.append((key, _dumps(history)))
+        if not rows:
+            return
+        written = await self._disk_put(rows)
+        for key, payload in rows:
+            history = self._spilling.pop(key, None)
+            if history is None:
+                continue  # 写盘期间被 acquire 取回或被 pop
+            if written:
+                self._disk_keys.add(key)
+                self.stats.spills += 1
+                self.stats.spilled_bytes += len(payload.encode("utf-8"))
+            else:
+                self._memory[key] = history
+                self._memory.move_to_end(key, last=False)
+                self._measure(key, history)
+                continue
+            self._message_sizes.pop(key, None)
+        if written:
+            log.info(
+                "conversation_history_spilled",
+                count=len(rows),
+                memory_bytes=self._memory_bytes,
+                budget_bytes=self._memory_budget,
+            )
+
+    # ── 落盘层 ────────────────────────────────────────────────
+    # 与 EmbeddingCache 相同：标准库 sqlite3 + asyncio.to_thread，_disk_lock 串行化
+    # 同一连接上的访问
+
+    async def _rehydrate(self, key: str) -> History | None:
+        if self._disk_disabled:
+            return None
+        if self._conn is None:
+            await self._disk_open()
+        if key not in self._disk_keys:
+            return None
+        await self._disk_flush_deletes()
+        async with self._disk_lock:
+            try:
+                payload = await asyncio.to_thread(self._disk_get_sync, key)
+            except Exception as exc:
+                self._disable_disk("read", exc)
+                return None
+        if payload is None:
+            self._disk_keys.discard(key)
+            return None
+        history, sizes = await asyncio.to_thread(_decode, payload)
+        self._memory[key] = history
+        self._message_sizes[key] = sizes
+        self._account(key, _total_bytes(sizes))
+        self.stats.rehydrations += 1
+        return history
+
+    async def _disk_open(self) -> None:
+        async with self._disk_lock:
+            try:
+                keys = await asyncio.to_thread(self._connect_sync)
+            except Exception as exc:
+                self._disable_disk("open", exc)
+                return
+        self._disk_keys.update(keys - self._pending_deletes)
+
+    async def _disk_put(self, rows: list[tuple[str, str]]) -> bool:
+        if self._disk_disabled:
+            return False
+        if self._conn is None:
+            await self._disk_open()
+        await self._disk_flush_deletes()
+        async with self._disk_lock:
+            try:
+                await asyncio.to_thread(self._disk_put_sync, rows)
+            except Exception as exc:
+                self._disable_disk("write", exc)
+                return False
+        return True
+
+    async def _disk_flush_deletes(self) -> None:
+        if self._disk_disabled or self._conn is None or not self._pending_deletes:
+            return
+        keys = list(self._pending_deletes)
+        self._pending_deletes.clear()
+        async with self._disk_lock:
+            try:
+                await asyncio.to_thread(self._disk_delete_sync, keys)
+            except Exception as exc:
+                self._disable_disk("delete", exc)
+
+    def _connect_sync(self) -> set[str]:
+        assert self._path is not None
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self._path), check_same_thread=False, timeout=5.0)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(_DDL)
+        with conn:
+            conn.execute(
+                "DELETE FROM conversation_history WHERE updated_at < ?",
+                (time.time() - _SPILL_RETENTION_S,),
+            )
+        self._conn = conn
+        return {
+            str(row[0])
+            for row in conn.execute("SELECT history_key FROM conversation_history")
+        }
+
+    def _disk_get_sync(self, key: str) -> str | None:
+        assert self._conn is not None
+        row = self._conn.execute(
+            "SELECT payload FROM conversation_history WHERE history_key = ?", (key,)
+        ).fetchone()
+        return None if row is None else str(row[0])
+
+    def _disk_put_sync(self, rows: list[tuple[str, str]]) -> None:
+        assert self._conn is not None
+        now = time.time()
+        with self._conn:
+            self._conn.executemany(
+                """
+                INSERT INTO conversation_history (history_key, payload, size_bytes, updated_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(history_key) DO UPDATE SET
+                    payload = excluded.payload,
+                    size_bytes = excluded.size_bytes,
+                    updated_at = excluded.updated_at
+                """,
+                [(key, payload, len(payload.encode("utf-8")), now) for key, payload in rows],
+            )
+
+    def _disk_delete_sync(self, keys: list[str]) -> None:
+        assert self._conn is not None
+        with self._conn:
+            self._conn.executemany(
+                "DELETE FROM conversation_history WHERE history_key = ?",
+                [(key,) for key in keys],
+            )
+
+    def _disable_disk(self, stage: str, exc: Exception) -> None:
+        self.stats.disk_errors += 1
+        self._disk_disabled = True
+        log.warning(
+            "conversation_history_disk_disabled",
+            stage=stage,
+            path=str(self._path),
+            error=str(exc)[:200],
+        )
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from typing import Protocol
 
+from octoagent.provider.streaming import StreamDelta
 from pydantic import BaseModel
 
 from .manifest import SkillManifest
@@ -32,6 +33,16 @@ class StructuredModelClientProtocol(Protocol):
         """生成单步 Skill 输出。"""
 
 
+class ModelDeltaSinkProtocol(Protocol):
+    """模型输出增量出口（SkillRunner 在每次 generate 期间转发 provider 增量）。"""
+
+    def publish(self, task_id: str, step: int, delta: StreamDelta) -> None:
+        """接收单个增量（同步、不得阻塞，实现方自行缓冲合并）。"""
+
+    def flush(self, task_id: str) -> None:
+        """本次模型调用结束：推出缓冲中的剩余增量。"""
+
+
 class SkillRunnerProtocol(Protocol):
     """Skill 执行协议。"""
 
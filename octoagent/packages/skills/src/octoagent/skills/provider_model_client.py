@@ -9,7 +9,8 @@
 - 把 task_scope（``f"{task_id}:{trace_id}"``）传给 router，让同 task 内 alias
   钉死（F1 修复）
 - 对话历史管理（per (task_id, trace_id) 缓存 + idle eviction）从 LiteLLMSkillClient
-  原样复用——历史管理逻辑与 LLM 调用层无关，复制是为了独立演进
+  原样复用——历史管理逻辑与 LLM 调用层无关，复制是为了独立演进；历史本体存放在
+  ``ConversationHistoryStore``（按字节计量的内存预算，超出时落盘、按需恢复）
 - 工具 schema 统一以 OpenAI Chat 嵌套格式生产；ProviderClient 内部按 transport
   转换为 Responses flat / Anthropic flat 格式
 
@@ -21,16 +22,19 @@ from __future__ import annotations
 
 import json
 import time
-from collections import OrderedDict
+from pathlib import Path
 from typing import Any
 
 import structlog
+from octoagent.provider.prompt_cache import CACHE_BREAKPOINT_KEY
 from octoagent.provider.provider_router import ProviderRouter
+from octoagent.provider.streaming import current_delta_callback
 from octoagent.tooling.security_render import render_tool_result_for_llm  # F124 T021
 
 # Feature 081 P4：compactor.py 已删除。运行时 compaction 主线在
 # gateway/services/context_compaction.py（走 llm_service.call → ProviderRouter），
 # 此处不再依赖 LiteLLM-Proxy-bound ContextCompactor。
+from .history_store import ConversationHistoryStore
 from .manifest import SkillManifest
 from .models import (
     FeedbackKind,
@@ -103,19 +107,24 @@ class ProviderModelClient:
         provider_router: ProviderRouter,
         tool_broker: Any | None = None,
         event_store: Any | None = None,
+        history_spill_path: Path | None = None,
     ) -> None:
         self._router = provider_router
         self._tool_broker = tool_broker
         self._event_store = event_store  # F126 项2: emit TOOL_RESULT_EVICTED
-        self._histories: OrderedDict[str, list[dict[str, Any]]] = OrderedDict()
+        # history_spill_path=None 时历史只常驻内存（超预算只告警）
+        self._histories = ConversationHistoryStore(history_spill_path)
         self._last_access: dict[str, float] = {}
         # F126 项2: key → tool_call_id → {artifact_ref, tool_name}，供 tail eviction
         # 构造确定性占位（仅记录有 artifact_ref=可 read-back 恢复的 tool 结果）。
         self._fold_meta: dict[str, dict[str, dict[str, str]]] = {}
 
     async def aclose(self) -> None:
-        """释放本客户端持有的会话状态，不关闭共享 ProviderRouter。"""
-        self._histories.clear()
+        """释放本客户端持有的会话状态，不关闭共享 ProviderRouter。
+
+        配置了落盘层时未结束的会话先落盘，重启后同 key 的 generate 可继续。
+        """
+        await self._histories.aclose()
         self._last_access.clear()
         self._fold_meta.clear()
 
@@ -130,6 +139,10 @@ class ProviderModelClient:
         # task scope 在 router 内也用同一个 key（task_id:trace_id），一并清理
         self._router.invalidate_task(key)
 
+    @property
+    def history_store(self) -> ConversationHistoryStore:
+        return self._histories
+
     # ──────────────── 历史管理（与 LiteLLMSkillClient 同源） ────────────────
 
     def _key(self, ctx: SkillExecutionContext) -> str:
@@ -174,7 +187,11 @@ class ProviderModelClient:
             role = str(item.get("role", "user")).strip().lower() or "user"
             if role not in {"system", "user", "assistant"}:
                 role = "user"
-            normalized.append({"role": role, "content": content})
+            message = {"role": role, "content": content}
+            if role == "system" and item.get(CACHE_BREAKPOINT_KEY):
+                # prompt 缓存断点标记透传给 ProviderClient
+                message[CACHE_BREAKPOINT_KEY] = item[CACHE_BREAKPOINT_KEY]
+            normalized.append(message)
         return normalized
 
     @classmethod
@@ -377,8 +394,9 @@ class ProviderModelClient:
 
         fold_meta = self._fold_meta.get(key, {})
         evicted: list[dict[str, Any]] = []
+        rewritten: list[int] = []
         # 从最旧（前部）向后扫，优先折叠旧 tool 结果，直到回到预算内或无可折叠
-        for msg in history:
+        for index, msg in enumerate(history):
             if self._estimate_history_tokens(history) <= budget_tokens:
                 break
             if msg.get("role") != "tool":
@@ -400,6 +418,7 @@ class ProviderModelClient:
                 f"（工具 {meta['tool_name']}，折叠前 {folded_bytes} 字节）]"
             )
             msg["content"] = placeholder  # 原地改写、位置不动、内容确定性冻结
+            rewritten.append(index)
             evicted.append(
                 {
                     "tool_call_id": call_id,
@@ -410,6 +429,9 @@ class ProviderModelClient:
                 }
             )
 
+        if rewritten:
+            # 原地改写不属于追加，需显式让 history store 重新计量这几条
+            self._histories.remeasure(key, rewritten)
         if evicted:
             await self._emit_evicted(key, step, evicted)
 
@@ -510,35 +532,60 @@ class ProviderModelClient:
 
         key = self._key(execution_context)
 
-        if key not in self._histories:
-            if step > 1:
-                log.error(
-                    "conversation_history_missing_on_resume",
-                    key=key,
-                    step=step,
-                    attempt=attempt,
-                    has_feedback=bool(feedback),
-                )
-                raise _LLMCallError(
-                    "conversation_state_lost",
-                    (
-                        f"step={step} 但 conversation history (key={key}) 已丢失，"
-                        "可能是进程重启或活跃会话被淘汰；不能凭 initial history "
-                        "重建 tool_call 配对。请从 checkpoint 恢复完整对话轨迹后重试。"
-                    ),
-                    retriable=False,
-                )
-            self._histories[key] = self._build_initial_history(
+        history = await self._histories.acquire(
+            key,
+            create=None if step > 1 else lambda: self._build_initial_history(
                 manifest=manifest,
                 execution_context=execution_context,
                 prompt=prompt,
+            ),
+        )
+        if history is None:
+            log.error(
+                "conversation_history_missing_on_resume",
+                key=key,
+                step=step,
+                attempt=attempt,
+                has_feedback=bool(feedback),
+            )
+            raise _LLMCallError(
+                "conversation_state_lost",
+                (
+                    f"step={step} 但 conversation history (key={key}) 已丢失，"
+                    "可能是进程重启或活跃会话被淘汰；不能凭 initial history "
+                    "重建 tool_call 配对。请从 checkpoint 恢复完整对话轨迹后重试。"
+                ),
+                retriable=False,
             )
 
-        self._histories.move_to_end(key)
         self._last_access[key] = time.monotonic()
         self._evict_idle_histories_if_needed(protect_key=key)
 
-        history = self._histories[key]
+        try:
+            return await self._generate_with_history(
+                history,
+                key=key,
+                manifest=manifest,
+                execution_context=execution_context,
+                feedback=feedback,
+                attempt=attempt,
+                step=step,
+            )
+        finally:
+            # history 已原地追加本步消息：重新计量，超预算时落盘其他空闲会话
+            await self._histories.release(key)
+
+    async def _generate_with_history(
+        self,
+        history: list[dict[str, Any]],
+        *,
+        key: str,
+        manifest: SkillManifest,
+        execution_context: SkillExecutionContext,
+        feedback: list[ToolFeedbackMessage],
+        attempt: int,
+        step: int,
+    ) -> SkillOutputEnvelope:
         if step > 1 and feedback:
             self._append_feedback_to_history(history, feedback)
             self._record_fold_meta(key, feedback)  # F126 项2
@@ -602,6 +649,8 @@ class ProviderModelClient:
             model_name=resolved.model_name,
             reasoning=reasoning,
             tool_choice=force_tool_choice,
+            # SkillRunner 注入增量出口时在本上下文绑定了回调
+            on_delta=current_delta_callback(),
         )
 
         return self._append_assistant_and_build_envelope(
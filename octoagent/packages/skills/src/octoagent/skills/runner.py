@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import asyncio
+import functools
 import hashlib
 import json
 import os
@@ -23,6 +24,7 @@ from octoagent.provider import ModelRequestsNotAllowedError
 # ProviderModelClient（Feature 080 主 model_client）抛的也是 ProviderLLMCallError，
 # 这里 alias 为 LLMCallError 与现有签名兼容。
 from octoagent.provider import ProviderLLMCallError as LLMCallError
+from octoagent.provider.streaming import bind_delta_callback
 from octoagent.tooling.models import ExecutionContext, PermissionPreset, SideEffectLevel
 from octoagent.tooling.protocols import EventStoreProtocol, ToolBrokerProtocol
 from pydantic import BaseModel, ValidationError
@@ -56,7 +58,7 @@ from .models import (
     is_runtime_exempt_tool,
     resolve_effective_tool_allowlist,
 )
-from .protocols import StructuredModelClientProtocol
+from .protocols import ModelDeltaSinkProtocol, StructuredModelClientProtocol
 
 logger = structlog.get_logger(__name__)
 
@@ -80,6 +82,7 @@ class SkillRunner:
         event_store: EventStoreProtocol | None = None,
         hooks: list[SkillRunnerHook] | None = None,
         on_tool_search_result: Callable[[str, str, str], Awaitable[None]] | None = None,
+        model_delta_sink: ModelDeltaSinkProtocol | None = None,
     ) -> None:
         self._model_client = model_client
         self._tool_broker = tool_broker
@@ -87,6 +90,8 @@ class SkillRunner:
         self._hooks = hooks or [NoopSkillRunnerHook()]
         # Feature 072: tool_search 结果回调（用于提升 deferred 工具）
         self._on_tool_search_result = on_tool_search_result
+        # 模型输出增量出口（None = 不流式转发，只在调用结束后发整段事件）
+        self._model_delta_sink = model_delta_sink
 
     async def aclose(self) -> None:
         """释放本地模型客户端资源，不取得其共享上游资源所有权。"""
@@ -160,7 +165,7 @@ class SkillRunner:
             await self._emit_model_started(manifest, execution_context, attempts, steps)
 
             try:
-                raw_output = await self._model_client.generate(
+                raw_output = await self._generate(
                     manifest=manifest,
                     execution_context=execution_context,
                     prompt=prompt,
@@ -255,8 +260,12 @@ class SkillRunner:
                             "rate_limit_backoff",
                             step=steps,
                             rate_limit_retries=rate_limit_retries,
+                            paced_by_governor=exc.paced_by_governor,
                         )
-                        await self._rate_limit_backoff(manifest, rate_limit_retries)
+                        if not exc.paced_by_governor:
+                            # provider 共享限流治理器已接管冷却 / 降速时，下次调用在
+                            # 发送前统一等待，不再叠加本地退避
+                            await self._rate_limit_backoff(manifest, rate_limit_retries)
                         steps -= 1
                         tracker.steps = steps
                         continue
@@ -1014,6 +1023,34 @@ class SkillRunner:
             },
         )
 
+    async def _generate(
+        self,
+        *,
+        manifest: SkillManifest,
+        execution_context: SkillExecutionContext,
+        prompt: str,
+        feedback: list[ToolFeedbackMessage],
+        attempt: int,
+        step: int,
+    ) -> SkillOutputEnvelope:
+        """单步模型调用；注入了增量出口时把 provider 增量转发给 sink（调用结束 flush）"""
+        sink = self._model_delta_sink
+        task_id = execution_context.task_id
+        callback = functools.partial(sink.publish, task_id, step) if sink is not None else None
+        with bind_delta_callback(callback):
+            try:
+                return await self._model_client.generate(
+                    manifest=manifest,
+                    execution_context=execution_context,
+                    prompt=prompt,
+                    feedback=feedback,
+                    attempt=attempt,
+                    step=step,
+                )
+            finally:
+                if sink is not None:
+                    sink.flush(task_id)
+
     async def _emit_model_started(
         self,
         manifest: SkillManifest,
@@ -1048,6 +1085,10 @@ class SkillRunner:
             "response_summary": output.content[:200],
             "token_usage": output.token_usage or {},
         }
+        metadata = getattr(output, "metadata", None)
+        ttft_ms = metadata.get("ttft_ms") if isinstance(metadata, dict) else None
+        if ttft_ms is not None:
+            payload["ttft_ms"] = ttft_ms
         if output.tool_calls:
             payload["tool_calls"] = [
                 {"tool_name": tc.tool_name, "arguments": tc.arguments} for tc in output.tool_calls
@@ -0,0 +1,147 @@
+"""ConversationHistoryStore：字节计量 / 超预算落盘 / 按需恢复 / 重启恢复 / 指标。"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from octoagent.skills import history_store as history_store_module
+from octoagent.skills.history_store import ConversationHistoryStore, history_bytes
+
+pytestmark = pytest.mark.asyncio
+
+
+def _history(tag: str, size: int = 1000) -> list[dict]:
+    return [
+        {"role": "system", "content": "sys"},
+        {"role": "user", "content": tag},
+        {"role": "tool", "tool_call_id": f"{tag}-c1", "content": "X" * size},
+    ]
+
+
+async def test_over_budget_spills_idle_histories_and_rehydrates_lazily(tmp_path: Path) -> None:
+    one = history_bytes(_history("a"))
+    store = ConversationHistoryStore(tmp_path / "h.db", memory_budget_bytes=one * 2 + 10)
+    for tag in ("a", "b", "c"):
+        await store.acquire(tag, create=lambda tag=tag: _history(tag))
+        await store.release(tag)
+
+    # 预算只容两条，回落到 90% 只剩一条常驻：最久未用的 a / b 落盘
+    snapshot = store.snapshot()
+    assert snapshot["memory_entries"] == 1
+    assert snapshot["memory_bytes"] == one
+    assert snapshot["spills"] == 2
+    assert snapshot["spilled_entries"] == 2
+    assert "a" in store
+
+    history = await store.acquire("a")
+    assert history == _history("a")
+    await store.release("a")
+    snapshot = store.snapshot()
+    assert snapshot["rehydrations"] == 1
+    assert snapshot["misses"] == 3
+    assert await store.acquire("missing") is None
+    await store.aclose()
+
+
+async def test_in_use_history_is_not_spilled(tmp_path: Path) -> None:
+    store = ConversationHistoryStore(tmp_path / "h.db", memory_budget_bytes=100)
+    active = await store.acquire("active", create=lambda: _history("active"))
+    assert active is not None
+    await store.acquire("idle", create=lambda: _history("idle"))
+    await store.release("idle")
+
+    # active 仍在 generate 中：只能落盘 idle，active 原地追加的消息不会丢
+    assert store.snapshot()["spilled_entries"] == 1
+    active.append({"role": "assistant", "content": "done"})
+    await store.release("active")
+    assert store.snapshot()["spilled_entries"] == 2
+
+    restored = await store.acquire("active")
+    assert restored is not None
+    assert restored[-1] == {"role": "assistant", "content": "done"}
+    await store.aclose()
+
+
+async def test_release_measures_only_appended_messages(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    store = ConversationHistoryStore(None)
+    history = await store.acquire("k", create=lambda: _history("k"))
+    assert history is not None
+    await store.release("k")
+    assert store.memory_bytes == history_bytes(history)
+
+    measured: list[dict] = []
+    real_message_bytes = history_store_module.message_bytes
+
+    def _counting(message: dict) -> int:
+        measured.append(message)
+        return real_message_bytes(message)
+
+    monkeypatch.setattr(history_store_module, "message_bytes", _counting)
+    for step in range(3):
+        await store.acquire("k")
+        history.append({"role": "assistant", "content": f"step-{step}"})
+        await store.release("k")
+
+    assert measured == history[-3:]
+    assert store.memory_bytes == history_bytes(history)
+
+
+async def test_remeasure_accounts_in_place_rewrites() -> None:
+    store = ConversationHistoryStore(None)
+    history = await store.acquire("k", create=lambda: _history("k", size=5000))
+    assert history is not None
+    await store.release("k")
+
+    await store.acquire("k")
+    history[2]["content"] = "[folded]"
+    history.append({"role": "user", "content": "next"})
+    store.remeasure("k", [2, 99])
+    await store.release("k")
+
+    assert store.memory_bytes == history_bytes(history)
+
+
+async def test_aclose_persists_histories_for_restart(tmp_path: Path) -> None:
+    path = tmp_path / "h.db"
+    store = ConversationHistoryStore(path)
+    await store.acquire("task:trace", create=lambda: _history("resume"))
+    await store.release("task:trace")
+    await store.aclose()
+    assert len(store) == 0
+
+    restarted = ConversationHistoryStore(path)
+    assert await restarted.acquire("task:trace") == _history("resume")
+    assert restarted.snapshot()["rehydrations"] == 1
+    await restarted.aclose()
+
+
+async def test_pop_drops_spilled_copy(tmp_path: Path) -> None:
+    path = tmp_path / "h.db"
+    store = ConversationHistoryStore(path)
+    await store.acquire("done", create=lambda: _history("done"))
+    await store.release("done")
+    await store.aclose()
+
+    store = ConversationHistoryStore(path)
+    assert await store.acquire("done") is not None
+    store.pop("done")
+    assert "done" not in store
+    await store.aclose()
+
+    assert await ConversationHistoryStore(path).acquire("done") is None
+
+
+async def test_without_disk_over_budget_keeps_histories() -> None:
+    store = ConversationHistoryStore(None, memory_budget_bytes=10)
+    await store.acquire("k", create=lambda: _history("k"))
+    await store.release("k")
+
+    snapshot = store.snapshot()
+    assert snapshot["memory_entries"] == 1
+    assert snapshot["over_budget_warnings"] == 1
+    assert snapshot["disk_enabled"] is False
+    await store.aclose()
+    assert len(store) == 0
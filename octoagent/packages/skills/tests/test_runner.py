@@ -1414,6 +1414,55 @@ async def test_runner_rate_limit_backoff_is_exponential(
     assert waits == [0.1, 0.2, 0.4], f"退避应指数递增，实际 {waits}"
 
 
+async def test_runner_rate_limit_skips_local_backoff_when_governor_paced(
+    execution_context, tool_broker, event_store, monkeypatch
+) -> None:
+    """provider 共享限流治理器已接管的 429 不再叠加本地退避（重试上界不变）。"""
+    from octoagent.skills import runner as runner_mod
+    from octoagent.skills.models import RetryPolicy
+
+    from .conftest import EchoOutput
+
+    waits: list[float] = []
+
+    async def _fake_sleep(secs: float) -> None:
+        waits.append(secs)
+
+    monkeypatch.setattr(runner_mod.asyncio, "sleep", _fake_sleep)
+
+    def _paced_error():
+        exc = _rate_limit_error()
+        exc.paced_by_governor = True
+        return exc
+
+    manifest = SkillManifest(
+        skill_id="demo.echo",
+        version="0.1.0",
+        input_model=EchoInput,
+        output_model=EchoOutput,
+        model_alias="main",
+        tools_allowed=["system.echo"],
+        retry_policy=RetryPolicy(max_attempts=6, backoff_ms=100),
+    )
+    client = QueueModelClient(
+        [_paced_error() for _ in range(2)] + [SkillOutputEnvelope(content="ok", complete=True)]
+    )
+    runner = SkillRunner(
+        model_client=client, tool_broker=tool_broker, event_store=event_store
+    )
+
+    result = await runner.run(
+        manifest=manifest,
+        execution_context=execution_context,
+        skill_input=EchoInput(text="hi"),
+        prompt="echo",
+    )
+
+    assert result.status == SkillRunStatus.SUCCEEDED
+    assert client.calls == 3
+    assert waits == []
+
+
 async def test_runner_rate_limit_exhausts_retries_fails_repeat_error(
     execution_context, tool_broker, event_store
 ) -> None:
@@ -1495,3 +1544,56 @@ async def test_runner_rate_limit_counter_resets_after_success(
         f"清零生效则段2 429 应仍可退避，实际 {result.error_category}"
     )
     assert client.calls == 4
+
+
+class _RecordingDeltaSink:
+    def __init__(self) -> None:
+        self.published: list[tuple[str, int, Any]] = []
+        self.flushed: list[str] = []
+
+    def publish(self, task_id: str, step: int, delta: Any) -> None:
+        self.published.append((task_id, step, delta))
+
+    def flush(self, task_id: str) -> None:
+        self.flushed.append(task_id)
+
+
+class _DeltaEmittingClient(QueueModelClient):
+    """模拟 ProviderModelClient：从上下文取增量回调并推一个文本增量"""
+
+    async def generate(self, **kwargs: Any) -> SkillOutputEnvelope:
+        from octoagent.provider.streaming import StreamDelta, current_delta_callback
+
+        callback = current_delta_callback()
+        if callback is not None:
+            callback(StreamDelta(kind="text", text=f"step-{kwargs['step']}"))
+        return await super().generate(**kwargs)
+
+
+async def test_runner_forwards_model_deltas_to_sink(
+    echo_manifest, execution_context, tool_broker, event_store
+) -> None:
+    from octoagent.provider.streaming import current_delta_callback
+
+    sink = _RecordingDeltaSink()
+    client = _DeltaEmittingClient([SkillOutputEnvelope(content="ok", complete=True)])
+    runner = SkillRunner(
+        model_client=client,
+        tool_broker=tool_broker,
+        event_store=event_store,
+        model_delta_sink=sink,
+    )
+
+    result = await runner.run(
+        manifest=echo_manifest,
+        execution_context=execution_context,
+        skill_input=EchoInput(text="hello"),
+        prompt="echo",
+    )
+
+    assert result.status == SkillRunStatus.SUCCEEDED
+    task_id = execution_context.task_id
+    assert [(t, s, d.text) for t, s, d in sink.published] == [(task_id, 1, "step-1")]
+    assert sink.flushed == [task_id]
+    # 调用结束后回调解绑，不泄漏到后续上下文
+    assert current_delta_callback() is None
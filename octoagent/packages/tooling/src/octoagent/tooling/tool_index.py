@@ -2,12 +2,14 @@
 
 from __future__ import annotations
 
-import math
+import hashlib
 import re
 import time
 from collections.abc import Sequence
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import lru_cache
 
+import numpy as np
 from octoagent.core.models import DynamicToolSelection, ToolIndexHit, ToolIndexQuery
 from ulid import ULID
 
@@ -15,6 +17,8 @@ from .models import ToolMeta, ToolSearchHit, ToolSearchResult, ToolTier
 
 _TOKEN_PATTERN = re.compile(r"[a-z0-9_]+|[\u4e00-\u9fff]+")
 _EMBED_DIM = 96
+# query embedding / 分词 LRU 容量（同一轮对话内 select_tools 与 search_for_deferred 反复查询）
+_QUERY_CACHE_SIZE = 1024
 
 
 def _tokenize(value: str) -> list[str]:
@@ -31,22 +35,41 @@ def _tokenize(value: str) -> list[str]:
     return tokens
 
 
-def _hash_embed(text: str, *, dim: int = _EMBED_DIM) -> list[float]:
-    vector = [0.0] * dim
+def _stable_bucket(token: str, dim: int) -> int:
+    """token -> 维度下标（blake2b，跨进程稳定；内置 hash() 受 PYTHONHASHSEED 影响）"""
+    digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little") % dim
+
+
+def _hash_embed(text: str, *, dim: int = _EMBED_DIM) -> np.ndarray:
+    vector = np.zeros(dim, dtype=np.float64)
     for token in _tokenize(text):
-        index = hash(token) % dim
-        vector[index] += 1.0
-    norm = math.sqrt(sum(item * item for item in vector))
+        vector[_stable_bucket(token, dim)] += 1.0
+    norm = float(np.linalg.norm(vector))
     if norm == 0:
         return vector
-    return [item / norm for item in vector]
-
-
-def _cosine(left: Sequence[float], right: Sequence[float]) -> float:
-    size = min(len(left), len(right))
-    if size == 0:
-        return 0.0
-    return sum(left[i] * right[i] for i in range(size))
+    return vector / norm
+
+
+@lru_cache(maxsize=_QUERY_CACHE_SIZE)
+def _query_features(query: str) -> tuple[np.ndarray, frozenset[str]]:
+    """query embedding + token 集合（只读，LRU 复用）"""
+    embedding = _hash_embed(query)
+    embedding.flags.writeable = False
+    return embedding, frozenset(_tokenize(query))
+
+
+def _search_text(tool: ToolMeta) -> str:
+    return " ".join(
+        [
+            tool.name,
+            tool.description,
+            tool.tool_group,
+            " ".join(tool.tags),
+            " ".join(tool.worker_types),
+            tool.manifest_ref,
+        ]
+    )
 
 
 @dataclass(slots=True)
@@ -55,7 +78,18 @@ class ToolIndexRecord:
 
     meta: ToolMeta
     search_text: str
-    embedding: list[float]
+    embedding: np.ndarray
+    tokens: frozenset[str] = field(default_factory=frozenset)
+
+    @classmethod
+    def from_meta(cls, meta: ToolMeta) -> ToolIndexRecord:
+        search_text = _search_text(meta)
+        return cls(
+            meta=meta,
+            search_text=search_text,
+            embedding=_hash_embed(search_text),
+            tokens=frozenset(_tokenize(search_text)),
+        )
 
 
 class ToolIndexBackend:
@@ -69,44 +103,137 @@ class ToolIndexBackend:
     async def query(self, request: ToolIndexQuery) -> list[ToolIndexHit]:
         raise NotImplementedError
 
+    async def upsert(self, records: Sequence[ToolIndexRecord]) -> None:
+        raise NotImplementedError
+
+    async def remove(self, tool_names: Sequence[str]) -> None:
+        raise NotImplementedError
+
 
 class InMemoryToolIndexBackend(ToolIndexBackend):
-    """默认本地向量检索 backend。"""
+    """默认本地向量检索 backend。
+
+    全部工具 embedding 存为连续矩阵（行序与 _records 一致），查询时一次矩阵-向量乘积
+    打分，关键词重叠走倒排表计数，top-k 用 argpartition 取候选后再精排。
+    rebuild 按工具名复用未变化记录的矩阵行，只为新增 / 变化的工具写入新行；upsert 不经
+    rebuild，原地改写变化的行并在末尾追加新增行。
+    """
 
     backend_name = "in_memory"
 
     def __init__(self) -> None:
         self._records: list[ToolIndexRecord] = []
+        self._matrix = np.zeros((0, _EMBED_DIM), dtype=np.float64)
+        self._row_by_name: dict[str, int] = {}
+        # token -> 包含该 token 的行号
+        self._postings: dict[str, np.ndarray] = {}
 
     async def rebuild(self, records: list[ToolIndexRecord]) -> None:
-        self._records = list(records)
+        previous = {
+            record.meta.name: (record, self._row_by_name[record.meta.name])
+            for record in self._records
+        }
+        matrix = np.empty((len(records), _EMBED_DIM), dtype=np.float64)
+        reused_new: list[int] = []
+        reused_old: list[int] = []
+        for row, record in enumerate(records):
+            old = previous.get(record.meta.name)
+            if old is not None and old[0].search_text == record.search_text:
+                reused_new.append(row)
+                reused_old.append(old[1])
+            else:
+                matrix[row] = record.embedding
+        if reused_new:
+            matrix[reused_new] = self._matrix[reused_old]
+        self._install(list(records), matrix)
+
+    async def upsert(self, records: Sequence[ToolIndexRecord]) -> None:
+        """增量注册 / 更新工具：只为新增 / 检索文本变化的工具写矩阵行，其余行原样保留"""
+        latest = {record.meta.name: record for record in records}
+        if not latest:
+            return
+        merged = list(self._records)
+        changed_rows: list[int] = []
+        added: list[ToolIndexRecord] = []
+        for name, record in latest.items():
+            row = self._row_by_name.get(name)
+            if row is None:
+                added.append(record)
+                continue
+            if merged[row].search_text != record.search_text:
+                changed_rows.append(row)
+            merged[row] = record
+        matrix = self._matrix
+        if changed_rows:
+            # 查询在单次同步调用内完成打分，原地改写行不会被读到一半
+            matrix[changed_rows] = np.asarray([merged[row].embedding for row in changed_rows])
+        if added:
+            matrix = np.vstack([matrix, np.asarray([record.embedding for record in added])])
+            merged.extend(added)
+        self._install(merged, matrix)
+
+    async def remove(self, tool_names: Sequence[str]) -> None:
+        """增量注销工具：删除对应矩阵行"""
+        doomed = {self._row_by_name[name] for name in tool_names if name in self._row_by_name}
+        if not doomed:
+            return
+        keep = [row for row in range(len(self._records)) if row not in doomed]
+        self._install([self._records[row] for row in keep], self._matrix[keep])
 
     async def query(self, request: ToolIndexQuery) -> list[ToolIndexHit]:
-        query_embedding = _hash_embed(request.query)
-        hits: list[ToolIndexHit] = []
-        for record in self._records:
-            matched_filters = _matched_filters(record.meta, request)
-            if matched_filters is None:
-                continue
-            score = _score_record(record, query_embedding, request, matched_filters)
-            hits.append(
-                ToolIndexHit(
-                    tool_name=record.meta.name,
-                    score=round(score, 5),
-                    match_reason=_match_reason(record.meta, matched_filters),
-                    matched_filters=matched_filters,
-                    tool_group=record.meta.tool_group,
-                    metadata={
-                        "tags": list(record.meta.tags),
-                        "worker_types": list(record.meta.worker_types),
-                        "manifest_ref": record.meta.manifest_ref,
-                        **record.meta.metadata,
-                    },
-                )
+        if not self._records:
+            return []
+        matched_filters = _request_filters(request)
+        mask = _filter_mask(self._records, request)
+        candidates = np.flatnonzero(mask)
+        if candidates.size == 0:
+            return []
+
+        query_embedding, query_tokens = _query_features(request.query)
+        scores = self._matrix @ query_embedding
+        overlap_rows = [self._postings[token] for token in query_tokens if token in self._postings]
+        if overlap_rows:
+            overlap = np.bincount(np.concatenate(overlap_rows), minlength=len(self._records))
+            scores += np.minimum(overlap * 0.08, 0.4)
+        scores += len(matched_filters) * 0.02
+        for token in query_tokens:
+            row = self._row_by_name.get(token)
+            if row is not None:
+                scores[row] += 0.2
+        np.maximum(scores, 0.0, out=scores)
+
+        top_rows = _top_rows(scores, candidates, request.limit)
+        hits = [
+            ToolIndexHit(
+                tool_name=self._records[row].meta.name,
+                score=round(float(scores[row]), 5),
+                match_reason=_match_reason(self._records[row].meta, matched_filters),
+                matched_filters=list(matched_filters),
+                tool_group=self._records[row].meta.tool_group,
+                metadata={
+                    "tags": list(self._records[row].meta.tags),
+                    "worker_types": list(self._records[row].meta.worker_types),
+                    "manifest_ref": self._records[row].meta.manifest_ref,
+                    **self._records[row].meta.metadata,
+                },
             )
+            for row in top_rows
+        ]
         hits.sort(key=lambda item: (-item.score, item.tool_name))
         return hits[: request.limit]
 
+    def _install(self, records: list[ToolIndexRecord], matrix: np.ndarray) -> None:
+        self._records = records
+        self._matrix = np.ascontiguousarray(matrix)
+        self._row_by_name = {record.meta.name: row for row, record in enumerate(records)}
+        postings: dict[str, list[int]] = {}
+        for row, record in enumerate(records):
+            for token in record.tokens:
+                postings.setdefault(token, []).append(row)
+        self._postings = {
+            token: np.asarray(rows, dtype=np.intp) for token, rows in postings.items()
+        }
+
 
 class LanceDBToolIndexBackend(InMemoryToolIndexBackend):
     """可选 LanceDB backend。
@@ -124,6 +251,42 @@ class LanceDBToolIndexBackend(InMemoryToolIndexBackend):
         super().__init__()
 
 
+def _top_rows(scores: np.ndarray, candidates: np.ndarray, limit: int) -> list[int]:
+    """候选行中按 (-score, tool_name) 排序的前 limit 行的超集
+
+    argpartition 取第 limit 大分数作阈值，阈值下方留出舍入余量（hit.score 保留 5 位
+    小数后再按名称排序），保证与全量排序结果一致。
+    """
+    candidate_scores = scores[candidates]
+    if limit <= 0 or candidates.size <= limit:
+        return candidates.tolist()
+    kth = candidates.size - limit
+    threshold = np.partition(candidate_scores, kth)[kth]
+    return candidates[candidate_scores >= threshold - 1e-5].tolist()
+
+
+def _request_filters(request: ToolIndexQuery) -> list[str]:
+    """请求命中的过滤维度（对所有通过过滤的工具相同）"""
+    matched: list[str] = []
+    if request.tool_groups:
+        matched.append("tool_group")
+    if request.worker_type is not None:
+        matched.append("worker_type")
+    if request.tags:
+        matched.append("tags")
+    return matched
+
+
+def _filter_mask(records: Sequence[ToolIndexRecord], request: ToolIndexQuery) -> np.ndarray:
+    if not (request.tool_groups or request.worker_type is not None or request.tags):
+        return np.ones(len(records), dtype=bool)
+    return np.fromiter(
+        (_matched_filters(record.meta, request) is not None for record in records),
+        dtype=bool,
+        count=len(records),
+    )
+
+
 def _matched_filters(meta: ToolMeta, request: ToolIndexQuery) -> list[str] | None:
     matched: list[str] = []
     if request.tool_groups and meta.tool_group not in request.tool_groups:
@@ -141,23 +304,6 @@ def _matched_filters(meta: ToolMeta, request: ToolIndexQuery) -> list[str] | Non
     return matched
 
 
-def _score_record(
-    record: ToolIndexRecord,
-    query_embedding: Sequence[float],
-    request: ToolIndexQuery,
-    matched_filters: list[str],
-) -> float:
-    score = _cosine(record.embedding, query_embedding)
-    query_tokens = set(_tokenize(request.query))
-    meta_tokens = set(_tokenize(record.search_text))
-    overlap = len(query_tokens.intersection(meta_tokens))
-    score += min(overlap * 0.08, 0.4)
-    score += len(matched_filters) * 0.02
-    if record.meta.name in query_tokens:
-        score += 0.2
-    return max(score, 0.0)
-
-
 def _match_reason(meta: ToolMeta, matched_filters: list[str]) -> str:
     parts = [meta.description.strip() or meta.name]
     if matched_filters:
@@ -175,6 +321,7 @@ class ToolIndex:
         self._degraded_reason = ""
         self._backend = self._build_backend(preferred_backend)
         self._records: list[ToolIndexRecord] = []
+        self._records_by_name: dict[str, ToolIndexRecord] = {}
         if self._backend.backend_name == "in_memory" and not self._degraded_reason:
             self._degraded_reason = "static_index"
 
@@ -187,36 +334,43 @@ class ToolIndex:
         return self._degraded_reason
 
     async def rebuild(self, tools: Sequence[ToolMeta]) -> None:
-        self._records = [
-            ToolIndexRecord(
-                meta=tool,
-                search_text=" ".join(
-                    [
-                        tool.name,
-                        tool.description,
-                        tool.tool_group,
-                        " ".join(tool.tags),
-                        " ".join(tool.worker_types),
-                        tool.manifest_ref,
-                    ]
-                ),
-                embedding=_hash_embed(
-                    " ".join(
-                        [
-                            tool.name,
-                            tool.description,
-                            tool.tool_group,
-                            " ".join(tool.tags),
-                            " ".join(tool.worker_types),
-                            tool.manifest_ref,
-                        ]
-                    )
-                ),
-            )
-            for tool in tools
-        ]
+        # 未变化的工具复用已有记录（embedding / 分词不重算）
+        previous = self._records_by_name
+        records: list[ToolIndexRecord] = []
+        for tool in tools:
+            record = previous.get(tool.name)
+            if record is None or record.search_text != _search_text(tool):
+                record = ToolIndexRecord.from_meta(tool)
+            else:
+                record.meta = tool
+            records.append(record)
+        self._records = records
+        self._records_by_name = {record.meta.name: record for record in records}
         await self._backend.rebuild(self._records)
 
+    async def upsert(self, tools: Sequence[ToolMeta]) -> None:
+        """增量注册 / 更新工具（MCP server 单独上下线时无需全量 rebuild）"""
+        records = [ToolIndexRecord.from_meta(tool) for tool in tools]
+        updated: dict[str, ToolIndexRecord] = {}
+        for record in records:
+            if record.meta.name in self._records_by_name:
+                updated[record.meta.name] = record
+            else:
+                self._records.append(record)
+            self._records_by_name[record.meta.name] = record
+        if updated:
+            # 单次遍历替换所有更新项（逐条替换为 O(N·k)）
+            self._records = [updated.get(item.meta.name, item) for item in self._records]
+        await self._backend.upsert(records)
+
+    async def remove(self, tool_names: Sequence[str]) -> None:
+        """增量注销工具"""
+        doomed = set(tool_names)
+        self._records = [item for item in self._records if item.meta.name not in doomed]
+        for name in doomed:
+            self._records_by_name.pop(name, None)
+        await self._backend.remove(list(doomed))
+
     async def select_tools(
         self,
         request: ToolIndexQuery,
@@ -328,10 +482,7 @@ class ToolIndex:
 
     def _find_record(self, tool_name: str) -> ToolIndexRecord | None:
         """通过工具名查找内部记录"""
-        for record in self._records:
-            if record.meta.name == tool_name:
-                return record
-        return None
+        return self._records_by_name.get(tool_name)
 
     def _count_deferred(self) -> int:
         """计算 Deferred 工具总数"""
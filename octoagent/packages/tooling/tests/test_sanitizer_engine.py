@@ -0,0 +1,134 @@
+"""脱敏引擎：与原始深拷贝实现逐值等价 / 写时复制 / 大 tool result 吞吐基准。
+
+参照实现即重构前的 sanitizer：每层 dict / list 全量重建，每个字符串依次跑凭证正则与
+$HOME 替换。新引擎只能跳过不可能改动的字符串和子树，结果必须与参照完全相等。
+吞吐基准耗时依赖机器，默认跳过；设置 OCTOAGENT_SANITIZER_BENCH=1 后运行。
+"""
+
+from __future__ import annotations
+
+import os
+import random
+import time
+from typing import Any
+
+import pytest
+from octoagent.tooling import sanitizer
+from octoagent.tooling.sanitizer import sanitize_for_event
+
+_HOME = os.path.expanduser("~")
+
+
+def _reference_sanitize(value: Any, key: Any = None, home: str = _HOME) -> Any:
+    if isinstance(value, dict):
+        return {k: _reference_sanitize(v, k, home) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_reference_sanitize(item, None, home) for item in value]
+    if isinstance(value, str):
+        if key is not None and sanitizer._SENSITIVE_KEY_PATTERNS.search(key):
+            return "[REDACTED]"
+        text = sanitizer._CREDENTIAL_VALUE_PATTERN.sub(
+            lambda m: f"{m.group(1)}=[REDACTED]", value
+        )
+        if home and home in text:
+            text = text.replace(home, "~")
+        return text
+    return value
+
+
+def _tool_result_payload(index: int) -> dict[str, Any]:
+    return {
+        "tool_name": "filesystem.read_text",
+        "duration_ms": 12,
+        "args": {"path": f"{_HOME}/proj/src/mod{index}.py", "limit": 2000},
+        "result": {
+            "content": "def handler(event):\n    x = compute(event) or {}\n" * 2000,
+            "items": [{"id": k, "name": f"item-{k}", "tags": ["a", "b"]} for k in range(300)],
+        },
+        "truncated": False,
+        "artifact_ref": None,
+    }
+
+
+def test_matches_reference_on_mixed_samples() -> None:
+    rng = random.Random(20260301)
+    fragments = [
+        "plain text",
+        "x = 1",
+        "token=abc123",
+        "PassWord = hunter2 tail",
+        "api KEY=sk-xyz",
+        "ſecret=leak",  # IGNORECASE 下 ſ 等价于 s
+        "Key=leak",  # Kelvin 符号等价于 K
+        f"{_HOME}/a.txt",
+        f"cd {_HOME} && key={_HOME}/id_rsa",
+        "keyboard = qwerty",
+        "",
+    ]
+    samples = [
+        "".join(rng.choice(fragments) + " " for _ in range(rng.randint(1, 5)))
+        for _ in range(300)
+    ]
+    payload = {
+        "values": samples,
+        "nested": {"secret_field": "x", "ok": samples[:20], "n": 3},
+    }
+    assert sanitize_for_event(payload) == _reference_sanitize(payload)
+
+
+def test_value_redactor_matches_reference_for_overlapping_home() -> None:
+    # $HOME 以敏感词前缀结尾 / 含敏感词：顺序执行的语义不能被改变
+    for home in ("/home/to", "/home/key", "/Users/Secret Agent", ""):
+        redactor = sanitizer._build_value_redactor(home)
+        for text in (f"{home}ken=abc", f"{home}=x", f"{home}/a key = b", "token = 1"):
+            expected = _reference_sanitize(text, home=home)
+            assert redactor.redact(text) == expected, (home, text)
+
+
+def test_unchanged_subtrees_are_not_copied() -> None:
+    payload = _tool_result_payload(0)
+    payload["args"]["path"] = "/tmp/outside-home.py"
+
+    assert sanitize_for_event(payload) is payload
+
+    payload["args"]["path"] = f"{_HOME}/x.py"
+    result = sanitize_for_event(payload)
+    assert result is not payload
+    assert result["args"] is not payload["args"]
+    assert result["args"]["path"] == "~/x.py"
+    assert payload["args"]["path"] == f"{_HOME}/x.py"  # 入参不被修改
+    assert result["result"] is payload["result"]  # 未改动的兄弟子树共享
+
+
+def test_large_tool_result_matches_reference() -> None:
+    """大 tool result（~100KB 正文 + 300 项列表）脱敏结果与参照实现相等"""
+    for payload in [_tool_result_payload(i) for i in range(3)]:
+        assert sanitize_for_event(payload) == _reference_sanitize(payload)
+
+
+@pytest.mark.skipif(
+    not os.environ.get("OCTOAGENT_SANITIZER_BENCH"),
+    reason="吞吐基准耗时依赖机器，需显式开启",
+)
+def test_large_tool_result_throughput_benchmark() -> None:
+    """基准：大 tool result 单次脱敏耗时，与参照实现对照（OCTOAGENT_SANITIZER_BENCH=1 开启）"""
+    payloads = [_tool_result_payload(i) for i in range(20)]
+
+    def _elapsed(fn) -> float:
+        start = time.perf_counter()
+        for payload in payloads:
+            fn(payload)
+        return (time.perf_counter() - start) * 1000 / len(payloads)
+
+    engine_ms = _elapsed(sanitize_for_event)
+    reference_ms = _elapsed(_reference_sanitize)
+    report = f"engine={engine_ms:.2f}ms/payload reference={reference_ms:.2f}ms/payload"
+    assert engine_ms < reference_ms, report
+
+
+def test_credential_gate_is_case_insensitive_superset() -> None:
+    # 闸门在 casefold 文本上判定：凡 IGNORECASE 凭证正则能命中的，闸门必须命中
+    for text in ("TOKEN =x", "Secret\t=y", "KEY=z", "ſECRET=w", "pAsSwOrD= 1"):
+        assert sanitizer._CREDENTIAL_VALUE_PATTERN.search(text)
+        assert sanitizer._CREDENTIAL_GATE.search(text.casefold()), text
+    assert sanitize_for_event({"v": "ſecret=w"})["v"] == "ſecret=[REDACTED]"